@@ -4,6 +4,8 @@ Agent definitions, registry, and runtime wrapper.
 
 from agent_factory.agents.agent import Agent, AgentConfig, AgentResult, AgentStatus, Handoff
 from agent_factory.agents.config import AgentConfig as Config
+from agent_factory.agents.context_packer import ContextPacker, PackedContext, TokenCounter
+from agent_factory.agents.prepared import PreparedAgent, compile_agent
 
 __all__ = [
     "Agent",
@@ -12,4 +14,9 @@ __all__ = [
     "AgentResult",
     "AgentStatus",
     "Handoff",
+    "ContextPacker",
+    "PackedContext",
+    "TokenCounter",
+    "PreparedAgent",
+    "compile_agent",
 ]
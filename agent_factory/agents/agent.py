@@ -3,14 +3,16 @@ Agent class - Core primitive for creating and running AI agents.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
 from enum import Enum
 
 from agent_factory.tools.base import Tool
+from agent_factory.agents.prepared import PreparedAgent, compile_agent
 from agent_factory.runtime.memory import MemoryStore
 from agent_factory.core.guardrails import Guardrails
 from agent_factory.promptlog import Run, SQLiteStorage
 from agent_factory.knowledge import KnowledgePack
+from agent_factory.utils.async_utils import run_sync, run_in_thread, spawn_background
 import uuid
 import time
 
@@ -29,10 +31,28 @@ class AgentConfig:
     model: str = "gpt-4o"
     temperature: float = 0.7
     max_tokens: int = 2000
-    timeout: int = 30  # seconds
-    retry_attempts: int = 3
+    timeout: int = 30  # seconds, per model call attempt
+    retry_attempts: int = 3  # retries after the first attempt on transient errors
+    retry_backoff: float = 0.5  # seconds, base of the jittered exponential backoff
+    hedge_requests: bool = False  # send a second request once a call passes the latency quantile
+    hedge_quantile: float = 0.95
     enable_memory: bool = True
     enable_guardrails: bool = True
+    max_tool_iterations: int = 10
+    tool_timeout: float = 30.0  # seconds, per tool call
+    cache_responses: Optional[bool] = None  # None: cache only when temperature is 0
+    cache_ttl: int = 3600  # seconds
+    semantic_cache: bool = False
+    # Minimum cosine similarity; the default HashingEmbedder scores inputs that
+    # differ in one key word (e.g. an amount) around 0.9, so stay above that
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_ttl: int = 3600  # seconds
+    context_max_tokens: int = 8000  # prompt budget for instructions, tools and context
+    context_summary_tokens: int = 256  # budget for the summary of dropped turns
+    # "provider:model" strings or {"provider", "model", "weight"} dicts; when set,
+    # runs are routed across these targets instead of the agent's model on OpenAI
+    provider_targets: List[Any] = field(default_factory=list)
+    routing_strategy: str = "ordered"  # ordered, latency or weighted
 
 
 @dataclass
@@ -113,15 +133,36 @@ class Agent:
         self.knowledge_packs = knowledge_packs or []
         self.prompt_log_storage = prompt_log_storage
         self._status = AgentStatus.IDLE
+        self._prepared: Optional[PreparedAgent] = None
+    
+    @property
+    def prepared(self) -> PreparedAgent:
+        """Compiled request artifacts, rebuilt only after the agent changes."""
+        prepared = self._prepared
+        if prepared is None or not self._prepared_is_current(prepared):
+            prepared = self._prepared = compile_agent(self)
+        return prepared
+    
+    def _prepared_is_current(self, prepared: PreparedAgent) -> bool:
+        """Cheap check for changes made by assigning attributes directly."""
+        return (
+            prepared.model == self.model
+            and prepared.system_prompt is self.instructions
+            and prepared.config == self.config
+            and len(prepared.tools) == len(self.tools)
+            and all(a is b for a, b in zip(prepared.tools, self.tools))
+        )
     
     def add_tool(self, tool: Tool) -> None:
         """Add a tool to the agent."""
         if tool not in self.tools:
             self.tools.append(tool)
+            self._prepared = None
     
     def remove_tool(self, tool_id: str) -> None:
         """Remove a tool by ID."""
         self.tools = [t for t in self.tools if t.id != tool_id]
+        self._prepared = None
     
     def attach_knowledge_pack(self, pack: KnowledgePack) -> None:
         """Attach a knowledge pack to the agent."""
@@ -131,6 +172,7 @@ class Agent:
     def update_instructions(self, instructions: str) -> None:
         """Update agent instructions."""
         self.instructions = instructions
+        self._prepared = None
     
     def run(
         self,
@@ -141,6 +183,27 @@ class Agent:
         """
         Run the agent with given input.
         
+        Synchronous wrapper around :meth:`arun`.
+        
+        Args:
+            input_text: User input/question
+            session_id: Optional session ID for memory
+            context: Optional context dictionary
+            
+        Returns:
+            AgentResult with output and metadata
+        """
+        return run_sync(self.arun(input_text, session_id=session_id, context=context))
+    
+    async def arun(
+        self,
+        input_text: str,
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AgentResult:
+        """
+        Run the agent with given input without blocking the event loop.
+        
         Args:
             input_text: User input/question
             session_id: Optional session ID for memory
@@ -165,28 +228,21 @@ class Agent:
                         error=f"Input blocked by guardrails: {guardrail_result.reason}",
                         run_id=run_id,
                     )
-                    self._log_run(run_id, input_text, result, start_time)
+                    await run_in_thread(self._log_run, run_id, input_text, result, start_time)
                     return result
             
-            # Load memory if available
-            memory_context = {}
-            if self.memory and session_id:
-                memory_context = self.memory.get_context(session_id)
-            
-            # Load knowledge pack context if available
-            knowledge_context = {}
-            if self.knowledge_packs:
-                knowledge_context = self._get_knowledge_context(input_text)
-            
-            # Prepare context
-            full_context = {
-                **(context or {}),
-                **memory_context,
-                **knowledge_context,
-            }
-            
-            # Execute agent (this would integrate with OpenAI SDK)
-            output = self._execute_agent(input_text, full_context)
+            # Serve near-duplicate inputs from the semantic cache. Memory and
+            # caller context shape the answer, so runs with either bypass it
+            semantic = self.config.semantic_cache and not session_id and not context
+            execution = await self._semantic_lookup(input_text) if semantic else None
+            if execution is None:
+                full_context = await self._prepare_context(input_text, session_id, context)
+                
+                # Execute agent against the LLM provider
+                execution = await self._execute_agent(input_text, full_context)
+                if semantic:
+                    await self._semantic_store(input_text, execution)
+            output = execution.get("output", "")
             
             # Apply output guardrails
             if self.guardrails:
@@ -196,7 +252,7 @@ class Agent:
             
             # Save to memory
             if self.memory and session_id:
-                self.memory.save_interaction(session_id, input_text, output)
+                await run_in_thread(self.memory.save_interaction, session_id, input_text, output)
             
             execution_time = time.time() - start_time
             
@@ -205,27 +261,155 @@ class Agent:
             result = AgentResult(
                 output=output,
                 status=AgentStatus.COMPLETED,
+                tokens_used=execution.get("tokens_used", 0),
                 execution_time=execution_time,
-                metadata={"model": self.model},
+                tool_calls=execution.get("tool_calls", []),
+                metadata={"model": self.model, "cached": execution.get("cached", False)},
                 run_id=run_id,
             )
+            if "semantic_similarity" in execution:
+                result.metadata["semantic_similarity"] = execution["semantic_similarity"]
+            if "routing" in execution:
+                result.metadata.update(execution["routing"])
             
             # Log to prompt log
-            self._log_run(run_id, input_text, result, start_time)
+            await run_in_thread(self._log_run, run_id, input_text, result, start_time)
             
             return result
             
         except Exception as e:
+            from agent_factory.integrations.request_policy import is_retryable
+            
             self._status = AgentStatus.ERROR
             result = AgentResult(
                 output="",
                 status=AgentStatus.ERROR,
                 error=str(e),
+                metadata={"retryable": is_retryable(e)},
                 run_id=run_id,
             )
-            self._log_run(run_id, input_text, result, start_time)
+            await run_in_thread(self._log_run, run_id, input_text, result, start_time)
             return result
     
+    async def run_stream(
+        self,
+        input_text: str,
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the agent and stream events as they are produced.
+        
+        Output guardrails are applied to the final output only. Memory and
+        prompt-log writes are scheduled in the background so they do not hold
+        the stream open.
+        
+        Args:
+            input_text: User input/question
+            session_id: Optional session ID for memory
+            context: Optional context dictionary
+            
+        Yields:
+            ``token`` events with ``content``, ``tool_call``/``tool_result``
+            events, then a final ``done`` (or ``error``) event carrying the run
+            result fields
+        """
+        start_time = time.time()
+        run_id = str(uuid.uuid4())
+        
+        try:
+            self._status = AgentStatus.RUNNING
+            
+            if self.guardrails:
+                guardrail_result = self.guardrails.validate_input(input_text)
+                if not guardrail_result.allowed:
+                    raise ValueError(f"Input blocked by guardrails: {guardrail_result.reason}")
+            
+            full_context = await self._prepare_context(input_text, session_id, context)
+            
+            execution: Dict[str, Any] = {}
+            async for event in self._stream_agent(input_text, full_context):
+                if event.get("type") == "completed":
+                    execution = event
+                else:
+                    yield event
+            
+            output = execution.get("output", "")
+            if self.guardrails:
+                guardrail_result = self.guardrails.validate_output(output)
+                if not guardrail_result.allowed:
+                    output = f"[Output modified by guardrails: {guardrail_result.reason}]"
+            
+            self._status = AgentStatus.COMPLETED
+            result = AgentResult(
+                output=output,
+                status=AgentStatus.COMPLETED,
+                tokens_used=execution.get("tokens_used", 0),
+                execution_time=time.time() - start_time,
+                tool_calls=execution.get("tool_calls", []),
+                metadata={"model": self.model, **execution.get("routing", {})},
+                run_id=run_id,
+            )
+        except Exception as e:
+            self._status = AgentStatus.ERROR
+            result = AgentResult(
+                output="",
+                status=AgentStatus.ERROR,
+                error=str(e),
+                execution_time=time.time() - start_time,
+                run_id=run_id,
+            )
+        
+        spawn_background(self._finalize_stream(run_id, input_text, session_id, result, start_time))
+        
+        yield {
+            "type": "done" if result.status == AgentStatus.COMPLETED else "error",
+            "run_id": run_id,
+            "output": result.output,
+            "status": result.status.value,
+            "error": result.error,
+            "tokens_used": result.tokens_used,
+            "execution_time": result.execution_time,
+            "tool_calls": result.tool_calls,
+        }
+    
+    async def _prepare_context(
+        self,
+        input_text: str,
+        session_id: Optional[str],
+        context: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Merge caller context with memory and knowledge pack context."""
+        memory_context = {}
+        if self.memory and session_id:
+            memory_context = await run_in_thread(self.memory.get_context, session_id)
+        
+        knowledge_context = {}
+        if self.knowledge_packs:
+            knowledge_context = await run_in_thread(self._get_knowledge_context, input_text)
+        
+        return {
+            **(context or {}),
+            **memory_context,
+            **knowledge_context,
+        }
+    
+    async def _finalize_stream(
+        self,
+        run_id: str,
+        input_text: str,
+        session_id: Optional[str],
+        result: AgentResult,
+        start_time: float,
+    ) -> None:
+        """Persist memory and prompt log for a streamed run."""
+        try:
+            if result.status == AgentStatus.COMPLETED and self.memory and session_id:
+                await run_in_thread(self.memory.save_interaction, session_id, input_text, result.output)
+        except Exception:
+            pass
+        await run_in_thread(self._log_run, run_id, input_text, result, start_time)
+    
     def _get_knowledge_context(self, query: str) -> Dict[str, Any]:
         """Get context from knowledge packs using RAG retrieval."""
         context = {}
@@ -254,6 +438,10 @@ class Agent:
                                 retrieved_texts.append({'text': result, 'score': 1.0})
                         
                         if retrieved_texts:
+                            context.setdefault("retrieved_chunks", []).extend(
+                                {**r, "source": pack.id}
+                                for r in retrieved_texts[:pack.retriever_config.get('top_k', 5)]
+                            )
                             # Format as context string
                             context_text = "\n\n".join([
                                 f"[Relevance: {r['score']:.2f}]\n{r['text']}"
@@ -301,42 +489,221 @@ class Agent:
             # Silently fail if logging fails
             pass
     
-    def _execute_agent(self, input_text: str, context: Dict[str, Any]) -> str:
+    async def _execute_agent(self, input_text: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Execute the agent using the underlying LLM SDK.
+        Execute the agent using the underlying async LLM SDK.
+        
+        Tool calls requested by the model are executed and fed back until the
+        model produces a final answer (see ``runtime.tool_executor``).
         
         Args:
             input_text: User input text
             context: Context dictionary
             
         Returns:
-            Agent output text
+            Dictionary with output, tool_calls (execution records) and tokens_used
             
         Raises:
-            RuntimeError: If execution fails
+            AgentExecutionError: If execution fails
         """
         try:
             from agent_factory.integrations.openai_client import OpenAIAgentClient
+            from agent_factory.runtime.tool_executor import run_tool_loop
             
-            client = OpenAIAgentClient()
-            result = client.run_agent(
-                instructions=self.instructions,
-                input_text=input_text,
-                model=self.model,
+            router = self._router()
+            client = router or self._resilient(OpenAIAgentClient())
+            caching = self._cache_enabled()
+            if caching:
+                from agent_factory.cache.response_cache import CachingAgentClient, get_response_cache
+                client = CachingAgentClient(client, get_response_cache(), ttl=self.config.cache_ttl)
+            
+            execution = await run_tool_loop(
+                client,
+                request=self._build_request(input_text, context),
                 tools=self.tools,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                context=context,
+                max_iterations=self.config.max_tool_iterations,
+                tool_timeout=self.config.tool_timeout,
             )
-            
-            return result.get("output", "")
+            if caching:
+                execution["cached"] = client.hits > 0 and client.misses == 0
+            if router is not None and router.served_by is not None:
+                execution["routing"] = router.routing_info()
+            return execution
         except ImportError:
             # Fallback if OpenAI SDK not available
-            return f"[Agent {self.name} would process: {input_text}]"
+            return {"output": f"[Agent {self.name} would process: {input_text}]", "tool_calls": []}
         except Exception as e:
             from agent_factory.core.exceptions import AgentExecutionError
             raise AgentExecutionError(f"Agent execution failed: {str(e)}") from e
     
+    async def _stream_agent(
+        self, input_text: str, context: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming counterpart of :meth:`_execute_agent`.
+        
+        Args:
+            input_text: User input text
+            context: Context dictionary
+            
+        Yields:
+            Tool-loop events, ending with a ``completed`` event
+            
+        Raises:
+            AgentExecutionError: If execution fails
+        """
+        from agent_factory.core.exceptions import AgentExecutionError
+        
+        try:
+            from agent_factory.integrations.openai_client import OpenAIAgentClient
+            from agent_factory.runtime.tool_executor import stream_tool_loop
+        except ImportError:
+            output = f"[Agent {self.name} would process: {input_text}]"
+            yield {"type": "token", "content": output}
+            yield {"type": "completed", "output": output, "tool_calls": [], "tokens_used": 0}
+            return
+        
+        try:
+            router = self._router()
+            client = router or self._resilient(OpenAIAgentClient())
+            async for event in stream_tool_loop(
+                client,
+                request=self._build_request(input_text, context),
+                tools=self.tools,
+                max_iterations=self.config.max_tool_iterations,
+                tool_timeout=self.config.tool_timeout,
+            ):
+                if event.get("type") == "completed" and router is not None and router.served_by is not None:
+                    event["routing"] = router.routing_info()
+                yield event
+        except Exception as e:
+            raise AgentExecutionError(f"Agent execution failed: {str(e)}") from e
+    
+    def _router(self) -> Optional[Any]:
+        """Routing client over the configured provider targets, if any."""
+        if not self.config.provider_targets:
+            return None
+        
+        from agent_factory.integrations.provider_router import RoutingAgentClient, create_provider_client
+        
+        return RoutingAgentClient(
+            self.config.provider_targets,
+            strategy=self.config.routing_strategy,
+            client_factory=lambda target: self._resilient(
+                create_provider_client(target.provider), provider=target.provider
+            ),
+        )
+    
+    def _resilient(self, client: Any, provider: str = "openai") -> Any:
+        """Wrap a provider client with the config's retry policy and the shared rate governor."""
+        from agent_factory.integrations.rate_governor import get_rate_governor
+        from agent_factory.integrations.request_policy import RequestPolicy, ResilientAgentClient
+        
+        return ResilientAgentClient(
+            client,
+            RequestPolicy.from_config(self.config),
+            provider=provider,
+            governor=get_rate_governor(),
+        )
+    
+    async def _semantic_lookup(self, input_text: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached answer for a similar earlier input, if enabled."""
+        if not self.config.semantic_cache:
+            return None
+        
+        from agent_factory.cache.semantic_cache import get_semantic_cache, make_scope
+        
+        # Embedding and search are CPU-bound; keep them off the event loop
+        match = await run_in_thread(
+            get_semantic_cache().lookup,
+            make_scope(self.id, self.model, self.instructions),
+            input_text,
+            threshold=self.config.semantic_cache_threshold,
+        )
+        if match is None:
+            return None
+        return {
+            "output": match.payload,
+            "tool_calls": [],
+            "cached": True,
+            "semantic_similarity": match.similarity,
+        }
+    
+    async def _semantic_store(self, input_text: str, execution: Dict[str, Any]) -> None:
+        """Store a fresh answer in the semantic cache, if enabled."""
+        if not self.config.semantic_cache or not execution.get("output"):
+            return
+        
+        from agent_factory.cache.semantic_cache import get_semantic_cache, make_scope
+        
+        await run_in_thread(
+            get_semantic_cache().store,
+            make_scope(self.id, self.model, self.instructions),
+            input_text,
+            execution["output"],
+            ttl=self.config.semantic_cache_ttl,
+        )
+    
+    def _cache_enabled(self) -> bool:
+        """Whether model responses for this agent are served from the response cache."""
+        if self.config.cache_responses is not None:
+            return self.config.cache_responses
+        return self.config.temperature == 0
+    
+    def _build_request(self, input_text: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Build provider client keyword arguments for one run."""
+        prepared = self.prepared
+        return {
+            "instructions": prepared.system_prompt,
+            "input_text": input_text,
+            "model": prepared.model,
+            "tools": list(prepared.tools),
+            "temperature": prepared.config.temperature,
+            "max_tokens": prepared.config.max_tokens,
+            "context": self._pack_context(input_text, context, prepared),
+            "prepared": prepared,
+        }
+    
+    def _pack_context(
+        self,
+        input_text: str,
+        context: Dict[str, Any],
+        prepared: PreparedAgent,
+    ) -> Dict[str, Any]:
+        """Fit memory, caller and knowledge context into the prompt token budget."""
+        from agent_factory.agents.context_packer import ContextPacker
+        
+        context = dict(context or {})
+        
+        # Memory returns newest interactions first
+        turns: List[Dict[str, Any]] = []
+        for interaction in reversed(context.pop("recent_interactions", [])):
+            turns.append({"role": "user", "content": interaction.get("input", "")})
+            turns.append({"role": "assistant", "content": interaction.get("output", "")})
+        turns.extend(context.pop("messages", []))
+        
+        chunks = context.pop("retrieved_chunks", [])
+        # Formatted knowledge strings are superseded by the structured chunks
+        for pack in self.knowledge_packs:
+            if chunks:
+                context.pop(f"{pack.id}_context", None)
+            context.pop(f"{pack.id}_sources", None)
+        
+        packer = ContextPacker(
+            model=prepared.model,
+            max_tokens=prepared.config.context_max_tokens,
+            summary_tokens=prepared.config.context_summary_tokens,
+        )
+        packed = packer.pack(
+            prepared.system_prompt,
+            input_text,
+            tool_tokens=prepared.tool_tokens,
+            turns=turns,
+            chunks=chunks,
+            extras=context,
+        )
+        return packed.to_context()
+    
     def handoff(
         self,
         to: "Agent",
@@ -0,0 +1,320 @@
+"""
+Token-aware packing of agent context into a prompt budget.
+
+Instructions, the user input and tool schemas are always sent. The remaining
+budget is filled by priority: recent conversation turns (newest first), then
+retrieved knowledge chunks (highest score first), then other caller context.
+Turns that do not fit are folded into a short extractive summary, and the
+first chunk that does not fit is truncated rather than dropped whole.
+
+Token counts use ``tiktoken`` when installed (``tokens`` extra) and a
+character-based estimate otherwise. Counts are cached per encoding and text.
+"""
+
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from agent_factory.tools.base import Tool
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised when tiktoken is absent
+    tiktoken = None
+
+# Approximate characters per token for the estimate used without tiktoken
+_CHARS_PER_TOKEN = 4
+
+# Per-message framing tokens added by chat formats
+_MESSAGE_OVERHEAD = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: str) -> Optional[Any]:
+    """Get the tiktoken encoding for a model, or None to use the estimate."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def _count_tokens(model: str, text: str) -> int:
+    """Count tokens in a text chunk for a model (cached)."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """
+    Per-model token counter with cached counts.
+
+    Example:
+        >>> counter = TokenCounter("gpt-4o")
+        >>> counter.count("Hello there")
+    """
+
+    def __init__(self, model: str = "gpt-4o"):
+        """
+        Initialize token counter.
+
+        Args:
+            model: Model whose tokenizer is used
+        """
+        self.model = model
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's tokenizer rather than an estimate."""
+        return _get_encoding(self.model) is not None
+
+    def count(self, text: str) -> int:
+        """Count tokens in text."""
+        if not text:
+            return 0
+        return _count_tokens(self.model, text)
+
+    def count_message(self, message: Dict[str, Any]) -> int:
+        """Count tokens in a chat message including framing overhead."""
+        content = message.get("content") or ""
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str)
+        return _MESSAGE_OVERHEAD + self.count(content)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Truncate text to at most ``max_tokens`` tokens.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Token limit
+
+        Returns:
+            Truncated text, or the original text if it already fits
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        encoding = _get_encoding(self.model)
+        if encoding is None:
+            return text[: max_tokens * _CHARS_PER_TOKEN]
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+@dataclass
+class PackedContext:
+    """Context selected to fit a token budget."""
+    messages: List[Dict[str, Any]] = field(default_factory=list)
+    history_summary: str = ""
+    retrieved_context: str = ""
+    tokens_used: int = 0
+    budget: int = 0
+    turns_dropped: int = 0
+    chunks_dropped: int = 0
+    truncated: bool = False
+
+    def to_context(self) -> Dict[str, Any]:
+        """Context dictionary understood by the provider clients."""
+        return {
+            "packed": True,
+            "messages": self.messages,
+            "history_summary": self.history_summary,
+            "retrieved_context": self.retrieved_context,
+            "context_tokens": self.tokens_used,
+        }
+
+
+def render_system_prompt(instructions: str, context: Optional[Dict[str, Any]]) -> str:
+    """
+    Build the system prompt from instructions and a packed context.
+
+    Args:
+        instructions: Agent instructions
+        context: Output of :meth:`PackedContext.to_context`
+
+    Returns:
+        System prompt text
+    """
+    parts = [instructions]
+    if context:
+        if context.get("history_summary"):
+            parts.append(f"Earlier conversation (summarized):\n{context['history_summary']}")
+        if context.get("retrieved_context"):
+            parts.append(f"Relevant context:\n{context['retrieved_context']}")
+    return "\n\n".join(parts)
+
+
+def tool_schema_text(tool: Tool) -> str:
+    """Serialized tool schema as sent to the model, used for counting."""
+    return json.dumps(
+        {
+            "name": tool.id,
+            "description": tool.description,
+            "parameters": tool.get_schema().get("parameters", {}),
+        },
+        sort_keys=True,
+    )
+
+
+class ContextPacker:
+    """
+    Fill a token budget with the most useful context for one model call.
+
+    Example:
+        >>> packer = ContextPacker("gpt-4o", max_tokens=8000)
+        >>> packed = packer.pack(instructions, input_text, tools, turns=history, chunks=chunks)
+        >>> client.arun_agent(..., context=packed.to_context())
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        max_tokens: int = 8000,
+        summary_tokens: int = 256,
+        min_chunk_tokens: int = 64,
+    ):
+        """
+        Initialize context packer.
+
+        Args:
+            model: Model whose tokenizer is used for counting
+            max_tokens: Prompt token budget
+            summary_tokens: Maximum size of the summary of dropped turns
+            min_chunk_tokens: Smallest useful truncated chunk
+        """
+        self.counter = TokenCounter(model)
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+
+    def pack(
+        self,
+        instructions: str,
+        input_text: str,
+        tools: Optional[Sequence[Tool]] = None,
+        turns: Optional[List[Dict[str, Any]]] = None,
+        chunks: Optional[List[Dict[str, Any]]] = None,
+        extras: Optional[Dict[str, Any]] = None,
+        tool_tokens: Optional[int] = None,
+    ) -> PackedContext:
+        """
+        Pack context into the budget.
+
+        Args:
+            instructions: System instructions (always sent)
+            input_text: User input (always sent)
+            tools: Tools whose schemas are sent (always counted)
+            turns: Conversation messages, oldest first
+            chunks: Retrieved chunks with ``text`` and optional ``score``/``source``
+            extras: Other caller context, rendered as ``key: value`` lines
+            tool_tokens: Precomputed token count of the tool schemas, used
+                instead of counting ``tools``
+
+        Returns:
+            PackedContext within the budget where possible
+        """
+        counter = self.counter
+        packed = PackedContext(budget=self.max_tokens)
+
+        # Required: instructions, input and tool schemas
+        used = _MESSAGE_OVERHEAD + counter.count(instructions)
+        used += _MESSAGE_OVERHEAD + counter.count(input_text)
+        if tool_tokens is not None:
+            used += tool_tokens
+        else:
+            for tool in tools or []:
+                used += counter.count(tool_schema_text(tool))
+        remaining = self.max_tokens - used
+
+        # Recent turns, newest first
+        turns = turns or []
+        kept: List[Dict[str, Any]] = []
+        for index in range(len(turns) - 1, -1, -1):
+            cost = counter.count_message(turns[index])
+            if cost > remaining:
+                break
+            kept.append(turns[index])
+            remaining -= cost
+        kept.reverse()
+        dropped_turns = turns[: len(turns) - len(kept)]
+        packed.messages = kept
+        packed.turns_dropped = len(dropped_turns)
+
+        # Retrieved chunks, best first; truncate the first one that overflows
+        sections: List[str] = []
+        ordered = sorted(chunks or [], key=lambda c: c.get("score", 0.0), reverse=True)
+        for position, chunk in enumerate(ordered):
+            text = chunk.get("text", "")
+            if not text:
+                continue
+            cost = counter.count(text) + 2  # separator
+            if cost <= remaining:
+                sections.append(text)
+                remaining -= cost
+                continue
+            if remaining - 2 >= self.min_chunk_tokens:
+                sections.append(counter.truncate(text, remaining - 2))
+                remaining = 0
+                packed.truncated = True
+                packed.chunks_dropped = len(ordered) - position - 1
+            else:
+                packed.chunks_dropped = len(ordered) - position
+            break
+
+        # Other caller context, lowest priority
+        for key, value in (extras or {}).items():
+            line = f"{key}: {value if isinstance(value, str) else json.dumps(value, default=str)}"
+            cost = counter.count(line) + 1
+            if cost > remaining:
+                packed.truncated = True
+                break
+            sections.append(line)
+            remaining -= cost
+        packed.retrieved_context = "\n\n".join(sections)
+
+        # Fold dropped turns into a summary with what is left
+        if dropped_turns:
+            limit = min(self.summary_tokens, remaining)
+            if limit > 0:
+                packed.history_summary = counter.truncate(summarize_turns(dropped_turns), limit)
+                remaining -= counter.count(packed.history_summary)
+
+        packed.tokens_used = self.max_tokens - remaining
+        return packed
+
+
+def summarize_turns(turns: List[Dict[str, Any]]) -> str:
+    """
+    Extractive summary of conversation turns: the first sentence of each.
+
+    Args:
+        turns: Chat messages, oldest first
+
+    Returns:
+        One line per turn
+    """
+    lines = []
+    for turn in turns:
+        content = turn.get("content") or ""
+        if not isinstance(content, str):
+            continue
+        first = _SENTENCE_END.split(content.strip(), maxsplit=1)[0]
+        if first:
+            lines.append(f"- {turn.get('role', 'user')}: {first}")
+    return "\n".join(lines)
@@ -0,0 +1,99 @@
+"""
+Precompiled per-agent request artifacts.
+
+An agent is compiled once into an immutable :class:`PreparedAgent` holding
+the provider-formatted tool schemas, the system prompt and a snapshot of the
+config. Provider clients reuse these instead of rebuilding them on every
+model call, and the unchanged prefix (system prompt plus tools) is what
+provider-side prompt caching keys on.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Tuple
+
+from agent_factory.agents.context_packer import TokenCounter, tool_schema_text
+from agent_factory.tools.base import Tool
+
+if TYPE_CHECKING:
+    from agent_factory.agents.agent import Agent, AgentConfig
+
+
+def openai_tool_schema(tool: Tool) -> Dict[str, Any]:
+    """Format a tool for the OpenAI chat completions API."""
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.id,
+            "description": tool.description,
+            "parameters": tool.get_schema().get("parameters", {}),
+        }
+    }
+
+
+def anthropic_tool_schema(tool: Tool) -> Dict[str, Any]:
+    """Format a tool for the Anthropic messages API."""
+    return {
+        "name": tool.id,
+        "description": tool.description,
+        "input_schema": tool.get_schema().get("parameters", {})
+    }
+
+
+@dataclass(frozen=True)
+class PreparedAgent:
+    """
+    Immutable, provider-ready snapshot of an agent.
+
+    The schema dictionaries are shared between requests and must not be
+    modified by callers.
+    """
+    agent_id: str
+    model: str
+    system_prompt: str
+    config: "AgentConfig"
+    tools: Tuple[Tool, ...]
+    tools_by_id: Mapping[str, Tool]
+    openai_tools: Tuple[Dict[str, Any], ...]
+    anthropic_tools: Tuple[Dict[str, Any], ...]
+    tool_tokens: int
+    fingerprint: str
+
+
+def compile_agent(agent: "Agent") -> PreparedAgent:
+    """
+    Compile an agent into a :class:`PreparedAgent`.
+
+    Args:
+        agent: Agent to compile
+
+    Returns:
+        PreparedAgent for the agent's current model, instructions, tools and config
+    """
+    tools = tuple(agent.tools)
+    openai_tools = tuple(openai_tool_schema(tool) for tool in tools)
+    counter = TokenCounter(agent.model)
+
+    # Identifies the stable request prefix: same fingerprint, same prefix
+    fingerprint = hashlib.sha256(
+        json.dumps(
+            {"model": agent.model, "system": agent.instructions, "tools": openai_tools},
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    return PreparedAgent(
+        agent_id=agent.id,
+        model=agent.model,
+        system_prompt=agent.instructions,
+        config=replace(agent.config),
+        tools=tools,
+        tools_by_id=MappingProxyType({tool.id: tool for tool in tools}),
+        openai_tools=openai_tools,
+        anthropic_tools=tuple(anthropic_tool_schema(tool) for tool in tools),
+        tool_tokens=sum(counter.count(tool_schema_text(tool)) for tool in tools),
+        fingerprint=fingerprint,
+    )
@@ -68,6 +68,15 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled LLM provider connections on application shutdown."""
+    from agent_factory.integrations.client_pool import get_client_pool
+    
+    await get_client_pool().aclose()
+    logger.info("LLM provider client pool closed")
+
+
 # Include routers
 app.include_router(agents.router, prefix="/api/v1/agents", tags=["agents"])
 app.include_router(tools.router, prefix="/api/v1/tools", tags=["tools"])
@@ -1,12 +1,16 @@
 """Agent API routes."""
 
+import json
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from agent_factory.agents.agent import Agent
 from agent_factory.registry.local_registry import LocalRegistry
 from agent_factory.runtime.engine import RuntimeEngine
+from agent_factory.utils.async_utils import run_in_thread
 
 router = APIRouter()
 registry = LocalRegistry()
@@ -26,6 +30,13 @@ class AgentRun(BaseModel):
     context: Optional[dict] = None
 
 
+class AgentRunBatch(BaseModel):
+    inputs: List[str]
+    max_concurrency: int = Field(default=8, ge=1, le=64)
+    session_id: Optional[str] = None
+    context: Optional[dict] = None
+
+
 @router.post("/", response_model=dict)
 def create_agent(agent_data: AgentCreate):
     """Create a new agent."""
@@ -68,14 +79,14 @@ def get_agent(agent_id: str):
 
 
 @router.post("/{agent_id}/run", response_model=dict)
-def run_agent(agent_id: str, run_data: AgentRun):
+async def run_agent(agent_id: str, run_data: AgentRun):
     """Run an agent."""
-    agent = registry.get_agent(agent_id)
+    agent = await run_in_thread(registry.get_agent, agent_id)
     
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
     
-    result = agent.run(
+    result = await agent.arun(
         run_data.input_text,
         session_id=run_data.session_id,
         context=run_data.context,
@@ -89,6 +100,68 @@ def run_agent(agent_id: str, run_data: AgentRun):
     }
 
 
+@router.post("/{agent_id}/run_batch", response_model=dict)
+async def run_agent_batch(agent_id: str, batch_data: AgentRunBatch):
+    """Run an agent over many inputs concurrently."""
+    agent = await run_in_thread(registry.get_agent, agent_id)
+    
+    if not agent:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    
+    if agent_id not in runtime.agents_registry:
+        runtime.register_agent(agent)
+    
+    batch = await runtime.arun_agent_batch(
+        agent_id,
+        batch_data.inputs,
+        max_concurrency=batch_data.max_concurrency,
+        session_id=batch_data.session_id,
+        context=batch_data.context,
+    )
+    
+    return {
+        "agent_id": batch.agent_id,
+        "results": [
+            {
+                "index": item.index,
+                "execution_id": item.execution_id,
+                "output": item.result.output if item.result else None,
+                "status": item.result.status.value if item.result else "error",
+                "error": item.error,
+            }
+            for item in batch.items
+        ],
+        "succeeded": batch.succeeded,
+        "failed": batch.failed,
+        "tokens_used": batch.tokens_used,
+        "cost_estimate": batch.cost_estimate,
+        "execution_time": batch.execution_time,
+    }
+
+
+@router.post("/{agent_id}/run/stream")
+async def run_agent_stream(agent_id: str, run_data: AgentRun):
+    """Run an agent and stream tokens and tool events as Server-Sent Events."""
+    agent = await run_in_thread(registry.get_agent, agent_id)
+    
+    if not agent:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    
+    async def event_stream():
+        async for event in agent.run_stream(
+            run_data.input_text,
+            session_id=run_data.session_id,
+            context=run_data.context,
+        ):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/{agent_id}")
 def delete_agent(agent_id: str):
     """Delete an agent."""
@@ -113,7 +113,7 @@ async def retry_execution(
         original_input = execution.metadata.get("input_text", "") if execution.metadata else ""
         session_id = execution.metadata.get("session_id") if execution.metadata else None
         
-        new_execution_id = runtime.run_agent(
+        new_execution_id = await runtime.arun_agent(
             execution.entity_id,
             original_input,
             session_id=session_id,
@@ -129,7 +129,7 @@ async def retry_execution(
         # Get original context from metadata
         original_context = execution.metadata.get("context", {}) if execution.metadata else {}
         
-        new_execution_id = runtime.run_workflow(
+        new_execution_id = await runtime.arun_workflow(
             execution.entity_id,
             original_context,
         )
@@ -139,6 +139,32 @@ async def retry_execution(
     return {"execution_id": new_execution_id, "status": "retrying"}
 
 
+@router.post("/{execution_id}/resume", response_model=Dict[str, Any])
+async def resume_execution(
+    execution_id: str,
+    user=Depends(get_current_user)
+):
+    """Resume a failed workflow execution from its last completed step."""
+    require_permission(Permission.WRITE_WORKFLOWS)(lambda: None)()
+    
+    checkpoint = runtime.checkpoints.load(execution_id)
+    if not checkpoint:
+        raise HTTPException(status_code=404, detail="No checkpoint for execution")
+    
+    if checkpoint.workflow_id not in runtime.workflows_registry:
+        from agent_factory.registry.local_registry import LocalRegistry
+        reg = LocalRegistry()
+        workflow = reg.get_workflow(checkpoint.workflow_id)
+        if not workflow:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        runtime.register_workflow(workflow)
+    
+    await runtime.aresume_workflow(execution_id)
+    execution = runtime.get_execution(execution_id)
+    
+    return {"execution_id": execution_id, "status": execution.status if execution else "completed"}
+
+
 @router.delete("/{execution_id}")
 async def cancel_execution(
     execution_id: str,
@@ -22,6 +22,9 @@ class WorkflowCreate(BaseModel):
     steps: List[Dict[str, Any]]
     triggers: Optional[List[Dict[str, Any]]] = None
     branching: Optional[Dict[str, Dict[str, str]]] = None
+    max_parallel: int = 4
+    timeout: Optional[float] = None
+    token_budget: Optional[int] = None
 
 
 class WorkflowUpdate(BaseModel):
@@ -30,6 +33,9 @@ class WorkflowUpdate(BaseModel):
     steps: Optional[List[Dict[str, Any]]] = None
     triggers: Optional[List[Dict[str, Any]]] = None
     branching: Optional[Dict[str, Dict[str, str]]] = None
+    max_parallel: Optional[int] = None
+    timeout: Optional[float] = None
+    token_budget: Optional[int] = None
 
 
 class WorkflowRun(BaseModel):
@@ -74,8 +80,15 @@ async def create_workflow(
             input_mapping=step_data.get("input_mapping", {}),
             output_mapping=step_data.get("output_mapping", {}),
             condition=condition,
-            timeout=step_data.get("timeout", 30),
-            retry_attempts=step_data.get("retry_attempts", 3),
+            timeout=step_data.get("timeout"),
+            retry_attempts=step_data.get("retry_attempts"),
+            retry_backoff=step_data.get("retry_backoff", 0.5),
+            depends_on=step_data.get("depends_on"),
+            cacheable=step_data.get("cacheable", False),
+            cache_ttl=step_data.get("cache_ttl"),
+            map_over=step_data.get("map_over"),
+            map_concurrency=step_data.get("map_concurrency", 4),
+            map_on_error=step_data.get("map_on_error", "fail_fast"),
         )
         steps.append(step)
     
@@ -105,6 +118,9 @@ async def create_workflow(
         steps=steps,
         triggers=triggers if triggers else None,
         branching=branching if branching else None,
+        max_parallel=workflow_data.max_parallel,
+        timeout=workflow_data.timeout,
+        token_budget=workflow_data.token_budget,
     )
     
     registry.register_workflow(workflow)
@@ -164,8 +180,15 @@ async def update_workflow(
                 input_mapping=step_data.get("input_mapping", {}),
                 output_mapping=step_data.get("output_mapping", {}),
                 condition=condition,
-                timeout=step_data.get("timeout", 30),
-                retry_attempts=step_data.get("retry_attempts", 3),
+                timeout=step_data.get("timeout"),
+                retry_attempts=step_data.get("retry_attempts"),
+                retry_backoff=step_data.get("retry_backoff", 0.5),
+                depends_on=step_data.get("depends_on"),
+                cacheable=step_data.get("cacheable", False),
+                cache_ttl=step_data.get("cache_ttl"),
+                map_over=step_data.get("map_over"),
+                map_concurrency=step_data.get("map_concurrency", 4),
+                map_on_error=step_data.get("map_on_error", "fail_fast"),
             )
             steps.append(step)
         workflow.steps = steps
@@ -190,6 +213,15 @@ async def update_workflow(
             )
         workflow.branching = branching
     
+    if workflow_data.max_parallel is not None:
+        workflow.max_parallel = workflow_data.max_parallel
+    
+    if workflow_data.timeout is not None:
+        workflow.timeout = workflow_data.timeout
+    
+    if workflow_data.token_budget is not None:
+        workflow.token_budget = workflow_data.token_budget
+    
     registry.register_workflow(workflow)
     runtime.register_workflow(workflow)
     
@@ -225,7 +257,7 @@ async def trigger_workflow(
     # Create context from trigger config
     context = trigger_data.config.copy()
     
-    execution_id = runtime.run_workflow(workflow_id, context)
+    execution_id = await runtime.arun_workflow(workflow_id, context)
     
     return {"execution_id": execution_id, "status": "triggered"}
 
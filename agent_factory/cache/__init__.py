@@ -1,5 +1,32 @@
 """Caching utilities."""
 
 from agent_factory.cache.redis_cache import RedisCache, get_cache
+from agent_factory.cache.response_cache import (
+    CachingAgentClient,
+    DiskResponseCache,
+    ResponseCache,
+    get_response_cache,
+    make_cache_key,
+)
+from agent_factory.cache.semantic_cache import (
+    Embedder,
+    HashingEmbedder,
+    SemanticCache,
+    configure_semantic_cache,
+    get_semantic_cache,
+)
 
-__all__ = ["RedisCache", "get_cache"]
+__all__ = [
+    "RedisCache",
+    "get_cache",
+    "ResponseCache",
+    "DiskResponseCache",
+    "CachingAgentClient",
+    "get_response_cache",
+    "make_cache_key",
+    "Embedder",
+    "HashingEmbedder",
+    "SemanticCache",
+    "get_semantic_cache",
+    "configure_semantic_cache",
+]
@@ -0,0 +1,392 @@
+"""
+Exact-match cache for LLM responses.
+
+Each model call is keyed by a stable hash of everything that determines its
+output: model, instructions, assembled messages, tool schemas, temperature and
+max_tokens. Responses are kept in an in-process LRU bounded by size in bytes,
+optionally backed by a persistent tier (SQLite on disk or Redis) shared
+between processes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent_factory.monitoring.metrics import MetricsCollector
+from agent_factory.utils.async_utils import run_in_thread
+
+
+def make_cache_key(
+    model: str,
+    instructions: str,
+    messages: List[Dict[str, Any]],
+    tool_schemas: List[Dict[str, Any]],
+    temperature: float,
+    max_tokens: int,
+) -> str:
+    """
+    Build a stable cache key for one model call.
+    
+    Args:
+        model: Model name
+        instructions: System instructions
+        messages: Provider-formatted messages sent to the model
+        tool_schemas: Provider-formatted tool schemas
+        temperature: Sampling temperature
+        max_tokens: Maximum output tokens
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "instructions": instructions,
+            "messages": messages,
+            "tools": tool_schemas,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskResponseCache:
+    """
+    SQLite-backed persistent tier for the response cache.
+    
+    Example:
+        >>> tier = DiskResponseCache("./.cache/responses.db")
+        >>> cache = ResponseCache(persistent=tier)
+    """
+    
+    def __init__(self, db_path: str = "./.cache/responses.db"):
+        """
+        Initialize disk cache.
+        
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            )
+        """)
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] < time.time():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any, ttl: int = 3600) -> None:
+        """Store a value with a time to live in seconds."""
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), expires_at),
+            )
+            self._conn.commit()
+    
+    def delete(self, key: str) -> None:
+        """Delete a cached value."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def clear(self) -> None:
+        """Delete all cached values."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache: in-process LRU plus optional persistent tier.
+    
+    The persistent tier is any object with ``get(key)`` and
+    ``set(key, value, ttl)``, e.g. :class:`DiskResponseCache` or
+    :class:`~agent_factory.cache.redis_cache.RedisCache`.
+    
+    Example:
+        >>> cache = ResponseCache(max_bytes=32 * 1024 * 1024)
+        >>> cache.set(key, response)
+        >>> cache.get(key)
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: int = 3600,
+        persistent: Optional[Any] = None,
+    ):
+        """
+        Initialize response cache.
+        
+        Args:
+            max_bytes: Size bound of the in-process tier in bytes
+            ttl: Default time to live in seconds
+            persistent: Optional persistent tier
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.persistent = persistent
+        self.key_prefix = "llm_response:"
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: Cache key from :func:`make_cache_key`
+        
+        Returns:
+            Cached response or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires_at = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    MetricsCollector.record_cache_hit("llm_response")
+                    return value
+                del self._entries[key]
+                self._size -= size
+        
+        value = None
+        if self.persistent is not None:
+            try:
+                value = self.persistent.get(self.key_prefix + key)
+            except Exception:
+                value = None
+        
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            MetricsCollector.record_cache_miss("llm_response")
+            return None
+        
+        # Promote to the in-process tier
+        self._store(key, value, self.ttl)
+        with self._lock:
+            self.hits += 1
+        MetricsCollector.record_cache_hit("llm_response")
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a response in all tiers.
+        
+        Args:
+            key: Cache key from :func:`make_cache_key`
+            value: JSON-serializable response
+            ttl: Time to live in seconds (defaults to the cache TTL)
+        """
+        ttl = ttl or self.ttl
+        self._store(key, value, ttl)
+        if self.persistent is not None:
+            try:
+                self.persistent.set(self.key_prefix + key, value, ttl=ttl)
+            except Exception:
+                pass
+    
+    def clear(self) -> None:
+        """Clear the in-process tier (the persistent tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+    
+    def _store(self, key: str, value: Any, ttl: int) -> None:
+        size = len(json.dumps(value, default=str).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size, time.time() + ttl)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+
+class CachingAgentClient:
+    """
+    Provider client wrapper that serves repeated model calls from a cache.
+    
+    Caching happens per model call, so tools requested by a cached response
+    are still executed and the follow-up call is keyed on their results.
+    """
+    
+    def __init__(self, client: Any, cache: ResponseCache, ttl: Optional[int] = None):
+        """
+        Initialize caching client.
+        
+        Args:
+            client: Provider client (``OpenAIAgentClient`` or ``AnthropicAgentClient``)
+            cache: Response cache
+            ttl: Time to live for stored responses in seconds
+        """
+        self.client = client
+        self.cache = cache
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+    
+    async def arun_agent(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "gpt-4o",
+        tools: Optional[List[Any]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Same contract as the wrapped client's ``arun_agent``."""
+        key_model = model
+        if hasattr(self.client, "_build_request"):
+            # Anthropic: instructions and context are folded into ``system``
+            request = self.client._build_request(
+                instructions, input_text, model, tools, temperature, max_tokens, context,
+                tool_messages, prepared,
+            )
+            messages = [{"role": "system", "content": request.get("system", "")}] + request["messages"]
+            tool_schemas = request.get("tools") or []
+        elif hasattr(self.client, "_build_messages"):
+            messages = self.client._build_messages(instructions, input_text, context, tool_messages)
+            tool_schemas = self.client._build_tools(tools, prepared)
+        else:
+            # Clients that do not build provider requests themselves (e.g. the
+            # provider router): key on the call's arguments and the targets
+            # that may serve it
+            targets = getattr(self.client, "targets", None)
+            if targets:
+                key_model = ",".join(getattr(target, "name", str(target)) for target in targets)
+            messages = [
+                {"role": "user", "content": input_text, "context": context or {}},
+                *(tool_messages or []),
+            ]
+            tool_schemas = [tool.get_schema() if hasattr(tool, "get_schema") else str(tool) for tool in tools or []]
+        
+        key = make_cache_key(
+            model=key_model,
+            instructions=instructions,
+            messages=messages,
+            tool_schemas=tool_schemas,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        
+        # The disk and Redis tiers block, so keep them off the event loop
+        blocking = getattr(self.cache, "persistent", None) is not None
+        cached = await run_in_thread(self.cache.get, key) if blocking else self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            # No tokens are spent on a cache hit
+            return {**cached, "tokens_used": 0, "cached": True}
+        
+        self.misses += 1
+        response = await self.client.arun_agent(
+            instructions=instructions,
+            input_text=input_text,
+            model=model,
+            tools=tools,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            context=context,
+            tool_messages=tool_messages,
+            prepared=prepared,
+        )
+        if blocking:
+            await run_in_thread(self.cache.set, key, response, ttl=self.ttl)
+        else:
+            self.cache.set(key, response, ttl=self.ttl)
+        return response
+    
+    def build_tool_messages(self, response: Dict[str, Any], tool_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delegate to the wrapped client."""
+        return self.client.build_tool_messages(response, tool_results)
+
+
+# Global response cache
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get global response cache.
+    
+    The persistent tier is selected with ``RESPONSE_CACHE_BACKEND``
+    (``memory``, ``disk`` or ``redis``).
+    
+    Returns:
+        Response cache
+    """
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            backend = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+            persistent: Optional[Any] = None
+            if backend == "disk":
+                persistent = DiskResponseCache(os.getenv("RESPONSE_CACHE_PATH", "./.cache/responses.db"))
+            elif backend == "redis":
+                from agent_factory.cache.redis_cache import get_cache
+                persistent = get_cache()
+            
+            _response_cache = ResponseCache(
+                max_bytes=int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+                ttl=int(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+                persistent=persistent,
+            )
+        return _response_cache
@@ -0,0 +1,330 @@
+"""
+Semantic response cache.
+
+Returns an earlier answer when a new input is close enough to one already
+answered by the same agent. Inputs are embedded locally with a pluggable
+embedder and matched against a vector index; with NumPy installed the index
+is a single matrix-vector product, otherwise a pure-Python scan is used and
+each scope keeps at most ``PURE_PYTHON_MAX_ENTRIES`` entries so the scan
+stays cheap. Each scope's index has its own lock, so scopes never wait on
+each other.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agent_factory.monitoring.metrics import MetricsCollector
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+# Per-scope entry cap without NumPy; a pure-Python scan of 1000 entries takes ~30 ms
+PURE_PYTHON_MAX_ENTRIES = 1000
+
+
+class Embedder(ABC):
+    """Base class for text embedders used by the semantic cache."""
+    
+    dim: int
+    
+    @abstractmethod
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed text as an L2-normalized vector.
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Vector of length ``dim``
+        """
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """
+    Offline embedder using hashed word and character n-gram features.
+    
+    Paraphrases share most of their character n-grams, so cosine similarity
+    of these vectors tracks surface similarity without any model download.
+    
+    Example:
+        >>> embedder = HashingEmbedder(dim=512)
+        >>> vector = embedder.embed("How do I reset my password?")
+    """
+    
+    _token_pattern = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, dim: int = 512, ngram_range: Tuple[int, int] = (3, 5)):
+        """
+        Initialize hashing embedder.
+        
+        Args:
+            dim: Vector dimension
+            ngram_range: Inclusive range of character n-gram sizes
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+    
+    def embed(self, text: str) -> List[float]:
+        """Embed text as an L2-normalized feature-hashed vector."""
+        vector = [0.0] * self.dim
+        tokens = self._token_pattern.findall(text.lower())
+        
+        features: List[str] = list(tokens)
+        low, high = self.ngram_range
+        for token in tokens:
+            padded = f" {token} "
+            for n in range(low, high + 1):
+                features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        
+        for feature in features:
+            # crc32 is stable across processes, unlike hash()
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign
+        
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm:
+            vector = [v / norm for v in vector]
+        return vector
+
+
+class _VectorIndex:
+    """Bounded ring buffer of vectors with cosine-similarity search."""
+    
+    def __init__(self, dim: int, max_entries: int):
+        self.dim = dim
+        self.max_entries = max_entries
+        self.payloads: List[Any] = []
+        self.texts: List[str] = []
+        self.lock = threading.Lock()
+        self._next = 0
+        if np is not None:
+            self._vectors = np.zeros((min(max_entries, 64), dim), dtype=np.float32)
+            self._expires = np.zeros(min(max_entries, 64), dtype=np.float64)
+        else:
+            self._vectors = []
+            self._expires = []
+    
+    def __len__(self) -> int:
+        return len(self.payloads)
+    
+    def add(self, vector: Sequence[float], text: str, payload: Any, expires_at: float) -> None:
+        """Add a vector, overwriting the oldest entry once full."""
+        if len(self.payloads) < self.max_entries:
+            slot = len(self.payloads)
+            self.payloads.append(payload)
+            self.texts.append(text)
+        else:
+            slot = self._next
+            self._next = (self._next + 1) % self.max_entries
+            self.payloads[slot] = payload
+            self.texts[slot] = text
+        
+        if np is not None:
+            if slot >= len(self._vectors):
+                capacity = min(self.max_entries, len(self._vectors) * 2)
+                self._vectors = np.resize(self._vectors, (capacity, self.dim))
+                self._expires = np.resize(self._expires, capacity)
+            self._vectors[slot] = vector
+            self._expires[slot] = expires_at
+        elif slot < len(self._vectors):
+            self._vectors[slot] = list(vector)
+            self._expires[slot] = expires_at
+        else:
+            self._vectors.append(list(vector))
+            self._expires.append(expires_at)
+    
+    def search(self, vector: Sequence[float], now: float) -> Optional[Tuple[float, int]]:
+        """Find the most similar unexpired entry as (similarity, slot)."""
+        size = len(self.payloads)
+        if size == 0:
+            return None
+        
+        if np is not None:
+            scores = self._vectors[:size] @ np.asarray(vector, dtype=np.float32)
+            scores[self._expires[:size] < now] = -np.inf
+            slot = int(np.argmax(scores))
+            score = float(scores[slot])
+        else:
+            score, slot = -math.inf, -1
+            for i in range(size):
+                if self._expires[i] < now:
+                    continue
+                s = sum(a * b for a, b in zip(self._vectors[i], vector))
+                if s > score:
+                    score, slot = s, i
+        
+        if slot < 0 or score == -math.inf:
+            return None
+        return score, slot
+
+
+@dataclass
+class SemanticMatch:
+    """A semantic cache hit."""
+    payload: Any
+    similarity: float
+    matched_input: str
+
+
+class SemanticCache:
+    """
+    Per-scope semantic cache of agent answers.
+    
+    Each scope (normally one agent version) has its own bounded index.
+    Threshold and TTL are supplied per call so each agent can use its own.
+    
+    Example:
+        >>> cache = SemanticCache()
+        >>> cache.store("support-bot", "How do I reset my password?", {"output": "..."}, ttl=3600)
+        >>> match = cache.lookup("support-bot", "how can i reset my password", threshold=0.8)
+    """
+    
+    def __init__(self, embedder: Optional[Embedder] = None, max_entries: int = 10000):
+        """
+        Initialize semantic cache.
+        
+        Args:
+            embedder: Text embedder (default: HashingEmbedder)
+            max_entries: Maximum entries kept per scope (at most
+                ``PURE_PYTHON_MAX_ENTRIES`` without NumPy)
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.max_entries = max_entries if np is not None else min(max_entries, PURE_PYTHON_MAX_ENTRIES)
+        self._indexes: Dict[str, _VectorIndex] = {}
+        self._lock = threading.Lock()  # guards the scope map; each index has its own lock
+    
+    def lookup(self, scope: str, text: str, threshold: float) -> Optional[SemanticMatch]:
+        """
+        Find a cached answer for text similar to an earlier input.
+        
+        Args:
+            scope: Cache scope (e.g. agent ID and version)
+            text: Input text
+            threshold: Minimum cosine similarity for a hit
+        
+        Returns:
+            Best match at or above the threshold, or None
+        """
+        vector = self.embedder.embed(text)
+        with self._lock:
+            index = self._indexes.get(scope)
+        match = None
+        if index is not None:
+            with index.lock:
+                found = index.search(vector, time.time())
+                if found is not None and found[0] >= threshold:
+                    similarity, slot = found
+                    match = SemanticMatch(
+                        payload=index.payloads[slot],
+                        similarity=similarity,
+                        matched_input=index.texts[slot],
+                    )
+        
+        if match is None:
+            MetricsCollector.record_cache_miss("semantic")
+        else:
+            MetricsCollector.record_cache_hit("semantic")
+        return match
+    
+    def store(self, scope: str, text: str, payload: Any, ttl: int = 3600) -> None:
+        """
+        Store an answer for an input.
+        
+        Args:
+            scope: Cache scope (e.g. agent ID and version)
+            text: Input text
+            payload: Answer to return on later hits
+            ttl: Time to live in seconds
+        """
+        vector = self.embedder.embed(text)
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                index = _VectorIndex(self.embedder.dim, self.max_entries)
+                self._indexes[scope] = index
+        with index.lock:
+            index.add(vector, text, payload, time.time() + ttl)
+    
+    def clear(self, scope: Optional[str] = None) -> None:
+        """Clear one scope, or every scope if none is given."""
+        with self._lock:
+            if scope is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(scope, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "scopes": len(self._indexes),
+                "entries": sum(len(index) for index in self._indexes.values()),
+                "vectorized": np is not None,
+            }
+
+
+def make_scope(agent_id: str, model: str, instructions: str) -> str:
+    """
+    Build a cache scope that changes whenever the agent's prompt or model does.
+    
+    Args:
+        agent_id: Agent ID
+        model: Model name
+        instructions: System instructions
+    
+    Returns:
+        Scope string
+    """
+    digest = hashlib.sha256(f"{model}\n{instructions}".encode("utf-8")).hexdigest()[:16]
+    return f"{agent_id}:{digest}"
+
+
+# Global semantic cache
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Get global semantic cache.
+    
+    Returns:
+        Semantic cache
+    """
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache()
+        return _semantic_cache
+
+
+def configure_semantic_cache(
+    embedder: Optional[Embedder] = None,
+    max_entries: int = 10000,
+) -> SemanticCache:
+    """
+    Replace the global semantic cache, e.g. to plug in a different embedder.
+    
+    Args:
+        embedder: Text embedder (default: HashingEmbedder)
+        max_entries: Maximum entries kept per scope
+    
+    Returns:
+        New semantic cache
+    """
+    global _semantic_cache
+    with _semantic_cache_lock:
+        _semantic_cache = SemanticCache(embedder=embedder, max_entries=max_entries)
+        return _semantic_cache
@@ -137,8 +137,15 @@ def update(
                 input_mapping=step_data.get("input_mapping", {}),
                 output_mapping=step_data.get("output_mapping", {}),
                 condition=condition,
-                timeout=step_data.get("timeout", 30),
-                retry_attempts=step_data.get("retry_attempts", 3),
+                timeout=step_data.get("timeout"),
+                retry_attempts=step_data.get("retry_attempts"),
+                retry_backoff=step_data.get("retry_backoff", 0.5),
+                depends_on=step_data.get("depends_on"),
+                cacheable=step_data.get("cacheable", False),
+                cache_ttl=step_data.get("cache_ttl"),
+                map_over=step_data.get("map_over"),
+                map_concurrency=step_data.get("map_concurrency", 4),
+                map_on_error=step_data.get("map_on_error", "fail_fast"),
             )
             steps.append(step)
         
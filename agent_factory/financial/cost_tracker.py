@@ -358,25 +358,9 @@ class CostTracker:
         Returns:
             Estimated cost
         """
-        # Model pricing (per 1K tokens)
-        pricing = {
-            "gpt-4o": {"input": Decimal("0.0025"), "output": Decimal("0.01")},
-            "gpt-4": {"input": Decimal("0.03"), "output": Decimal("0.06")},
-            "gpt-3.5-turbo": {"input": Decimal("0.0005"), "output": Decimal("0.0015")},
-            "claude-3-opus": {"input": Decimal("0.015"), "output": Decimal("0.075")},
-            "claude-3-sonnet": {"input": Decimal("0.003"), "output": Decimal("0.015")},
-        }
-        
-        model_pricing = pricing.get(model, pricing["gpt-4o"])
-        
-        # Estimate 70% input, 30% output
-        input_tokens = int(tokens * 0.7)
-        output_tokens = int(tokens * 0.3)
-        
-        input_cost = (Decimal(input_tokens) / 1000) * model_pricing["input"]
-        output_cost = (Decimal(output_tokens) / 1000) * model_pricing["output"]
+        from agent_factory.integrations.pricing import estimate_llm_cost
         
-        total_cost = input_cost + output_cost
+        total_cost = estimate_llm_cost(tokens, model)
         
         # Record estimated cost
         self.record_cost(
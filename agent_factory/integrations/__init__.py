@@ -1,5 +1,19 @@
 """Integrations for Agent Factory Platform."""
 
 from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.integrations.client_pool import (
+    ClientPoolConfig,
+    ProviderClientPool,
+    get_client_pool,
+    configure_client_pool,
+    close_client_pool,
+)
 
-__all__ = ["OpenAIAgentClient"]
+__all__ = [
+    "OpenAIAgentClient",
+    "ClientPoolConfig",
+    "ProviderClientPool",
+    "get_client_pool",
+    "configure_client_pool",
+    "close_client_pool",
+]
@@ -3,9 +3,12 @@ Anthropic Claude SDK integration for Agent Factory Platform.
 """
 
 import os
-from typing import List, Dict, Any, Optional
-from anthropic import Anthropic
+from typing import List, Dict, Any, Optional, AsyncIterator
+from anthropic import Anthropic, AsyncAnthropic
 from agent_factory.tools.base import Tool
+from agent_factory.agents.context_packer import render_system_prompt
+from agent_factory.agents.prepared import PreparedAgent, anthropic_tool_schema
+from agent_factory.integrations.client_pool import get_client_pool
 
 
 class AnthropicAgentClient:
@@ -15,18 +18,28 @@ class AnthropicAgentClient:
     This wraps the Anthropic SDK to provide agent execution capabilities.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize Anthropic client.
         
+        SDK clients come from the process-wide client pool, so constructing
+        this wrapper is cheap and HTTP connections are reused across runs.
+        
         Args:
             api_key: Anthropic API key (defaults to ANTHROPIC_API_KEY env var)
+            base_url: Optional API base URL override
         """
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key required. Set ANTHROPIC_API_KEY environment variable.")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self.base_url = base_url
+        self.client: Anthropic = get_client_pool().get_client("anthropic", self.api_key, self.base_url)
+    
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Pooled async Anthropic client for the current event loop."""
+        return get_client_pool().get_async_client("anthropic", self.api_key, self.base_url)
     
     def run_agent(
         self,
@@ -37,6 +50,8 @@ class AnthropicAgentClient:
         temperature: float = 0.7,
         max_tokens: int = 2000,
         context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
     ) -> Dict[str, Any]:
         """
         Run an agent using Anthropic Claude API.
@@ -49,64 +64,60 @@ class AnthropicAgentClient:
             temperature: Temperature setting
             max_tokens: Maximum tokens
             context: Additional context
+            tool_messages: Prior tool-use turns from ``build_tool_messages``
+            prepared: Compiled agent whose tool schemas are reused
             
         Returns:
             Agent execution result
         """
-        # Build messages
-        messages = [
-            {
-                "role": "user",
-                "content": input_text
-            }
-        ]
+        request = self._build_request(
+            instructions, input_text, model, tools, temperature, max_tokens, context,
+            tool_messages, prepared,
+        )
         
-        # Convert tools to Anthropic format
-        anthropic_tools = []
-        if tools:
-            for tool in tools:
-                tool_schema = tool.get_schema()
-                anthropic_tools.append({
-                    "name": tool.id,
-                    "description": tool.description,
-                    "input_schema": tool_schema.get("parameters", {})
-                })
+        try:
+            response = self.client.messages.create(**request)
+            return self._parse_response(response, model)
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API error: {str(e)}") from e
+    
+    async def arun_agent(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        tools: Optional[List[Tool]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``run_agent`` using the async Anthropic client.
         
-        # Build system message with instructions
-        system_message = instructions
-        if context:
-            system_message += f"\n\nContext: {context}"
+        Args:
+            instructions: System instructions for the agent
+            input_text: User input
+            model: Model to use
+            tools: List of tools available to the agent
+            temperature: Temperature setting
+            max_tokens: Maximum tokens
+            context: Additional context
+            tool_messages: Prior tool-use turns from ``build_tool_messages``
+            prepared: Compiled agent whose tool schemas are reused
+            
+        Returns:
+            Agent execution result
+        """
+        request = self._build_request(
+            instructions, input_text, model, tools, temperature, max_tokens, context,
+            tool_messages, prepared,
+        )
         
         try:
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system_message,
-                messages=messages,
-                tools=anthropic_tools if anthropic_tools else None,
-            )
-            
-            # Extract content
-            output = ""
-            tool_calls = []
-            
-            for content_block in response.content:
-                if content_block.type == "text":
-                    output += content_block.text
-                elif content_block.type == "tool_use":
-                    tool_calls.append({
-                        "id": content_block.id,
-                        "name": content_block.name,
-                        "input": content_block.input
-                    })
-            
-            return {
-                "output": output,
-                "tool_calls": tool_calls,
-                "tokens_used": response.usage.input_tokens + response.usage.output_tokens,
-                "model": model,
-            }
+            response = await self.async_client.messages.create(**request)
+            return self._parse_response(response, model)
         except Exception as e:
             raise RuntimeError(f"Anthropic API error: {str(e)}") from e
     
@@ -135,39 +146,199 @@ class AnthropicAgentClient:
         Yields:
             Chunks of agent output
         """
-        messages = [
-            {
-                "role": "user",
-                "content": input_text
-            }
-        ]
+        request = self._build_request(
+            instructions, input_text, model, tools, temperature, max_tokens, context
+        )
         
-        anthropic_tools = []
-        if tools:
-            for tool in tools:
-                tool_schema = tool.get_schema()
-                anthropic_tools.append({
-                    "name": tool.id,
-                    "description": tool.description,
-                    "input_schema": tool_schema.get("parameters", {})
-                })
+        try:
+            with self.client.messages.stream(**request) as stream:
+                for event in stream:
+                    if event.type == "content_block_delta":
+                        if hasattr(event.delta, "text"):
+                            yield event.delta.text
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API streaming error: {str(e)}") from e
+    
+    async def astream_agent(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        tools: Optional[List[Tool]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of ``stream_agent``.
         
-        system_message = instructions
-        if context:
-            system_message += f"\n\nContext: {context}"
+        Yields:
+            Chunks of agent output
+        """
+        request = self._build_request(
+            instructions, input_text, model, tools, temperature, max_tokens, context
+        )
         
         try:
-            with self.client.messages.stream(
-                model=model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system_message,
-                messages=messages,
-                tools=anthropic_tools if anthropic_tools else None,
-            ) as stream:
-                for event in stream:
+            async with self.async_client.messages.stream(**request) as stream:
+                async for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, "text"):
                             yield event.delta.text
         except Exception as e:
             raise RuntimeError(f"Anthropic API streaming error: {str(e)}") from e
+    
+    async def astream_events(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "claude-3-5-sonnet-20241022",
+        tools: Optional[List[Tool]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a message as events.
+        
+        Yields ``{"type": "token", "content": ...}`` for each text delta, then a
+        single ``{"type": "response", ...}`` event shaped like the result of
+        ``arun_agent``.
+        
+        Yields:
+            Token events followed by one response event
+        """
+        request = self._build_request(
+            instructions, input_text, model, tools, temperature, max_tokens, context,
+            tool_messages, prepared,
+        )
+        
+        try:
+            async with self.async_client.messages.stream(**request) as stream:
+                async for event in stream:
+                    if event.type == "content_block_delta":
+                        if hasattr(event.delta, "text"):
+                            yield {"type": "token", "content": event.delta.text}
+                message = await stream.get_final_message()
+        except Exception as e:
+            raise RuntimeError(f"Anthropic API streaming error: {str(e)}") from e
+        
+        yield {"type": "response", **self._parse_response(message, model)}
+    
+    @staticmethod
+    def _build_request(
+        instructions: str,
+        input_text: str,
+        model: str,
+        tools: Optional[List[Tool]],
+        temperature: float,
+        max_tokens: int,
+        context: Optional[Dict[str, Any]],
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
+    ) -> Dict[str, Any]:
+        """Build keyword arguments for ``messages.create``/``messages.stream``."""
+        messages = []
+        if context and context.get("packed"):
+            # Anthropic takes the system prompt separately from the turns
+            messages.extend(
+                m for m in context["messages"] if m.get("role") in ("user", "assistant")
+            )
+            # The conversation must open with a user turn
+            while messages and messages[0]["role"] != "user":
+                messages.pop(0)
+        messages.append({
+            "role": "user",
+            "content": input_text
+        })
+        if tool_messages:
+            messages.extend(tool_messages)
+        
+        # Convert tools to Anthropic format
+        if prepared is not None:
+            anthropic_tools = list(prepared.anthropic_tools)
+        else:
+            anthropic_tools = [anthropic_tool_schema(tool) for tool in tools or []]
+        
+        # Build system message with instructions
+        if context and context.get("packed"):
+            system_message = render_system_prompt(instructions, context)
+        else:
+            system_message = instructions
+            if context:
+                system_message += f"\n\nContext: {context}"
+        
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_message,
+            "messages": messages,
+            "tools": anthropic_tools if anthropic_tools else None,
+        }
+    
+    @staticmethod
+    def build_tool_messages(
+        response: Dict[str, Any],
+        tool_results: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the assistant tool_use message and user tool_result message for a turn.
+        
+        Args:
+            response: Result of ``run_agent``/``arun_agent`` containing tool_calls
+            tool_results: Execution records with id, status and output/error
+            
+        Returns:
+            Messages to pass as ``tool_messages`` on the next turn
+        """
+        assistant_content: List[Dict[str, Any]] = []
+        if response.get("output"):
+            assistant_content.append({"type": "text", "text": response["output"]})
+        for call in response.get("tool_calls", []):
+            assistant_content.append({
+                "type": "tool_use",
+                "id": call["id"],
+                "name": call["name"],
+                "input": call.get("input") or {},
+            })
+        
+        results_content = []
+        for result in tool_results:
+            success = result.get("status") == "success"
+            results_content.append({
+                "type": "tool_result",
+                "tool_use_id": result["id"],
+                "content": result.get("output") if success else f"Error: {result.get('error')}",
+                "is_error": not success,
+            })
+        
+        return [
+            {"role": "assistant", "content": assistant_content},
+            {"role": "user", "content": results_content},
+        ]
+    
+    @staticmethod
+    def _parse_response(response: Any, model: str) -> Dict[str, Any]:
+        """Extract output, tool calls and usage from a message response."""
+        output = ""
+        tool_calls = []
+        
+        for content_block in response.content:
+            if content_block.type == "text":
+                output += content_block.text
+            elif content_block.type == "tool_use":
+                tool_calls.append({
+                    "id": content_block.id,
+                    "name": content_block.name,
+                    "input": content_block.input
+                })
+        
+        return {
+            "output": output,
+            "tool_calls": tool_calls,
+            "tokens_used": response.usage.input_tokens + response.usage.output_tokens,
+            "model": model,
+        }
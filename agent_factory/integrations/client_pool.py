@@ -0,0 +1,380 @@
+"""
+Process-wide pool of LLM provider SDK clients.
+
+Creating an ``OpenAI``/``Anthropic`` client builds a new HTTP connection pool,
+so every run would pay for TCP and TLS setup. The pool hands out one shared
+client per (provider, API key, base URL) with keep-alive connections, plus
+one async client per event loop since async connections are loop-bound.
+Async clients are always closed on their own loop: when the pool drops
+them, or when their loop shuts down.
+"""
+
+import asyncio
+import atexit
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class ClientPoolConfig:
+    """Connection settings shared by all pooled provider clients."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # seconds
+    timeout: float = 60.0  # seconds
+    # SDK-level retries for async clients; async agent calls are retried by
+    # the request policy instead, so the two do not multiply
+    async_max_retries: int = 0
+
+    @classmethod
+    def from_env(cls) -> "ClientPoolConfig":
+        """Build config from LLM_* environment variables."""
+        return cls(
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(os.getenv("LLM_REQUEST_TIMEOUT", "60")),
+            async_max_retries=int(os.getenv("LLM_ASYNC_SDK_MAX_RETRIES", "0")),
+        )
+
+
+
+def _build_http_client(sdk: Any, config: ClientPoolConfig, is_async: bool) -> Any:
+    """Build the SDK's default HTTP client with the pool's connection limits."""
+    import httpx
+
+    cls = sdk.DefaultAsyncHttpxClient if is_async else sdk.DefaultHttpxClient
+    limits = httpx.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+    return cls(limits=limits, timeout=config.timeout)
+
+
+def _openai_factory(
+    api_key: str, base_url: Optional[str], config: ClientPoolConfig, is_async: bool
+) -> Any:
+    import openai
+
+    cls = openai.AsyncOpenAI if is_async else openai.OpenAI
+    http_client = _build_http_client(openai, config, is_async)
+    kwargs = {"max_retries": config.async_max_retries} if is_async else {}
+    return cls(api_key=api_key, base_url=base_url, http_client=http_client, **kwargs)
+
+
+def _anthropic_factory(
+    api_key: str, base_url: Optional[str], config: ClientPoolConfig, is_async: bool
+) -> Any:
+    import anthropic
+
+    cls = anthropic.AsyncAnthropic if is_async else anthropic.Anthropic
+    http_client = _build_http_client(anthropic, config, is_async)
+    kwargs = {"max_retries": config.async_max_retries} if is_async else {}
+    return cls(api_key=api_key, base_url=base_url, http_client=http_client, **kwargs)
+
+
+_FACTORIES: Dict[str, Callable[..., Any]] = {
+    "openai": _openai_factory,
+    "anthropic": _anthropic_factory,
+}
+
+
+@dataclass
+class _AsyncEntry:
+    client: Any
+    loop: asyncio.AbstractEventLoop
+    # Task that closes the client when its loop cancels pending tasks on shutdown
+    guard: Optional["asyncio.Task[None]"] = None
+
+
+async def _aclose(client: Any) -> None:
+    """Close an async SDK or httpx client."""
+    closer = getattr(client, "aclose", None) or client.close
+    await closer()
+
+
+async def _close_with_loop(client: Any) -> None:
+    """Wait until cancelled, then close the client on this loop."""
+    try:
+        await asyncio.get_running_loop().create_future()
+    except asyncio.CancelledError:
+        await _aclose(client)
+        raise
+
+
+async def _close_entry(entry: _AsyncEntry) -> None:
+    """Close a pooled async client on its own loop."""
+    if entry.guard is None:
+        await _aclose(entry.client)
+    elif not entry.guard.done():
+        # The guard closes the client as it unwinds
+        entry.guard.cancel()
+        await asyncio.wait([entry.guard])
+
+
+@dataclass
+class PoolStats:
+    """Counters for pool usage."""
+    clients_created: int = 0
+    hits: int = 0
+    by_provider: Dict[str, int] = field(default_factory=dict)
+
+
+class ProviderClientPool:
+    """
+    Shared, keep-alive SDK clients keyed by provider, API key and base URL.
+
+    Example:
+        >>> pool = get_client_pool()
+        >>> client = pool.get_client("openai", api_key="sk-...")
+        >>> aclient = pool.get_async_client("openai", api_key="sk-...")
+    """
+
+    def __init__(self, config: Optional[ClientPoolConfig] = None):
+        """
+        Initialize client pool.
+
+        Args:
+            config: Connection settings (defaults to LLM_* environment variables)
+        """
+        self.config = config or ClientPoolConfig.from_env()
+        self.stats = PoolStats()
+        self._clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+        self._async_clients: Dict[Tuple[str, str, Optional[str], int], _AsyncEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+        """
+        Get the shared synchronous SDK client.
+
+        Args:
+            provider: Provider name ("openai" or "anthropic")
+            api_key: Provider API key
+            base_url: Optional API base URL override
+
+        Returns:
+            Provider SDK client
+        """
+        key = (provider, api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.stats.hits += 1
+                return client
+
+            client = self._factory(provider)(api_key, base_url, self.config, False)
+            self._clients[key] = client
+            self._count_created(provider)
+            return client
+
+    def get_async_client(
+        self,
+        provider: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+    ) -> Any:
+        """
+        Get the shared async SDK client for the current event loop.
+
+        Outside a running loop this returns the client bound to the shared
+        background loop used by the synchronous API.
+
+        Args:
+            provider: Provider name ("openai" or "anthropic")
+            api_key: Provider API key
+            base_url: Optional API base URL override
+
+        Returns:
+            Async provider SDK client
+        """
+        loop = _running_loop()
+        in_loop = loop is not None
+        if loop is None:
+            from agent_factory.utils.async_utils import get_background_loop
+            loop = get_background_loop()
+
+        key = (provider, api_key, base_url, id(loop))
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is not None and entry.loop is loop and not loop.is_closed():
+                self.stats.hits += 1
+                return entry.client
+
+            # Drop clients whose loop has gone away; their guards closed them
+            # while the loop shut down
+            for stale_key in [k for k, e in self._async_clients.items() if e.loop.is_closed()]:
+                del self._async_clients[stale_key]
+            if entry is not None and entry.loop is not loop:
+                del self._async_clients[key]
+
+            client = self._factory(provider)(api_key, base_url, self.config, True)
+            # Clients of the shared background loop are closed by close()
+            guard = loop.create_task(_close_with_loop(client)) if in_loop else None
+            self._async_clients[key] = _AsyncEntry(client=client, loop=loop, guard=guard)
+            self._count_created(provider)
+            return client
+
+    def evict(self, provider: str, api_key: str, base_url: Optional[str] = None) -> int:
+        """
+        Close and drop all clients for an API key, e.g. after it was rotated.
+
+        Async clients are closed on their own event loops.
+
+        Args:
+            provider: Provider name
+            api_key: API key whose clients to drop
+            base_url: API base URL the clients were created with
+
+        Returns:
+            Number of clients dropped
+        """
+        with self._lock:
+            client = self._clients.pop((provider, api_key, base_url), None)
+            async_keys = [k for k in self._async_clients if k[:3] == (provider, api_key, base_url)]
+            entries = [self._async_clients.pop(k) for k in async_keys]
+
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+        for entry in entries:
+            self._retire(entry, wait=True)
+        return len(entries) + (client is not None)
+
+    def close(self) -> None:
+        """Close all pooled clients and their connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            async_entries = list(self._async_clients.values())
+            self._clients.clear()
+            self._async_clients.clear()
+
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+        for entry in async_entries:
+            self._retire(entry, wait=True)
+
+    async def aclose(self) -> None:
+        """Close all pooled clients from within a running event loop."""
+        current = asyncio.get_running_loop()
+        with self._lock:
+            own = [k for k, e in self._async_clients.items() if e.loop is current]
+            entries = [self._async_clients.pop(k) for k in own]
+
+        for entry in entries:
+            try:
+                await _close_entry(entry)
+            except Exception:
+                pass
+
+        # Remaining clients belong to other loops/threads
+        await current.run_in_executor(None, self.close)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        with self._lock:
+            return {
+                "clients_created": self.stats.clients_created,
+                "hits": self.stats.hits,
+                "by_provider": dict(self.stats.by_provider),
+                "sync_clients": len(self._clients),
+                "async_clients": len(self._async_clients),
+            }
+
+    @staticmethod
+    def _retire(entry: _AsyncEntry, wait: bool = False) -> None:
+        """Close a dropped async client on its own loop, waiting if on another thread."""
+        loop = entry.loop
+        if loop.is_closed():
+            return
+        try:
+            if _running_loop() is loop:
+                # Cannot block the loop we are running on; close in the background
+                from agent_factory.utils.async_utils import spawn_background
+                spawn_background(_close_entry(entry))
+            elif loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(_close_entry(entry), loop)
+                if wait:
+                    future.result(timeout=5.0)
+            else:
+                loop.run_until_complete(_close_entry(entry))
+        except Exception:
+            pass
+
+    def _count_created(self, provider: str) -> None:
+        self.stats.clients_created += 1
+        self.stats.by_provider[provider] = self.stats.by_provider.get(provider, 0) + 1
+
+    @staticmethod
+    def _factory(provider: str) -> Callable[..., Any]:
+        factory = _FACTORIES.get(provider)
+        if factory is None:
+            raise ValueError(f"Unknown LLM provider: {provider}")
+        return factory
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+# Global client pool
+_pool: Optional[ProviderClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ProviderClientPool:
+    """
+    Get global provider client pool.
+
+    Returns:
+        Provider client pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProviderClientPool()
+        return _pool
+
+
+
+def configure_client_pool(config: ClientPoolConfig) -> ProviderClientPool:
+    """
+    Replace the global pool with one using the given connection settings.
+
+    Args:
+        config: Connection settings
+
+    Returns:
+        New provider client pool
+    """
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, ProviderClientPool(config)
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def close_client_pool() -> None:
+    """Close and discard the global provider client pool."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, None
+    if old is not None:
+        old.close()
+
+
+@atexit.register
+def _close_on_exit() -> None:
+    close_client_pool()
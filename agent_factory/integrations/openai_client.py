@@ -3,9 +3,12 @@ OpenAI Agents SDK integration for Agent Factory Platform.
 """
 
 import os
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Optional, AsyncIterator
+from openai import OpenAI, AsyncOpenAI
 from agent_factory.tools.base import Tool
+from agent_factory.agents.context_packer import render_system_prompt
+from agent_factory.agents.prepared import PreparedAgent, openai_tool_schema
+from agent_factory.integrations.client_pool import get_client_pool
 
 
 class OpenAIAgentClient:
@@ -15,18 +18,28 @@ class OpenAIAgentClient:
     This wraps the OpenAI SDK to provide agent execution capabilities.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
         """
         Initialize OpenAI client.
         
+        SDK clients come from the process-wide client pool, so constructing
+        this wrapper is cheap and HTTP connections are reused across runs.
+        
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
+            base_url: Optional API base URL override
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url
+        self.client: OpenAI = get_client_pool().get_client("openai", self.api_key, self.base_url)
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Pooled async OpenAI client for the current event loop."""
+        return get_client_pool().get_async_client("openai", self.api_key, self.base_url)
     
     def run_agent(
         self,
@@ -37,6 +50,8 @@ class OpenAIAgentClient:
         temperature: float = 0.7,
         max_tokens: int = 2000,
         context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
     ) -> Dict[str, Any]:
         """
         Run an agent using OpenAI API with circuit breaker protection.
@@ -49,6 +64,8 @@ class OpenAIAgentClient:
             temperature: Temperature setting (default: 0.7)
             max_tokens: Maximum tokens (default: 2000)
             context: Optional conversation context (optional)
+            tool_messages: Prior tool-call turns from ``build_tool_messages`` (optional)
+            prepared: Compiled agent whose tool schemas are reused (optional)
             
         Returns:
             Dictionary with output, tool_calls, tokens_used, and model
@@ -57,54 +74,206 @@ class OpenAIAgentClient:
             ValueError: If API key is not configured
             Exception: If API call fails (wrapped by circuit breaker)
         """
-        # Convert tools to OpenAI format
-        openai_tools = []
-        if tools:
-            for tool in tools:
-                tool_schema = tool.get_schema()
-                openai_tools.append({
-                    "type": "function",
-                    "function": {
-                        "name": tool.id,
-                        "description": tool.description,
-                        "parameters": tool_schema.get("parameters", {}),
-                    }
-                })
+        openai_tools = self._build_tools(tools, prepared)
+        messages = self._build_messages(instructions, input_text, context, tool_messages)
         
-        # Build messages
-        messages = [
-            {"role": "system", "content": instructions}
-        ]
+        # Call OpenAI API with circuit breaker protection
+        response = self._get_breaker().call(
+            self.client.chat.completions.create,
+            model=model,
+            messages=messages,
+            tools=openai_tools if openai_tools else None,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
         
-        # Add context if provided
-        if context and "messages" in context:
-            messages.extend(context["messages"][-10:])  # Last 10 messages
+        return self._parse_response(response, model)
+    
+    async def arun_agent(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "gpt-4o",
+        tools: Optional[List[Tool]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of ``run_agent`` using the async OpenAI client.
+        
+        Args:
+            instructions: System instructions for the agent
+            input_text: User input
+            model: Model to use (default: "gpt-4o")
+            tools: List of tools available to the agent (optional)
+            temperature: Temperature setting (default: 0.7)
+            max_tokens: Maximum tokens (default: 2000)
+            context: Optional conversation context (optional)
+            tool_messages: Prior tool-call turns from ``build_tool_messages`` (optional)
+            prepared: Compiled agent whose tool schemas are reused (optional)
+            
+        Returns:
+            Dictionary with output, tool_calls, tokens_used, and model
+        """
+        openai_tools = self._build_tools(tools, prepared)
+        messages = self._build_messages(instructions, input_text, context, tool_messages)
+        
+        response = await self._get_breaker().call_async(
+            self.async_client.chat.completions.create,
+            model=model,
+            messages=messages,
+            tools=openai_tools if openai_tools else None,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        
+        return self._parse_response(response, model)
+    
+    async def astream_events(
+        self,
+        instructions: str,
+        input_text: str,
+        model: str = "gpt-4o",
+        tools: Optional[List[Tool]] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        context: Optional[Dict[str, Any]] = None,
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+        prepared: Optional[PreparedAgent] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion as events.
+        
+        Yields ``{"type": "token", "content": ...}`` for each text delta, then a
+        single ``{"type": "response", ...}`` event shaped like the result of
+        ``arun_agent`` with the assembled output and tool calls.
+        
+        Args:
+            instructions: System instructions for the agent
+            input_text: User input
+            model: Model to use (default: "gpt-4o")
+            tools: List of tools available to the agent (optional)
+            temperature: Temperature setting (default: 0.7)
+            max_tokens: Maximum tokens (default: 2000)
+            context: Optional conversation context (optional)
+            tool_messages: Prior tool-call turns from ``build_tool_messages`` (optional)
+            prepared: Compiled agent whose tool schemas are reused (optional)
+            
+        Yields:
+            Token events followed by one response event
+        """
+        openai_tools = self._build_tools(tools, prepared)
+        messages = self._build_messages(instructions, input_text, context, tool_messages)
+        
+        stream = await self._get_breaker().call_async(
+            self.async_client.chat.completions.create,
+            model=model,
+            messages=messages,
+            tools=openai_tools if openai_tools else None,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        
+        output_parts: List[str] = []
+        calls: Dict[int, Dict[str, Any]] = {}
+        tokens_used = 0
+        
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                tokens_used = chunk.usage.total_tokens
+            if not chunk.choices:
+                continue
+            
+            delta = chunk.choices[0].delta
+            if delta.content:
+                output_parts.append(delta.content)
+                yield {"type": "token", "content": delta.content}
+            
+            # Tool calls arrive as fragments keyed by index
+            for fragment in delta.tool_calls or []:
+                call = calls.setdefault(fragment.index, {"id": None, "name": "", "arguments": ""})
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function:
+                    if fragment.function.name:
+                        call["name"] += fragment.function.name
+                    if fragment.function.arguments:
+                        call["arguments"] += fragment.function.arguments
+        
+        yield {
+            "type": "response",
+            "output": "".join(output_parts),
+            "tool_calls": [calls[index] for index in sorted(calls)],
+            "tokens_used": tokens_used,
+            "model": model,
+        }
+    
+    @staticmethod
+    def _build_tools(
+        tools: Optional[List[Tool]],
+        prepared: Optional[PreparedAgent] = None,
+    ) -> List[Dict[str, Any]]:
+        """Convert tools to OpenAI format, reusing precompiled schemas when given."""
+        if prepared is not None:
+            return list(prepared.openai_tools)
+        return [openai_tool_schema(tool) for tool in tools or []]
+    
+    @staticmethod
+    def _build_messages(
+        instructions: str,
+        input_text: str,
+        context: Optional[Dict[str, Any]],
+        tool_messages: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build the chat message list."""
+        if context and context.get("packed"):
+            # Already fitted to the token budget by the agent's context packer
+            messages = [
+                {"role": "system", "content": render_system_prompt(instructions, context)}
+            ]
+            messages.extend(context["messages"])
+        else:
+            messages = [
+                {"role": "system", "content": instructions}
+            ]
+            
+            # Add context if provided
+            if context and "messages" in context:
+                messages.extend(context["messages"][-10:])  # Last 10 messages
         
         # Add user input
         messages.append({"role": "user", "content": input_text})
         
-        # Call OpenAI API with circuit breaker protection
+        # Add assistant tool calls and their results from earlier turns
+        if tool_messages:
+            messages.extend(tool_messages)
+        return messages
+    
+    @staticmethod
+    def _get_breaker():
+        """Get the shared OpenAI circuit breaker."""
         from agent_factory.security.circuit_breaker import get_circuit_breaker, CircuitBreakerConfig
+        from agent_factory.integrations.request_policy import is_rate_limited
         
-        breaker = get_circuit_breaker(
+        return get_circuit_breaker(
             "openai_api",
             config=CircuitBreakerConfig(
                 failure_threshold=5,
                 success_threshold=2,
                 timeout=60.0,
+                # 429s shrink the rate governor's limit instead of opening the breaker
+                is_failure=lambda error: not is_rate_limited(error),
             )
         )
-        
-        response = breaker.call(
-            self.client.chat.completions.create,
-            model=model,
-            messages=messages,
-            tools=openai_tools if openai_tools else None,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        
-        # Extract response
+    
+    @staticmethod
+    def _parse_response(response: Any, model: str) -> Dict[str, Any]:
+        """Extract output, tool calls and usage from a completion."""
         message = response.choices[0].message
         output = message.content or ""
         
@@ -125,6 +294,41 @@ class OpenAIAgentClient:
             "model": model,
         }
     
+    @staticmethod
+    def build_tool_messages(
+        response: Dict[str, Any],
+        tool_results: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the assistant tool-call message and tool result messages for a turn.
+        
+        Args:
+            response: Result of ``run_agent``/``arun_agent`` containing tool_calls
+            tool_results: Execution records with id, status and output/error
+            
+        Returns:
+            Messages to pass as ``tool_messages`` on the next turn
+        """
+        messages: List[Dict[str, Any]] = [{
+            "role": "assistant",
+            "content": response.get("output") or None,
+            "tool_calls": [
+                {
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": call.get("arguments") or "{}"},
+                }
+                for call in response.get("tool_calls", [])
+            ],
+        }]
+        for result in tool_results:
+            if result.get("status") == "success":
+                content = result.get("output")
+            else:
+                content = f"Error: {result.get('error')}"
+            messages.append({"role": "tool", "tool_call_id": result["id"], "content": content})
+        return messages
+    
     def execute_tool_call(
         self,
         tool: Tool,
@@ -0,0 +1,41 @@
+"""
+LLM model pricing and token cost estimates.
+
+Prices are in USD per 1K tokens. When only a total token count is known,
+it is split 70% input and 30% output. Unknown models are priced as gpt-4o.
+"""
+
+from decimal import Decimal
+from typing import Dict
+
+DEFAULT_PRICING_MODEL = "gpt-4o"
+
+MODEL_PRICING: Dict[str, Dict[str, Decimal]] = {
+    "gpt-4o": {"input": Decimal("0.0025"), "output": Decimal("0.01")},
+    "gpt-4": {"input": Decimal("0.03"), "output": Decimal("0.06")},
+    "gpt-3.5-turbo": {"input": Decimal("0.0005"), "output": Decimal("0.0015")},
+    "claude-3-opus": {"input": Decimal("0.015"), "output": Decimal("0.075")},
+    "claude-3-sonnet": {"input": Decimal("0.003"), "output": Decimal("0.015")},
+}
+
+INPUT_TOKEN_SHARE = Decimal("0.7")
+
+
+def estimate_llm_cost(tokens: int, model: str = DEFAULT_PRICING_MODEL) -> Decimal:
+    """
+    Estimate the cost of a number of tokens on a model.
+
+    Args:
+        tokens: Total tokens (input and output)
+        model: Model name
+
+    Returns:
+        Estimated cost in USD
+    """
+    model_pricing = MODEL_PRICING.get(model, MODEL_PRICING[DEFAULT_PRICING_MODEL])
+    input_tokens = int(tokens * INPUT_TOKEN_SHARE)
+    output_tokens = int(tokens * (1 - INPUT_TOKEN_SHARE))
+
+    input_cost = (Decimal(input_tokens) / 1000) * model_pricing["input"]
+    output_cost = (Decimal(output_tokens) / 1000) * model_pricing["output"]
+    return input_cost + output_cost
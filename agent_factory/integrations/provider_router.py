@@ -0,0 +1,378 @@
+"""
+Latency-aware routing of agent model calls across provider/model targets.
+
+An agent configured with several targets (``AgentConfig.provider_targets``)
+is served by a :class:`RoutingAgentClient`, which orders the targets for
+each run and fails over to the next one when a call fails or the target's
+circuit breaker is open. Strategies:
+
+- ``ordered``: declared order; later targets are fallbacks only
+- ``latency``: lowest rolling latency, penalized by error rate and divided by weight
+- ``weighted``: random choice in proportion to weight and success rate,
+  with the rest ordered by latency as fallbacks
+
+Once a target has answered, the run stays on it, because tool-call turns
+are in that provider's message format. Providers are created through a
+registry, so tests and local deployments can register stand-in clients.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
+
+from agent_factory.core.exceptions import AgentFactoryError
+from agent_factory.monitoring.metrics import MetricsCollector
+from agent_factory.security.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, get_circuit_breaker
+
+STRATEGIES = ("ordered", "latency", "weighted")
+
+
+@dataclass(frozen=True)
+class ProviderTarget:
+    """One provider and model an agent can be served from."""
+    provider: str
+    model: str
+    weight: float = 1.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @classmethod
+    def parse(cls, spec: Union[str, Dict[str, Any], "ProviderTarget"]) -> "ProviderTarget":
+        """
+        Build a target from ``"provider:model"``, a dict or a target.
+
+        Args:
+            spec: Target specification
+
+        Returns:
+            ProviderTarget
+
+        Raises:
+            ValueError: If the specification is malformed
+        """
+        if isinstance(spec, ProviderTarget):
+            return spec
+        if isinstance(spec, dict):
+            return cls(provider=spec["provider"], model=spec["model"], weight=float(spec.get("weight", 1.0)))
+        provider, sep, model = str(spec).partition(":")
+        if not sep or not provider or not model:
+            raise ValueError(f"Invalid provider target '{spec}', expected 'provider:model'")
+        return cls(provider=provider, model=model)
+
+
+# Provider registry
+_providers: Dict[str, Callable[[], Any]] = {}
+
+
+def _openai_client() -> Any:
+    from agent_factory.integrations.openai_client import OpenAIAgentClient
+
+    return OpenAIAgentClient()
+
+
+def _anthropic_client() -> Any:
+    from agent_factory.integrations.anthropic_client import AnthropicAgentClient
+
+    return AnthropicAgentClient()
+
+
+def register_provider(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Register a provider client factory.
+
+    The client must offer ``arun_agent``, ``astream_events`` and
+    ``build_tool_messages`` like ``OpenAIAgentClient``.
+
+    Args:
+        name: Provider name used in targets
+        factory: Zero-argument callable returning a client
+    """
+    _providers[name] = factory
+
+
+def unregister_provider(name: str) -> None:
+    """Remove a provider client factory."""
+    _providers.pop(name, None)
+
+
+def create_provider_client(provider: str) -> Any:
+    """
+    Create a client for a registered provider.
+
+    Raises:
+        ValueError: If the provider is not registered
+    """
+    factory = _providers.get(provider)
+    if factory is None:
+        raise ValueError(f"Unknown provider '{provider}'")
+    return factory()
+
+
+register_provider("openai", _openai_client)
+register_provider("anthropic", _anthropic_client)
+
+
+class TargetStats:
+    """Rolling latency and error rate for one target (exponentially weighted)."""
+
+    def __init__(self, alpha: float = 0.2, error_half_life: float = 60.0):
+        self.alpha = alpha
+        self.error_half_life = error_half_life
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.updated = time.monotonic()
+
+    def record(self, success: bool, latency: Optional[float]) -> None:
+        now = time.monotonic()
+        self.error_rate = self._decayed_error(now) * (1 - self.alpha) + (0.0 if success else self.alpha)
+        self.updated = now
+        self.calls += 1
+        if success:
+            if latency is not None:
+                self.latency = latency if self.latency is None else self.latency + self.alpha * (latency - self.latency)
+        else:
+            self.failures += 1
+
+    def score(self, weight: float) -> float:
+        """Lower is better; unmeasured targets score 0 so they get tried."""
+        if self.calls == 0:
+            return 0.0
+        error = self._decayed_error(time.monotonic())
+        return (self.latency or 1.0) * (1 + 4 * error) / max(weight, 1e-6)
+
+    def success_rate(self) -> float:
+        return 1.0 - self._decayed_error(time.monotonic())
+
+    def _decayed_error(self, now: float) -> float:
+        # Errors fade without traffic, so a demoted target is retried eventually
+        return self.error_rate * 0.5 ** ((now - self.updated) / self.error_half_life)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "error_rate": self._decayed_error(time.monotonic()),
+            "calls": self.calls,
+            "failures": self.failures,
+        }
+
+
+class RouterHealth:
+    """Process-wide target statistics shared by all routing clients."""
+
+    def __init__(self):
+        self._stats: Dict[str, TargetStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, target: ProviderTarget, success: bool, latency: Optional[float]) -> None:
+        with self._lock:
+            self._stats.setdefault(target.name, TargetStats()).record(success, latency)
+
+    def score(self, target: ProviderTarget) -> float:
+        with self._lock:
+            stats = self._stats.get(target.name)
+            return stats.score(target.weight) if stats else 0.0
+
+    def success_rate(self, target: ProviderTarget) -> float:
+        with self._lock:
+            stats = self._stats.get(target.name)
+            return stats.success_rate() if stats else 1.0
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+
+def _target_breaker(target: ProviderTarget) -> CircuitBreaker:
+    from agent_factory.integrations.request_policy import is_rate_limited
+
+    return get_circuit_breaker(
+        f"llm_target:{target.name}",
+        config=CircuitBreakerConfig(
+            failure_threshold=5,
+            success_threshold=1,
+            timeout=30.0,
+            is_failure=lambda error: not is_rate_limited(error),
+        ),
+    )
+
+
+class RoutingAgentClient:
+    """
+    Provider client that serves each run from one of several targets.
+
+    Example:
+        >>> client = RoutingAgentClient(["openai:gpt-4o", "anthropic:claude-3-5-sonnet-latest"])
+        >>> response = await client.arun_agent(instructions=..., input_text=...)
+        >>> client.routing_info()["target"]
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[Union[str, Dict[str, Any], ProviderTarget]],
+        strategy: str = "ordered",
+        client_factory: Optional[Callable[[ProviderTarget], Any]] = None,
+        health: Optional[RouterHealth] = None,
+    ):
+        """
+        Initialize routing client.
+
+        Args:
+            targets: Targets as ``"provider:model"`` strings, dicts or ProviderTarget
+            strategy: ``ordered``, ``latency`` or ``weighted``
+            client_factory: Builds the client for a target (defaults to the
+                provider registry)
+            health: Target statistics (defaults to the shared instance)
+
+        Raises:
+            ValueError: If no targets are given or the strategy is unknown
+        """
+        if not targets:
+            raise ValueError("At least one provider target is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown routing strategy '{strategy}', expected one of {STRATEGIES}")
+        self.targets = [ProviderTarget.parse(target) for target in targets]
+        self.strategy = strategy
+        self.client_factory = client_factory or (lambda target: create_provider_client(target.provider))
+        self.health = health or get_router_health()
+        self.served_by: Optional[ProviderTarget] = None
+        self.failed: List[Dict[str, str]] = []
+        self._clients: Dict[str, Any] = {}
+
+    def order(self) -> List[ProviderTarget]:
+        """Targets in the order they will be tried for the next run."""
+        if self.strategy == "ordered":
+            return list(self.targets)
+        by_latency = sorted(self.targets, key=self.health.score)
+        if self.strategy == "latency":
+            return by_latency
+        weights = [t.weight * max(self.health.success_rate(t), 0.01) for t in self.targets]
+        first = random.choices(self.targets, weights=weights)[0]
+        return [first] + [t for t in by_latency if t is not first]
+
+    def routing_info(self) -> Dict[str, Any]:
+        """Which target served the run and which ones failed before it."""
+        served = self.served_by
+        return {
+            "provider": served.provider if served else None,
+            "model": served.model if served else None,
+            "target": served.name if served else None,
+            "failed_targets": list(self.failed),
+        }
+
+    async def arun_agent(self, **kwargs: Any) -> Dict[str, Any]:
+        """Same contract as ``OpenAIAgentClient.arun_agent``; ``model`` comes from the target."""
+        if self.served_by is not None:
+            return await self._call(self.served_by, kwargs)
+
+        last_error: Optional[BaseException] = None
+        for target in self._available():
+            try:
+                response = await self._call(target, kwargs)
+            except Exception as e:
+                self._record_failure(target, e)
+                last_error = e
+                continue
+            self.served_by = target
+            return response
+        raise self._exhausted(last_error)
+
+    async def astream_events(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Same contract as ``OpenAIAgentClient.astream_events``; fails over before the first event only."""
+        if self.served_by is not None:
+            async for event in self._client(self.served_by).astream_events(**self._request(self.served_by, kwargs)):
+                yield event
+            return
+
+        last_error: Optional[BaseException] = None
+        for target in self._available():
+            start = time.monotonic()
+            stream = self._client(target).astream_events(**self._request(target, kwargs))
+            try:
+                first = await _target_breaker(target).call_async(stream.__anext__)
+            except StopAsyncIteration:
+                self.served_by = target
+                return
+            except Exception as e:
+                await _aclose(stream)
+                self._record_failure(target, e)
+                last_error = e
+                continue
+            self.health.record(target, True, time.monotonic() - start)
+            self.served_by = target
+            yield first
+            async for event in stream:
+                yield event
+            return
+        raise self._exhausted(last_error)
+
+    def build_tool_messages(self, response: Dict[str, Any], tool_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tool-turn messages in the format of the target serving this run."""
+        target = self.served_by or self.targets[0]
+        return self._client(target).build_tool_messages(response, tool_results)
+
+    def _available(self) -> List[ProviderTarget]:
+        """Ordered targets whose breaker is not open."""
+        available = []
+        for target in self.order():
+            if _target_breaker(target).is_available():
+                available.append(target)
+            else:
+                self.failed.append({"target": target.name, "error": "circuit open"})
+        return available
+
+    async def _call(self, target: ProviderTarget, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.monotonic()
+        response = await _target_breaker(target).call_async(
+            self._client(target).arun_agent, **self._request(target, kwargs)
+        )
+        self.health.record(target, True, time.monotonic() - start)
+        return response
+
+    def _client(self, target: ProviderTarget) -> Any:
+        client = self._clients.get(target.name)
+        if client is None:
+            client = self._clients[target.name] = self.client_factory(target)
+        return client
+
+    @staticmethod
+    def _request(target: ProviderTarget, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        return {**kwargs, "model": target.model}
+
+    def _record_failure(self, target: ProviderTarget, error: BaseException) -> None:
+        self.health.record(target, False, None)
+        self.failed.append({"target": target.name, "error": str(error)})
+        MetricsCollector.record_llm_failover(target.name)
+
+    def _exhausted(self, last_error: Optional[BaseException]) -> AgentFactoryError:
+        tried = ", ".join(f"{f['target']} ({f['error']})" for f in self.failed) or "none available"
+        error = AgentFactoryError(f"All provider targets failed: {tried}")
+        error.__cause__ = last_error
+        return error
+
+
+async def _aclose(stream: Any) -> None:
+    """Close an abandoned stream, ignoring errors."""
+    try:
+        await stream.aclose()
+    except Exception:
+        pass
+
+
+# Global router health
+_health: Optional[RouterHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_router_health() -> RouterHealth:
+    """Get the process-wide target statistics."""
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = RouterHealth()
+        return _health
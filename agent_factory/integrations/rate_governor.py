@@ -0,0 +1,418 @@
+"""
+Client-side concurrency and rate governor for LLM provider calls.
+
+Each provider and model gets an :class:`AdaptiveLimiter` that admits a
+request only when it is under its concurrency limit and its requests- and
+tokens-per-minute buckets have room. Requests that cannot start yet wait in
+FIFO order instead of being sent to fail with a 429.
+
+Without configured limits a target is unbounded until the provider answers
+with a 429. From then on the concurrency limit adapts (AIMD): it grows by
+about one slot per window of successful calls and shrinks multiplicatively
+on a 429 (at most once per baseline latency, so one burst of 429s counts
+once). A ``retry-after`` hint on a 429 pauses admission for that key.
+Latency alone never shrinks the limit, since LLM latency mostly tracks
+output length rather than provider load.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from agent_factory.agents.context_packer import TokenCounter
+from agent_factory.integrations.request_policy import is_rate_limited
+from agent_factory.monitoring.metrics import MetricsCollector
+
+
+@dataclass
+class RateLimits:
+    """Limits and adaptation settings for one provider or provider/model."""
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    # None: no concurrency limit until the first 429
+    initial_concurrency: Optional[int] = None
+    min_concurrency: int = 1
+    max_concurrency: Optional[int] = None  # None: the limit may grow without bound
+    decrease_factor: float = 0.5  # limit multiplier on a 429
+
+    @classmethod
+    def from_env(cls) -> "RateLimits":
+        """Build default limits from LLM_* environment variables."""
+        rpm = os.getenv("LLM_REQUESTS_PER_MINUTE")
+        tpm = os.getenv("LLM_TOKENS_PER_MINUTE")
+        initial = os.getenv("LLM_INITIAL_CONCURRENCY")
+        maximum = os.getenv("LLM_MAX_CONCURRENCY")
+        return cls(
+            requests_per_minute=int(rpm) if rpm else None,
+            tokens_per_minute=int(tpm) if tpm else None,
+            initial_concurrency=int(initial) if initial else None,
+            max_concurrency=int(maximum) if maximum else None,
+        )
+
+
+class _TokenBucket:
+    """Per-minute budget refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Waiter:
+    __slots__ = ("loop", "future")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.future: Optional["asyncio.Future[None]"] = None
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class Slot:
+    """
+    Admission to one provider request; use as an async context manager.
+
+    Set ``tokens_used`` before leaving the block so the token budget is
+    corrected from the estimate to the actual usage.
+    """
+
+    def __init__(self, limiter: "AdaptiveLimiter", tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.tokens_used: Optional[int] = None
+        self._start = 0.0
+
+    async def __aenter__(self) -> "Slot":
+        await self.limiter.acquire(self.tokens)
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        cancelled = exc_type is not None and issubclass(exc_type, asyncio.CancelledError)
+        self.limiter.release(
+            self.tokens,
+            # Cancelled calls (timeouts, lost hedges) say nothing about latency
+            latency=None if cancelled else time.monotonic() - self._start,
+            tokens_used=self.tokens_used,
+            error=exc if isinstance(exc, Exception) else None,
+        )
+        return False
+
+
+class AdaptiveLimiter:
+    """
+    Adaptive concurrency limit plus RPM/TPM buckets for one target.
+
+    Example:
+        >>> limiter = get_rate_governor().limiter("openai", "gpt-4o")
+        >>> async with limiter.slot(tokens=1200) as slot:
+        ...     response = await client.arun_agent(...)
+        ...     slot.tokens_used = response["tokens_used"]
+    """
+
+    def __init__(self, key: str, limits: RateLimits):
+        """
+        Initialize limiter.
+
+        Args:
+            key: Target name, e.g. ``"openai:gpt-4o"``
+            limits: Limits and adaptation settings
+        """
+        self.key = key
+        self.limits = limits
+        if limits.initial_concurrency is None:
+            self.limit = math.inf
+        else:
+            self.limit = float(max(limits.min_concurrency, min(limits.initial_concurrency, self._max_limit())))
+        self.in_flight = 0
+        self._rpm = _TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self._tpm = _TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self._waiters: Deque[_Waiter] = deque()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._baseline: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stats = {"admitted": 0, "queued": 0, "rate_limited": 0, "wait_time": 0.0}
+        MetricsCollector.set_llm_concurrency_limit(key, self.limit)
+
+    def slot(self, tokens: int = 0) -> Slot:
+        """Admission context for one request estimated at ``tokens`` tokens."""
+        return Slot(self, tokens)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until a request may start, in FIFO order with other waiters.
+
+        Pair every call with :meth:`release`; :meth:`slot` does this for you.
+
+        Args:
+            tokens: Estimated tokens for the request (prompt plus completion)
+        """
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(loop)
+        queued = False
+        start = time.monotonic()
+
+        try:
+            while True:
+                with self._lock:
+                    at_head = self._waiters[0] is waiter if queued else not self._waiters
+                    delay = self._admission_delay(tokens, time.monotonic()) if at_head else math.inf
+                    if delay == 0:
+                        if queued:
+                            self._waiters.popleft()
+                        self._admit(tokens)
+                        # The next waiter may fit as well
+                        self._wake_head()
+                        break
+                    if not queued:
+                        self._waiters.append(waiter)
+                        self._stats["queued"] += 1
+                        queued = True
+                    waiter.future = loop.create_future()
+                try:
+                    await asyncio.wait_for(waiter.future, None if delay == math.inf else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if queued:
+                with self._lock:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                    self._wake_head()
+            raise
+
+        with self._lock:
+            self._stats["wait_time"] += time.monotonic() - start
+
+    def release(
+        self,
+        tokens: int = 0,
+        latency: Optional[float] = None,
+        tokens_used: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Release an admitted request and adapt the limit from its outcome.
+
+        Args:
+            tokens: Token estimate passed to :meth:`acquire`
+            latency: Call duration in seconds, if it completed
+            tokens_used: Actual tokens used, to correct the TPM budget
+            error: Exception the call raised, if any
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if self._tpm is not None and tokens_used is not None:
+                if tokens_used < tokens:
+                    self._tpm.give(tokens - tokens_used)
+                else:
+                    self._tpm.take(tokens_used - tokens)
+
+            if error is not None and is_rate_limited(error):
+                self._stats["rate_limited"] += 1
+                self._decrease(self.limits.decrease_factor, now)
+                retry_after = _retry_after(error)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+            elif error is None and latency is not None:
+                self._observe(latency, now)
+
+            self._wake_head()
+            limit = self.limit
+        MetricsCollector.set_llm_concurrency_limit(self.key, limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current limit, load and counters."""
+        with self._lock:
+            return {
+                "limit": None if self.limit == math.inf else int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "baseline_latency": self._baseline,
+                **self._stats,
+            }
+
+    def _admission_delay(self, tokens: int, now: float) -> float:
+        """Seconds until a request may start; inf when only a release can free a slot."""
+        if self.limit != math.inf and self.in_flight >= int(self.limit):
+            return math.inf
+        delay = max(0.0, self._blocked_until - now)
+        if self._rpm is not None:
+            delay = max(delay, self._rpm.delay(1, now))
+        if self._tpm is not None and tokens:
+            delay = max(delay, self._tpm.delay(tokens, now))
+        return delay
+
+    def _admit(self, tokens: int) -> None:
+        self.in_flight += 1
+        self._stats["admitted"] += 1
+        if self._rpm is not None:
+            self._rpm.take(1)
+        if self._tpm is not None and tokens:
+            self._tpm.take(tokens)
+
+    def _wake_head(self) -> None:
+        if not self._waiters:
+            return
+        head = self._waiters[0]
+        if head.future is not None:
+            try:
+                head.loop.call_soon_threadsafe(_resolve, head.future)
+            except RuntimeError:
+                # Waiter's loop is closed; it can no longer be admitted
+                self._waiters.popleft()
+                self._wake_head()
+
+    def _max_limit(self) -> float:
+        maximum = self.limits.max_concurrency
+        return math.inf if maximum is None else float(maximum)
+
+    def _observe(self, latency: float, now: float) -> None:
+        """Additive increase after a success; track the baseline latency."""
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Let the baseline drift up slowly so one fast outlier does not pin it
+            self._baseline += (latency - self._baseline) * 0.01
+        self.limit = min(self._max_limit(), self.limit + 1.0 / self.limit)
+
+    def _decrease(self, factor: float, now: float) -> None:
+        """Multiplicative decrease, at most once per baseline latency."""
+        if now - self._last_decrease < (self._baseline or 1.0):
+            return
+        self._last_decrease = now
+        # An unbounded target starts from the concurrency the provider rejected
+        current = self.limit if self.limit != math.inf else float(self.in_flight + 1)
+        self.limit = max(float(self.limits.min_concurrency), current * factor)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Seconds from a ``retry-after`` header on the error or its causes."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                value = headers.get("retry-after")
+                if value is not None:
+                    return float(value)
+            except (TypeError, ValueError):
+                pass
+        error = error.__cause__
+    return None
+
+
+def estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """
+    Estimate prompt plus completion tokens for an ``arun_agent`` request.
+
+    Uses the context packer's count when the context was packed, and the
+    completion budget (``max_tokens``) as the worst case for the output.
+    """
+    context = request.get("context") or {}
+    prompt = context.get("context_tokens") if context.get("packed") else None
+    if prompt is None:
+        counter = TokenCounter(request.get("model") or "gpt-4o")
+        prompt = counter.count(request.get("instructions") or "") + counter.count(request.get("input_text") or "")
+    return int(prompt) + int(request.get("max_tokens") or 0)
+
+
+class RateGovernor:
+    """
+    Registry of adaptive limiters per provider and model.
+
+    Limits are looked up by ``"provider:model"``, then ``"provider"``, then
+    the default.
+
+    Example:
+        >>> governor = get_rate_governor()
+        >>> governor.configure("openai", RateLimits(requests_per_minute=500, tokens_per_minute=200_000))
+    """
+
+    def __init__(self, default: Optional[RateLimits] = None):
+        """
+        Initialize governor.
+
+        Args:
+            default: Limits for targets without their own (defaults to LLM_* env vars)
+        """
+        self.default = default or RateLimits.from_env()
+        self._limits: Dict[str, RateLimits] = {}
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, provider: str, limits: RateLimits, model: Optional[str] = None) -> None:
+        """
+        Set limits for a provider, or for one of its models.
+
+        Existing limiters for matching targets are rebuilt on next use.
+        """
+        name = f"{provider}:{model}" if model else provider
+        with self._lock:
+            self._limits[name] = limits
+            for key in list(self._limiters):
+                if key == name or (model is None and key.startswith(f"{provider}:")):
+                    del self._limiters[key]
+
+    def limiter(self, provider: str, model: str) -> AdaptiveLimiter:
+        """Get the limiter for a provider and model."""
+        key = f"{provider}:{model}"
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limits = self._limits.get(key) or self._limits.get(provider) or self.default
+                limiter = self._limiters[key] = AdaptiveLimiter(key, limits)
+            return limiter
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Stats per target."""
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.key: limiter.get_stats() for limiter in limiters}
+
+
+# Global rate governor
+_governor: Optional[RateGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_rate_governor() -> RateGovernor:
+    """Get the process-wide rate governor."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = RateGovernor()
+        return _governor
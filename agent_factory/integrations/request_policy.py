@@ -0,0 +1,454 @@
+"""
+Retry, deadline and hedging policy for LLM provider calls.
+
+Each attempt runs under its own deadline. Failures classified as transient
+(429, 408/409, 5xx, timeouts and connection errors) are retried with
+exponential backoff and full jitter. With hedging enabled, an attempt that
+is still running after the observed p95 latency for its provider and model
+gets a second, identical request; the first to succeed wins and the other is
+cancelled. This cuts tail latency caused by a few stuck requests at the cost
+of roughly ``1 - quantile`` extra calls.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from agent_factory.monitoring.metrics import MetricsCollector
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+# SDK exception class names for transport-level failures (OpenAI and Anthropic)
+_RETRYABLE_ERROR_NAMES = frozenset({
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "OverloadedError",
+})
+
+
+@dataclass
+class RequestPolicy:
+    """Retry, deadline and hedging settings for provider calls."""
+    max_attempts: int = 4
+    attempt_timeout: Optional[float] = 30.0  # seconds, per attempt
+    queue_timeout: Optional[float] = 60.0  # seconds waiting for rate governor admission
+    backoff_base: float = 0.5  # seconds
+    backoff_max: float = 8.0  # seconds
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_min_delay: float = 0.5  # seconds
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_config(cls, config: Any) -> "RequestPolicy":
+        """
+        Build a policy from an ``AgentConfig``.
+
+        ``retry_attempts`` counts retries after the first attempt and
+        ``timeout`` is the per-attempt deadline.
+        """
+        return cls(
+            max_attempts=1 + max(0, config.retry_attempts),
+            attempt_timeout=float(config.timeout) if config.timeout else None,
+            backoff_base=config.retry_backoff,
+            hedge=config.hedge_requests,
+            hedge_quantile=config.hedge_quantile,
+        )
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter exponential backoff before the given retry (1-based)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (retry - 1))))
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """Extract an HTTP status code from an SDK or HTTP exception, if any."""
+    for attr in ("status_code", "status", "http_status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Classify an error as transient.
+
+    Follows the ``__cause__`` chain, so SDK errors re-raised by a client
+    wrapper are classified by their original type.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+            return True
+        status = status_code_of(error)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        if type(error).__name__ in _RETRYABLE_ERROR_NAMES:
+            return True
+        error = error.__cause__
+    return False
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether an error (or its cause) is a provider rate-limit response."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if status_code_of(error) == 429 or type(error).__name__ == "RateLimitError":
+            return True
+        error = error.__cause__
+    return False
+
+
+class LatencyTracker:
+    """
+    Recent successful call latencies per provider and model.
+
+    Example:
+        >>> tracker = get_latency_tracker()
+        >>> tracker.record("openai:gpt-4o", 1.8)
+        >>> tracker.quantile("openai:gpt-4o", 0.95)
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of recent samples kept per key
+        """
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, latency: float) -> None:
+        """Record a successful call's latency in seconds."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def count(self, key: str) -> int:
+        """Number of samples held for a key."""
+        with self._lock:
+            return len(self._samples.get(key, ()))
+
+    def quantile(self, key: str, q: float) -> Optional[float]:
+        """Latency quantile for a key, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Sample counts and p50/p95/p99 per key."""
+        with self._lock:
+            keys = list(self._samples)
+        return {
+            key: {
+                "samples": self.count(key),
+                "p50": self.quantile(key, 0.50),
+                "p95": self.quantile(key, 0.95),
+                "p99": self.quantile(key, 0.99),
+            }
+            for key in keys
+        }
+
+
+async def call_with_policy(
+    func: Callable[..., Awaitable[T]],
+    policy: RequestPolicy,
+    key: str,
+    tracker: Optional[LatencyTracker] = None,
+    admit: Optional[Callable[[], Any]] = None,
+) -> T:
+    """
+    Call ``func`` under a request policy.
+
+    With ``admit``, every request (hedges included) first enters the
+    admission slot it returns. Waiting for admission is bounded by the
+    policy's ``queue_timeout``; the attempt deadline starts once admitted.
+
+    Args:
+        func: Coroutine function making one provider request; called with
+            no arguments, or with the admission slot when ``admit`` is given
+        policy: Request policy
+        key: Latency key, e.g. ``"openai:gpt-4o"``
+        tracker: Latency tracker (defaults to the shared tracker)
+        admit: Optional factory of admission slots (async context managers),
+            e.g. ``AdaptiveLimiter.slot``
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        Exception: The last error if it is not retryable or attempts run out
+    """
+    tracker = tracker or get_latency_tracker()
+    attempts = max(1, policy.max_attempts)
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return await _attempt(func, policy, key, tracker, admit)
+        except Exception as e:
+            if attempt >= attempts or not is_retryable(e):
+                raise
+            MetricsCollector.record_llm_retry(key, _reason(e))
+            await asyncio.sleep(policy.backoff(attempt))
+
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+async def _attempt(
+    func: Callable[..., Awaitable[T]],
+    policy: RequestPolicy,
+    key: str,
+    tracker: LatencyTracker,
+    admit: Optional[Callable[[], Any]],
+) -> T:
+    """One attempt, hedged when the policy allows."""
+    hedge_delay = _hedge_delay(policy, key, tracker)
+
+    def request() -> Awaitable[T]:
+        return _request(func, policy, key, tracker, admit)
+
+    if hedge_delay is None:
+        return await request()
+    return await _hedged(request, hedge_delay, key)
+
+
+async def _request(
+    func: Callable[..., Awaitable[T]],
+    policy: RequestPolicy,
+    key: str,
+    tracker: LatencyTracker,
+    admit: Optional[Callable[[], Any]],
+) -> T:
+    """One request: admission within the queue timeout, then the call within the attempt deadline."""
+    if admit is None:
+        start = time.monotonic()
+        result = await asyncio.wait_for(func(), timeout=policy.attempt_timeout)
+        tracker.record(key, time.monotonic() - start)
+        return result
+
+    slot = admit()
+    await asyncio.wait_for(slot.__aenter__(), timeout=policy.queue_timeout)
+    start = time.monotonic()
+    try:
+        result = await asyncio.wait_for(func(slot), timeout=policy.attempt_timeout)
+    except BaseException as e:
+        await slot.__aexit__(type(e), e, e.__traceback__)
+        raise
+    await slot.__aexit__(None, None, None)
+    tracker.record(key, time.monotonic() - start)
+    return result
+
+
+def _hedge_delay(policy: RequestPolicy, key: str, tracker: LatencyTracker) -> Optional[float]:
+    """Delay before hedging, or None when hedging is off or there is too little data."""
+    if not policy.hedge or tracker.count(key) < policy.hedge_min_samples:
+        return None
+    threshold = tracker.quantile(key, policy.hedge_quantile)
+    if threshold is None:
+        return None
+    delay = max(policy.hedge_min_delay, threshold)
+    if policy.attempt_timeout is not None and delay >= policy.attempt_timeout:
+        return None
+    return delay
+
+
+async def _hedged(func: Callable[[], Awaitable[T]], delay: float, key: str) -> T:
+    """Run ``func``; if it is slower than ``delay``, race it against a second call."""
+    primary = asyncio.ensure_future(func())
+    tasks: List["asyncio.Future[T]"] = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            MetricsCollector.record_llm_hedge(key)
+            tasks.append(asyncio.ensure_future(func()))
+
+        error: Optional[BaseException] = None
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def _reason(error: BaseException) -> str:
+    """Short label for why a call was retried."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    status = status_code_of(error) or status_code_of(error.__cause__ or error)
+    return str(status) if status is not None else type(error).__name__
+
+
+class ResilientAgentClient:
+    """
+    Provider client wrapper that applies a :class:`RequestPolicy` to model calls.
+
+    Streams are retried only if they fail before the first event, since a
+    partially delivered stream cannot be replayed, and are never hedged.
+    With a rate governor, every request (including hedges) first waits for
+    admission from the target's limiter. That wait is bounded by the
+    policy's ``queue_timeout``; the attempt deadline only starts once the
+    request is admitted.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        policy: RequestPolicy,
+        provider: str = "openai",
+        tracker: Optional[LatencyTracker] = None,
+        governor: Optional[Any] = None,
+    ):
+        """
+        Initialize resilient client.
+
+        Args:
+            client: Provider client (``OpenAIAgentClient`` or ``AnthropicAgentClient``)
+            policy: Request policy
+            provider: Provider name used in latency keys
+            tracker: Latency tracker (defaults to the shared tracker)
+            governor: ``RateGovernor`` admitting requests (optional)
+        """
+        self.client = client
+        self.policy = policy
+        self.provider = provider
+        self.tracker = tracker or get_latency_tracker()
+        self.governor = governor
+
+    def __getattr__(self, name: str) -> Any:
+        # Request builders and other helpers come from the wrapped client
+        return getattr(self.client, name)
+
+    async def arun_agent(self, **kwargs: Any) -> Dict[str, Any]:
+        """Same contract as the wrapped client's ``arun_agent``."""
+        key = f"{self.provider}:{kwargs.get('model', '')}"
+        if self.governor is None:
+            return await call_with_policy(lambda: self.client.arun_agent(**kwargs), self.policy, key, self.tracker)
+        return await call_with_policy(
+            lambda slot: self._call(slot, kwargs), self.policy, key, self.tracker, admit=lambda: self._slot(kwargs),
+        )
+
+    async def _call(self, slot: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """One admitted request; reports its token usage to the slot."""
+        response = await self.client.arun_agent(**kwargs)
+        slot.tokens_used = response.get("tokens_used")
+        return response
+
+    def _slot(self, kwargs: Dict[str, Any]) -> Any:
+        """Governor admission slot for a request."""
+        from agent_factory.integrations.rate_governor import estimate_request_tokens
+
+        limiter = self.governor.limiter(self.provider, kwargs.get("model", ""))
+        return limiter.slot(estimate_request_tokens(kwargs))
+
+    async def astream_events(self, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Same contract as the wrapped client's ``astream_events``."""
+        key = f"{self.provider}:{kwargs.get('model', '')}"
+        attempts = max(1, self.policy.max_attempts)
+
+        for attempt in range(1, attempts + 1):
+            stream = self._stream(kwargs)
+            try:
+                first = await stream.__anext__()
+            except StopAsyncIteration:
+                return
+            except Exception as e:
+                await _aclose(stream)
+                if attempt >= attempts or not is_retryable(e):
+                    raise
+                MetricsCollector.record_llm_retry(key, _reason(e))
+                await asyncio.sleep(self.policy.backoff(attempt))
+                continue
+
+            yield first
+            async for event in stream:
+                yield event
+            return
+
+    async def _stream(self, kwargs: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        One stream, holding a governor slot until it ends when configured.
+
+        Admission is bounded by the queue timeout and the first event by the
+        attempt deadline.
+        """
+        slot = None
+        if self.governor is not None:
+            slot = self._slot(kwargs)
+            await asyncio.wait_for(slot.__aenter__(), timeout=self.policy.queue_timeout)
+        try:
+            events = self.client.astream_events(**kwargs)
+            try:
+                event = await asyncio.wait_for(events.__anext__(), timeout=self.policy.attempt_timeout)
+            except StopAsyncIteration:
+                return
+            while True:
+                if slot is not None and event.get("type") == "response":
+                    slot.tokens_used = event.get("tokens_used")
+                yield event
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    return
+        except BaseException as e:
+            if slot is not None:
+                await slot.__aexit__(type(e), e, e.__traceback__)
+                slot = None
+            raise
+        finally:
+            if slot is not None:
+                await slot.__aexit__(None, None, None)
+
+    def build_tool_messages(self, response: Dict[str, Any], tool_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Delegate to the wrapped client."""
+        return self.client.build_tool_messages(response, tool_results)
+
+
+async def _aclose(stream: Any) -> None:
+    """Close an async generator, ignoring errors."""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is not None:
+        try:
+            await aclose()
+        except Exception:
+            pass
+
+
+# Global latency tracker
+_latency_tracker: Optional[LatencyTracker] = None
+_latency_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the process-wide latency tracker."""
+    global _latency_tracker
+    with _latency_tracker_lock:
+        if _latency_tracker is None:
+            _latency_tracker = LatencyTracker()
+        return _latency_tracker
@@ -67,6 +67,53 @@ cache_misses_total = Counter(
     ["cache_type"]
 )
 
+agent_runs_coalesced_total = Counter(
+    "agent_runs_coalesced_total",
+    "Agent runs served by an identical in-flight run",
+    ["agent_id"]
+)
+
+llm_request_retries_total = Counter(
+    "llm_request_retries_total",
+    "LLM provider calls retried after a transient failure",
+    ["target", "reason"]
+)
+
+llm_request_hedges_total = Counter(
+    "llm_request_hedges_total",
+    "Hedged LLM provider calls sent after the latency threshold",
+    ["target"]
+)
+
+llm_failovers_total = Counter(
+    "llm_failovers_total",
+    "LLM provider targets that failed and were skipped for another target",
+    ["target"]
+)
+
+llm_concurrency_limit = Gauge(
+    "llm_concurrency_limit",
+    "Adaptive concurrency limit for LLM provider calls",
+    ["target"]
+)
+
+job_queue_depth = Gauge(
+    "job_queue_depth",
+    "Jobs waiting in the job queue",
+)
+
+worker_active_jobs = Gauge(
+    "worker_active_jobs",
+    "Jobs being processed by a worker pool",
+    ["pool"]
+)
+
+worker_jobs_total = Counter(
+    "worker_jobs_total",
+    "Jobs finished by a worker pool",
+    ["pool", "status"]
+)
+
 
 class MetricsCollector:
     """Metrics collector for Agent Factory Platform."""
@@ -93,6 +140,31 @@ class MetricsCollector:
         """Record cache miss."""
         cache_misses_total.labels(cache_type=cache_type).inc()
     
+    @staticmethod
+    def record_coalesced_run(agent_id: str):
+        """Record an agent run that shared an in-flight run's result."""
+        agent_runs_coalesced_total.labels(agent_id=agent_id).inc()
+    
+    @staticmethod
+    def record_llm_retry(target: str, reason: str):
+        """Record a retried LLM provider call."""
+        llm_request_retries_total.labels(target=target, reason=reason).inc()
+    
+    @staticmethod
+    def record_llm_hedge(target: str):
+        """Record a hedged LLM provider call."""
+        llm_request_hedges_total.labels(target=target).inc()
+    
+    @staticmethod
+    def record_llm_failover(target: str):
+        """Record a failover away from an LLM provider target."""
+        llm_failovers_total.labels(target=target).inc()
+    
+    @staticmethod
+    def set_llm_concurrency_limit(target: str, limit: float):
+        """Set the current adaptive concurrency limit for an LLM target."""
+        llm_concurrency_limit.labels(target=target).set(limit)
+    
     @staticmethod
     def set_active_sessions(count: int):
         """Set active sessions count."""
@@ -102,6 +174,21 @@ class MetricsCollector:
     def set_active_executions(count: int):
         """Set active executions count."""
         active_executions.set(count)
+    
+    @staticmethod
+    def set_job_queue_depth(count: int):
+        """Set the number of queued jobs."""
+        job_queue_depth.set(count)
+    
+    @staticmethod
+    def set_worker_active_jobs(pool: str, count: int):
+        """Set the number of jobs a worker pool is processing."""
+        worker_active_jobs.labels(pool=pool).set(count)
+    
+    @staticmethod
+    def record_worker_job(pool: str, status: str):
+        """Record a job finished, failed or re-queued by a worker pool."""
+        worker_jobs_total.labels(pool=pool, status=status).inc()
 
 
 class MetricsMiddleware(BaseHTTPMiddleware):
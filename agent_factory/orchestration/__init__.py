@@ -3,7 +3,7 @@ Multi-agent orchestration - Coordinate multiple agents with routing.
 """
 
 from agent_factory.orchestration.graph import AgentGraph, AgentNode, RoutingEdge
-from agent_factory.orchestration.router import AgentRouter
+from agent_factory.orchestration.router import AgentRouter, EmbeddingRouter
 from agent_factory.orchestration.executor import OrchestrationExecutor
 
 __all__ = [
@@ -11,5 +11,6 @@ __all__ = [
     "AgentNode",
     "RoutingEdge",
     "AgentRouter",
+    "EmbeddingRouter",
     "OrchestrationExecutor",
 ]
@@ -2,25 +2,49 @@
 Multi-agent orchestration executor.
 """
 
-from typing import Dict, Any, Optional
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional
 
-from agent_factory.orchestration.graph import AgentGraph
+from agent_factory.orchestration.graph import AgentGraph, AgentNode
 from agent_factory.orchestration.router import AgentRouter
 from agent_factory.promptlog import SQLiteStorage, Run
 from agent_factory.promptlog.model import Run as RunModel
+from agent_factory.utils.async_utils import run_in_thread, run_sync
+
+
+@dataclass
+class _RunState:
+    """Shared by all branches of one orchestration run."""
+    run_id: str
+    max_steps: int
+    steps: int = 0
+    path: List[str] = field(default_factory=list)
 
 
 class OrchestrationExecutor:
-    """Execute multi-agent orchestration flows."""
+    """
+    Execute multi-agent orchestration flows.
     
-    def __init__(self, storage: Optional[SQLiteStorage] = None):
+    Each hop runs the current agent on the message text (the previous
+    agent's output, or the ``input`` of the initial message) and asks the
+    router where to go next. When the router returns several agents, they
+    run concurrently as branches until they reach the fan-out node's join
+    node, which then runs once on their gathered outputs.
+    """
+    
+    def __init__(self, storage: Optional[SQLiteStorage] = None, router: Optional[AgentRouter] = None):
         """
         Initialize executor.
         
         Args:
             storage: Optional prompt log storage
+            router: Optional router (defaults to condition-based routing)
         """
-        self.router = AgentRouter()
+        self.router = router or AgentRouter()
         self.storage = storage
     
     def execute(
@@ -32,48 +56,140 @@ class OrchestrationExecutor:
         """
         Execute multi-agent flow.
         
+        Synchronous wrapper around :meth:`aexecute`.
+        
         Args:
             graph: Agent graph
             inputs: Initial inputs
-            max_steps: Maximum number of routing steps
+            max_steps: Maximum number of agent runs
         
         Returns:
             Final outputs
         """
-        current_agent_id = graph.entry_point
-        current_message = inputs
-        step_count = 0
+        return run_sync(self.aexecute(graph, inputs, max_steps=max_steps))
+    
+    async def aexecute(
+        self,
+        graph: AgentGraph,
+        inputs: Dict[str, Any],
+        max_steps: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Execute multi-agent flow on the running event loop.
+        
+        Args:
+            graph: Agent graph
+            inputs: Initial inputs
+            max_steps: Maximum number of agent runs, across all branches
         
-        while current_agent_id and step_count < max_steps:
-            # Get current agent
-            node = graph.get_node(current_agent_id)
-            if not node:
+        Returns:
+            Final message: ``output``, ``agent_id`` and ``status`` of the last
+            agent (``branches`` when the flow ended in parallel branches),
+            plus ``path``, the agents run in completion order
+        """
+        state = _RunState(run_id=str(uuid.uuid4()), max_steps=max_steps)
+        message = await self._run_chain(graph, graph.entry_point, dict(inputs), None, state)
+        return {**message, "path": state.path}
+    
+    async def _run_chain(
+        self,
+        graph: AgentGraph,
+        agent_id: Optional[str],
+        message: Dict[str, Any],
+        stop_at: Optional[str],
+        state: _RunState,
+    ) -> Dict[str, Any]:
+        """Follow routing from ``agent_id`` until the flow ends or reaches ``stop_at``."""
+        current = agent_id
+        while current is not None and current != stop_at:
+            node = graph.get_node(current)
+            if node is None or state.steps >= state.max_steps:
                 break
             
-            # Execute agent (placeholder - would use actual runtime)
-            # result = node.agent.run(current_message)
-            # For now, placeholder
-            result = {"output": "placeholder"}
-            
-            # Log execution
-            if self.storage:
-                run = RunModel(
-                    run_id=f"orchestration-{step_count}",
-                    agent_id=current_agent_id,
-                    inputs=current_message,
-                    outputs=result,
-                    status="success",
-                )
-                self.storage.save_run(run)
-            
-            # Route to next agent
-            next_agent_id = self.router.route(result, current_agent_id, graph)
-            
-            if not next_agent_id:
+            message = await self._run_node(node, message, state)
+            if message["status"] == "error":
                 break
             
-            current_agent_id = next_agent_id
-            current_message = result
-            step_count += 1
+            next_agents = await self.router.anext_agents(message, current, graph)
+            if len(next_agents) > 1:
+                # Scatter the branches, then gather them at the join node
+                join = graph.index.join_for(current)
+                branches = await asyncio.gather(*(
+                    self._run_chain(graph, target, message, join, state) for target in next_agents
+                ))
+                message = self._gather(next_agents, branches)
+                if message["status"] == "error":
+                    break
+                current = join
+            else:
+                current = next_agents[0] if next_agents else None
+        
+        return message
+    
+    async def _run_node(self, node: AgentNode, message: Dict[str, Any], state: _RunState) -> Dict[str, Any]:
+        """Run one agent on the message and return its output message."""
+        state.steps += 1
+        step = state.steps
+        input_text = self._message_text(message)
+        start = time.time()
+        tokens_used = 0
+        
+        try:
+            agent = node.agent
+            if hasattr(agent, "arun"):
+                result = await agent.arun(input_text)
+            else:
+                result = await run_in_thread(agent.run, input_text)
+            tokens_used = result.tokens_used
+            output = {
+                "agent_id": node.agent_id,
+                "output": result.output,
+                "status": result.status.value,
+            }
+            if result.error:
+                output["error"] = result.error
+        except Exception as e:
+            output = {"agent_id": node.agent_id, "output": "", "status": "error", "error": str(e)}
+        state.path.append(node.agent_id)
         
-        return current_message
+        # Log execution
+        if self.storage:
+            run = RunModel(
+                run_id=f"orchestration-{state.run_id}-{step}",
+                agent_id=node.agent_id,
+                inputs={"input": input_text},
+                outputs={"output": output["output"]},
+                status="error" if output["status"] == "error" else "success",
+                execution_time=time.time() - start,
+                tokens_used=tokens_used,
+                metadata={"error": output["error"]} if "error" in output else {},
+            )
+            await run_in_thread(self.storage.save_run, run)
+        
+        return output
+    
+    @staticmethod
+    def _gather(targets: List[str], branches: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine branch results into the join node's input message."""
+        errors = [branch for branch in branches if branch.get("status") == "error"]
+        message: Dict[str, Any] = {
+            "output": "\n\n".join(
+                f"[{branch.get('agent_id', target)}]\n{branch.get('output', '')}"
+                for target, branch in zip(targets, branches)
+            ),
+            "branches": {target: branch.get("output") for target, branch in zip(targets, branches)},
+            "status": "error" if errors else "completed",
+        }
+        if errors:
+            message["error"] = "; ".join(
+                f"{branch.get('agent_id')}: {branch.get('error')}" for branch in errors
+            )
+        return message
+    
+    @staticmethod
+    def _message_text(message: Dict[str, Any]) -> str:
+        """Text an agent receives for a message."""
+        for key in ("output", "input"):
+            if key in message:
+                return str(message[key])
+        return json.dumps(message, default=str)
@@ -2,10 +2,13 @@
 Agent graph model for multi-agent orchestration.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from agent_factory.agents.agent import Agent
+from agent_factory.core.exceptions import WorkflowError
+from agent_factory.workflows.conditions import CompiledCondition, compile_condition
 
 
 @dataclass
@@ -14,6 +17,7 @@ class AgentNode:
     agent_id: str
     agent: Agent
     metadata: Dict[str, Any] = field(default_factory=dict)
+    join: Optional[str] = None  # Where parallel branches leaving this node meet; inferred if None
 
 
 @dataclass
@@ -23,6 +27,112 @@ class RoutingEdge:
     to_agent: str
     condition: Optional[str] = None  # Expression for conditional routing
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _compiled: Optional[CompiledCondition] = field(default=None, init=False, repr=False, compare=False)
+    
+    def evaluate(self, context: Dict[str, Any]) -> bool:
+        """
+        Evaluate the edge condition against a message context.
+        
+        Unconditional edges always hold. The expression is compiled on
+        first use and recompiled only if it changes.
+        
+        Args:
+            context: Message context (e.g. ``output`` and ``agent_id``)
+        
+        Returns:
+            Whether the edge can be taken
+        """
+        if not self.condition:
+            return True
+        compiled = self._compiled
+        if compiled is None or compiled.expression != self.condition:
+            compiled = self._compiled = compile_condition(self.condition)
+        return compiled.evaluate(context)
+
+
+class GraphIndex:
+    """Node, adjacency and join lookups for one version of an agent graph."""
+    
+    def __init__(self, graph: "AgentGraph"):
+        """
+        Build the index.
+        
+        Args:
+            graph: Agent graph
+        
+        Raises:
+            WorkflowError: If node IDs repeat or an edge condition is invalid
+        """
+        self.nodes: Dict[str, AgentNode] = {}
+        for node in graph.nodes:
+            if node.agent_id in self.nodes:
+                raise WorkflowError(f"Duplicate agent node: {node.agent_id}")
+            self.nodes[node.agent_id] = node
+        
+        outgoing: Dict[str, List[RoutingEdge]] = {}
+        for edge in graph.edges:
+            if edge.condition:
+                try:
+                    edge._compiled = compile_condition(edge.condition)
+                except ValueError as e:
+                    raise WorkflowError(
+                        f"Invalid condition on edge {edge.from_agent} -> {edge.to_agent}: {e}"
+                    )
+            outgoing.setdefault(edge.from_agent, []).append(edge)
+        
+        self.outgoing: Dict[str, Tuple[RoutingEdge, ...]] = {
+            agent_id: tuple(edges) for agent_id, edges in outgoing.items()
+        }
+        self.conditional: Dict[str, Tuple[RoutingEdge, ...]] = {
+            agent_id: tuple(edge for edge in edges if edge.condition)
+            for agent_id, edges in self.outgoing.items()
+        }
+        self.unconditional: Dict[str, Tuple[str, ...]] = {
+            agent_id: tuple(edge.to_agent for edge in edges if not edge.condition)
+            for agent_id, edges in self.outgoing.items()
+        }
+        self._joins: Dict[str, Optional[str]] = {}
+        self.signature = graph._signature()
+    
+    def join_for(self, agent_id: str) -> Optional[str]:
+        """
+        Node where the parallel branches leaving ``agent_id`` meet.
+        
+        Uses the node's ``join`` when set; otherwise the nearest node
+        reachable from every branch. None means the branches run to their
+        ends and are gathered into the final result.
+        """
+        if agent_id not in self._joins:
+            node = self.nodes.get(agent_id)
+            if node is not None and node.join:
+                self._joins[agent_id] = node.join
+            else:
+                self._joins[agent_id] = self._nearest_common(self.unconditional.get(agent_id, ()))
+        return self._joins[agent_id]
+    
+    def _nearest_common(self, starts: Tuple[str, ...]) -> Optional[str]:
+        distances = [self._distances(start) for start in starts]
+        if not distances:
+            return None
+        common = set(distances[0]).intersection(*distances[1:]) - set(starts)
+        if not common:
+            return None
+        order = {agent_id: position for position, agent_id in enumerate(self.nodes)}
+        return min(
+            common,
+            key=lambda agent_id: (max(d[agent_id] for d in distances), order.get(agent_id, len(order))),
+        )
+    
+    def _distances(self, start: str) -> Dict[str, int]:
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for edge in self.outgoing.get(current, ()):
+                if edge.to_agent not in distances:
+                    distances[edge.to_agent] = distances[current] + 1
+                    queue.append(edge.to_agent)
+        return distances
 
 
 @dataclass
@@ -30,6 +140,9 @@ class AgentGraph:
     """
     Graph of agents with routing edges.
     
+    Lookups go through an index of nodes and outgoing edges that is built
+    on first use and rebuilt when nodes or edges are added or replaced.
+    
     Example:
         >>> graph = AgentGraph(
         ...     nodes=[
@@ -45,14 +158,34 @@ class AgentGraph:
     nodes: List[AgentNode]
     edges: List[RoutingEdge]
     entry_point: str  # Starting agent ID
+    _index: Optional[GraphIndex] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def index(self) -> GraphIndex:
+        """Index for the current nodes and edges, built on first use."""
+        index = self._index
+        if index is None or index.signature != self._signature():
+            index = self._index = GraphIndex(self)
+        return index
+    
+    def _signature(self) -> Tuple[int, int, int, int]:
+        # Cheap change detection: appending, removing or replacing the lists
+        return (id(self.nodes), len(self.nodes), id(self.edges), len(self.edges))
+    
+    def add_node(self, node: AgentNode) -> None:
+        """Add a node to the graph."""
+        self.nodes.append(node)
+        self._index = None
+    
+    def add_edge(self, edge: RoutingEdge) -> None:
+        """Add an edge to the graph."""
+        self.edges.append(edge)
+        self._index = None
     
     def get_node(self, agent_id: str) -> Optional[AgentNode]:
         """Get node by agent ID."""
-        for node in self.nodes:
-            if node.agent_id == agent_id:
-                return node
-        return None
+        return self.index.nodes.get(agent_id)
     
     def get_outgoing_edges(self, agent_id: str) -> List[RoutingEdge]:
         """Get all outgoing edges from an agent."""
-        return [edge for edge in self.edges if edge.from_agent == agent_id]
+        return list(self.index.outgoing.get(agent_id, ()))
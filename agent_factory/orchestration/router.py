@@ -2,13 +2,60 @@
 Message routing logic for multi-agent orchestration.
 """
 
-from typing import Dict, Any, Optional
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 
-from agent_factory.orchestration.graph import AgentGraph, RoutingEdge
+from agent_factory.cache.semantic_cache import Embedder, HashingEmbedder
+from agent_factory.orchestration.graph import AgentGraph, AgentNode, RoutingEdge
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
 
 
 class AgentRouter:
-    """Route messages between agents in a graph."""
+    """
+    Route messages between agents in a graph.
+    
+    Conditional edges are checked in declaration order and the first whose
+    condition holds for the message is taken. If none holds, every
+    unconditional edge is taken; several of them fan out in parallel.
+    """
+    
+    def next_agents(
+        self,
+        message: Dict[str, Any],
+        current_agent_id: str,
+        graph: AgentGraph,
+    ) -> List[str]:
+        """
+        Determine the agents to route to.
+        
+        Args:
+            message: Current message/context
+            current_agent_id: Current agent ID
+            graph: Agent graph
+        
+        Returns:
+            Next agent IDs; empty if routing should stop
+        """
+        index = graph.index
+        for edge in index.conditional.get(current_agent_id, ()):
+            if edge.evaluate(message):
+                return [edge.to_agent]
+        return list(index.unconditional.get(current_agent_id, ()))
+    
+    async def anext_agents(
+        self,
+        message: Dict[str, Any],
+        current_agent_id: str,
+        graph: AgentGraph,
+    ) -> List[str]:
+        """Async form of :meth:`next_agents`, used by the executor."""
+        return self.next_agents(message, current_agent_id, graph)
     
     def route(
         self,
@@ -27,19 +74,203 @@ class AgentRouter:
         Returns:
             Next agent ID, or None if routing should stop
         """
-        outgoing_edges = graph.get_outgoing_edges(current_agent_id)
+        next_agents = self.next_agents(message, current_agent_id, graph)
+        return next_agents[0] if next_agents else None
+
+
+class EmbeddingRouter(AgentRouter):
+    """
+    Route to the candidate agent whose description is closest to the message.
+    
+    Conditional edges are checked first, as with :class:`AgentRouter`. When
+    a node has several unconditional edges, one target is chosen instead of
+    fanning out to all of them: the message is embedded locally and compared
+    with each candidate's ``metadata["description"]`` and
+    ``metadata["examples"]`` (falling back to the agent's name and
+    instructions). Candidate vectors are embedded once per set of candidates
+    and kept as a matrix, so a routing decision costs one embedding and one
+    matrix-vector product.
+    
+    When the two best scores are within ``margin`` and a ``fallback_agent``
+    is set, that agent picks the target instead (asynchronous path only).
+    Nodes with ``metadata["routing"] == "parallel"`` keep scatter-gather.
+    
+    Example:
+        >>> router = EmbeddingRouter(margin=0.05, fallback_agent=triage_llm)
+        >>> executor = OrchestrationExecutor(router=router)
+    """
+    
+    def __init__(
+        self,
+        embedder: Optional[Embedder] = None,
+        margin: float = 0.05,
+        fallback_agent: Optional[Any] = None,
+        max_cached_matrices: int = 256,
+    ):
+        """
+        Initialize embedding router.
+        
+        Args:
+            embedder: Text embedder (default: HashingEmbedder)
+            margin: Score gap between the two best candidates below which
+                the fallback agent decides
+            fallback_agent: Optional agent asked to choose between close candidates
+            max_cached_matrices: Number of candidate sets whose embeddings are kept
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.margin = margin
+        self.fallback_agent = fallback_agent
+        self.max_cached_matrices = max_cached_matrices
+        self._matrices: "OrderedDict[Tuple[Any, ...], Tuple[Any, List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.decisions = 0
+        self.fallbacks = 0
+    
+    def next_agents(
+        self,
+        message: Dict[str, Any],
+        current_agent_id: str,
+        graph: AgentGraph,
+    ) -> List[str]:
+        """Determine the agents to route to by similarity only."""
+        candidates = super().next_agents(message, current_agent_id, graph)
+        if not self._should_choose(candidates, current_agent_id, graph):
+            return candidates
+        ranking = self.rank(self._message_text(message), candidates, graph)
+        self.decisions += 1
+        return [ranking[0][0]]
+    
+    async def anext_agents(
+        self,
+        message: Dict[str, Any],
+        current_agent_id: str,
+        graph: AgentGraph,
+    ) -> List[str]:
+        """Determine the agents to route to, asking the fallback agent on close calls."""
+        candidates = super().next_agents(message, current_agent_id, graph)
+        if not self._should_choose(candidates, current_agent_id, graph):
+            return candidates
+        
+        text = self._message_text(message)
+        ranking = self.rank(text, candidates, graph)
+        self.decisions += 1
+        if self.fallback_agent is not None and ranking[0][1] - ranking[1][1] < self.margin:
+            self.fallbacks += 1
+            choice = await self._ask_fallback(text, [agent_id for agent_id, _ in ranking], graph)
+            if choice is not None:
+                return [choice]
+        return [ranking[0][0]]
+    
+    def rank(self, text: str, candidates: Sequence[str], graph: AgentGraph) -> List[Tuple[str, float]]:
+        """
+        Score candidates against a message, best first.
         
-        if not outgoing_edges:
+        Args:
+            text: Message text
+            candidates: Candidate agent IDs
+            graph: Agent graph
+        
+        Returns:
+            (agent ID, cosine similarity) pairs; a candidate's score is its
+            best-matching description or example
+        """
+        matrix, owners = self._matrix(candidates, graph)
+        vector = self.embedder.embed(text)
+        
+        best = [float("-inf")] * len(candidates)
+        if np is not None:
+            scores = matrix @ np.asarray(vector, dtype=np.float32)
+            for row, owner in enumerate(owners):
+                best[owner] = max(best[owner], float(scores[row]))
+        else:
+            for row, owner in enumerate(owners):
+                score = sum(a * b for a, b in zip(matrix[row], vector))
+                best[owner] = max(best[owner], score)
+        
+        return sorted(zip(candidates, best), key=lambda item: item[1], reverse=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing statistics."""
+        with self._lock:
+            cached = len(self._matrices)
+        return {"decisions": self.decisions, "fallbacks": self.fallbacks, "cached_matrices": cached}
+    
+    @staticmethod
+    def _should_choose(candidates: List[str], current_agent_id: str, graph: AgentGraph) -> bool:
+        if len(candidates) < 2:
+            return False
+        node = graph.get_node(current_agent_id)
+        return not (node is not None and node.metadata.get("routing") == "parallel")
+    
+    def _matrix(self, candidates: Sequence[str], graph: AgentGraph) -> Tuple[Any, List[int]]:
+        """Embedding matrix of the candidates' texts and the candidate each row belongs to."""
+        texts = [self._candidate_texts(graph.get_node(agent_id)) for agent_id in candidates]
+        key = tuple((agent_id, tuple(agent_texts)) for agent_id, agent_texts in zip(candidates, texts))
+        with self._lock:
+            cached = self._matrices.get(key)
+            if cached is not None:
+                self._matrices.move_to_end(key)
+                return cached
+        
+        rows: List[List[float]] = []
+        owners: List[int] = []
+        for owner, agent_texts in enumerate(texts):
+            for text in agent_texts:
+                rows.append(self.embedder.embed(text))
+                owners.append(owner)
+        matrix = np.asarray(rows, dtype=np.float32) if np is not None else rows
+        
+        with self._lock:
+            self._matrices[key] = (matrix, owners)
+            while len(self._matrices) > self.max_cached_matrices:
+                self._matrices.popitem(last=False)
+        return matrix, owners
+    
+    @staticmethod
+    def _candidate_texts(node: Optional[AgentNode]) -> List[str]:
+        """Texts describing what a candidate agent handles."""
+        if node is None:
+            return [""]
+        texts: List[str] = []
+        if node.metadata.get("description"):
+            texts.append(str(node.metadata["description"]))
+        texts.extend(str(example) for example in node.metadata.get("examples", []))
+        if not texts:
+            agent = node.agent
+            texts.append(f"{getattr(agent, 'name', node.agent_id)}. {getattr(agent, 'instructions', '')}")
+        return texts
+    
+    async def _ask_fallback(self, text: str, candidates: List[str], graph: AgentGraph) -> Optional[str]:
+        """Ask the fallback agent to choose; None if its answer names no candidate."""
+        lines = [
+            f"- {agent_id}: {self._candidate_texts(graph.get_node(agent_id))[0]}"
+            for agent_id in candidates
+        ]
+        prompt = (
+            "Choose the agent best suited to handle the message. "
+            "Reply with the agent ID only.\n\n"
+            "Agents:\n" + "\n".join(lines) + f"\n\nMessage:\n{text}"
+        )
+        try:
+            result = await self.fallback_agent.arun(prompt)
+        except Exception:
             return None
         
-        # Simple routing: take first edge if no conditions
-        # In production, would evaluate conditions
-        for edge in outgoing_edges:
-            if not edge.condition:
-                return edge.to_agent
-            
-            # TODO: Evaluate condition expression
-            # For now, return first edge
-            return edge.to_agent
-        
-        return None
+        answer = (result.output or "").strip().strip("`'\".").strip()
+        if answer in candidates:
+            return answer
+        # Otherwise the candidate named earliest in the answer
+        found = [
+            (match.start(), agent_id)
+            for agent_id in candidates
+            for match in [re.search(rf"(?<![\w-]){re.escape(agent_id)}(?![\w-])", answer)]
+            if match
+        ]
+        return min(found)[1] if found else None
+    
+    @staticmethod
+    def _message_text(message: Dict[str, Any]) -> str:
+        for key in ("output", "input"):
+            if key in message:
+                return str(message[key])
+        return ""
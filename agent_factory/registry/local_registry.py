@@ -284,8 +284,15 @@ class LocalRegistry:
                     input_mapping=step_data.get("input_mapping", {}),
                     output_mapping=step_data.get("output_mapping", {}),
                     condition=condition,
-                    timeout=step_data.get("timeout", 30),
-                    retry_attempts=step_data.get("retry_attempts", 3),
+                    timeout=step_data.get("timeout"),
+                    retry_attempts=step_data.get("retry_attempts"),
+                    retry_backoff=step_data.get("retry_backoff", 0.5),
+                    depends_on=step_data.get("depends_on"),
+                    cacheable=step_data.get("cacheable", False),
+                    cache_ttl=step_data.get("cache_ttl"),
+                    map_over=step_data.get("map_over"),
+                    map_concurrency=step_data.get("map_concurrency", 4),
+                    map_on_error=step_data.get("map_on_error", "fail_fast"),
                 )
                 steps.append(step)
             
@@ -316,6 +323,9 @@ class LocalRegistry:
                 triggers=triggers if triggers else None,
                 branching=branching if branching else None,
                 agents_registry={},  # Will be populated by runtime engine
+                max_parallel=data.get("max_parallel", 4),
+                timeout=data.get("timeout"),
+                token_budget=data.get("token_budget"),
             )
             
             # Cache the workflow data
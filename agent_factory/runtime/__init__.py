@@ -4,6 +4,7 @@ Runtime engine, memory, logging, and configuration.
 
 # Import memory first (doesn't depend on engine)
 from agent_factory.runtime.memory import MemoryStore, SQLiteMemoryStore
+from agent_factory.runtime.execution_store import ExecutionStore, SQLiteExecutionBackend
 
 # Lazy import engine to avoid circular dependency with agents
 def __getattr__(name: str):
@@ -14,11 +15,18 @@ def __getattr__(name: str):
     elif name == "Execution":
         from agent_factory.runtime.engine import Execution
         return Execution
+    elif name in ("BatchResult", "BatchItemResult"):
+        from agent_factory.runtime import engine
+        return getattr(engine, name)
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "RuntimeEngine",
     "Execution",
+    "BatchResult",
+    "BatchItemResult",
     "MemoryStore",
     "SQLiteMemoryStore",
+    "ExecutionStore",
+    "SQLiteExecutionBackend",
 ]
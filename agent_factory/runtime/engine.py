@@ -3,28 +3,67 @@ Runtime engine for executing agents and workflows with prompt logging.
 """
 
 from typing import Dict, Optional, Any, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
+import asyncio
+import hashlib
+import json
 import uuid
 
-from agent_factory.agents.agent import Agent, AgentResult
+from agent_factory.agents.agent import Agent, AgentResult, AgentStatus
+from agent_factory.integrations.pricing import DEFAULT_PRICING_MODEL, estimate_llm_cost
 from agent_factory.workflows.model import Workflow, WorkflowResult
+from agent_factory.workflows.checkpoint import (
+    CheckpointStore,
+    SQLiteCheckpointStore,
+    WorkflowCheckpoint,
+)
+from agent_factory.workflows.step_cache import get_step_cache
 from agent_factory.promptlog import SQLiteStorage, Run as RunModel
 from agent_factory.telemetry.collector import get_collector
+from agent_factory.monitoring.metrics import MetricsCollector
+from agent_factory.runtime.execution_store import Execution, ExecutionStore
+from agent_factory.runtime.singleflight import SingleFlight
+from agent_factory.utils.async_utils import run_sync, run_in_thread
 
 
 @dataclass
-class Execution:
-    """Represents an execution instance."""
-    id: str
-    type: str  # "agent" or "workflow"
-    entity_id: str
-    status: str
-    created_at: datetime
-    completed_at: Optional[datetime] = None
-    result: Optional[Any] = None
+class BatchItemResult:
+    """Outcome of one input in a batch run."""
+    index: int
+    input_text: str
+    execution_id: Optional[str] = None
+    result: Optional[AgentResult] = None
     error: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    
+    @property
+    def success(self) -> bool:
+        """Whether the item ran and the agent completed."""
+        return (
+            self.error is None
+            and self.result is not None
+            and self.result.status == AgentStatus.COMPLETED
+        )
+
+
+@dataclass
+class BatchResult:
+    """Results of a batch run, in input order, with aggregated usage."""
+    agent_id: str
+    items: List[BatchItemResult] = field(default_factory=list)
+    tokens_used: int = 0
+    cost_estimate: float = 0.0  # USD, from integrations.pricing for the agent's model
+    execution_time: float = 0.0
+    
+    @property
+    def succeeded(self) -> int:
+        """Number of items that completed."""
+        return sum(1 for item in self.items if item.success)
+    
+    @property
+    def failed(self) -> int:
+        """Number of items that raised or returned an error."""
+        return len(self.items) - self.succeeded
 
 
 class RuntimeEngine:
@@ -43,6 +82,9 @@ class RuntimeEngine:
         tenant_id: Optional[str] = None,
         user_id: Optional[str] = None,
         project_id: Optional[str] = None,
+        coalesce_runs: bool = True,
+        execution_store: Optional[ExecutionStore] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
     ):
         """
         Initialize runtime engine.
@@ -52,8 +94,14 @@ class RuntimeEngine:
             tenant_id: Optional tenant ID for telemetry
             user_id: Optional user ID for telemetry
             project_id: Optional project ID for telemetry
+            coalesce_runs: Share one agent run between identical concurrent requests
+            execution_store: Optional store for executions; defaults to an
+                in-memory window of the most recent 10,000
+            checkpoint_store: Optional store for workflow checkpoints;
+                defaults to SQLite, opened on the first workflow run
         """
-        self.executions: Dict[str, Execution] = {}
+        self.executions = execution_store or ExecutionStore()
+        self._checkpoint_store = checkpoint_store
         self.agents_registry: Dict[str, Agent] = {}
         self.workflows_registry: Dict[str, Workflow] = {}
         self.prompt_log_storage = prompt_log_storage or SQLiteStorage()
@@ -61,6 +109,15 @@ class RuntimeEngine:
         self.user_id = user_id
         self.project_id = project_id
         self.telemetry_collector = get_collector()
+        self.coalesce_runs = coalesce_runs
+        self._in_flight = SingleFlight()
+    
+    @property
+    def checkpoints(self) -> CheckpointStore:
+        """Workflow checkpoint store, created on first use."""
+        if self._checkpoint_store is None:
+            self._checkpoint_store = SQLiteCheckpointStore()
+        return self._checkpoint_store
     
     def register_agent(self, agent: Agent) -> None:
         """Register an agent in the runtime."""
@@ -85,6 +142,8 @@ class RuntimeEngine:
         """
         Run an agent and return execution ID.
         
+        Synchronous wrapper around :meth:`arun_agent`.
+        
         Args:
             agent_id: Agent ID to run
             input_text: Input text
@@ -94,6 +153,40 @@ class RuntimeEngine:
         Returns:
             Execution ID
         """
+        return run_sync(
+            self.arun_agent(agent_id, input_text, session_id=session_id, context=context)
+        )
+    
+    async def arun_agent(
+        self,
+        agent_id: str,
+        input_text: str,
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Run an agent on the running event loop and return execution ID.
+        
+        Args:
+            agent_id: Agent ID to run
+            input_text: Input text
+            session_id: Optional session ID
+            context: Optional context
+            
+        Returns:
+            Execution ID
+        """
+        execution = await self._arun_agent_execution(agent_id, input_text, session_id, context)
+        return execution.id
+    
+    async def _arun_agent_execution(
+        self,
+        agent_id: str,
+        input_text: str,
+        session_id: Optional[str],
+        context: Optional[Dict[str, Any]],
+    ) -> Execution:
+        """Run an agent and return its execution record."""
         agent = self.agents_registry.get(agent_id)
         if not agent:
             raise ValueError(f"Agent not found: {agent_id}")
@@ -107,42 +200,141 @@ class RuntimeEngine:
             created_at=datetime.now(),
             metadata={"input_text": input_text, "session_id": session_id, "context": context},
         )
-        self.executions[execution_id] = execution
+        self.executions.add(execution)
         
         try:
-            result = agent.run(input_text, session_id=session_id, context=context)
+            if self.coalesce_runs:
+                key = self._run_key(agent, input_text, session_id, context)
+                result, shared = await self._in_flight.do(
+                    key,
+                    lambda: agent.arun(input_text, session_id=session_id, context=context),
+                )
+                if shared:
+                    execution.metadata["coalesced"] = True
+                    MetricsCollector.record_coalesced_run(agent_id)
+            else:
+                result = await agent.arun(input_text, session_id=session_id, context=context)
             
             execution.status = "completed"
             execution.completed_at = datetime.now()
             execution.result = result
             
-            # Log to prompt log (agent already logs internally, but we log execution too)
-            self._log_execution(execution_id, agent_id, input_text, result)
-            
-            # Record telemetry
-            self.telemetry_collector.record_agent_run(
-                agent_id=agent_id,
-                tenant_id=self.tenant_id,
-                user_id=self.user_id,
-                project_id=self.project_id,
-                agent_name=getattr(agent, "name", None),
-                session_id=session_id,
-                status="completed" if execution.status == "completed" else "failed",
-                execution_time=result.execution_time if result else 0.0,
-                tokens_used=result.tokens_used if result else 0,
-                cost_estimate=result.cost_estimate if result else 0.0,
-                input_length=len(input_text),
-                output_length=len(result.output) if result and result.output else 0,
+            # Update the store, log to prompt log and record telemetry off the event loop
+            await run_in_thread(
+                self._record_agent_execution,
+                execution, agent, input_text, session_id, result,
             )
             
-            return execution_id
+            return execution
             
         except Exception as e:
             execution.status = "error"
             execution.completed_at = datetime.now()
             execution.error = str(e)
+            self.executions.update(execution)
             raise
     
+    def run_agent_batch(
+        self,
+        agent_id: str,
+        inputs: List[str],
+        max_concurrency: int = 8,
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> BatchResult:
+        """
+        Run an agent over many inputs concurrently.
+        
+        Synchronous wrapper around :meth:`arun_agent_batch`.
+        
+        Args:
+            agent_id: Agent ID to run
+            inputs: Input texts
+            max_concurrency: Maximum number of runs in flight at once
+            session_id: Optional session ID shared by all runs
+            context: Optional context shared by all runs
+            
+        Returns:
+            BatchResult with one item per input, in input order
+        """
+        return run_sync(
+            self.arun_agent_batch(
+                agent_id,
+                inputs,
+                max_concurrency=max_concurrency,
+                session_id=session_id,
+                context=context,
+            )
+        )
+    
+    async def arun_agent_batch(
+        self,
+        agent_id: str,
+        inputs: List[str],
+        max_concurrency: int = 8,
+        session_id: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> BatchResult:
+        """
+        Run an agent over many inputs on the running event loop.
+        
+        A fixed pool of ``max_concurrency`` workers pulls inputs in order, so
+        memory stays bounded however many inputs are given. A failing input
+        is recorded on its item and does not stop the batch.
+        
+        Args:
+            agent_id: Agent ID to run
+            inputs: Input texts
+            max_concurrency: Maximum number of runs in flight at once
+            session_id: Optional session ID shared by all runs
+            context: Optional context shared by all runs
+            
+        Returns:
+            BatchResult with one item per input, in input order
+        """
+        if agent_id not in self.agents_registry:
+            raise ValueError(f"Agent not found: {agent_id}")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        start = datetime.now()
+        items = [
+            BatchItemResult(index=index, input_text=input_text)
+            for index, input_text in enumerate(inputs)
+        ]
+        pending = iter(items)
+        
+        async def worker() -> None:
+            # Items are handed out from a shared iterator; no await between
+            # next() calls, so each item goes to exactly one worker
+            for item in pending:
+                try:
+                    execution = await self._arun_agent_execution(
+                        agent_id, item.input_text, session_id, context,
+                    )
+                    item.execution_id = execution.id
+                    item.result = execution.result
+                    if item.result.status != AgentStatus.COMPLETED:
+                        item.error = item.result.error
+                    if execution.metadata.get("coalesced"):
+                        coalesced.add(item.index)
+                except Exception as e:
+                    item.error = str(e)
+        
+        coalesced = set()
+        await asyncio.gather(*(worker() for _ in range(min(max_concurrency, len(items)))))
+        
+        batch = BatchResult(agent_id=agent_id, items=items)
+        for item in items:
+            if item.result is None or item.index in coalesced:
+                # Coalesced items shared the usage of another item's model call
+                continue
+            batch.tokens_used += item.result.tokens_used
+        model = getattr(self.agents_registry[agent_id], "model", DEFAULT_PRICING_MODEL)
+        batch.cost_estimate = float(estimate_llm_cost(batch.tokens_used, model))
+        batch.execution_time = (datetime.now() - start).total_seconds()
+        return batch
+    
     def run_workflow(
         self,
         workflow_id: str,
@@ -151,6 +343,25 @@ class RuntimeEngine:
         """
         Run a workflow and return execution ID.
         
+        Synchronous wrapper around :meth:`arun_workflow`.
+        
+        Args:
+            workflow_id: Workflow ID to run
+            context: Initial context
+            
+        Returns:
+            Execution ID
+        """
+        return run_sync(self.arun_workflow(workflow_id, context))
+    
+    async def arun_workflow(
+        self,
+        workflow_id: str,
+        context: Dict[str, Any],
+    ) -> str:
+        """
+        Run a workflow on the running event loop and return execution ID.
+        
         Args:
             workflow_id: Workflow ID to run
             context: Initial context
@@ -171,42 +382,206 @@ class RuntimeEngine:
             created_at=datetime.now(),
             metadata={"context": context},
         )
-        self.executions[execution_id] = execution
+        self.executions.add(execution)
+        
+        checkpoint = WorkflowCheckpoint(
+            execution_id=execution_id,
+            workflow_id=workflow_id,
+            context=context,
+        )
+        await self._aexecute_workflow(workflow, execution, checkpoint)
+        return execution_id
+    
+    def resume_workflow(self, execution_id: str) -> str:
+        """
+        Resume a workflow execution from its checkpoint.
+        
+        Synchronous wrapper around :meth:`aresume_workflow`.
+        
+        Args:
+            execution_id: Execution ID of the interrupted or failed run
+            
+        Returns:
+            Execution ID
+        """
+        return run_sync(self.aresume_workflow(execution_id))
+    
+    async def aresume_workflow(self, execution_id: str) -> str:
+        """
+        Resume a workflow execution from its checkpoint on the running event loop.
+        
+        Steps the checkpoint records as executed keep their outputs and are
+        not run again; the run continues with the first step that did not
+        complete, under the same execution ID. A completed execution is
+        left as it is.
+        
+        Args:
+            execution_id: Execution ID of the interrupted or failed run
+            
+        Returns:
+            Execution ID
+        """
+        checkpoint = await run_in_thread(self.checkpoints.load, execution_id)
+        if not checkpoint:
+            raise ValueError(f"No checkpoint for execution: {execution_id}")
+        if checkpoint.status == "completed":
+            return execution_id
         
+        workflow = self.workflows_registry.get(checkpoint.workflow_id)
+        if not workflow:
+            raise ValueError(f"Workflow not found: {checkpoint.workflow_id}")
+        
+        execution = self.executions.get(execution_id)
+        if execution is None:
+            execution = Execution(
+                id=execution_id,
+                type="workflow",
+                entity_id=checkpoint.workflow_id,
+                status="running",
+                created_at=datetime.now(),
+                metadata={"context": checkpoint.context},
+            )
+            self.executions.add(execution)
+        else:
+            execution.status = "running"
+            execution.completed_at = None
+            execution.error = None
+            self.executions.update(execution)
+        
+        await self._aexecute_workflow(workflow, execution, checkpoint)
+        return execution_id
+    
+    async def _aexecute_workflow(
+        self,
+        workflow: Workflow,
+        execution: Execution,
+        checkpoint: WorkflowCheckpoint,
+    ) -> None:
+        """Run a workflow against its checkpoint and record the outcome."""
+        context = checkpoint.context
         try:
-            result = workflow.execute(context)
+            result = await workflow.aexecute(
+                context, checkpoint=checkpoint, checkpoint_store=self.checkpoints,
+            )
             
-            execution.status = "completed"
+            execution.status = "completed" if result.success else "error"
             execution.completed_at = datetime.now()
             execution.result = result
+            execution.error = result.error
             
-            # Log workflow execution
-            self._log_workflow_execution(execution_id, workflow_id, context, result)
-            
-            # Record telemetry
-            workflow = self.workflows_registry.get(workflow_id)
-            self.telemetry_collector.record_workflow_run(
-                workflow_id=workflow_id,
-                tenant_id=self.tenant_id,
-                user_id=self.user_id,
-                project_id=self.project_id,
-                workflow_name=getattr(workflow, "name", None) if workflow else None,
-                status="completed" if execution.status == "completed" else "failed",
-                execution_time=result.execution_time if result else 0.0,
-                steps_completed=getattr(result, "steps_completed", 0) if result else 0,
-                steps_total=getattr(result, "steps_total", 0) if result else 0,
-                tokens_used=getattr(result, "tokens_used", 0) if result else 0,
-                cost_estimate=getattr(result, "cost_estimate", 0.0) if result else 0.0,
+            await run_in_thread(
+                self._record_workflow_execution, execution, workflow, context, result,
             )
             
-            return execution_id
-            
         except Exception as e:
             execution.status = "error"
             execution.completed_at = datetime.now()
             execution.error = str(e)
+            self.executions.update(execution)
             raise
     
+    def _record_agent_execution(
+        self,
+        execution: Execution,
+        agent: Agent,
+        input_text: str,
+        session_id: Optional[str],
+        result: AgentResult,
+    ) -> None:
+        """Store, log and record telemetry for a finished agent execution."""
+        self.executions.update(execution)
+        
+        # Log to prompt log (agent already logs internally, but we log execution too)
+        self._log_execution(execution.id, execution.entity_id, input_text, result)
+        
+        # A coalesced run shares the leader's model call, so it adds no usage
+        coalesced = bool(execution.metadata and execution.metadata.get("coalesced"))
+        
+        # Record telemetry
+        self.telemetry_collector.record_agent_run(
+            agent_id=execution.entity_id,
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            project_id=self.project_id,
+            agent_name=getattr(agent, "name", None),
+            session_id=session_id,
+            status="completed" if execution.status == "completed" else "failed",
+            execution_time=result.execution_time if result else 0.0,
+            tokens_used=result.tokens_used if result and not coalesced else 0,
+            cost_estimate=getattr(result, "cost_estimate", 0.0) if result and not coalesced else 0.0,
+            input_length=len(input_text),
+            output_length=len(result.output) if result and result.output else 0,
+        )
+    
+    @staticmethod
+    def _run_key(
+        agent: Agent,
+        input_text: str,
+        session_id: Optional[str],
+        context: Optional[Dict[str, Any]],
+    ) -> str:
+        """Key identifying agent runs that must produce the same result."""
+        payload = json.dumps(
+            {
+                "agent_id": agent.id,
+                "model": agent.model,
+                "instructions": agent.instructions,
+                "tools": sorted(tool.id for tool in agent.tools),
+                "config": asdict(agent.config),
+                "input": input_text,
+                "session_id": session_id,
+                "context": context,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def purge_step_cache(self, agent_id: Optional[str] = None) -> int:
+        """
+        Remove memoized outputs of cacheable workflow steps.
+        
+        Args:
+            agent_id: Only remove outputs of this agent (default: all agents)
+            
+        Returns:
+            Number of entries removed
+        """
+        caches = {id(cache): cache for cache in (
+            [get_step_cache()] + [w.step_cache for w in self.workflows_registry.values() if w.step_cache]
+        )}
+        return sum(cache.purge(agent_id=agent_id) for cache in caches.values())
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get counts of executed and coalesced agent runs."""
+        return self._in_flight.get_stats()
+    
+    def _record_workflow_execution(
+        self,
+        execution: Execution,
+        workflow: Workflow,
+        context: Dict[str, Any],
+        result: WorkflowResult,
+    ) -> None:
+        """Store, log and record telemetry for a finished workflow execution."""
+        self.executions.update(execution)
+        
+        self._log_workflow_execution(execution.id, execution.entity_id, context, result)
+        
+        self.telemetry_collector.record_workflow_run(
+            workflow_id=execution.entity_id,
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            project_id=self.project_id,
+            workflow_name=getattr(workflow, "name", None) if workflow else None,
+            status="completed" if execution.status == "completed" else "failed",
+            execution_time=result.execution_time if result else 0.0,
+            steps_completed=getattr(result, "steps_completed", 0) if result else 0,
+            steps_total=getattr(result, "steps_total", 0) if result else 0,
+            tokens_used=result.metadata.get("tokens_used", 0) if result else 0,
+            cost_estimate=getattr(result, "cost_estimate", 0.0) if result else 0.0,
+        )
+    
     def _log_execution(
         self,
         execution_id: str,
@@ -274,14 +649,8 @@ class RuntimeEngine:
         Returns:
             List of executions
         """
-        results = list(self.executions.values())
-        
-        if entity_id:
-            results = [e for e in results if e.entity_id == entity_id]
-        
-        if status:
-            results = [e for e in results if e.status == status]
-        
-        results.sort(key=lambda e: e.created_at, reverse=True)
-        
-        return results[:limit]
+        return self.executions.list(entity_id=entity_id, status=status, limit=limit)
+    
+    def get_execution_store_stats(self) -> Dict[str, Any]:
+        """Get execution store size and spill statistics."""
+        return self.executions.get_stats()
@@ -0,0 +1,27 @@
+"""Bounded execution store and its persistent backends."""
+
+from agent_factory.runtime.execution_store.base import Execution, ExecutionBackend
+from agent_factory.runtime.execution_store.sqlite import SQLiteExecutionBackend
+from agent_factory.runtime.execution_store.store import ExecutionStore
+
+# Lazy import Postgres backend to avoid requiring sqlalchemy at import time
+def __getattr__(name: str):
+    """Lazy import for PostgresExecutionBackend."""
+    if name == "PostgresExecutionBackend":
+        try:
+            from agent_factory.runtime.execution_store.postgres import PostgresExecutionBackend
+            return PostgresExecutionBackend
+        except ImportError:
+            raise ImportError(
+                "PostgresExecutionBackend requires sqlalchemy. "
+                "Install with: pip install sqlalchemy psycopg2-binary"
+            )
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = [
+    "Execution",
+    "ExecutionBackend",
+    "ExecutionStore",
+    "SQLiteExecutionBackend",
+    "PostgresExecutionBackend",
+]
@@ -0,0 +1,130 @@
+"""
+Execution record and the interface for persistent execution backends.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict, is_dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Execution:
+    """Represents an execution instance."""
+    id: str
+    type: str  # "agent" or "workflow"
+    entity_id: str
+    status: str
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+def execution_to_row(execution: Execution) -> Dict[str, Any]:
+    """
+    Flatten an execution into column values.
+    
+    Results are stored as JSON, so an execution read back from a backend
+    carries its result as a plain dictionary.
+    """
+    result = execution.result
+    if is_dataclass(result) and not isinstance(result, type):
+        result = asdict(result)
+    return {
+        "id": execution.id,
+        "type": execution.type,
+        "entity_id": execution.entity_id,
+        "status": execution.status,
+        "created_at": execution.created_at,
+        "completed_at": execution.completed_at,
+        "result": json.dumps(result, default=str) if result is not None else None,
+        "error": execution.error,
+        "metadata": json.dumps(execution.metadata, default=str) if execution.metadata else None,
+    }
+
+
+def execution_from_row(row: Dict[str, Any]) -> Execution:
+    """Rebuild an execution from column values."""
+    created_at = row["created_at"]
+    completed_at = row["completed_at"]
+    return Execution(
+        id=row["id"],
+        type=row["type"],
+        entity_id=row["entity_id"],
+        status=row["status"],
+        created_at=datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at,
+        completed_at=(
+            datetime.fromisoformat(completed_at) if isinstance(completed_at, str) else completed_at
+        ),
+        result=json.loads(row["result"]) if row["result"] else None,
+        error=row["error"],
+        metadata=json.loads(row["metadata"]) if row["metadata"] else None,
+    )
+
+
+class ExecutionBackend(ABC):
+    """
+    Abstract base class for persistent execution storage.
+    
+    Receives executions spilled out of the in-memory window of
+    :class:`~agent_factory.runtime.execution_store.ExecutionStore`.
+    """
+    
+    @abstractmethod
+    def save_many(self, executions: List[Execution]) -> None:
+        """
+        Insert or replace executions.
+        
+        Args:
+            executions: Executions to store
+        """
+        pass
+    
+    @abstractmethod
+    def get(self, execution_id: str) -> Optional[Execution]:
+        """
+        Get an execution by ID.
+        
+        Args:
+            execution_id: Execution ID
+            
+        Returns:
+            Execution or None
+        """
+        pass
+    
+    @abstractmethod
+    def list(
+        self,
+        entity_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Execution]:
+        """
+        List executions, newest first.
+        
+        Args:
+            entity_id: Filter by entity ID
+            status: Filter by status
+            limit: Maximum number of results
+            
+        Returns:
+            List of executions
+        """
+        pass
+    
+    @abstractmethod
+    def delete_before(self, cutoff: datetime) -> int:
+        """
+        Delete executions created before a cutoff.
+        
+        Args:
+            cutoff: Oldest creation time to keep
+            
+        Returns:
+            Number of deleted executions
+        """
+        pass
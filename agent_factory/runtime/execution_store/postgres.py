@@ -0,0 +1,151 @@
+"""
+PostgreSQL backend for execution storage.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Index
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+from agent_factory.runtime.execution_store.base import (
+    Execution,
+    ExecutionBackend,
+    execution_from_row,
+    execution_to_row,
+)
+
+Base = declarative_base()
+
+
+class ExecutionModel(Base):
+    """SQLAlchemy model for executions."""
+    __tablename__ = "executions"
+    
+    id = Column(String, primary_key=True)
+    type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
+    completed_at = Column(DateTime)
+    result = Column(Text)
+    error = Column(Text)
+    metadata_json = Column("metadata", Text)
+    
+    __table_args__ = (
+        Index("idx_executions_entity_created", "entity_id", "created_at"),
+        Index("idx_executions_status_created", "status", "created_at"),
+    )
+
+
+class PostgresExecutionBackend(ExecutionBackend):
+    """
+    PostgreSQL storage backend for executions.
+    
+    Suitable for production deployments shared by several API processes.
+    """
+    
+    def __init__(self, database_url: Optional[str] = None):
+        """
+        Initialize PostgreSQL execution backend.
+        
+        Args:
+            database_url: PostgreSQL connection URL
+        """
+        import os
+        
+        if not database_url:
+            database_url = os.getenv(
+                "EXECUTIONS_DATABASE_URL",
+                os.getenv("DATABASE_URL", "postgresql://localhost/agent_factory")
+            )
+        
+        self.engine = create_engine(database_url, pool_pre_ping=True)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        
+        # Create tables
+        Base.metadata.create_all(bind=self.engine)
+    
+    def save_many(self, executions: List[Execution]) -> None:
+        """Insert or replace executions in one transaction."""
+        session = self.SessionLocal()
+        
+        try:
+            for execution in executions:
+                row = execution_to_row(execution)
+                row["metadata_json"] = row.pop("metadata")
+                session.merge(ExecutionModel(**row))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def get(self, execution_id: str) -> Optional[Execution]:
+        """Get an execution by ID."""
+        session = self.SessionLocal()
+        
+        try:
+            model = session.get(ExecutionModel, execution_id)
+            return self._to_execution(model) if model else None
+        finally:
+            session.close()
+    
+    def list(
+        self,
+        entity_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Execution]:
+        """List executions, newest first."""
+        session = self.SessionLocal()
+        
+        try:
+            query = session.query(ExecutionModel)
+            
+            if entity_id:
+                query = query.filter(ExecutionModel.entity_id == entity_id)
+            
+            if status:
+                query = query.filter(ExecutionModel.status == status)
+            
+            query = query.order_by(ExecutionModel.created_at.desc()).limit(limit)
+            
+            return [self._to_execution(model) for model in query.all()]
+        finally:
+            session.close()
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete executions created before a cutoff."""
+        session = self.SessionLocal()
+        
+        try:
+            deleted = (
+                session.query(ExecutionModel)
+                .filter(ExecutionModel.created_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _to_execution(model: ExecutionModel) -> Execution:
+        """Convert a model row to an execution."""
+        return execution_from_row({
+            "id": model.id,
+            "type": model.type,
+            "entity_id": model.entity_id,
+            "status": model.status,
+            "created_at": model.created_at,
+            "completed_at": model.completed_at,
+            "result": model.result,
+            "error": model.error,
+            "metadata": model.metadata_json,
+        })
@@ -0,0 +1,134 @@
+"""
+SQLite backend for execution storage.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from agent_factory.runtime.execution_store.base import (
+    Execution,
+    ExecutionBackend,
+    execution_from_row,
+    execution_to_row,
+)
+
+_COLUMNS = (
+    "id", "type", "entity_id", "status", "created_at",
+    "completed_at", "result", "error", "metadata",
+)
+
+
+class SQLiteExecutionBackend(ExecutionBackend):
+    """
+    SQLite storage backend for executions.
+    
+    Suitable for local development and single-node deployments.
+    """
+    
+    def __init__(self, db_path: str = "./agent_factory/executions.db"):
+        """
+        Initialize SQLite execution backend.
+        
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+    
+    def _init_db(self) -> None:
+        """Initialize database tables."""
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS executions (
+                id TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                completed_at TEXT,
+                result TEXT,
+                error TEXT,
+                metadata TEXT
+            )
+        """)
+        
+        # Indexes match the filtered, newest-first listing queries
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_executions_created
+            ON executions(created_at)
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_executions_entity_created
+            ON executions(entity_id, created_at)
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_executions_status_created
+            ON executions(status, created_at)
+        """)
+        self._conn.commit()
+    
+    def save_many(self, executions: List[Execution]) -> None:
+        """Insert or replace executions in one transaction."""
+        rows = []
+        for execution in executions:
+            row = execution_to_row(execution)
+            row["created_at"] = row["created_at"].isoformat()
+            if row["completed_at"] is not None:
+                row["completed_at"] = row["completed_at"].isoformat()
+            rows.append(tuple(row[column] for column in _COLUMNS))
+        
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO executions ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                rows,
+            )
+            self._conn.commit()
+    
+    def get(self, execution_id: str) -> Optional[Execution]:
+        """Get an execution by ID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM executions WHERE id = ?", (execution_id,)
+            ).fetchone()
+        return execution_from_row(dict(row)) if row else None
+    
+    def list(
+        self,
+        entity_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Execution]:
+        """List executions, newest first."""
+        query = "SELECT * FROM executions WHERE 1=1"
+        params: list = []
+        
+        if entity_id:
+            query += " AND entity_id = ?"
+            params.append(entity_id)
+        
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [execution_from_row(dict(row)) for row in rows]
+    
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete executions created before a cutoff."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM executions WHERE created_at < ?", (cutoff.isoformat(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
@@ -0,0 +1,363 @@
+"""
+Bounded, indexed execution store.
+
+Recent executions live in an in-memory window ordered by creation. Each one
+gets a monotonically increasing sequence number at insertion, and secondary
+indexes keep sorted sequence lists per ``entity_id``, per status and per
+``(entity_id, status)`` pair, so a filtered, newest-first listing walks only
+the matching entries. When the window is full the oldest executions are
+spilled to an optional persistent backend (or dropped if there is none);
+executions older than the retention period are dropped from both tiers.
+Backend writes and retention sweeps run on a background writer thread, so
+adding or updating an execution never waits on the backend.
+"""
+
+import bisect
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agent_factory.runtime.execution_store.base import Execution, ExecutionBackend
+
+logger = logging.getLogger(__name__)
+
+
+def _remove_sorted(values: List[int], value: int) -> None:
+    """Remove a value from a sorted list."""
+    index = bisect.bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
+
+
+class ExecutionStore(Mapping):
+    """
+    Execution store with a bounded in-memory window and optional spillover.
+    
+    Behaves as a read-only mapping of execution ID to execution over the
+    in-memory window; lookups by ID fall through to the backend.
+    
+    Example:
+        >>> store = ExecutionStore(
+        ...     max_in_memory=5000,
+        ...     backend=SQLiteExecutionBackend("./executions.db"),
+        ...     retention=timedelta(days=7),
+        ... )
+        >>> engine = RuntimeEngine(execution_store=store)
+    """
+    
+    def __init__(
+        self,
+        max_in_memory: int = 10_000,
+        backend: Optional[ExecutionBackend] = None,
+        retention: Optional[timedelta] = None,
+        spill_batch: int = 100,
+        prune_interval: float = 60.0,
+    ):
+        """
+        Initialize execution store.
+        
+        Args:
+            max_in_memory: Maximum number of executions kept in memory
+            backend: Optional persistent backend for spilled executions
+            retention: Optional age after which executions are dropped
+            spill_batch: Number of executions written to the backend at once
+            prune_interval: Minimum seconds between backend retention sweeps
+        """
+        if max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1")
+        
+        self.max_in_memory = max_in_memory
+        self.backend = backend
+        self.retention = retention
+        self.spill_batch = max(1, spill_batch)
+        self.prune_interval = prune_interval
+        
+        self._window: "OrderedDict[str, Execution]" = OrderedDict()
+        self._seq_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._status_of: Dict[str, str] = {}
+        self._by_entity: Dict[str, List[int]] = {}
+        self._by_status: Dict[str, List[int]] = {}
+        self._by_entity_status: Dict[Tuple[str, str], List[int]] = {}
+        self._next_seq = 0
+        self._last_prune = time.monotonic()
+        self._lock = threading.Lock()
+        # Spilled executions not yet written by the writer thread, oldest first
+        self._pending: "OrderedDict[str, Execution]" = OrderedDict()
+        self._writes: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.spilled = 0
+        self.expired = 0
+    
+    def add(self, execution: Execution) -> None:
+        """
+        Add a new execution.
+        
+        Args:
+            execution: Execution to add
+        """
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            
+            self._window[execution.id] = execution
+            self._seq_of[execution.id] = seq
+            self._id_of[seq] = execution.id
+            self._status_of[execution.id] = execution.status
+            # Sequence numbers only grow, so appending keeps the lists sorted
+            self._by_entity.setdefault(execution.entity_id, []).append(seq)
+            self._by_status.setdefault(execution.status, []).append(seq)
+            self._by_entity_status.setdefault((execution.entity_id, execution.status), []).append(seq)
+            
+            self._expire_window()
+            
+            if len(self._window) > self.max_in_memory:
+                count = max(len(self._window) - self.max_in_memory, self.spill_batch)
+                evicted = [self._pop_oldest() for _ in range(min(count, len(self._window)))]
+                if self.backend is not None:
+                    for spilled in evicted:
+                        self._pending[spilled.id] = spilled
+                    self.spilled += len(evicted)
+                    self._submit(lambda: self._write(evicted))
+        
+        self._maybe_prune_backend()
+    
+    def update(self, execution: Execution) -> None:
+        """
+        Record a change to an execution, e.g. a new status.
+        
+        Args:
+            execution: Execution previously passed to :meth:`add`
+        """
+        with self._lock:
+            seq = self._seq_of.get(execution.id)
+            if seq is not None:
+                old_status = self._status_of[execution.id]
+                if old_status != execution.status:
+                    self._unindex(self._by_status, old_status, seq)
+                    self._unindex(self._by_entity_status, (execution.entity_id, old_status), seq)
+                    bisect.insort(self._by_status.setdefault(execution.status, []), seq)
+                    bisect.insort(
+                        self._by_entity_status.setdefault((execution.entity_id, execution.status), []), seq
+                    )
+                    self._status_of[execution.id] = execution.status
+                return
+        
+        # Spilled while still running; bring the persisted copy up to date
+        if self.backend is not None:
+            self._submit(lambda: self.backend.save_many([execution]))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued backend writes and retention sweeps to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits until done)
+            
+        Returns:
+            True if all writes queued before the call have finished
+        """
+        if self._writer is None:
+            return True
+        done = threading.Event()
+        self._submit(done.set)
+        return done.wait(timeout)
+    
+    def get(self, execution_id: str, default: Any = None) -> Optional[Execution]:
+        """Get an execution by ID from memory or the backend."""
+        with self._lock:
+            execution = self._window.get(execution_id) or self._pending.get(execution_id)
+        if execution is not None:
+            return execution
+        if self.backend is not None:
+            execution = self.backend.get(execution_id)
+            if execution is not None:
+                return execution
+        return default
+    
+    def list(
+        self,
+        entity_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Execution]:
+        """
+        List executions newest first, topping up from the backend.
+        
+        Args:
+            entity_id: Filter by entity ID
+            status: Filter by status
+            limit: Maximum number of results
+            
+        Returns:
+            List of executions
+        """
+        results: List[Execution] = []
+        if limit <= 0:
+            return results
+        
+        with self._lock:
+            if entity_id and status:
+                seqs = self._by_entity_status.get((entity_id, status), [])
+            elif entity_id:
+                seqs = self._by_entity.get(entity_id, [])
+            elif status:
+                seqs = self._by_status.get(status, [])
+            else:
+                seqs = None
+            
+            if seqs is not None:
+                for seq in reversed(seqs[-limit:]):
+                    results.append(self._window[self._id_of[seq]])
+            else:
+                for execution in reversed(self._window.values()):
+                    results.append(execution)
+                    if len(results) >= limit:
+                        break
+            
+            # Spilled executions are older than the window; unwritten ones are the newest of them
+            pending_ids = set()
+            for execution in reversed(self._pending.values()):
+                if len(results) >= limit:
+                    break
+                if entity_id and execution.entity_id != entity_id:
+                    continue
+                if status and execution.status != status:
+                    continue
+                results.append(execution)
+                pending_ids.add(execution.id)
+        
+        if len(results) < limit and self.backend is not None:
+            # The writer may have persisted some of the pending executions meanwhile
+            stored = self.backend.list(
+                entity_id=entity_id, status=status, limit=limit - len(results) + len(pending_ids)
+            )
+            results.extend(e for e in stored if e.id not in pending_ids)
+            del results[limit:]
+        
+        return results
+    
+    def prune(self) -> int:
+        """
+        Drop executions older than the retention period from both tiers.
+        
+        Returns:
+            Number of executions dropped
+        """
+        if self.retention is None:
+            return 0
+        
+        with self._lock:
+            dropped = self._expire_window()
+        if self.backend is not None:
+            # Let queued spills land first so the sweep sees them
+            self.flush()
+            dropped += self.backend.delete_before(datetime.now() - self.retention)
+        self._last_prune = time.monotonic()
+        return dropped
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get store size and spill statistics."""
+        with self._lock:
+            return {
+                "in_memory": len(self._window),
+                "max_in_memory": self.max_in_memory,
+                "spilled": self.spilled,
+                "pending_writes": len(self._pending),
+                "expired": self.expired,
+            }
+    
+    def __getitem__(self, execution_id: str) -> Execution:
+        execution = self.get(execution_id)
+        if execution is None:
+            raise KeyError(execution_id)
+        return execution
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._window))
+    
+    def __len__(self) -> int:
+        return len(self._window)
+    
+    def __contains__(self, execution_id: object) -> bool:
+        return self.get(execution_id) is not None
+    
+    def _pop_oldest(self) -> Execution:
+        """Remove the oldest in-memory execution and its index entries."""
+        execution_id, execution = self._window.popitem(last=False)
+        seq = self._seq_of.pop(execution_id)
+        del self._id_of[seq]
+        status = self._status_of.pop(execution_id)
+        self._unindex(self._by_entity, execution.entity_id, seq)
+        self._unindex(self._by_status, status, seq)
+        self._unindex(self._by_entity_status, (execution.entity_id, status), seq)
+        return execution
+    
+    def _expire_window(self) -> int:
+        """Drop in-memory executions past the retention period."""
+        if self.retention is None:
+            return 0
+        cutoff = datetime.now() - self.retention
+        dropped = 0
+        while self._window:
+            oldest = next(iter(self._window.values()))
+            if oldest.created_at >= cutoff:
+                break
+            self._pop_oldest()
+            dropped += 1
+        self.expired += dropped
+        return dropped
+    
+    def _maybe_prune_backend(self) -> None:
+        """Run a backend retention sweep if one is due."""
+        if self.retention is None or self.backend is None:
+            return
+        if time.monotonic() - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = time.monotonic()
+        cutoff = datetime.now() - self.retention
+        self._submit(lambda: self.backend.delete_before(cutoff))
+    
+    def _write(self, executions: List[Execution]) -> None:
+        """Persist spilled executions, then stop serving them from memory."""
+        try:
+            self.backend.save_many(executions)
+        finally:
+            with self._lock:
+                for execution in executions:
+                    if self._pending.get(execution.id) is execution:
+                        del self._pending[execution.id]
+    
+    def _submit(self, task: Callable[[], None]) -> None:
+        """Queue a backend task for the writer thread, starting it on first use."""
+        self._writes.put(task)
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name="execution-store-writer", daemon=True)
+                self._writer.start()
+    
+    def _run_writer(self) -> None:
+        """Writer thread loop: run queued backend tasks in order."""
+        while True:
+            task = self._writes.get()
+            try:
+                task()
+            except Exception:
+                logger.exception("Execution store backend error")
+    
+    @staticmethod
+    def _unindex(index: Dict[Any, List[int]], key: Any, seq: int) -> None:
+        """Remove a sequence number from one index bucket."""
+        seqs = index.get(key)
+        if seqs is None:
+            return
+        _remove_sorted(seqs, seq)
+        if not seqs:
+            del index[key]
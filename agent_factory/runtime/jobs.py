@@ -2,11 +2,20 @@
 Job queue system for async execution of agents and workflows.
 """
 
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
 import uuid
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional, Any, List
+from pathlib import Path
+from queue import Full
+from typing import Dict, Optional, Any, List, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -87,6 +96,37 @@ class JobQueue(ABC):
         """
         pass
     
+    def dequeue_many(self, n: int, job_type: Optional[JobType] = None) -> List[Job]:
+        """
+        Dequeue up to ``n`` jobs.
+        
+        Backends that can claim a batch in one operation override this.
+        
+        Args:
+            n: Maximum number of jobs
+            job_type: Optional job type filter
+            
+        Returns:
+            Dequeued jobs, possibly empty
+        """
+        jobs: List[Job] = []
+        while len(jobs) < n:
+            job = self.dequeue(job_type)
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+    
+    def qsize(self, job_type: Optional[JobType] = None) -> int:
+        """
+        Number of queued jobs.
+        
+        Args:
+            job_type: Optional job type filter
+        """
+        jobs = self.list_jobs(status=JobStatus.QUEUED, limit=1_000_000)
+        return sum(1 for job in jobs if job_type is None or job.job_type == job_type)
+    
     @abstractmethod
     def get_job(self, job_id: str) -> Optional[Job]:
         """
@@ -133,54 +173,123 @@ class JobQueue(ABC):
 
 class InMemoryJobQueue(JobQueue):
     """
-    In-memory job queue (for development/testing).
+    In-memory job queue (for development, tests and single-process workers).
     
-    Not suitable for production with multiple workers.
+    Queued jobs are kept in one heap per job type, ordered by
+    ``metadata["priority"]`` (higher first) and then by enqueue order, so
+    a typed dequeue never scans jobs of other types. Cancelling or
+    finishing a queued job only marks its heap entry stale; stale entries
+    are dropped when they reach the top. All methods are thread-safe.
+    
+    Example:
+        >>> queue = InMemoryJobQueue(max_size=1000)
+        >>> queue.enqueue(job, timeout=5.0)  # raises queue.Full if still full
+        >>> job = queue.dequeue(JobType.AGENT_RUN, timeout=1.0)
     """
     
-    def __init__(self):
-        """Initialize in-memory queue."""
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Initialize in-memory queue.
+        
+        Args:
+            max_size: Maximum number of queued jobs; ``enqueue`` waits for
+                space beyond it (default: unbounded)
+        """
         self.jobs: Dict[str, Job] = {}
-        self.queue: List[str] = []  # List of job IDs in queue order
-    
-    def enqueue(self, job: Job) -> None:
-        """Enqueue a job."""
-        self.jobs[job.job_id] = job
-        if job.status == JobStatus.QUEUED:
-            self.queue.append(job.job_id)
+        self.max_size = max_size
+        self._heaps: Dict[JobType, List[Tuple[int, int, str]]] = {job_type: [] for job_type in JobType}
+        self._queued: Dict[str, int] = {}  # job ID -> sequence number of its live heap entry
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
     
-    def dequeue(self, job_type: Optional[JobType] = None) -> Optional[Job]:
-        """Dequeue a job."""
-        while self.queue:
-            job_id = self.queue.pop(0)
-            job = self.jobs.get(job_id)
+    def enqueue(self, job: Job, timeout: Optional[float] = None) -> None:
+        """
+        Enqueue a job.
+        
+        Args:
+            job: Job to enqueue
+            timeout: Seconds to wait for space when the queue is full
+                (default: wait until space frees up)
             
-            if not job:
-                continue
+        Raises:
+            queue.Full: If the queue is still full after ``timeout``
+        """
+        with self._not_full:
+            if job.status == JobStatus.QUEUED and job.job_id not in self._queued and self.max_size is not None:
+                if not self._not_full.wait_for(lambda: len(self._queued) < self.max_size, timeout):
+                    raise Full(f"Job queue is full ({self.max_size} jobs)")
+            self._store(job)
+    
+    def dequeue(self, job_type: Optional[JobType] = None, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Dequeue the highest-priority, oldest queued job.
+        
+        Args:
+            job_type: Optional job type filter
+            timeout: Seconds to wait for a job when none is queued
+                (default: return immediately)
             
-            if job_type and job.job_type != job_type:
-                # Put back at end if wrong type
-                self.queue.append(job_id)
-                continue
+        Returns:
+            Job marked running, or None if no job became available
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._not_empty:
+            while True:
+                job = self._pop(job_type)
+                if job is not None:
+                    self._not_full.notify()
+                    return job
+                remaining = deadline - time.monotonic() if deadline is not None else 0
+                if remaining <= 0:
+                    return None
+                self._not_empty.wait(remaining)
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued job.
+        
+        Args:
+            job_id: Job ID
             
-            job.status = JobStatus.RUNNING
-            job.started_at = datetime.utcnow()
-            return job
+        Returns:
+            True if the job was queued and is now cancelled
+        """
+        with self._lock:
+            if self._queued.pop(job_id, None) is None:
+                return False
+            job = self.jobs[job_id]
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.utcnow()
+            self._not_full.notify()
+            return True
+    
+    def qsize(self, job_type: Optional[JobType] = None) -> int:
+        """
+        Number of queued jobs.
         
-        return None
+        Args:
+            job_type: Optional job type filter
+        """
+        with self._lock:
+            if job_type is None:
+                return len(self._queued)
+            return sum(1 for job_id in self._queued if self.jobs[job_id].job_type == job_type)
     
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
         return self.jobs.get(job_id)
     
     def update_job(self, job: Job) -> None:
-        """Update job."""
-        self.jobs[job.job_id] = job
+        """
+        Update job.
         
-        # Remove from queue if completed/failed/cancelled
-        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
-            if job.job_id in self.queue:
-                self.queue.remove(job.job_id)
+        Leaving the queued status removes the job from its queue; returning
+        to it (e.g. for a retry) queues it again. Never waits for capacity.
+        """
+        with self._lock:
+            self._store(job)
     
     def list_jobs(
         self,
@@ -189,7 +298,8 @@ class InMemoryJobQueue(JobQueue):
         limit: int = 100,
     ) -> List[Job]:
         """List jobs."""
-        jobs = list(self.jobs.values())
+        with self._lock:
+            jobs = list(self.jobs.values())
         
         if tenant_id:
             jobs = [j for j in jobs if j.tenant_id == tenant_id]
@@ -199,37 +309,106 @@ class InMemoryJobQueue(JobQueue):
         
         jobs.sort(key=lambda j: j.created_at, reverse=True)
         return jobs[:limit]
+    
+    def _store(self, job: Job) -> None:
+        """Save a job and queue or unqueue it to match its status. Caller holds the lock."""
+        self.jobs[job.job_id] = job
+        if job.status != JobStatus.QUEUED:
+            # Tombstone: the heap entry is skipped once it reaches the top
+            if self._queued.pop(job.job_id, None) is not None:
+                self._not_full.notify()
+            return
+        if job.job_id in self._queued:
+            return
+        
+        seq = next(self._counter)
+        heap = self._heaps[job.job_type]
+        heapq.heappush(heap, (-int(job.metadata.get("priority", 0)), seq, job.job_id))
+        self._queued[job.job_id] = seq
+        if len(heap) > 64 and len(heap) > 2 * len(self._queued):
+            self._compact(heap)
+        # Waiters may filter by type, so wake them all
+        self._not_empty.notify_all()
+    
+    def _pop(self, job_type: Optional[JobType]) -> Optional[Job]:
+        """Take the best live job, dropping stale heap entries. Caller holds the lock."""
+        types = [job_type] if job_type else list(self._heaps)
+        best: Optional[JobType] = None
+        for candidate in types:
+            heap = self._heaps[candidate]
+            while heap and self._queued.get(heap[0][2]) != heap[0][1]:
+                heapq.heappop(heap)
+            if heap and (best is None or heap[0][:2] < self._heaps[best][0][:2]):
+                best = candidate
+        if best is None:
+            return None
+        
+        _, _, job_id = heapq.heappop(self._heaps[best])
+        del self._queued[job_id]
+        job = self.jobs[job_id]
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        return job
+    
+    def _compact(self, heap: List[Tuple[int, int, str]]) -> None:
+        """Drop stale entries once they outnumber live ones."""
+        heap[:] = [entry for entry in heap if self._queued.get(entry[2]) == entry[1]]
+        heapq.heapify(heap)
 
 
 class SQLiteJobQueue(JobQueue):
     """
-    SQLite-based job queue (for single-worker deployments).
+    SQLite-based job queue.
+    
+    Safe for several worker threads and processes on one host: a job is
+    claimed with a single ``UPDATE ... RETURNING`` statement, so exactly
+    one worker moves it from queued to running. The database runs in WAL
+    mode, letting readers proceed while a claim is written, and each
+    thread (per process) keeps one persistent connection.
     """
     
-    def __init__(self, db_path: str = "./agent_factory/jobs.db"):
+    _COLUMNS = (
+        "job_id, job_type, resource_id, input_data, tenant_id, user_id, project_id, "
+        "status, created_at, started_at, completed_at, result, error, retry_count, "
+        "max_retries, metadata"
+    )
+    
+    def __init__(self, db_path: str = "./agent_factory/jobs.db", busy_timeout: float = 30.0):
         """
         Initialize SQLite job queue.
         
         Args:
             db_path: Path to SQLite database
+            busy_timeout: Seconds to wait for another connection's write lock
         """
-        import sqlite3
-        import json
-        from pathlib import Path
-        
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
         self._init_db()
     
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use (or after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+    
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+        self._local.conn = None
+    
     def _init_db(self) -> None:
         """Initialize database tables."""
-        import sqlite3
-        import json
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS jobs (
                 job_id TEXT PRIMARY KEY,
                 job_type TEXT NOT NULL,
@@ -250,35 +429,28 @@ class SQLiteJobQueue(JobQueue):
             )
         """)
         
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_jobs_status 
-            ON jobs(status)
+        # Serves the claim query for both filtered and unfiltered dequeues
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_type_created
+            ON jobs(status, job_type, created_at)
         """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+            ON jobs(status, created_at)
+        """)
+        conn.execute("DROP INDEX IF EXISTS idx_jobs_status")
         
-        cursor.execute("""
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_jobs_tenant 
             ON jobs(tenant_id)
         """)
-        
-        conn.commit()
-        conn.close()
     
     def enqueue(self, job: Job) -> None:
         """Enqueue a job."""
-        import sqlite3
-        import json
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO jobs 
-                (job_id, job_type, resource_id, input_data, tenant_id, user_id, project_id,
-                 status, created_at, started_at, completed_at, result, error, retry_count,
-                 max_retries, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        self._connection().execute(
+            f"INSERT OR REPLACE INTO jobs ({self._COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
                 job.job_id,
                 job.job_type.value,
                 job.resource_id,
@@ -295,67 +467,94 @@ class SQLiteJobQueue(JobQueue):
                 job.retry_count,
                 job.max_retries,
                 json.dumps(job.metadata),
-            ))
-            
-            conn.commit()
-        finally:
-            conn.close()
+            ),
+        )
     
     def dequeue(self, job_type: Optional[JobType] = None) -> Optional[Job]:
-        """Dequeue a job."""
-        import sqlite3
-        import json
+        """Claim the oldest queued job (of ``job_type``, if given)."""
+        jobs = self.dequeue_many(1, job_type)
+        return jobs[0] if jobs else None
+    
+    def dequeue_many(self, n: int, job_type: Optional[JobType] = None) -> List[Job]:
+        """
+        Claim up to ``n`` of the oldest queued jobs in one statement.
+        
+        Args:
+            n: Maximum number of jobs to claim
+            job_type: Optional job type filter
+            
+        Returns:
+            Claimed jobs, oldest first, already marked running
+        """
+        if n <= 0:
+            return []
+        
+        subquery = "SELECT job_id FROM jobs WHERE status = ?"
+        sub_params: List[Any] = [JobStatus.QUEUED.value]
+        if job_type:
+            subquery += " AND job_type = ?"
+            sub_params.append(job_type.value)
+        subquery += " ORDER BY created_at ASC LIMIT ?"
+        sub_params.append(n)
+        claim = [JobStatus.RUNNING.value, datetime.utcnow().isoformat()]
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._connection()
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            # One statement: selecting and marking the jobs happen under the same write lock
+            rows = conn.execute(
+                f"UPDATE jobs SET status = ?, started_at = ? WHERE job_id IN ({subquery}) "
+                f"RETURNING {self._COLUMNS}",
+                [*claim, *sub_params],
+            ).fetchall()
+        else:  # pragma: no cover - RETURNING needs SQLite 3.35
+            rows = self._claim_in_transaction(conn, subquery, sub_params, claim)
         
+        jobs = [self._row_to_job(row) for row in rows]
+        jobs.sort(key=lambda job: job.created_at)
+        return jobs
+    
+    def _claim_in_transaction(
+        self,
+        conn: sqlite3.Connection,
+        subquery: str,
+        sub_params: List[Any],
+        claim: List[Any],
+    ) -> List[tuple]:
+        """Claim jobs inside a write transaction on SQLite without RETURNING."""
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            query = """
-                SELECT * FROM jobs 
-                WHERE status = ? 
-                ORDER BY created_at ASC 
-                LIMIT 1
-            """
-            
-            cursor.execute(query, (JobStatus.QUEUED.value,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            # Parse row
-            job = self._row_to_job(row)
-            
-            if job_type and job.job_type != job_type:
-                return None
-            
-            # Update status
-            job.status = JobStatus.RUNNING
-            job.started_at = datetime.utcnow()
-            self.update_job(job)
-            
-            return job
-        finally:
-            conn.close()
+            job_ids = [row[0] for row in conn.execute(subquery, sub_params).fetchall()]
+            rows: List[tuple] = []
+            if job_ids:
+                placeholders = ", ".join("?" for _ in job_ids)
+                conn.execute(
+                    f"UPDATE jobs SET status = ?, started_at = ? WHERE job_id IN ({placeholders})",
+                    [*claim, *job_ids],
+                )
+                rows = conn.execute(
+                    f"SELECT {self._COLUMNS} FROM jobs WHERE job_id IN ({placeholders})", job_ids
+                ).fetchall()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+    
+    def qsize(self, job_type: Optional[JobType] = None) -> int:
+        """Number of queued jobs, counted from the status index."""
+        query = "SELECT COUNT(*) FROM jobs WHERE status = ?"
+        params: List[Any] = [JobStatus.QUEUED.value]
+        if job_type:
+            query += " AND job_type = ?"
+            params.append(job_type.value)
+        return self._connection().execute(query, params).fetchone()[0]
     
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
-        import sqlite3
-        import json
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            return self._row_to_job(row)
-        finally:
-            conn.close()
+        row = self._connection().execute(
+            f"SELECT {self._COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
     
     def update_job(self, job: Job) -> None:
         """Update job."""
@@ -368,38 +567,25 @@ class SQLiteJobQueue(JobQueue):
         limit: int = 100,
     ) -> List[Job]:
         """List jobs."""
-        import sqlite3
-        import json
+        query = f"SELECT {self._COLUMNS} FROM jobs WHERE 1=1"
+        params: List[Any] = []
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if tenant_id:
+            query += " AND tenant_id = ?"
+            params.append(tenant_id)
         
-        try:
-            query = "SELECT * FROM jobs WHERE 1=1"
-            params = []
-            
-            if tenant_id:
-                query += " AND tenant_id = ?"
-                params.append(tenant_id)
-            
-            if status:
-                query += " AND status = ?"
-                params.append(status.value)
-            
-            query += " ORDER BY created_at DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            return [self._row_to_job(row) for row in rows]
-        finally:
-            conn.close()
+        if status:
+            query += " AND status = ?"
+            params.append(status.value)
+        
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        
+        rows = self._connection().execute(query, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
     
     def _row_to_job(self, row: tuple) -> Job:
         """Convert database row to Job."""
-        import json
-        
         return Job(
             job_id=row[0],
             job_type=JobType(row[1]),
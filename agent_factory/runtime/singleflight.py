@@ -0,0 +1,114 @@
+"""
+Singleflight coalescing of identical concurrent calls.
+
+While a call for a key is in flight, later callers with the same key wait on
+the first call's future instead of starting their own. Futures are
+``concurrent.futures.Future`` so waiters on other event loops or threads
+(e.g. the sync API's background loop and an API server loop) share them too.
+
+Cancellation belongs to the cancelled caller only. If the leader is
+cancelled, its followers start over: one of them becomes the new leader and
+the others wait on it. A cancelled follower stops waiting without affecting
+the shared call.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """Published to followers when the leader was cancelled before finishing."""
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for coalesced calls."""
+    executed: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+
+
+class SingleFlight:
+    """
+    Keyed table of in-flight calls.
+    
+    Example:
+        >>> flight = SingleFlight()
+        >>> result, shared = await flight.do(key, lambda: agent.arun(text))
+    """
+    
+    def __init__(self):
+        """Initialize the in-flight table."""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = SingleFlightStats()
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Run ``func`` unless a call with the same key is already in flight.
+        
+        Args:
+            key: Call key
+            func: Zero-argument coroutine function to run as the leader
+        
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            waited on another caller's call
+        
+        Raises:
+            Exception: Whatever the leader's call raised
+        """
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    self._calls[key] = future
+                    self.stats.executed += 1
+                    self.stats.in_flight += 1
+                    break
+                self.stats.coalesced += 1
+            
+            waiter = asyncio.wrap_future(future)
+            # Retrieve the outcome even if this follower stops waiting, so it is not logged as unhandled
+            waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+            try:
+                # Shielded so a cancelled follower does not cancel the shared future
+                return await asyncio.shield(waiter), True
+            except _LeaderCancelled:
+                continue
+        
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            self._finish(key)
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            self._finish(key)
+            future.set_exception(e)
+            raise
+        
+        # Remove the key before publishing so later callers start a fresh call
+        self._finish(key)
+        future.set_result(result)
+        return result, False
+    
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+            self.stats.in_flight -= 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics."""
+        with self._lock:
+            return {
+                "executed": self.stats.executed,
+                "coalesced": self.stats.coalesced,
+                "in_flight": self.stats.in_flight,
+            }
@@ -0,0 +1,290 @@
+"""
+Tool-calling loop and concurrent tool execution for agent runs.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agent_factory.core.exceptions import AgentExecutionError
+from agent_factory.tools.base import Tool
+
+
+class ToolExecutor:
+    """
+    Execute the tool calls of one model turn concurrently.
+
+    Sync tools run in a bounded thread pool, async tools run natively on the
+    event loop. Wall time for a turn follows the slowest tool, not the sum.
+
+    Note:
+        A timed-out sync tool cannot be interrupted; its thread keeps its
+        pool slot until the implementation returns.
+
+    Example:
+        >>> executor = ToolExecutor(max_workers=8, timeout=10.0)
+        >>> records = await executor.execute(tool_calls, {"web_search": search_tool})
+    """
+
+    def __init__(self, max_workers: int = 8, timeout: Optional[float] = 30.0):
+        """
+        Initialize tool executor.
+
+        Args:
+            max_workers: Maximum number of sync tools running at once
+            timeout: Default per-tool timeout in seconds (None disables it)
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-tool")
+
+    async def execute(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        tools: Dict[str, Tool],
+        timeout: Optional[float] = None,
+        iteration: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls concurrently.
+
+        Args:
+            tool_calls: Tool calls as returned by a provider client
+            tools: Available tools by ID
+            timeout: Per-tool timeout override in seconds
+            iteration: Tool-loop iteration, recorded on each result
+
+        Returns:
+            One record per call, in call order, with status, output and timing
+        """
+        batch_start = time.time()
+        return list(await asyncio.gather(*(
+            self._execute_one(call, tools, timeout or self.timeout, iteration, batch_start)
+            for call in tool_calls
+        )))
+
+    async def _execute_one(
+        self,
+        call: Dict[str, Any],
+        tools: Dict[str, Tool],
+        timeout: Optional[float],
+        iteration: int,
+        batch_start: float,
+    ) -> Dict[str, Any]:
+        """Execute a single tool call and build its record."""
+        start = time.time()
+        record: Dict[str, Any] = {
+            "id": call.get("id"),
+            "name": call.get("name"),
+            "arguments": None,
+            "iteration": iteration,
+            "started_at": round(start - batch_start, 6),
+        }
+
+        try:
+            arguments = self._parse_arguments(call)
+            record["arguments"] = arguments
+
+            tool = tools.get(call.get("name"))
+            if tool is None:
+                raise AgentExecutionError(f"Unknown tool: {call.get('name')}")
+
+            if tool.is_async:
+                awaitable = tool.aexecute(**arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                awaitable = loop.run_in_executor(self._pool, lambda: tool.execute(**arguments))
+
+            result = await asyncio.wait_for(awaitable, timeout=timeout)
+            record["status"] = "success"
+            record["output"] = self._to_content(result)
+        except asyncio.TimeoutError:
+            record["status"] = "timeout"
+            record["error"] = f"Tool {call.get('name')} timed out after {timeout}s"
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+
+        record["execution_time"] = time.time() - start
+        return record
+
+    @staticmethod
+    def _parse_arguments(call: Dict[str, Any]) -> Dict[str, Any]:
+        """Get call arguments as a dict (OpenAI sends JSON, Anthropic a dict)."""
+        arguments = call.get("input", call.get("arguments"))
+        if arguments is None or arguments == "":
+            return {}
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments)
+        if not isinstance(arguments, dict):
+            raise AgentExecutionError(f"Tool arguments must be an object, got {type(arguments).__name__}")
+        return arguments
+
+    @staticmethod
+    def _to_content(result: Any) -> str:
+        """Render a tool result as message content for the model."""
+        if isinstance(result, str):
+            return result
+        try:
+            return json.dumps(result, default=str)
+        except (TypeError, ValueError):
+            return str(result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the tool thread pool."""
+        self._pool.shutdown(wait=wait)
+
+
+async def run_tool_loop(
+    client: Any,
+    request: Dict[str, Any],
+    tools: List[Tool],
+    executor: Optional["ToolExecutor"] = None,
+    max_iterations: int = 10,
+    tool_timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Call the model, run requested tools, and feed results back until it answers.
+
+    Args:
+        client: Provider client with ``arun_agent`` and ``build_tool_messages``
+        request: Keyword arguments for ``client.arun_agent``
+        tools: Tools available to the model
+        executor: Tool executor (defaults to the shared executor)
+        max_iterations: Maximum number of tool-executing turns
+        tool_timeout: Per-tool timeout override in seconds
+
+    Returns:
+        Dictionary with output, tool_calls (execution records), tokens_used,
+        and iterations
+
+    Raises:
+        AgentExecutionError: If the model keeps calling tools past max_iterations
+    """
+    executor = executor or get_tool_executor()
+    tools_by_id = {tool.id: tool for tool in tools}
+    tool_messages: List[Dict[str, Any]] = []
+    records: List[Dict[str, Any]] = []
+    tokens_used = 0
+    iteration = 0
+
+    while True:
+        response = await client.arun_agent(**request, tool_messages=tool_messages or None)
+        tokens_used += response.get("tokens_used", 0) or 0
+        calls = response.get("tool_calls") or []
+
+        if not calls or not tools_by_id:
+            return {
+                "output": response.get("output", ""),
+                "tool_calls": records,
+                "tokens_used": tokens_used,
+                "iterations": iteration,
+            }
+
+        if iteration >= max_iterations:
+            raise AgentExecutionError(
+                f"Tool loop exceeded max_iterations ({max_iterations}) without a final answer"
+            )
+
+        iteration += 1
+        turn_records = await executor.execute(calls, tools_by_id, timeout=tool_timeout, iteration=iteration)
+        records.extend(turn_records)
+        tool_messages.extend(client.build_tool_messages(response, turn_records))
+
+
+async def stream_tool_loop(
+    client: Any,
+    request: Dict[str, Any],
+    tools: List[Tool],
+    executor: Optional["ToolExecutor"] = None,
+    max_iterations: int = 10,
+    tool_timeout: Optional[float] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of :func:`run_tool_loop`.
+
+    Args:
+        client: Provider client with ``astream_events`` and ``build_tool_messages``
+        request: Keyword arguments for ``client.astream_events``
+        tools: Tools available to the model
+        executor: Tool executor (defaults to the shared executor)
+        max_iterations: Maximum number of tool-executing turns
+        tool_timeout: Per-tool timeout override in seconds
+
+    Yields:
+        ``token``, ``tool_call`` and ``tool_result`` events as they happen, then
+        one ``completed`` event with output, tool_calls, tokens_used and iterations
+
+    Raises:
+        AgentExecutionError: If the model keeps calling tools past max_iterations
+    """
+    executor = executor or get_tool_executor()
+    tools_by_id = {tool.id: tool for tool in tools}
+    tool_messages: List[Dict[str, Any]] = []
+    records: List[Dict[str, Any]] = []
+    tokens_used = 0
+    iteration = 0
+
+    while True:
+        response: Dict[str, Any] = {}
+        async for event in client.astream_events(**request, tool_messages=tool_messages or None):
+            if event.get("type") == "response":
+                response = event
+            else:
+                yield event
+
+        tokens_used += response.get("tokens_used", 0) or 0
+        calls = response.get("tool_calls") or []
+
+        if not calls or not tools_by_id:
+            yield {
+                "type": "completed",
+                "output": response.get("output", ""),
+                "tool_calls": records,
+                "tokens_used": tokens_used,
+                "iterations": iteration,
+            }
+            return
+
+        if iteration >= max_iterations:
+            raise AgentExecutionError(
+                f"Tool loop exceeded max_iterations ({max_iterations}) without a final answer"
+            )
+
+        iteration += 1
+        for call in calls:
+            yield {
+                "type": "tool_call",
+                "id": call.get("id"),
+                "name": call.get("name"),
+                "iteration": iteration,
+            }
+
+        turn_records = await executor.execute(calls, tools_by_id, timeout=tool_timeout, iteration=iteration)
+        for record in turn_records:
+            yield {"type": "tool_result", **record}
+
+        records.extend(turn_records)
+        tool_messages.extend(client.build_tool_messages(response, turn_records))
+
+
+# Shared tool executor
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """
+    Get the shared tool executor.
+
+    Returns:
+        Tool executor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ToolExecutor()
+        return _executor
@@ -2,15 +2,31 @@
 Worker for processing jobs from the queue.
 """
 
+import dataclasses
+import logging
+import multiprocessing
+import queue
 import time
 import threading
-from typing import Optional, Callable
-from datetime import datetime
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Callable, Tuple
+from datetime import datetime, timedelta
 
-from agent_factory.runtime.jobs import Job, JobQueue, JobStatus, JobType, get_job_queue
+from agent_factory.monitoring.metrics import MetricsCollector
+from agent_factory.runtime.jobs import (
+    InMemoryJobQueue,
+    Job,
+    JobQueue,
+    JobStatus,
+    JobType,
+    get_job_queue,
+)
 from agent_factory.runtime.engine import RuntimeEngine
 from agent_factory.telemetry.collector import get_collector
 
+logger = logging.getLogger(__name__)
+
 
 class Worker:
     """
@@ -85,98 +101,574 @@ class Worker:
         Args:
             job: Job to process
         """
-        collector = get_collector()
+        try:
+            _execute_job(self.runtime_engine, job)
+        finally:
+            _finish_job(self.job_queue, job)
+
+
+class WorkerPool:
+    """
+    Pool of workers processing jobs from the queue concurrently.
+    
+    A dispatcher thread claims jobs in batches for idle slots. Each slot
+    runs its job in the pool's own process (``mode="thread"``, for
+    I/O-bound LLM jobs) or hands it to a dedicated child process
+    (``mode="process"``, for CPU-heavy jobs), so a job that overruns its
+    deadline or crashes its process only affects that slot.
+    
+    Deadlines are only hard in process mode, where the child process is
+    killed. Threads cannot be killed: in thread mode a job that overruns
+    its deadline is failed, but its slot stays busy until the job's
+    thread returns, so the pool never runs more than ``concurrency`` jobs.
+    
+    Running jobs carry a heartbeat (``metadata["heartbeat_at"]``) that the
+    pool refreshes while they run. Jobs whose heartbeat stopped, because
+    the pool or process holding them died, are re-queued by any pool
+    sharing the queue, up to the job's ``max_retries``.
+    
+    Example:
+        >>> pool = WorkerPool(runtime_engine=runtime, concurrency=16, job_timeout=300)
+        >>> pool.start()
+        >>> pool.get_metrics()["throughput"]
+        >>> pool.stop(timeout=60)  # finish in-flight jobs, re-queue unstarted ones
+    """
+    
+    def __init__(
+        self,
+        runtime_engine: Optional[RuntimeEngine] = None,
+        job_queue: Optional[JobQueue] = None,
+        concurrency: int = 4,
+        mode: str = "thread",
+        engine_factory: Optional[Callable[[], RuntimeEngine]] = None,
+        job_type: Optional[JobType] = None,
+        job_timeout: Optional[float] = None,
+        poll_interval: float = 0.5,
+        heartbeat_interval: float = 10.0,
+        heartbeat_timeout: float = 60.0,
+        mp_context: Optional[str] = None,
+        pool_id: Optional[str] = None,
+    ):
+        """
+        Initialize worker pool.
+        
+        Args:
+            runtime_engine: Runtime engine for thread mode
+            job_queue: Job queue (defaults to global queue)
+            concurrency: Number of jobs processed at once
+            mode: "thread" or "process"
+            engine_factory: Picklable callable creating a runtime engine;
+                required for process mode, where each child process calls it once
+            job_type: Only process jobs of this type
+            job_timeout: Default per-job deadline in seconds; a job's
+                ``metadata["timeout"]`` overrides it
+            poll_interval: Seconds to wait before polling an empty queue again
+            heartbeat_interval: Seconds between heartbeats of running jobs
+            heartbeat_timeout: Seconds without a heartbeat after which a
+                running job is considered abandoned and re-queued
+            mp_context: Multiprocessing start method for process mode;
+                defaults to "forkserver" where available, else "spawn",
+                since forking a process that runs threads is unsafe
+            pool_id: Identifier written into job heartbeats and metrics
+        
+        Raises:
+            ValueError: If the mode is unknown or lacks an engine
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool mode: {mode}")
+        if mode == "process" and engine_factory is None:
+            raise ValueError("Process mode requires an engine_factory")
+        if mode == "thread" and runtime_engine is None:
+            if engine_factory is None:
+                raise ValueError("Thread mode requires a runtime_engine or engine_factory")
+            runtime_engine = engine_factory()
+        
+        self.runtime_engine = runtime_engine
+        self.job_queue = job_queue or get_job_queue()
+        self.concurrency = max(1, concurrency)
+        self.mode = mode
+        self.engine_factory = engine_factory
+        self.job_type = job_type
+        self.job_timeout = job_timeout
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.pool_id = pool_id or f"pool-{uuid.uuid4().hex[:8]}"
+        if mp_context is None:
+            mp_context = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._mp = multiprocessing.get_context(mp_context)
+        
+        self.running = False
+        self._stopping = threading.Event()
+        self._lock = threading.Condition()
+        self._active: Dict[str, Job] = {}  # claimed jobs, until finished or re-queued
+        self._free = self.concurrency
+        self._handoff: "queue.Queue[Job]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._slots: List[_ProcessSlot] = []
+        self._finished: Deque[float] = deque()  # completion times within the throughput window
+        self._counts = {"completed": 0, "failed": 0, "requeued": 0}
+        self.throughput_window = 60.0
+    
+    def start(self) -> None:
+        """Start the dispatcher, slots and heartbeat monitor."""
+        if self.running:
+            return
         
+        self.running = True
+        self._stopping.clear()
+        self._free = self.concurrency
+        self._handoff = queue.Queue()
+        self._threads = [threading.Thread(target=self._dispatch, name=f"{self.pool_id}-dispatch", daemon=True)]
+        for i in range(self.concurrency):
+            slot = _ProcessSlot(self._mp, self.engine_factory) if self.mode == "process" else None
+            if slot is not None:
+                self._slots.append(slot)
+            self._threads.append(
+                threading.Thread(target=self._run_slot, args=(slot,), name=f"{self.pool_id}-slot-{i}", daemon=True)
+            )
+        self._monitor = threading.Thread(target=self._run_monitor, name=f"{self.pool_id}-monitor", daemon=True)
+        for thread in self._threads + [self._monitor]:
+            thread.start()
+    
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """
+        Stop claiming jobs and drain.
+        
+        Jobs already claimed keep running for up to ``timeout`` seconds.
+        Claimed jobs that have not started by then are re-queued without
+        counting a retry. In process mode, jobs still running are killed
+        with their child processes and re-queued the same way. In thread
+        mode they cannot be killed, so they stay claimed: their heartbeats
+        keep being refreshed and their results are stored when their
+        threads return, so no job is run twice.
+        
+        Args:
+            timeout: Seconds to wait for in-flight jobs (None waits for all)
+        """
+        if not self.running:
+            return
+        
+        self._stopping.set()
+        with self._lock:
+            self._lock.notify_all()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        # The dispatcher returns within a poll interval; after it, no new jobs are handed off
+        self._threads[0].join()
+        for thread in self._threads[1:]:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._handoff.get_nowait())
+            except queue.Empty:
+                break
+        if self.mode == "process":
+            handed_off = {job.job_id for job in leftover}
+            with self._lock:
+                leftover.extend(job for job in self._active.values() if job.job_id not in handed_off)
+        for job in leftover:
+            if self._release(job):
+                self._requeue(job, "Worker pool stopped", count_retry=False)
+        
+        for slot in self._slots:
+            slot.close()
+        self._slots = []
+        self._monitor.join(timeout=self.heartbeat_interval)
+        self.running = False
+        MetricsCollector.set_worker_active_jobs(self.pool_id, len(self._active))
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get pool metrics.
+        
+        Returns:
+            Queue depth, active jobs, finished counts and throughput
+            (jobs per second over the last ``throughput_window`` seconds)
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._finished and self._finished[0] < now - self.throughput_window:
+                self._finished.popleft()
+            metrics = {
+                "pool_id": self.pool_id,
+                "mode": self.mode,
+                "concurrency": self.concurrency,
+                "active_jobs": len(self._active),
+                "throughput": len(self._finished) / self.throughput_window,
+                **self._counts,
+            }
         try:
-            if job.job_type == JobType.AGENT_RUN:
-                # Run agent
-                input_text = job.input_data.get("input_text", "")
-                session_id = job.input_data.get("session_id")
-                context = job.input_data.get("context")
-                
-                execution_id = self.runtime_engine.run_agent(
-                    agent_id=job.resource_id,
-                    input_text=input_text,
-                    session_id=session_id,
-                    context=context,
-                )
-                
-                execution = self.runtime_engine.get_execution(execution_id)
-                
-                if execution:
-                    job.result = {
-                        "execution_id": execution_id,
-                        "output": execution.result.output if execution.result else None,
-                        "status": execution.status,
-                        "execution_time": execution.result.execution_time if execution.result else 0.0,
-                    }
-                    job.status = JobStatus.COMPLETED
+            metrics["queue_depth"] = self.job_queue.qsize(self.job_type)
+        except Exception:
+            metrics["queue_depth"] = None
+        return metrics
+    
+    def requeue_stale_jobs(self) -> int:
+        """
+        Re-queue running jobs whose heartbeat stopped.
+        
+        Only jobs claimed by a worker pool carry heartbeats; jobs of this
+        pool are never considered stale.
+        
+        Returns:
+            Number of jobs re-queued or failed after their last retry
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.heartbeat_timeout)
+        count = 0
+        for job in self.job_queue.list_jobs(status=JobStatus.RUNNING, limit=10_000):
+            heartbeat = job.metadata.get("heartbeat_at")
+            if not heartbeat or datetime.fromisoformat(heartbeat) > cutoff:
+                continue
+            with self._lock:
+                if job.job_id in self._active:
+                    continue
+            current = self.job_queue.get_job(job.job_id)  # re-read to narrow races with other pools
+            if current is None or current.status != JobStatus.RUNNING or current.metadata.get("heartbeat_at") != heartbeat:
+                continue
+            self._requeue(current, f"Heartbeat lost (worker {current.metadata.get('worker_id')})")
+            count += 1
+        return count
+    
+    def _dispatch(self) -> None:
+        """Claim jobs for idle slots until stopped."""
+        blocking = isinstance(self.job_queue, InMemoryJobQueue)
+        while not self._stopping.is_set():
+            with self._lock:
+                self._lock.wait_for(lambda: self._free > 0 or self._stopping.is_set(), self.poll_interval)
+                free = self._free
+            if free <= 0 or self._stopping.is_set():
+                continue
+            
+            try:
+                if blocking:
+                    # Wake as soon as a job arrives instead of sleeping a full interval
+                    first = self.job_queue.dequeue(self.job_type, timeout=self.poll_interval)
+                    jobs = [first] + self.job_queue.dequeue_many(free - 1, self.job_type) if first else []
                 else:
-                    job.status = JobStatus.FAILED
-                    job.error = "Execution not found"
+                    jobs = self.job_queue.dequeue_many(free, self.job_type)
+            except Exception:
+                logger.exception("Worker pool error")
+                jobs = []
             
-            elif job.job_type == JobType.WORKFLOW_RUN:
-                # Run workflow
-                context = job.input_data.get("context", {})
-                
-                execution_id = self.runtime_engine.run_workflow(
-                    workflow_id=job.resource_id,
-                    context=context,
-                )
-                
-                execution = self.runtime_engine.get_execution(execution_id)
-                
-                if execution:
-                    job.result = {
-                        "execution_id": execution_id,
-                        "output": execution.result.output if execution.result else None,
-                        "status": execution.status,
-                        "execution_time": execution.result.execution_time if execution.result else 0.0,
-                    }
-                    job.status = JobStatus.COMPLETED
+            if not jobs:
+                if not blocking:
+                    self._stopping.wait(self.poll_interval)
+                continue
+            
+            now = datetime.utcnow().isoformat()
+            for job in jobs:
+                job.metadata["heartbeat_at"] = now
+                job.metadata["worker_id"] = self.pool_id
+                with self._lock:
+                    self._active[job.job_id] = job
+                    self._free -= 1
+                self.job_queue.update_job(job)
+                self._handoff.put(job)
+    
+    def _run_slot(self, slot: Optional["_ProcessSlot"]) -> None:
+        """Process handed-off jobs until stopped and drained."""
+        while True:
+            try:
+                job = self._handoff.get(timeout=0.1)
+            except queue.Empty:
+                if self._stopping.is_set() and not self._threads[0].is_alive() and self._handoff.empty():
+                    return
+                continue
+            
+            timeout = job.metadata.get("timeout", self.job_timeout)
+            # Work on a copy so heartbeats keep writing the claimed state
+            work = dataclasses.replace(job, metadata=dict(job.metadata))
+            runaway = None
+            try:
+                if slot is not None:
+                    outcome = slot.run(work, timeout)
                 else:
-                    job.status = JobStatus.FAILED
-                    job.error = "Execution not found"
+                    outcome, runaway = self._run_in_thread(work, timeout)
+            except Exception as e:
+                outcome = f"Worker error: {e}"
             
+            if isinstance(outcome, Job):
+                self._complete(job, outcome)
+            elif outcome == _CRASHED:
+                self._release(job, requeue="Worker process crashed")
             else:
-                job.status = JobStatus.FAILED
-                job.error = f"Unknown job type: {job.job_type}"
+                work.status = JobStatus.FAILED
+                work.error = outcome
+                self._complete(job, work)
             
-        except Exception as e:
+            if runaway is not None:
+                # The job is failed, but keep its slot busy until its thread returns
+                runaway.join()
+            with self._lock:
+                self._free += 1
+                self._lock.notify_all()
+    
+    def _run_in_thread(self, work: Job, timeout: Optional[float]) -> Tuple[Any, Optional[threading.Thread]]:
+        """
+        Run a job in this process, giving up on it at the deadline.
+        
+        Returns:
+            The outcome and, if the deadline passed, the still running thread
+        """
+        if timeout is None:
+            _execute_job(self.runtime_engine, work)
+            return work, None
+        
+        thread = threading.Thread(
+            target=_execute_job, args=(self.runtime_engine, work), name=f"{self.pool_id}-job-{work.job_id}", daemon=True,
+        )
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            # Threads cannot be killed; the job's result is discarded when it finishes
+            return f"Job deadline of {timeout}s exceeded", thread
+        return work, None
+    
+    def _complete(self, job: Job, outcome: Job) -> None:
+        """Store a finished job, unless it was re-queued meanwhile."""
+        if not self._release(job):
+            return
+        job.status, job.result, job.error = outcome.status, outcome.result, outcome.error
+        for key in ("heartbeat_at", "worker_id"):
+            job.metadata.pop(key, None)
+        _finish_job(self.job_queue, job)
+        
+        status = "completed" if job.status == JobStatus.COMPLETED else "failed"
+        with self._lock:
+            self._counts[status] += 1
+            self._finished.append(time.monotonic())
+        MetricsCollector.record_worker_job(self.pool_id, status)
+    
+    def _release(self, job: Job, requeue: Optional[str] = None) -> bool:
+        """Drop the pool's claim on a job; False if it was already released."""
+        with self._lock:
+            owned = self._active.pop(job.job_id, None) is not None
+        if owned and requeue:
+            self._requeue(job, requeue)
+        return owned
+    
+    def _requeue(self, job: Job, reason: str, count_retry: bool = True) -> None:
+        """Put a job back in the queue, or fail it after its last retry."""
+        for key in ("heartbeat_at", "worker_id"):
+            job.metadata.pop(key, None)
+        job.error = reason
+        if count_retry:
+            job.retry_count += 1
+        if job.retry_count > job.max_retries:
             job.status = JobStatus.FAILED
-            job.error = str(e)
+            job.completed_at = datetime.utcnow()
+            status = "failed"
+        else:
+            job.status = JobStatus.QUEUED
+            job.started_at = None
+            status = "requeued"
+        self.job_queue.update_job(job)
+        with self._lock:
+            self._counts[status] += 1
+        MetricsCollector.record_worker_job(self.pool_id, status)
+    
+    def _run_monitor(self) -> None:
+        """
+        Refresh heartbeats, re-queue abandoned jobs and publish gauges.
+        
+        After ``stop()`` only heartbeats are refreshed, until the jobs left
+        running in threads have finished.
+        """
+        stopping = False
+        while True:
+            if stopping:
+                with self._lock:
+                    # Slots notify when they free up, so this returns once the last job finishes
+                    self._lock.wait_for(lambda: not self._active, self.heartbeat_interval)
+            else:
+                stopping = self._stopping.wait(self.heartbeat_interval)
+            try:
+                now = datetime.utcnow().isoformat()
+                with self._lock:
+                    if stopping and not self._active:
+                        return
+                    # Under the lock so a heartbeat never overwrites a finished job
+                    for job in self._active.values():
+                        job.metadata["heartbeat_at"] = now
+                        self.job_queue.update_job(job)
+                if stopping:
+                    continue
+                self.requeue_stale_jobs()
+                
+                metrics = self.get_metrics()
+                MetricsCollector.set_worker_active_jobs(self.pool_id, metrics["active_jobs"])
+                if metrics["queue_depth"] is not None:
+                    MetricsCollector.set_job_queue_depth(metrics["queue_depth"])
+            except Exception:
+                logger.exception("Worker pool monitor error")
+
+
+_CRASHED = "crashed"
+
+
+class _ProcessSlot:
+    """Child process that runs one job at a time for a worker pool slot."""
+    
+    def __init__(self, mp_context: Any, engine_factory: Callable[[], RuntimeEngine]):
+        self._mp = mp_context
+        self._engine_factory = engine_factory
+        self._process = None
+        self._conn = None
+    
+    def run(self, job: Job, timeout: Optional[float]) -> Any:
+        """Run a job; returns the processed job, ``_CRASHED`` or a deadline error."""
+        if self._process is None or not self._process.is_alive():
+            self._spawn()
+        try:
+            self._conn.send(job)
+            if not self._conn.poll(timeout):
+                self._kill()
+                return f"Job deadline of {timeout}s exceeded"
+            return self._conn.recv()
+        except (EOFError, OSError):
+            self._kill()
+            return _CRASHED
+    
+    def close(self) -> None:
+        """Stop the child process."""
+        if self._process is not None and self._process.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._process.join(timeout=1.0)
+        self._kill()
+    
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._mp.Pipe()
+        self._process = self._mp.Process(target=_process_slot_main, args=(self._engine_factory, child_conn), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+    
+    def _kill(self) -> None:
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process.join(timeout=1.0)
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+
+def _process_slot_main(engine_factory: Callable[[], RuntimeEngine], conn: Any) -> None:
+    """Child process loop: run jobs received over the pipe with one engine."""
+    engine = engine_factory()
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        _execute_job(engine, job)
+        conn.send(job)
+
+
+def _execute_job(runtime_engine: RuntimeEngine, job: Job) -> None:
+    """Run a job on the runtime engine, setting its result, status and error."""
+    collector = get_collector()
+    
+    try:
+        if job.job_type == JobType.AGENT_RUN:
+            # Run agent
+            input_text = job.input_data.get("input_text", "")
+            session_id = job.input_data.get("session_id")
+            context = job.input_data.get("context")
             
-            # Record error in telemetry
-            collector.record_error(
-                error_type=type(e).__name__,
-                error_message=str(e),
-                tenant_id=job.tenant_id,
-                user_id=job.user_id,
-                project_id=job.project_id,
-                resource_type=job.job_type.value,
-                resource_id=job.resource_id,
+            execution_id = runtime_engine.run_agent(
+                agent_id=job.resource_id,
+                input_text=input_text,
+                session_id=session_id,
+                context=context,
             )
+            
+            execution = runtime_engine.get_execution(execution_id)
+            
+            if execution:
+                job.result = {
+                    "execution_id": execution_id,
+                    "output": execution.result.output if execution.result else None,
+                    "status": execution.status,
+                    "execution_time": execution.result.execution_time if execution.result else 0.0,
+                }
+                job.status = JobStatus.COMPLETED
+            else:
+                job.status = JobStatus.FAILED
+                job.error = "Execution not found"
         
-        finally:
-            job.completed_at = datetime.utcnow()
-            self.job_queue.update_job(job)
+        elif job.job_type == JobType.WORKFLOW_RUN:
+            # Run workflow
+            context = job.input_data.get("context", {})
             
-            # Record telemetry
-            if job.job_type == JobType.AGENT_RUN and job.status == JobStatus.COMPLETED:
-                collector.record_agent_run(
-                    agent_id=job.resource_id,
-                    tenant_id=job.tenant_id,
-                    user_id=job.user_id,
-                    project_id=job.project_id,
-                    status="completed" if job.status == JobStatus.COMPLETED else "failed",
-                    execution_time=job.result.get("execution_time", 0.0) if job.result else 0.0,
-                )
-            elif job.job_type == JobType.WORKFLOW_RUN and job.status == JobStatus.COMPLETED:
-                collector.record_workflow_run(
-                    workflow_id=job.resource_id,
-                    tenant_id=job.tenant_id,
-                    user_id=job.user_id,
-                    project_id=job.project_id,
-                    status="completed" if job.status == JobStatus.COMPLETED else "failed",
-                    execution_time=job.result.get("execution_time", 0.0) if job.result else 0.0,
-                )
+            execution_id = runtime_engine.run_workflow(
+                workflow_id=job.resource_id,
+                context=context,
+            )
+            
+            execution = runtime_engine.get_execution(execution_id)
+            
+            if execution:
+                job.result = {
+                    "execution_id": execution_id,
+                    "output": execution.result.output if execution.result else None,
+                    "status": execution.status,
+                    "execution_time": execution.result.execution_time if execution.result else 0.0,
+                }
+                job.status = JobStatus.COMPLETED
+            else:
+                job.status = JobStatus.FAILED
+                job.error = "Execution not found"
+        
+        else:
+            job.status = JobStatus.FAILED
+            job.error = f"Unknown job type: {job.job_type}"
+        
+    except Exception as e:
+        job.status = JobStatus.FAILED
+        job.error = str(e)
+        
+        # Record error in telemetry
+        collector.record_error(
+            error_type=type(e).__name__,
+            error_message=str(e),
+            tenant_id=job.tenant_id,
+            user_id=job.user_id,
+            project_id=job.project_id,
+            resource_type=job.job_type.value,
+            resource_id=job.resource_id,
+        )
+
+
+def _finish_job(job_queue: JobQueue, job: Job) -> None:
+    """Store a processed job and record its telemetry."""
+    collector = get_collector()
+    job.completed_at = datetime.utcnow()
+    job_queue.update_job(job)
+    
+    # Record telemetry
+    if job.job_type == JobType.AGENT_RUN and job.status == JobStatus.COMPLETED:
+        collector.record_agent_run(
+            agent_id=job.resource_id,
+            tenant_id=job.tenant_id,
+            user_id=job.user_id,
+            project_id=job.project_id,
+            status="completed" if job.status == JobStatus.COMPLETED else "failed",
+            execution_time=job.result.get("execution_time", 0.0) if job.result else 0.0,
+        )
+    elif job.job_type == JobType.WORKFLOW_RUN and job.status == JobStatus.COMPLETED:
+        collector.record_workflow_run(
+            workflow_id=job.resource_id,
+            tenant_id=job.tenant_id,
+            user_id=job.user_id,
+            project_id=job.project_id,
+            status="completed" if job.status == JobStatus.COMPLETED else "failed",
+            execution_time=job.result.get("execution_time", 0.0) if job.result else 0.0,
+        )
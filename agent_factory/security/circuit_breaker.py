@@ -26,6 +26,9 @@ class CircuitBreakerConfig:
     success_threshold: int = 2  # Close circuit after N successes
     timeout: float = 60.0  # Seconds before attempting half-open
     expected_exception: type = Exception  # Exception type to catch
+    # Predicate deciding whether a caught exception counts as a failure;
+    # e.g. rate-limit errors are handled by backing off, not by opening
+    is_failure: Optional[Callable[[BaseException], bool]] = None
 
 
 @dataclass
@@ -97,9 +100,50 @@ class CircuitBreaker:
             self._on_success()
             return result
         except self.config.expected_exception as e:
-            self._on_failure()
+            if self.config.is_failure is None or self.config.is_failure(e):
+                self._on_failure()
             raise
-    
+
+    async def call_async(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Await a coroutine function with circuit breaker protection.
+
+        Args:
+            func: Coroutine function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Function result
+
+        Raises:
+            CircuitBreakerOpenError: If circuit is open
+            Exception: Original exception if call fails
+        """
+        with self._lock:
+            self._update_state()
+
+            if self.stats.state == CircuitState.OPEN:
+                from agent_factory.core.exceptions import AgentFactoryError
+                raise AgentFactoryError(
+                    f"Circuit breaker '{self.name}' is OPEN. Service unavailable."
+                )
+
+        try:
+            result = await func(*args, **kwargs)
+            self._on_success()
+            return result
+        except self.config.expected_exception as e:
+            if self.config.is_failure is None or self.config.is_failure(e):
+                self._on_failure()
+            raise
+
+    def is_available(self) -> bool:
+        """Whether a call would be attempted now (the circuit is not open)."""
+        with self._lock:
+            self._update_state()
+            return self.stats.state != CircuitState.OPEN
+
     def _update_state(self) -> None:
         """Update circuit breaker state based on current conditions."""
         current_time = time.time()
@@ -138,6 +138,28 @@ class Tool(ABC):
         except Exception as e:
             raise ToolExecutionError(f"Tool {self.id} execution failed: {str(e)}")
     
+    @property
+    def is_async(self) -> bool:
+        """Whether the implementation is a coroutine function."""
+        return inspect.iscoroutinefunction(self._implementation)
+    
+    async def aexecute(self, **kwargs) -> Any:
+        """
+        Execute a coroutine-function tool with given parameters.
+        
+        Args:
+            **kwargs: Tool parameters
+            
+        Returns:
+            Tool execution result
+        """
+        self.validate(**kwargs)
+        
+        try:
+            return await self._implementation(**kwargs)
+        except Exception as e:
+            raise ToolExecutionError(f"Tool {self.id} execution failed: {str(e)}")
+    
     def __call__(self, *args, **kwargs) -> Any:
         """
         Make tool callable directly.
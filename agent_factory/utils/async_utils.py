@@ -0,0 +1,117 @@
+"""
+Helpers for bridging the synchronous and asyncio execution paths.
+
+The async API (``Agent.arun``, ``RuntimeEngine.arun_agent`` ...) is the
+primary implementation; the sync API drives it on a shared background event
+loop so pooled async HTTP clients stay bound to a single loop.
+"""
+
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+# Strong references to fire-and-forget tasks so they are not garbage collected
+_background_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the shared background event loop, starting it on first use.
+
+    Returns:
+        Event loop running forever in a daemon thread
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="agent-factory-loop",
+                daemon=True,
+            )
+            thread.start()
+            _loop, _loop_thread = loop, thread
+        return _loop
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Safe to call with or without a running event loop in the calling thread
+    (e.g. from a notebook). Inside a running loop the call still blocks that
+    loop until the coroutine finishes, so async code should await the async
+    API (``Agent.arun`` ...) instead.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Coroutine result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+
+    # Called from a running loop: drive the coroutine from a worker thread,
+    # on the shared loop, or on a private loop if this is the shared loop
+    # (blocking it on itself would deadlock)
+    result: dict = {}
+    on_shared_loop = threading.current_thread() is _loop_thread
+
+    def _target() -> None:
+        try:
+            if on_shared_loop:
+                result["value"] = asyncio.run(coro)
+            else:
+                result["value"] = asyncio.run_coroutine_threadsafe(coro, get_background_loop()).result()
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=_target, daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+async def run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking callable in the default executor without blocking the loop.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Callable result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def spawn_background(coro: Coroutine[Any, Any, Any]) -> "asyncio.Task[Any]":
+    """
+    Schedule a coroutine on the running loop without awaiting it.
+
+    Args:
+        coro: Coroutine to run in the background
+
+    Returns:
+        The scheduled task
+    """
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
@@ -10,6 +10,13 @@ from agent_factory.workflows.model import (
     TriggerType,
     Condition,
 )
+from agent_factory.workflows.checkpoint import (
+    WorkflowCheckpoint,
+    CheckpointStore,
+    InMemoryCheckpointStore,
+    SQLiteCheckpointStore,
+)
+from agent_factory.workflows.step_cache import StepCache, get_step_cache
 from agent_factory.workflows.visualizer import to_mermaid, to_graphviz, visualize
 
 __all__ = [
@@ -19,6 +26,12 @@ __all__ = [
     "Trigger",
     "TriggerType",
     "Condition",
+    "WorkflowCheckpoint",
+    "CheckpointStore",
+    "InMemoryCheckpointStore",
+    "SQLiteCheckpointStore",
+    "StepCache",
+    "get_step_cache",
     "to_mermaid",
     "to_graphviz",
     "visualize",
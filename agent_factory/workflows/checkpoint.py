@@ -0,0 +1,260 @@
+"""
+Workflow checkpoints for resuming failed or interrupted runs.
+
+After each step finishes, the workflow saves the initial context, the
+context updates every finished step produced and the steps skipped by
+their condition. Resuming from a checkpoint restores those outputs and
+runs only the steps that did not complete, so a failure late in a
+workflow does not pay again for the steps before it.
+"""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class WorkflowCheckpoint:
+    """Progress of one workflow execution."""
+    execution_id: str
+    workflow_id: str
+    context: Dict[str, Any] = field(default_factory=dict)  # initial context
+    outputs: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # step ID -> context updates
+    skipped: List[str] = field(default_factory=list)  # steps whose condition was false
+    status: str = "running"  # "running", "failed" or "completed"
+    error: Optional[str] = None
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def steps_executed(self) -> List[str]:
+        """Steps that completed, in completion order."""
+        return list(self.outputs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize checkpoint to dictionary."""
+        return {
+            "execution_id": self.execution_id,
+            "workflow_id": self.workflow_id,
+            "context": self.context,
+            "outputs": self.outputs,
+            "steps_executed": self.steps_executed,
+            "skipped": self.skipped,
+            "status": self.status,
+            "error": self.error,
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class CheckpointStore(ABC):
+    """Interface for workflow checkpoint storage."""
+
+    @abstractmethod
+    def save(self, checkpoint: WorkflowCheckpoint) -> None:
+        """Insert or replace a checkpoint."""
+        pass
+
+    @abstractmethod
+    def load(self, execution_id: str) -> Optional[WorkflowCheckpoint]:
+        """Get the checkpoint of an execution."""
+        pass
+
+    @abstractmethod
+    def delete(self, execution_id: str) -> bool:
+        """Delete the checkpoint of an execution."""
+        pass
+
+    @abstractmethod
+    def list(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[WorkflowCheckpoint]:
+        """List checkpoints, most recently updated first."""
+        pass
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store kept in process memory.
+
+    Checkpoints do not survive a restart; useful for tests and for
+    resuming within one process.
+    """
+
+    def __init__(self):
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def save(self, checkpoint: WorkflowCheckpoint) -> None:
+        """Insert or replace a checkpoint."""
+        # Store a serialized copy so later changes to the live checkpoint don't leak in
+        data = json.loads(json.dumps(checkpoint.to_dict(), default=str))
+        with self._lock:
+            self._checkpoints[checkpoint.execution_id] = data
+
+    def load(self, execution_id: str) -> Optional[WorkflowCheckpoint]:
+        """Get the checkpoint of an execution."""
+        with self._lock:
+            data = self._checkpoints.get(execution_id)
+        return _checkpoint_from_dict(data) if data else None
+
+    def delete(self, execution_id: str) -> bool:
+        """Delete the checkpoint of an execution."""
+        with self._lock:
+            return self._checkpoints.pop(execution_id, None) is not None
+
+    def list(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[WorkflowCheckpoint]:
+        """List checkpoints, most recently updated first."""
+        with self._lock:
+            items = list(self._checkpoints.values())
+        items = [
+            data for data in items
+            if (not workflow_id or data["workflow_id"] == workflow_id)
+            and (not status or data["status"] == status)
+        ]
+        items.sort(key=lambda data: data["updated_at"], reverse=True)
+        return [_checkpoint_from_dict(data) for data in items[:limit]]
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    SQLite storage for workflow checkpoints.
+
+    Suitable for local development and single-node deployments.
+    """
+
+    def __init__(self, db_path: str = "./agent_factory/checkpoints.db"):
+        """
+        Initialize SQLite checkpoint store.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def _init_db(self) -> None:
+        """Initialize database tables."""
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS workflow_checkpoints (
+                execution_id TEXT PRIMARY KEY,
+                workflow_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                context TEXT NOT NULL,
+                outputs TEXT NOT NULL,
+                steps_executed TEXT NOT NULL,
+                skipped TEXT NOT NULL,
+                error TEXT,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_checkpoints_workflow_updated
+            ON workflow_checkpoints(workflow_id, updated_at)
+        """)
+        self._conn.commit()
+
+    def save(self, checkpoint: WorkflowCheckpoint) -> None:
+        """Insert or replace a checkpoint."""
+        row = (
+            checkpoint.execution_id,
+            checkpoint.workflow_id,
+            checkpoint.status,
+            json.dumps(checkpoint.context, default=str),
+            json.dumps(checkpoint.outputs, default=str),
+            json.dumps(checkpoint.steps_executed),
+            json.dumps(checkpoint.skipped),
+            checkpoint.error,
+            checkpoint.updated_at.isoformat(),
+        )
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO workflow_checkpoints
+                (execution_id, workflow_id, status, context, outputs,
+                 steps_executed, skipped, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                row,
+            )
+            self._conn.commit()
+
+    def load(self, execution_id: str) -> Optional[WorkflowCheckpoint]:
+        """Get the checkpoint of an execution."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM workflow_checkpoints WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def delete(self, execution_id: str) -> bool:
+        """Delete the checkpoint of an execution."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM workflow_checkpoints WHERE execution_id = ?", (execution_id,)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def list(
+        self,
+        workflow_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[WorkflowCheckpoint]:
+        """List checkpoints, most recently updated first."""
+        query = "SELECT * FROM workflow_checkpoints WHERE 1=1"
+        params: list = []
+
+        if workflow_id:
+            query += " AND workflow_id = ?"
+            params.append(workflow_id)
+
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> WorkflowCheckpoint:
+        data = dict(row)
+        for column in ("context", "outputs", "steps_executed", "skipped"):
+            data[column] = json.loads(data[column])
+        return _checkpoint_from_dict(data)
+
+
+def _checkpoint_from_dict(data: Dict[str, Any]) -> WorkflowCheckpoint:
+    """Rebuild a checkpoint, keeping outputs in completion order."""
+    outputs = data["outputs"]
+    order = data.get("steps_executed") or list(outputs)
+    return WorkflowCheckpoint(
+        execution_id=data["execution_id"],
+        workflow_id=data["workflow_id"],
+        context=data["context"],
+        outputs={step_id: outputs[step_id] for step_id in order if step_id in outputs},
+        skipped=list(data["skipped"]),
+        status=data["status"],
+        error=data.get("error"),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
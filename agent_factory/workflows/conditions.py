@@ -0,0 +1,234 @@
+"""
+Compiled workflow condition expressions.
+
+A condition such as ``$steps.search.output.count > 0 and $status == 'done'``
+is parsed once into a tree of closures. ``$`` paths are resolved straight
+from the context at evaluation time, so evaluation cost depends on the
+expression, not on the size of the context, and values keep their types
+instead of being substituted into the expression as text.
+
+Supported syntax matches :class:`~agent_factory.utils.safe_evaluator.SafeEvaluator`.
+For compatibility with agent outputs, which are strings, a numeric string
+compared with or combined with a number is converted to a number first.
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from agent_factory.utils.safe_evaluator import SafeEvaluator
+
+Evaluator = Callable[[Dict[str, Any]], Any]
+
+_PATH = re.compile(r"\$([A-Za-z_]\w*(?:\.\w+)*)")
+_PLACEHOLDER = "__path_{}"
+
+
+class CompiledCondition:
+    """
+    A condition expression compiled for repeated evaluation.
+
+    Example:
+        >>> condition = compile_condition("$score > 0.5")
+        >>> condition.evaluate({"score": "0.8"})
+        True
+    """
+
+    __slots__ = ("expression", "paths", "_evaluate")
+
+    def __init__(self, expression: str, paths: Tuple[str, ...], evaluate: Evaluator):
+        self.expression = expression
+        self.paths = paths
+        self._evaluate = evaluate
+
+    def __call__(self, context: Dict[str, Any]) -> Any:
+        """Evaluate and return the raw value; errors propagate."""
+        return self._evaluate(context)
+
+    def evaluate(self, context: Dict[str, Any]) -> bool:
+        """Evaluate as a boolean; evaluation errors count as False."""
+        try:
+            return bool(self._evaluate(context))
+        except Exception:
+            return False
+
+
+@lru_cache(maxsize=1024)
+def compile_condition(expression: str) -> CompiledCondition:
+    """
+    Compile a condition expression (cached per expression).
+
+    Args:
+        expression: Condition expression with optional ``$path`` references
+
+    Returns:
+        CompiledCondition
+
+    Raises:
+        ValueError: If the expression is invalid or uses unsupported syntax
+    """
+    if not expression or not isinstance(expression, str):
+        raise ValueError("Expression must be a non-empty string")
+
+    paths: List[str] = []
+
+    def placeholder(match: "re.Match[str]") -> str:
+        paths.append(match.group(1))
+        return _PLACEHOLDER.format(len(paths) - 1)
+
+    source = _PATH.sub(placeholder, expression).strip()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression syntax: {e}")
+
+    resolvers = [_path_resolver(path) for path in paths]
+    return CompiledCondition(expression, tuple(paths), _compile(tree.body, resolvers))
+
+
+def _path_resolver(path: str) -> Evaluator:
+    """
+    Resolve ``a.b.c`` against the context.
+
+    The longest dotted prefix that is a context key wins (step outputs are
+    stored under flat keys such as ``steps.search.output``); the remaining
+    parts walk nested dictionaries. Missing values resolve to None.
+    """
+    parts = path.split(".")
+    splits = tuple(
+        (".".join(parts[:i]), tuple(parts[i:])) for i in range(len(parts), 0, -1)
+    )
+
+    def resolve(context: Dict[str, Any]) -> Any:
+        for key, rest in splits:
+            if key in context:
+                value = context[key]
+                for part in rest:
+                    if not isinstance(value, dict):
+                        return None
+                    value = value.get(part)
+                return value
+        return None
+
+    return resolve
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_number(text: str) -> Any:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def _coerce(left: Any, right: Any) -> Tuple[Any, Any]:
+    """Convert a numeric string to a number when the other operand is one."""
+    if isinstance(left, str) and _is_number(right):
+        return _to_number(left), right
+    if isinstance(right, str) and _is_number(left):
+        return left, _to_number(right)
+    return left, right
+
+
+def _compile(node: ast.AST, resolvers: List[Evaluator]) -> Evaluator:
+    """Compile an AST node into a closure over the context."""
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda context: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name.startswith("__path_"):
+            return resolvers[int(name[len("__path_"):])]
+        if name in SafeEvaluator._SAFE_CONSTANTS:
+            constant = SafeEvaluator._SAFE_CONSTANTS[name]
+            return lambda context: constant
+
+        def lookup(context: Dict[str, Any]) -> Any:
+            if name in context:
+                return context[name]
+            raise ValueError(f"Unknown variable or constant: {name}")
+        return lookup
+
+    if isinstance(node, ast.BinOp):
+        op = SafeEvaluator._OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = _compile(node.left, resolvers), _compile(node.right, resolvers)
+        return lambda context: op(*_coerce(left(context), right(context)))
+
+    if isinstance(node, ast.UnaryOp):
+        op = SafeEvaluator._UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported unary operator: {type(node.op).__name__}")
+        operand = _compile(node.operand, resolvers)
+        return lambda context: op(operand(context))
+
+    if isinstance(node, ast.Compare):
+        first = _compile(node.left, resolvers)
+        chain = []
+        for op_node, comparator in zip(node.ops, node.comparators):
+            op = SafeEvaluator._COMPARATORS.get(type(op_node))
+            if op is None:
+                raise ValueError(f"Unsupported comparison operator: {type(op_node).__name__}")
+            chain.append((op, _compile(comparator, resolvers)))
+
+        def compare(context: Dict[str, Any]) -> bool:
+            left = first(context)
+            for op, comparator in chain:
+                right = comparator(context)
+                if not op(*_coerce(left, right)):
+                    return False
+                left = right
+            return True
+        return compare
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile(value, resolvers) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda context: all(operand(context) for operand in operands)
+        if isinstance(node.op, ast.Or):
+            return lambda context: any(operand(context) for operand in operands)
+        raise ValueError(f"Unsupported boolean operator: {type(node.op).__name__}")
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in SafeEvaluator._SAFE_FUNCTIONS:
+            raise ValueError("Only built-in safe functions are supported")
+        func = SafeEvaluator._SAFE_FUNCTIONS[node.func.id]
+        args = [_compile(arg, resolvers) for arg in node.args]
+        kwargs = {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                raise ValueError("**kwargs not supported")
+            kwargs[keyword.arg] = _compile(keyword.value, resolvers)
+        return lambda context: func(
+            *[arg(context) for arg in args],
+            **{key: value(context) for key, value in kwargs.items()},
+        )
+
+    if isinstance(node, (ast.List, ast.Tuple)):
+        elements = [_compile(element, resolvers) for element in node.elts]
+        container = list if isinstance(node, ast.List) else tuple
+        return lambda context: container(element(context) for element in elements)
+
+    if isinstance(node, ast.Dict):
+        if any(key is None for key in node.keys):
+            raise ValueError("Dict unpacking not supported")
+        items = [(_compile(k, resolvers), _compile(v, resolvers)) for k, v in zip(node.keys, node.values)]
+        return lambda context: {k(context): v(context) for k, v in items}
+
+    if isinstance(node, ast.Subscript):
+        value = _compile(node.value, resolvers)
+        index_node = node.slice.value if isinstance(node.slice, ast.Index) else node.slice  # Python < 3.9
+        index = _compile(index_node, resolvers)
+        return lambda context: value(context)[index(context)]
+
+    raise ValueError(f"Unsupported AST node type: {type(node).__name__}")
@@ -0,0 +1,134 @@
+"""
+Step dependency graph for parallel workflow execution.
+
+Dependencies are declared with ``WorkflowStep.depends_on`` or inferred from
+the context keys a step reads and the keys earlier steps write:
+
+- ``$steps.<id>...`` references depend on step ``<id>``
+- any other reference in ``input_mapping``, ``map_over`` or the step's
+  condition depends on the latest earlier step writing that key (its
+  ``output_mapping`` keys, or ``output`` when it has none)
+- a step without ``input_mapping`` (or ``map_over``) reads "the current
+  input" and depends on the step declared just before it, which keeps
+  unmapped pipelines in order
+- a step with a branching condition is a barrier: it waits for every earlier
+  step and every later step waits for it
+
+Inferred edges only point backwards in declaration order, so the
+declaration order is always a valid topological order.
+"""
+
+import re
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Set
+
+from agent_factory.core.exceptions import WorkflowError
+
+if TYPE_CHECKING:
+    from agent_factory.workflows.model import Condition, WorkflowStep
+
+_REFERENCE = re.compile(r"\$([A-Za-z_][\w.]*)")
+_IDENTIFIER = re.compile(r"\$?([A-Za-z_][\w.]*)")
+
+
+def step_reads(step: "WorkflowStep") -> Set[str]:
+    """Context paths a step reads through its input mapping and condition."""
+    paths: Set[str] = set()
+    for value in step.input_mapping.values():
+        value = str(value)
+        # Unprefixed values are looked up as context keys too
+        paths.update(_REFERENCE.findall(value) or [value])
+    if step.condition is not None:
+        paths.update(_IDENTIFIER.findall(step.condition.expression))
+    if step.map_over:
+        paths.update(_IDENTIFIER.findall(step.map_over))
+        # A map step's element variables are its own, not read from other steps
+        paths = {path for path in paths if path.split(".")[0] not in ("item", "index")}
+    return paths
+
+
+def step_writes(step: "WorkflowStep") -> Set[str]:
+    """Context keys a step writes."""
+    keys = set(step.output_mapping) if step.output_mapping else {"output"}
+    keys.add(f"steps.{step.id}.output")
+    return keys
+
+
+class StepGraph:
+    """
+    Dependencies between the steps of one workflow run.
+
+    Example:
+        >>> graph = StepGraph(workflow.steps, workflow.branching)
+        >>> graph.dependencies["summarize"]
+        {'search', 'fetch'}
+    """
+
+    def __init__(
+        self,
+        steps: List["WorkflowStep"],
+        branching: Optional[Mapping[str, "Condition"]] = None,
+    ):
+        """
+        Build the graph.
+
+        Args:
+            steps: Steps in declaration order
+            branching: Branching conditions by step ID
+
+        Raises:
+            WorkflowError: If step IDs repeat or ``depends_on`` names an
+                unknown or later step
+        """
+        self.steps = list(steps)
+        self.index: Dict[str, int] = {}
+        for position, step in enumerate(self.steps):
+            if step.id in self.index:
+                raise WorkflowError(f"Duplicate workflow step id: {step.id}")
+            self.index[step.id] = position
+
+        branching = branching or {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        writers: Dict[str, str] = {}  # key -> latest step writing it
+        barrier: Optional[str] = None
+
+        for position, step in enumerate(self.steps):
+            if step.id in branching:
+                deps = {s.id for s in self.steps[:position]}
+            elif step.depends_on is not None:
+                deps = set(step.depends_on)
+                for dep in deps:
+                    if self.index.get(dep, position) >= position:
+                        raise WorkflowError(
+                            f"Step {step.id} depends on {dep}, which is not an earlier step"
+                        )
+            else:
+                deps = self._infer(step, position, writers)
+            if barrier is not None:
+                deps.add(barrier)
+            self.dependencies[step.id] = deps
+
+            for key in step_writes(step):
+                writers[key] = step.id
+            if step.id in branching:
+                barrier = step.id
+
+    def _infer(self, step: "WorkflowStep", position: int, writers: Dict[str, str]) -> Set[str]:
+        if not step.input_mapping and not step.map_over and position > 0:
+            deps = {self.steps[position - 1].id}
+        else:
+            deps = set()
+        for path in step_reads(step):
+            parts = path.split(".")
+            if parts[0] == "steps" and len(parts) > 1 and self.index.get(parts[1], position) < position:
+                deps.add(parts[1])
+            for key in (path, parts[0]):
+                if key in writers:
+                    deps.add(writers[key])
+        return deps
+
+    def ready(self, finished: Set[str], started: Set[str]) -> List["WorkflowStep"]:
+        """Steps not yet started whose dependencies have all finished, in declaration order."""
+        return [
+            step for step in self.steps
+            if step.id not in started and self.dependencies[step.id] <= finished
+        ]
@@ -3,9 +3,20 @@ Workflow model - Multi-step agent orchestration.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Optional, Any
 from enum import Enum
 
+from agent_factory.workflows.conditions import CompiledCondition, compile_condition
+
+if TYPE_CHECKING:
+    from agent_factory.workflows.checkpoint import CheckpointStore, WorkflowCheckpoint
+    from agent_factory.workflows.step_cache import StepCache
+
+# Seconds added to an agent's request policy worst case for the default step
+# deadline, covering tool calls and the work around the model calls
+STEP_DEADLINE_SLACK = 30.0
+
 
 class TriggerType(str, Enum):
     """Types of workflow triggers."""
@@ -20,6 +31,28 @@ class Condition:
     """Condition for workflow branching."""
     expression: str  # e.g., "$steps.search.output.count > 0"
     description: Optional[str] = None
+    _compiled: Optional[CompiledCondition] = field(default=None, init=False, repr=False, compare=False)
+    
+    def evaluate(self, context: Dict[str, Any]) -> bool:
+        """
+        Evaluate the condition against a context.
+        
+        The expression is compiled on first use and recompiled only if it
+        changes. Invalid expressions and evaluation errors count as False.
+        
+        Args:
+            context: Workflow context
+            
+        Returns:
+            Whether the condition holds
+        """
+        compiled = self._compiled
+        if compiled is None or compiled.expression != self.expression:
+            try:
+                compiled = self._compiled = compile_condition(self.expression)
+            except ValueError:
+                return False
+        return compiled.evaluate(context)
 
 
 @dataclass
@@ -38,8 +71,20 @@ class WorkflowStep:
     input_mapping: Dict[str, str] = field(default_factory=dict)  # Maps workflow vars to agent inputs
     output_mapping: Dict[str, str] = field(default_factory=dict)  # Maps agent outputs to workflow vars
     condition: Optional[Condition] = None
-    timeout: int = 30  # seconds
-    retry_attempts: int = 3
+    # Seconds per attempt; 0 disables. None: for agents with their own request
+    # policy, its worst case (attempts x attempt timeout plus backoff and
+    # STEP_DEADLINE_SLACK), else 30
+    timeout: Optional[float] = None
+    # Retries of transient failures after the first attempt. None: 0 for
+    # agents with their own request policy (they retry provider calls), else 3
+    retry_attempts: Optional[int] = None
+    retry_backoff: float = 0.5  # seconds; base of the jittered exponential backoff
+    depends_on: Optional[List[str]] = None  # None: inferred from input_mapping and condition
+    cacheable: bool = False  # reuse outputs across runs for the same agent version and input
+    cache_ttl: Optional[int] = None  # seconds; None uses the step cache default
+    map_over: Optional[str] = None  # context path of a list; runs the agent once per element
+    map_concurrency: int = 4  # maximum elements in flight at once
+    map_on_error: str = "fail_fast"  # "fail_fast" or "collect"
 
 
 @dataclass
@@ -77,6 +122,10 @@ class Workflow:
         triggers: Optional[List[Trigger]] = None,
         branching: Optional[Dict[str, Condition]] = None,
         agents_registry: Optional[Dict[str, Any]] = None,
+        max_parallel: int = 4,
+        step_cache: Optional["StepCache"] = None,
+        timeout: Optional[float] = None,
+        token_budget: Optional[int] = None,
     ):
         """
         Initialize a Workflow.
@@ -88,6 +137,12 @@ class Workflow:
             triggers: Optional list of triggers
             branching: Optional branching conditions
             agents_registry: Registry of available agents
+            max_parallel: Maximum number of independent steps run at once
+                (1 runs steps strictly in order)
+            step_cache: Cache for outputs of cacheable steps; defaults to
+                the process-wide step cache
+            timeout: Optional deadline for the whole run in seconds
+            token_budget: Optional cap on tokens used by all steps of a run
         """
         self.id = id
         self.name = name
@@ -95,6 +150,10 @@ class Workflow:
         self.triggers = triggers or []
         self.branching = branching or {}
         self.agents_registry = agents_registry or {}
+        self.max_parallel = max_parallel
+        self.step_cache = step_cache
+        self.timeout = timeout
+        self.token_budget = token_budget
     
     def add_step(self, step: WorkflowStep) -> None:
         """Add a step to the workflow."""
@@ -112,84 +171,428 @@ class Workflow:
         """
         Execute the workflow with given context.
         
+        Synchronous wrapper around :meth:`aexecute`.
+        
+        Args:
+            context: Initial context dictionary
+            start_step: Optional step ID to start from
+            
+        Returns:
+            WorkflowResult with execution results
+        """
+        from agent_factory.utils.async_utils import run_sync
+        
+        return run_sync(self.aexecute(context, start_step=start_step))
+    
+    async def aexecute(
+        self,
+        context: Dict[str, Any],
+        start_step: Optional[str] = None,
+        checkpoint: Optional["WorkflowCheckpoint"] = None,
+        checkpoint_store: Optional["CheckpointStore"] = None,
+    ) -> WorkflowResult:
+        """
+        Execute the workflow with given context on the running event loop.
+        
+        Steps run as soon as the steps they depend on have finished (see
+        ``workflows.dag``), up to ``max_parallel`` at a time. Each step sees
+        the context as a sequential run would: the initial context plus the
+        outputs of finished earlier steps, applied in declaration order.
+        
+        Each agent call is bounded by the step's ``timeout``; timeouts and
+        transient failures are retried up to ``retry_attempts`` times with
+        jittered exponential backoff, permanent failures are not. The
+        run fails when it passes the workflow ``timeout`` or uses more than
+        ``token_budget`` tokens; running steps are cancelled. Per-step
+        attempts, durations and tokens are reported in
+        ``WorkflowResult.metadata["steps"]``.
+        
+        With a checkpoint, steps it records as executed or skipped are not
+        run again: their outputs are restored and only the remaining steps
+        run. The checkpoint is updated, and saved to ``checkpoint_store``,
+        after every step and when the run ends.
+        
         Args:
             context: Initial context dictionary
             start_step: Optional step ID to start from
+            checkpoint: Optional checkpoint to resume from and keep updated
+            checkpoint_store: Optional store the checkpoint is saved to
             
         Returns:
             WorkflowResult with execution results
         """
+        import asyncio
         import time
+        from agent_factory.utils.async_utils import run_in_thread
+        from agent_factory.workflows.dag import StepGraph
+        
         start_time = time.time()
+        outputs: Dict[str, Dict[str, Any]] = {}
+        skipped: List[str] = []
+        cached: List[str] = []
+        map_errors: Dict[str, List[Dict[str, Any]]] = {}
+        running: Dict["asyncio.Future[Any]", WorkflowStep] = {}
+        restored: List[str] = []
+        step_stats: Dict[str, Dict[str, Any]] = {}
+        step_started: Dict[str, float] = {}
+        tokens_used = 0
+        deadline = start_time + self.timeout if self.timeout else None
+        
+        if checkpoint is not None:
+            known = {step.id for step in self.steps}
+            outputs.update(
+                (step_id, output) for step_id, output in checkpoint.outputs.items() if step_id in known
+            )
+            skipped.extend(step_id for step_id in checkpoint.skipped if step_id in known)
+            restored = list(outputs)
+        
+        def executed() -> List[str]:
+            return [step.id for step in self.steps if step.id in outputs]
+        
+        async def save(status: str = "running", error: Optional[str] = None) -> None:
+            if checkpoint is None:
+                return
+            checkpoint.outputs = dict(outputs)
+            checkpoint.skipped = list(skipped)
+            checkpoint.status = status
+            checkpoint.error = error
+            checkpoint.updated_at = datetime.now()
+            if checkpoint_store is not None:
+                await run_in_thread(checkpoint_store.save, checkpoint)
+        
+        def report(step: WorkflowStep) -> Dict[str, Any]:
+            stats = step_stats[step.id]
+            stats["duration"] = time.time() - step_started[step.id]
+            return stats
+        
+        async def failure(error: str) -> WorkflowResult:
+            for task, step in running.items():
+                task.cancel()
+                report(step)["cancelled"] = True
+            try:
+                await save("failed", error)
+            except Exception:
+                pass  # the run has already failed; keep its error
+            metadata: Dict[str, Any] = {"steps": step_stats, "tokens_used": tokens_used}
+            if restored:
+                metadata["resumed_steps"] = restored
+            return WorkflowResult(
+                success=False,
+                error=error,
+                steps_executed=executed(),
+                execution_time=time.time() - start_time,
+                metadata=metadata,
+            )
         
         try:
-            workflow_context = context.copy()
-            steps_executed = []
+            graph = StepGraph(self.steps, self.branching)
             
-            # Determine starting step
+            # Determine starting step; earlier steps count as finished
             start_index = 0
             if start_step:
-                for i, step in enumerate(self.steps):
-                    if step.id == start_step:
-                        start_index = i
-                        break
+                start_index = graph.index.get(start_step, 0)
+            started = {step.id for step in self.steps[:start_index]}
+            started.update(outputs, skipped)
+            finished = set(started)
+            cutoff = len(self.steps)  # steps past a failed branch are not run
+            limit = max(1, self.max_parallel)
             
-            # Execute steps sequentially
-            for i, step in enumerate(self.steps[start_index:], start=start_index):
-                # Check condition if present
-                if step.condition:
-                    if not self._evaluate_condition(step.condition, workflow_context):
-                        continue  # Skip this step
-                
-                # Get agent
-                agent = self.agents_registry.get(step.agent_id)
-                if not agent:
-                    return WorkflowResult(
-                        success=False,
-                        error=f"Agent not found: {step.agent_id}",
-                    )
-                
-                # Map inputs
-                agent_input = self._map_inputs(step.input_mapping, workflow_context)
+            # Re-apply branching decisions of restored steps
+            for step_id in restored:
+                if step_id in self.branching:
+                    index = graph.index[step_id]
+                    view = self._context_view(context, outputs, index + 1)
+                    if not self._evaluate_condition(self.branching[step_id], view):
+                        cutoff = min(cutoff, index + 1)
+            
+            while True:
+                # Launch ready steps, lowest declaration index first
+                progressed = True
+                while progressed and len(running) < limit:
+                    progressed = False
+                    for step in graph.ready(finished, started):
+                        if len(running) >= limit:
+                            break
+                        if graph.index[step.id] >= cutoff:
+                            continue
+                        started.add(step.id)
+                        progressed = True
+                        view = self._context_view(context, outputs, graph.index[step.id])
+                        
+                        # Check condition if present
+                        if step.condition and not self._evaluate_condition(step.condition, view):
+                            finished.add(step.id)  # Skip this step
+                            skipped.append(step.id)
+                            continue
+                        
+                        # Get agent
+                        agent = self.agents_registry.get(step.agent_id)
+                        if not agent:
+                            return await failure(f"Agent not found: {step.agent_id}")
+                        
+                        step_stats[step.id] = {"attempts": 0, "tokens_used": 0}
+                        step_started[step.id] = time.time()
+                        run = self._run_map_step if step.map_over else self._run_step
+                        task = asyncio.ensure_future(run(step, agent, view, step_stats[step.id]))
+                        running[task] = step
                 
-                # Execute agent
-                agent_result = agent.run(agent_input)
+                if not running:
+                    break
                 
-                if agent_result.status.value == "error":
-                    return WorkflowResult(
-                        success=False,
-                        error=f"Step {step.id} failed: {agent_result.error}",
-                        steps_executed=steps_executed,
-                    )
+                done, _ = await asyncio.wait(
+                    list(running),
+                    timeout=max(0.0, deadline - time.time()) if deadline else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    return await failure(f"Workflow deadline of {self.timeout}s exceeded")
                 
-                # Map outputs
-                step_output = self._map_outputs(step.output_mapping, agent_result.output)
-                workflow_context.update(step_output)
-                workflow_context[f"steps.{step.id}.output"] = agent_result.output
+                for task in sorted(done, key=lambda t: graph.index[running[t].id]):
+                    step = running.pop(task)
+                    agent_result = task.result()
+                    tokens_used += report(step)["tokens_used"]
+                    
+                    if agent_result.status.value == "error":
+                        return await failure(f"Step {step.id} failed: {agent_result.error}")
+                    
+                    if agent_result.metadata.get("step_cache") == "hit":
+                        cached.append(step.id)
+                    
+                    # Map outputs
+                    step_output = self._map_outputs(step.output_mapping, agent_result.output)
+                    step_output[f"steps.{step.id}.output"] = agent_result.output
+                    if agent_result.metadata.get("map_errors"):
+                        map_errors[step.id] = agent_result.metadata["map_errors"]
+                        step_output[f"steps.{step.id}.errors"] = map_errors[step.id]
+                    outputs[step.id] = step_output
+                    finished.add(step.id)
+                    
+                    # Check branching
+                    if step.id in self.branching:
+                        index = graph.index[step.id]
+                        view = self._context_view(context, outputs, index + 1)
+                        if not self._evaluate_condition(self.branching[step.id], view):
+                            cutoff = min(cutoff, index + 1)
                 
-                steps_executed.append(step.id)
+                await save()
                 
-                # Check branching
-                if step.id in self.branching:
-                    condition = self.branching[step.id]
-                    if not self._evaluate_condition(condition, workflow_context):
-                        break
+                if self.token_budget is not None and tokens_used > self.token_budget:
+                    return await failure(
+                        f"Token budget of {self.token_budget} exceeded ({tokens_used} tokens used)"
+                    )
             
             execution_time = time.time() - start_time
+            await save("completed")
+            
+            metadata: Dict[str, Any] = {
+                "max_parallel": limit,
+                "steps": step_stats,
+                "tokens_used": tokens_used,
+            }
+            if restored:
+                metadata["resumed_steps"] = restored
+            if cached:
+                metadata["cached_steps"] = cached
+            if map_errors:
+                metadata["map_errors"] = map_errors
             
             return WorkflowResult(
                 success=True,
-                output=workflow_context,
-                steps_executed=steps_executed,
+                output=self._context_view(context, outputs, len(self.steps)),
+                steps_executed=executed(),
                 execution_time=execution_time,
+                metadata=metadata,
             )
             
         except Exception as e:
-            return WorkflowResult(
-                success=False,
-                error=str(e),
-                steps_executed=steps_executed if 'steps_executed' in locals() else [],
-            )
+            return await failure(str(e))
+    
+    async def _run_step(
+        self,
+        step: WorkflowStep,
+        agent: Any,
+        context: Dict[str, Any],
+        stats: Dict[str, Any],
+    ) -> Any:
+        """Run one step's agent against its view of the context."""
+        # Map inputs
+        agent_input = self._map_inputs(step.input_mapping, context)
+        return await self._run_agent(step, agent, agent_input, stats)
+    
+    async def _run_map_step(
+        self,
+        step: WorkflowStep,
+        agent: Any,
+        context: Dict[str, Any],
+        stats: Dict[str, Any],
+    ) -> Any:
+        """
+        Run a map step: the agent once per element of the ``map_over`` list.
+        
+        Elements are taken lazily, so at most ``map_concurrency`` are in
+        flight at once. Each element is exposed to the input mapping as
+        ``$item`` and its position as ``$index``; without an input mapping
+        the element itself is the input. Outputs are collected in element
+        order. With ``map_on_error="collect"`` a failed element leaves None
+        in its slot and is reported under ``map_errors``; otherwise the
+        first failure cancels the remaining elements and fails the step.
+        """
+        import asyncio
+        import json
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        from agent_factory.core.exceptions import WorkflowError
+        
+        if step.map_on_error not in ("fail_fast", "collect"):
+            raise WorkflowError(f"Step {step.id}: unknown map_on_error {step.map_on_error!r}")
+        
+        items = self._resolve_path(step.map_over, context)
+        if isinstance(items, str):
+            # Agent outputs are text; accept a JSON array
+            try:
+                items = json.loads(items)
+            except ValueError:
+                pass
+        if not isinstance(items, (list, tuple)):
+            raise WorkflowError(f"Step {step.id}: {step.map_over} is not a list")
+        
+        results: List[Any] = [None] * len(items)
+        stats["items"] = len(items)
+        errors: List[Dict[str, Any]] = []
+        pending = iter(enumerate(items))
+        
+        async def worker() -> None:
+            for index, item in pending:
+                if step.input_mapping:
+                    agent_input = self._map_inputs(
+                        step.input_mapping, {**context, "item": item, "index": index},
+                    )
+                else:
+                    agent_input = item if isinstance(item, str) else json.dumps(item, default=str)
+                result = await self._run_agent(step, agent, agent_input, stats)
+                error = result.error if result.status == AgentStatus.ERROR else None
+                if error is None:
+                    results[index] = result.output
+                elif step.map_on_error == "collect":
+                    errors.append({"index": index, "error": error})
+                else:
+                    raise WorkflowError(f"item {index}: {error}")
+        
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(max(1, step.map_concurrency), len(items)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except WorkflowError as e:
+            return AgentResult(output="", status=AgentStatus.ERROR, error=str(e))
+        finally:
+            for task in workers:
+                task.cancel()
+        
+        errors.sort(key=lambda error: error["index"])
+        return AgentResult(
+            output=results,
+            status=AgentStatus.COMPLETED,
+            metadata={"map_errors": errors} if errors else {},
+        )
+    
+    async def _run_agent(
+        self,
+        step: WorkflowStep,
+        agent: Any,
+        agent_input: str,
+        stats: Dict[str, Any],
+    ) -> Any:
+        """
+        Run the step's agent on one input with the step's timeout and retries.
+        
+        Cacheable steps are served from the step cache when possible.
+        Attempts and tokens are added to ``stats``.
+        """
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        
+        cache = key = None
+        if step.cacheable:
+            from agent_factory.workflows.step_cache import get_step_cache, make_step_key
+            
+            cache = self.step_cache or get_step_cache()
+            key = make_step_key(agent, agent_input)
+            output = cache.get(key)
+            if output is not None:
+                return AgentResult(output=output, status=AgentStatus.COMPLETED, metadata={"step_cache": "hit"})
+        
+        result = await self._call_with_retries(step, agent, agent_input, stats)
+        if cache is not None and result.status == AgentStatus.COMPLETED:
+            cache.set(key, result.output, agent_id=step.agent_id, ttl=step.cache_ttl)
+        return result
+    
+    async def _call_with_retries(
+        self,
+        step: WorkflowStep,
+        agent: Any,
+        agent_input: str,
+        stats: Dict[str, Any],
+    ) -> Any:
+        """Call the agent, retrying timed out and transient failures with backoff."""
+        import asyncio
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        from agent_factory.integrations.request_policy import RequestPolicy, is_retryable
+        
+        # Agents with a request policy already retry and time out provider calls,
+        # so the step only bounds the policy's worst case in case a call hangs
+        config = getattr(agent, "config", None)
+        own_policy = getattr(config, "retry_attempts", None) is not None
+        retries = step.retry_attempts if step.retry_attempts is not None else (0 if own_policy else 3)
+        timeout = step.timeout
+        if timeout is None:
+            timeout = 30
+            if own_policy:
+                agent_policy = RequestPolicy.from_config(config)
+                if agent_policy.attempt_timeout:
+                    timeout = (
+                        agent_policy.max_attempts * agent_policy.attempt_timeout
+                        + (agent_policy.max_attempts - 1) * agent_policy.backoff_max
+                        + STEP_DEADLINE_SLACK
+                    )
+        policy = RequestPolicy(
+            max_attempts=1 + max(0, retries),
+            attempt_timeout=float(timeout) if timeout and timeout > 0 else None,
+            backoff_base=step.retry_backoff,
+        )
+        for attempt in range(1, policy.max_attempts + 1):
+            stats["attempts"] += 1
+            retryable = True
+            try:
+                result = await asyncio.wait_for(agent.arun(agent_input), policy.attempt_timeout)
+                retryable = bool(result.metadata.get("retryable", False))
+            except asyncio.TimeoutError:
+                result = AgentResult(
+                    output="",
+                    status=AgentStatus.ERROR,
+                    error=f"timed out after {timeout}s",
+                )
+            except Exception as e:
+                result = AgentResult(output="", status=AgentStatus.ERROR, error=str(e))
+                retryable = is_retryable(e)
+            stats["tokens_used"] += result.tokens_used
+            
+            if result.status != AgentStatus.ERROR or not retryable or attempt == policy.max_attempts:
+                return result
+            await asyncio.sleep(policy.backoff(attempt))
+        return result
+    
+    def _context_view(
+        self,
+        context: Dict[str, Any],
+        outputs: Dict[str, Dict[str, Any]],
+        before: int,
+    ) -> Dict[str, Any]:
+        """Initial context plus outputs of finished steps declared before index ``before``."""
+        view = context.copy()
+        for step in self.steps[:before]:
+            if step.id in outputs:
+                view.update(outputs[step.id])
+        return view
     
     def _map_inputs(self, mapping: Dict[str, str], context: Dict[str, Any]) -> str:
         """Map workflow context to agent input."""
@@ -219,6 +622,9 @@ class Workflow:
         """Resolve a path expression in context."""
         if path.startswith("$"):
             path = path[1:]
+            # Step outputs are stored under flat keys such as "steps.search.output"
+            if path in context:
+                return context[path]
             parts = path.split(".")
             value = context
             for part in parts:
@@ -232,102 +638,7 @@ class Workflow:
     
     def _evaluate_condition(self, condition: Condition, context: Dict[str, Any]) -> bool:
         """Evaluate a condition expression."""
-        import ast
-        import operator
-        
-        expression = condition.expression
-        
-        safe_operators = {
-            ast.Eq: operator.eq,
-            ast.NotEq: operator.ne,
-            ast.Lt: operator.lt,
-            ast.LtE: operator.le,
-            ast.Gt: operator.gt,
-            ast.GtE: operator.ge,
-            ast.And: lambda a, b: a and b,
-            ast.Or: lambda a, b: a or b,
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-        }
-        
-        def eval_node(node):
-            """Safely evaluate an AST node."""
-            if isinstance(node, ast.Constant):
-                return node.value
-            elif isinstance(node, ast.Name):
-                path = node.id.split(".")
-                value = context
-                for part in path:
-                    if isinstance(value, dict):
-                        value = value.get(part)
-                    else:
-                        return None
-                return value
-            elif isinstance(node, ast.BinOp):
-                left = eval_node(node.left)
-                right = eval_node(node.right)
-                op = safe_operators.get(type(node.op))
-                if op:
-                    return op(left, right)
-            elif isinstance(node, ast.Compare):
-                left = eval_node(node.left)
-                for op, right in zip(node.ops, node.comparators):
-                    right_val = eval_node(right)
-                    op_func = safe_operators.get(type(op))
-                    if op_func:
-                        if not op_func(left, right_val):
-                            return False
-                        left = right_val
-                return True
-            elif isinstance(node, ast.BoolOp):
-                values = [eval_node(v) for v in node.values]
-                op = safe_operators.get(type(node.op))
-                if op:
-                    result = values[0]
-                    for val in values[1:]:
-                        result = op(result, val)
-                    return result
-            
-            return False
-        
-        try:
-            # Use safe evaluator instead of eval
-            from agent_factory.utils.safe_evaluator import safe_evaluate
-            
-            # Replace $variables with actual values
-            processed_expression = expression
-            import re
-            
-            # Replace $key or $key.path patterns
-            for key, value in context.items():
-                pattern = r'\$' + re.escape(key) + r'(?:\.\w+)*'
-                def replace_match(match):
-                    matched = match.group(0)
-                    if '.' in matched:
-                        var_name = matched.split('.')[0][1:]
-                        path_parts = matched.split('.')[1:]
-                        try:
-                            val = context.get(var_name, {})
-                            for part in path_parts:
-                                if isinstance(val, dict):
-                                    val = val.get(part)
-                                else:
-                                    return 'None'
-                            return str(val)
-                        except:
-                            return 'None'
-                    else:
-                        return str(context.get(key, 'None'))
-                
-                processed_expression = re.sub(pattern, replace_match, processed_expression)
-            
-            result = safe_evaluate(processed_expression, context=context)
-            return bool(result)
-        except Exception:
-            # Fallback: return False if evaluation fails
-            return False
+        return condition.evaluate(context)
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize workflow to dictionary."""
@@ -346,6 +657,13 @@ class Workflow:
                     } if step.condition else None,
                     "timeout": step.timeout,
                     "retry_attempts": step.retry_attempts,
+                    "retry_backoff": step.retry_backoff,
+                    "depends_on": step.depends_on,
+                    "cacheable": step.cacheable,
+                    "cache_ttl": step.cache_ttl,
+                    "map_over": step.map_over,
+                    "map_concurrency": step.map_concurrency,
+                    "map_on_error": step.map_on_error,
                 }
                 for step in self.steps
             ],
@@ -361,4 +679,7 @@ class Workflow:
                 k: {"expression": v.expression, "description": v.description}
                 for k, v in self.branching.items()
             },
+            "max_parallel": self.max_parallel,
+            "timeout": self.timeout,
+            "token_budget": self.token_budget,
         }
@@ -0,0 +1,217 @@
+"""
+Cross-run memoization of cacheable workflow steps.
+
+A step marked ``cacheable`` stores its agent's output under a hash of the
+agent version (model, instructions and tool schemas), the agent config and
+the resolved step input. Later runs, of the same or another workflow, that
+give the same agent the same input reuse the output instead of calling the
+agent. Changing the agent changes its version, so stale outputs are never
+served; they age out by TTL or size-bounded LRU eviction, or are removed
+with :meth:`StepCache.purge`.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, NamedTuple, Optional
+
+from agent_factory.monitoring.metrics import MetricsCollector
+
+
+def agent_version(agent: Any) -> str:
+    """
+    Identify the version of an agent that determines its output.
+
+    Uses the compiled agent's fingerprint when available, falling back to
+    a hash of the model and instructions.
+    """
+    prepared = getattr(agent, "prepared", None)
+    fingerprint = getattr(prepared, "fingerprint", None)
+    if fingerprint:
+        return fingerprint
+    metadata = getattr(agent, "metadata", None)
+    payload = json.dumps(
+        {
+            "model": getattr(agent, "model", None),
+            "instructions": getattr(agent, "instructions", None),
+            "version": metadata.get("version") if isinstance(metadata, dict) else None,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def make_step_key(agent: Any, agent_input: str) -> str:
+    """
+    Build the cache key for one step execution.
+
+    Args:
+        agent: Agent the step runs
+        agent_input: Step input after input mapping
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    config = getattr(agent, "config", None)
+    if is_dataclass(config) and not isinstance(config, type):
+        config = asdict(config)
+    payload = json.dumps(
+        {
+            "agent_id": getattr(agent, "id", None),
+            "version": agent_version(agent),
+            "config": config,
+            "input": agent_input,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Entry(NamedTuple):
+    output: str
+    agent_id: Optional[str]
+    expires_at: float
+
+
+class StepCache:
+    """
+    In-process LRU cache of step outputs with per-entry TTL.
+
+    Example:
+        >>> cache = StepCache(max_entries=1000, ttl=3600)
+        >>> workflow = Workflow(..., step_cache=cache)
+        >>> cache.purge(agent_id="source-fetcher")
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 3600):
+        """
+        Initialize step cache.
+
+        Args:
+            max_entries: Maximum number of cached outputs; least recently
+                used entries are evicted first
+            ttl: Default time to live in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached step output.
+
+        Args:
+            key: Cache key from :func:`make_step_key`
+
+        Returns:
+            Cached output or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            MetricsCollector.record_cache_miss("workflow_step")
+            return None
+        MetricsCollector.record_cache_hit("workflow_step")
+        return entry.output
+
+    def set(
+        self,
+        key: str,
+        output: str,
+        agent_id: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Store a step output.
+
+        Args:
+            key: Cache key from :func:`make_step_key`
+            output: Agent output
+            agent_id: Agent that produced the output, for :meth:`purge`
+            ttl: Time to live in seconds (defaults to the cache TTL)
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + (ttl or self.ttl)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(output, agent_id, expires_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def purge(self, agent_id: Optional[str] = None, expired_only: bool = False) -> int:
+        """
+        Remove cached outputs.
+
+        Args:
+            agent_id: Only remove outputs of this agent (default: all agents)
+            expired_only: Only remove entries whose TTL has passed
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        with self._lock:
+            keys = [
+                key for key, entry in self._entries.items()
+                if (agent_id is None or entry.agent_id == agent_id)
+                and (not expired_only or entry.expires_at < now)
+            ]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global step cache
+_step_cache: Optional[StepCache] = None
+_step_cache_lock = threading.Lock()
+
+
+def get_step_cache() -> StepCache:
+    """
+    Get global step cache.
+
+    Sized with ``STEP_CACHE_MAX_ENTRIES`` and ``STEP_CACHE_TTL``.
+
+    Returns:
+        Step cache
+    """
+    global _step_cache
+    with _step_cache_lock:
+        if _step_cache is None:
+            _step_cache = StepCache(
+                max_entries=int(os.getenv("STEP_CACHE_MAX_ENTRIES", "1024")),
+                ttl=int(os.getenv("STEP_CACHE_TTL", "3600")),
+            )
+        return _step_cache
@@ -335,7 +335,7 @@ Be thorough and cite sources when possible.""",
         )
         
         # Run research
-        result = agent.run(request.query)
+        result = await agent.arun(request.query)
         
         # Format response
         response = ResearchResponse(
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-run overhead of pooled vs. per-run LLM provider clients.
+
+Starts a local stand-in for the OpenAI chat completions endpoint and times
+``OpenAIAgentClient.run_agent`` two ways:
+
+- before: a fresh ``OpenAI`` SDK client (and connection pool) for every run
+- after:  the shared keep-alive client from ``get_client_pool()``
+
+Usage:
+    python benchmarks/bench_client_pool.py --runs 200
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from openai import OpenAI
+
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.integrations.client_pool import close_client_pool
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "ok"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 1, "total_tokens": 6},
+}).encode()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive chat completions endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _time_runs(make_client, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        client = make_client()
+        client.run_agent(instructions="You are a benchmark.", input_text="ping")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<8} mean={statistics.mean(timings):7.3f} ms  "
+          f"p50={statistics.median(timings):7.3f} ms  p95={p95:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def per_run_client():
+        client = OpenAIAgentClient(api_key="bench", base_url=base_url)
+        client.client = OpenAI(api_key="bench", base_url=base_url)
+        return client
+
+    def pooled_client():
+        return OpenAIAgentClient(api_key="bench", base_url=base_url)
+
+    # Warm up imports and the pool
+    _time_runs(pooled_client, 5)
+
+    before = _time_runs(per_run_client, args.runs)
+    after = _time_runs(pooled_client, args.runs)
+
+    print(f"{args.runs} runs against {base_url}")
+    _report("before", before)
+    _report("after", after)
+    print(f"speedup  {statistics.mean(before) / statistics.mean(after):.2f}x")
+
+    close_client_pool()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
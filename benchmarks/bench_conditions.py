@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark workflow condition evaluation as the context grows.
+
+Times one condition two ways over contexts of increasing size:
+
+- before: the previous approach, which ran one regex substitution per
+  context key and re-parsed the result with ``safe_evaluate`` on every call
+- after:  ``Condition.evaluate``, compiled once and resolving ``$`` paths
+  directly from the context
+
+Usage:
+    python benchmarks/bench_conditions.py --runs 20 --sizes 10 1000 10000
+"""
+
+import argparse
+import re
+import statistics
+import time
+
+from agent_factory.utils.safe_evaluator import safe_evaluate
+from agent_factory.workflows.model import Condition
+
+EXPRESSION = "$steps.search.output.count > 0 and $attempts < 3"
+
+
+def legacy_evaluate(expression: str, context: dict) -> bool:
+    """The substitution-based evaluation used before conditions were compiled."""
+    try:
+        processed = expression
+        for key, value in context.items():
+            pattern = r'\$' + re.escape(key) + r'(?:\.\w+)*'
+
+            def replace_match(match, key=key):
+                matched = match.group(0)
+                if '.' in matched:
+                    val = context.get(matched.split('.')[0][1:], {})
+                    for part in matched.split('.')[1:]:
+                        if isinstance(val, dict):
+                            val = val.get(part)
+                        else:
+                            return 'None'
+                    return str(val)
+                return str(context.get(key, 'None'))
+
+            processed = re.sub(pattern, replace_match, processed)
+        return bool(safe_evaluate(processed, context=context))
+    except Exception:
+        return False
+
+
+def _context(size: int) -> dict:
+    context = {f"var_{i}": f"value {i}" for i in range(size)}
+    context["steps"] = {"search": {"output": {"count": 3}}}
+    context["attempts"] = 1
+    return context
+
+
+def _time(func, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def _report(label: str, timings: list) -> float:
+    mean = statistics.mean(timings)
+    print(f"  {label:<8} mean={mean:10.1f} us  p50={statistics.median(timings):10.1f} us")
+    return mean
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    args = parser.parse_args()
+
+    condition = Condition(expression=EXPRESSION)
+    for size in args.sizes:
+        context = _context(size)
+        # Both must agree before timing
+        assert condition.evaluate(context) == legacy_evaluate(EXPRESSION, context)
+
+        print(f"{size} context keys, {args.runs} evaluations")
+        before = _report("before", _time(lambda context=context: legacy_evaluate(EXPRESSION, context), args.runs))
+        after = _report("after", _time(lambda context=context: condition.evaluate(context), args.runs))
+        print(f"  speedup  {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
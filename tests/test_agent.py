@@ -1,7 +1,10 @@
 """Tests for Agent class."""
 
+import asyncio
+import time
+
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from agent_factory.agents.agent import Agent, AgentConfig, AgentStatus
 
 
@@ -116,12 +119,12 @@ def test_agent_run_with_mocked_client(mock_client_class):
     """Test agent.run() with mocked OpenAI client."""
     # Setup mock
     mock_client = Mock()
-    mock_client.run_agent.return_value = {
+    mock_client.arun_agent = AsyncMock(return_value={
         "output": "Mocked response",
         "tool_calls": [],
         "tokens_used": 100,
         "model": "gpt-4o",
-    }
+    })
     mock_client_class.return_value = mock_client
     
     agent = Agent(
@@ -134,5 +137,49 @@ def test_agent_run_with_mocked_client(mock_client_class):
     
     assert result.status == AgentStatus.COMPLETED
     assert result.output == "Mocked response"
-    assert result.tokens_used == 0  # Not set in current implementation
-    mock_client.run_agent.assert_called_once()
+    assert result.tokens_used == 100
+    mock_client.arun_agent.assert_awaited_once()
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_arun_concurrent(mock_client_class):
+    """Test agent.arun() runs many requests concurrently on one loop."""
+    async def slow_response(**kwargs):
+        await asyncio.sleep(0.2)
+        return {"output": kwargs["input_text"], "tool_calls": [], "tokens_used": 1}
+    
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(side_effect=slow_response)
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(id="test-agent", name="Test Agent", instructions="Test")
+    
+    async def run_all():
+        return await asyncio.gather(*(agent.arun(f"input-{i}") for i in range(50)))
+    
+    start = time.time()
+    results = asyncio.run(run_all())
+    elapsed = time.time() - start
+    
+    assert [r.output for r in results] == [f"input-{i}" for i in range(50)]
+    assert all(r.status == AgentStatus.COMPLETED for r in results)
+    # 50 x 0.2s sequentially would take 10s
+    assert elapsed < 2.0
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_run_inside_event_loop(mock_client_class):
+    """Test sync agent.run() works when called from a running event loop."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "ok", "tool_calls": []})
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(id="test-agent", name="Test Agent", instructions="Test")
+    
+    async def call_sync():
+        return agent.run("Test input")
+    
+    result = asyncio.run(call_sync())
+    assert result.output == "ok"
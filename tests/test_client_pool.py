@@ -0,0 +1,96 @@
+"""Tests for the shared LLM provider client pool."""
+
+import asyncio
+
+import pytest
+
+from agent_factory.integrations.client_pool import ClientPoolConfig, ProviderClientPool
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+
+
+@pytest.mark.unit
+def test_pool_reuses_client_per_key():
+    """Test same provider/key/base URL shares one client."""
+    pool = ProviderClientPool(ClientPoolConfig(max_connections=5))
+    
+    first = pool.get_client("openai", "key-1")
+    second = pool.get_client("openai", "key-1")
+    other_key = pool.get_client("openai", "key-2")
+    other_url = pool.get_client("openai", "key-1", base_url="http://localhost:9999/v1")
+    
+    assert first is second
+    assert first is not other_key
+    assert first is not other_url
+    assert pool.get_stats()["clients_created"] == 3
+    assert pool.get_stats()["hits"] == 1
+    
+    pool.close()
+    assert pool.get_stats()["sync_clients"] == 0
+
+
+@pytest.mark.unit
+def test_pool_separates_providers():
+    """Test providers get distinct clients."""
+    pool = ProviderClientPool()
+    
+    openai_client = pool.get_client("openai", "key")
+    anthropic_client = pool.get_client("anthropic", "key")
+    
+    assert type(openai_client).__name__ == "OpenAI"
+    assert type(anthropic_client).__name__ == "Anthropic"
+    
+    with pytest.raises(ValueError, match="Unknown LLM provider"):
+        pool.get_client("unknown", "key")
+    
+    pool.close()
+
+
+@pytest.mark.unit
+def test_pool_async_client_per_loop():
+    """Test async clients are shared within a loop but not across loops."""
+    pool = ProviderClientPool()
+    
+    async def get_twice():
+        return pool.get_async_client("openai", "key"), pool.get_async_client("openai", "key")
+    
+    a1, a2 = asyncio.run(get_twice())
+    b1, _ = asyncio.run(get_twice())
+    
+    assert a1 is a2
+    assert a1 is not b1
+    
+    pool.close()
+
+
+@pytest.mark.unit
+def test_agent_clients_share_pooled_connection(monkeypatch):
+    """Test OpenAIAgentClient instances reuse the pooled SDK client."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    
+    assert OpenAIAgentClient().client is OpenAIAgentClient().client
+
+
+@pytest.mark.unit
+def test_pool_closes_async_clients_on_their_own_loop():
+    """Test async clients are closed when their loop ends and when their key is evicted."""
+    pool = ProviderClientPool()
+    
+    async def get_client():
+        return pool.get_async_client("openai", "key")
+    
+    client = asyncio.run(get_client())
+    assert client.is_closed()
+    
+    async def rotate():
+        old = pool.get_async_client("openai", "old-key")
+        assert pool.evict("openai", "old-key") == 1
+        await asyncio.sleep(0.05)
+        return old.is_closed()
+    
+    assert asyncio.run(rotate())
+    
+    background = pool.get_async_client("openai", "key")
+    sync_client = pool.get_client("openai", "key")
+    assert pool.evict("openai", "key") == 2
+    assert background.is_closed() and sync_client.is_closed()
+    assert pool.get_stats()["async_clients"] == 0
@@ -0,0 +1,123 @@
+"""Tests for the token-aware context packer."""
+
+import pytest
+
+from agent_factory.agents.agent import Agent, AgentConfig
+from agent_factory.agents.context_packer import ContextPacker, TokenCounter, render_system_prompt
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+
+
+def _turns(count, words=20):
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"Turn {i} starts here. " + " ".join(["filler"] * words),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+def test_token_counter_counts_and_truncates():
+    """Test counts are cached per text and truncation respects the limit."""
+    counter = TokenCounter("gpt-4o")
+    text = "word " * 200
+    
+    assert counter.count("") == 0
+    assert counter.count(text) == counter.count(text) > 0
+    assert counter.count(counter.truncate(text, 10)) <= 10
+    assert counter.truncate("short", 10) == "short"
+
+
+@pytest.mark.unit
+def test_pack_keeps_everything_within_a_large_budget():
+    """Test nothing is dropped when the budget is ample."""
+    packer = ContextPacker("gpt-4o", max_tokens=100_000)
+    packed = packer.pack(
+        "Be helpful.",
+        "Hi",
+        turns=_turns(4),
+        chunks=[{"text": "Fact A", "score": 0.5}, {"text": "Fact B", "score": 0.9}],
+        extras={"user_name": "Sam"},
+    )
+    
+    assert packed.messages == _turns(4)
+    assert packed.turns_dropped == 0
+    assert packed.history_summary == ""
+    assert packed.retrieved_context == "Fact B\n\nFact A\n\nuser_name: Sam"
+    assert packed.tokens_used <= packed.budget
+
+
+@pytest.mark.unit
+def test_pack_prefers_recent_turns_and_summarizes_the_rest():
+    """Test old turns are dropped first and folded into a summary."""
+    counter = TokenCounter("gpt-4o")
+    turns = _turns(20)
+    base = 2 * 4 + counter.count("Be helpful.") + counter.count("Hi")
+    per_turn = counter.count_message(turns[-1])
+    budget = base + per_turn * 5 + per_turn // 2
+    
+    packed = ContextPacker("gpt-4o", max_tokens=budget).pack(
+        "Be helpful.", "Hi", turns=turns,
+    )
+    
+    assert packed.messages == turns[-5:]
+    assert packed.turns_dropped == 15
+    assert packed.history_summary.startswith("- user: Turn 0 starts here.")
+    assert packed.tokens_used <= budget
+
+
+@pytest.mark.unit
+def test_pack_truncates_the_first_overflowing_chunk():
+    """Test chunks are taken best first and the overflow is truncated."""
+    counter = TokenCounter("gpt-4o")
+    big = "lorem " * 400
+    budget = 2 * 4 + counter.count("Be helpful.") + counter.count("Hi") + 150
+    
+    packed = ContextPacker("gpt-4o", max_tokens=budget, min_chunk_tokens=32).pack(
+        "Be helpful.",
+        "Hi",
+        chunks=[
+            {"text": "Low score", "score": 0.1},
+            {"text": big, "score": 0.8},
+            {"text": "Best", "score": 0.9},
+        ],
+    )
+    
+    assert packed.retrieved_context.startswith("Best\n\nlorem")
+    assert "Low score" not in packed.retrieved_context
+    assert packed.truncated is True
+    assert packed.chunks_dropped == 1
+    assert packed.tokens_used <= budget
+
+
+@pytest.mark.unit
+def test_agent_request_sends_memory_and_knowledge_within_budget():
+    """Test the agent packs memory turns and retrieved chunks into the prompt."""
+    agent = Agent(
+        id="packer-agent",
+        name="Packer Agent",
+        instructions="Answer briefly.",
+        config=AgentConfig(context_max_tokens=2000),
+    )
+    context = {
+        "recent_interactions": [
+            {"input": "Second question", "output": "Second answer"},
+            {"input": "First question", "output": "First answer"},
+        ],
+        "retrieved_chunks": [{"text": "The sky is blue.", "score": 0.9, "source": "kb"}],
+        "ticket_id": "T-1",
+    }
+    
+    request = agent._build_request("What colour is the sky?", context)
+    messages = OpenAIAgentClient._build_messages(
+        request["instructions"], request["input_text"], request["context"],
+    )
+    
+    assert [m["content"] for m in messages[1:-1]] == [
+        "First question", "First answer", "Second question", "Second answer",
+    ]
+    assert "The sky is blue." in messages[0]["content"]
+    assert "ticket_id: T-1" in messages[0]["content"]
+    assert messages[-1] == {"role": "user", "content": "What colour is the sky?"}
+    assert render_system_prompt("x", None) == "x"
@@ -0,0 +1,143 @@
+"""Tests for the bounded execution store."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from agent_factory.runtime.execution_store import (
+    Execution,
+    ExecutionStore,
+    SQLiteExecutionBackend,
+)
+
+
+def make_execution(index, entity_id="agent-a", status="completed", created_at=None):
+    """Build an execution with a predictable ID."""
+    return Execution(
+        id=f"exec-{index}",
+        type="agent",
+        entity_id=entity_id,
+        status=status,
+        created_at=created_at or datetime.now(),
+        result={"output": f"output {index}"},
+    )
+
+
+@pytest.mark.unit
+def test_list_filters_newest_first():
+    """Test filtered listing uses the indexes and returns newest first."""
+    store = ExecutionStore()
+    for i in range(10):
+        store.add(make_execution(
+            i,
+            entity_id="agent-a" if i % 2 == 0 else "agent-b",
+            status="error" if i % 3 == 0 else "completed",
+        ))
+    
+    assert [e.id for e in store.list(limit=3)] == ["exec-9", "exec-8", "exec-7"]
+    assert [e.id for e in store.list(entity_id="agent-b")] == [
+        "exec-9", "exec-7", "exec-5", "exec-3", "exec-1",
+    ]
+    assert [e.id for e in store.list(status="error")] == ["exec-9", "exec-6", "exec-3", "exec-0"]
+    assert [e.id for e in store.list(entity_id="agent-a", status="error")] == ["exec-6", "exec-0"]
+    assert store.list(entity_id="missing") == []
+
+
+@pytest.mark.unit
+def test_update_reindexes_status():
+    """Test status changes move an execution between status indexes in creation order."""
+    store = ExecutionStore()
+    for i in range(3):
+        store.add(make_execution(i, status="running"))
+    
+    for i in (2, 0):
+        execution = store["exec-%d" % i]
+        execution.status = "completed"
+        store.update(execution)
+    
+    assert [e.id for e in store.list(status="completed")] == ["exec-2", "exec-0"]
+    assert [e.id for e in store.list(status="running")] == ["exec-1"]
+
+
+@pytest.mark.unit
+def test_window_is_bounded_without_backend():
+    """Test the oldest executions are dropped once the window is full."""
+    store = ExecutionStore(max_in_memory=5, spill_batch=1)
+    for i in range(8):
+        store.add(make_execution(i))
+    
+    assert len(store) == 5
+    assert store.get("exec-0") is None
+    assert [e.id for e in store.list()] == ["exec-7", "exec-6", "exec-5", "exec-4", "exec-3"]
+
+
+@pytest.mark.unit
+def test_spillover_to_sqlite(tmp_path):
+    """Test evicted executions are persisted and still listed and fetched."""
+    backend = SQLiteExecutionBackend(str(tmp_path / "executions.db"))
+    store = ExecutionStore(max_in_memory=4, backend=backend, spill_batch=2)
+    running = make_execution(0, status="running")
+    store.add(running)
+    for i in range(1, 8):
+        store.add(make_execution(i))
+    
+    assert len(store) <= 4
+    assert store.get_stats()["spilled"] == 4
+    
+    spilled = store.get("exec-1")
+    assert spilled.result == {"output": "output 1"}
+    assert "exec-1" in store
+    assert [e.id for e in store.list()] == [f"exec-{i}" for i in range(7, -1, -1)]
+    
+    # A run that finishes after being spilled updates its persisted copy
+    running.status = "completed"
+    store.update(running)
+    assert store.flush(timeout=5.0)
+    assert backend.get("exec-0").status == "completed"
+    assert store.get_stats()["pending_writes"] == 0
+
+
+@pytest.mark.unit
+def test_spills_are_written_in_the_background(tmp_path):
+    """Test adds never wait on the backend and unwritten spills stay visible."""
+    import threading
+    
+    class _GatedBackend(SQLiteExecutionBackend):
+        def __init__(self, db_path):
+            super().__init__(db_path)
+            self.gate = threading.Event()
+        
+        def save_many(self, executions):
+            self.gate.wait(5.0)
+            super().save_many(executions)
+    
+    backend = _GatedBackend(str(tmp_path / "executions.db"))
+    store = ExecutionStore(max_in_memory=2, backend=backend, spill_batch=1)
+    for i in range(5):
+        store.add(make_execution(i, entity_id="agent-a" if i % 2 == 0 else "agent-b"))
+    
+    assert store.get_stats()["pending_writes"] == 3
+    assert backend.get("exec-0") is None
+    assert store.get("exec-0").id == "exec-0"
+    assert [e.id for e in store.list(entity_id="agent-a", status="completed")] == ["exec-4", "exec-2", "exec-0"]
+    
+    backend.gate.set()
+    assert store.flush(timeout=5.0)
+    assert backend.get("exec-0") is not None
+    assert [e.id for e in store.list()] == [f"exec-{i}" for i in range(4, -1, -1)]
+
+
+@pytest.mark.unit
+def test_retention_drops_old_executions(tmp_path):
+    """Test executions past the retention period are dropped from both tiers."""
+    backend = SQLiteExecutionBackend(str(tmp_path / "executions.db"))
+    old = datetime.now() - timedelta(days=2)
+    backend.save_many([make_execution(0, created_at=old)])
+    
+    store = ExecutionStore(backend=backend, retention=timedelta(days=1))
+    store.add(make_execution(1, created_at=old))
+    store.add(make_execution(2))
+    
+    assert "exec-1" not in store
+    assert store.prune() == 1
+    assert backend.get("exec-0") is None
+    assert [e.id for e in store.list()] == ["exec-2"]
@@ -1,7 +1,8 @@
 """Tests for Anthropic client integration."""
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, AsyncMock, patch
+import asyncio
 import os
 
 from agent_factory.integrations.anthropic_client import AnthropicAgentClient
@@ -43,3 +44,30 @@ def test_anthropic_client_run_agent():
             
             assert result["output"] == "Test response"
             assert result["tokens_used"] == 30
+
+
+@pytest.mark.unit
+def test_anthropic_client_arun_agent():
+    """Test running agent with the async Anthropic client."""
+    with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}):
+        client = AnthropicAgentClient()
+        
+        mock_response = Mock()
+        mock_response.content = [
+            Mock(type="text", text="Async response")
+        ]
+        mock_response.usage = Mock(input_tokens=5, output_tokens=7)
+        
+        async def run():
+            with patch.object(
+                client.async_client.messages, 'create', AsyncMock(return_value=mock_response)
+            ):
+                return await client.arun_agent(
+                    instructions="You are a test agent",
+                    input_text="Hello"
+                )
+        
+        result = asyncio.run(run())
+        
+        assert result["output"] == "Async response"
+        assert result["tokens_used"] == 12
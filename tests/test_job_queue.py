@@ -169,3 +169,129 @@ def test_get_job_queue_singleton():
     queue2 = get_job_queue()
     
     assert queue1 is queue2
+
+
+@pytest.mark.unit
+def test_in_memory_queue_priorities_and_types():
+    """Test typed dequeues skip other types and higher priority goes first."""
+    queue = InMemoryJobQueue()
+    queue.enqueue(Job(job_id="wf-1", job_type=JobType.WORKFLOW_RUN, resource_id="wf", input_data={}))
+    queue.enqueue(Job(job_id="low", job_type=JobType.AGENT_RUN, resource_id="a", input_data={}))
+    queue.enqueue(Job(
+        job_id="high", job_type=JobType.AGENT_RUN, resource_id="a", input_data={}, metadata={"priority": 5},
+    ))
+    
+    assert queue.dequeue(JobType.AGENT_RUN).job_id == "high"
+    assert queue.dequeue(JobType.AGENT_RUN).job_id == "low"
+    assert queue.dequeue(JobType.AGENT_RUN) is None
+    assert queue.qsize() == 1
+    assert queue.dequeue().job_id == "wf-1"
+
+
+@pytest.mark.unit
+def test_in_memory_queue_cancel_and_requeue():
+    """Test cancelled or finished jobs are skipped and retried jobs queue again."""
+    queue = InMemoryJobQueue()
+    for i in range(3):
+        queue.enqueue(Job(job_id=f"job-{i}", job_type=JobType.AGENT_RUN, resource_id="a", input_data={}))
+    
+    assert queue.cancel("job-0") is True
+    assert queue.cancel("job-0") is False
+    assert queue.get_job("job-0").status == JobStatus.CANCELLED
+    
+    job = queue.get_job("job-1")
+    job.status = JobStatus.FAILED
+    queue.update_job(job)
+    assert queue.qsize() == 1
+    
+    assert queue.dequeue().job_id == "job-2"
+    job.status = JobStatus.QUEUED
+    queue.update_job(job)
+    assert queue.dequeue().job_id == "job-1"
+    assert queue.dequeue() is None
+
+
+@pytest.mark.unit
+def test_in_memory_queue_blocking_dequeue_and_backpressure():
+    """Test dequeue waits for a producer and enqueue waits for capacity."""
+    import threading
+    import time
+    from queue import Full
+    
+    queue = InMemoryJobQueue(max_size=1)
+    
+    def make(i):
+        return Job(job_id=f"job-{i}", job_type=JobType.AGENT_RUN, resource_id="a", input_data={})
+    
+    assert queue.dequeue(timeout=0.05) is None
+    threading.Timer(0.05, queue.enqueue, args=(make(0),)).start()
+    assert queue.dequeue(JobType.AGENT_RUN, timeout=2.0).job_id == "job-0"
+    
+    queue.enqueue(make(1))
+    with pytest.raises(Full):
+        queue.enqueue(make(2), timeout=0.05)
+    
+    threading.Timer(0.05, queue.dequeue).start()
+    start = time.monotonic()
+    queue.enqueue(make(3), timeout=2.0)
+    assert time.monotonic() - start >= 0.04
+    assert queue.qsize() == 1
+    assert queue.dequeue().job_id == "job-3"
+
+
+def _claim_jobs(db_path, results):
+    """Worker process: claim jobs in small batches until the queue is empty."""
+    queue = SQLiteJobQueue(db_path)
+    claimed = []
+    while True:
+        jobs = queue.dequeue_many(3)
+        if not jobs:
+            break
+        for job in jobs:
+            job.status = JobStatus.COMPLETED
+            queue.update_job(job)
+            claimed.append(job.job_id)
+    results.put(claimed)
+
+
+@pytest.mark.unit
+def test_sqlite_queue_dequeue_filters_by_type_and_batches(tmp_path):
+    """Test a job of another type at the head does not block typed dequeues."""
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue(Job(job_id="wf-1", job_type=JobType.WORKFLOW_RUN, resource_id="wf", input_data={}))
+    for i in range(3):
+        queue.enqueue(Job(job_id=f"job-{i}", job_type=JobType.AGENT_RUN, resource_id="agent", input_data={}))
+    
+    job = queue.dequeue(JobType.AGENT_RUN)
+    assert job.job_id == "job-0"
+    assert queue.get_job("job-0").status == JobStatus.RUNNING
+    
+    batch = queue.dequeue_many(5)
+    assert [job.job_id for job in batch] == ["wf-1", "job-1", "job-2"]
+    assert all(job.status == JobStatus.RUNNING and job.started_at for job in batch)
+    assert queue.dequeue_many(5) == []
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="requires fork")
+def test_sqlite_queue_concurrent_processes_claim_each_job_once(tmp_path):
+    """Test several worker processes never claim the same job."""
+    import multiprocessing
+    
+    db_path = str(tmp_path / "jobs.db")
+    queue = SQLiteJobQueue(db_path)
+    for i in range(200):
+        queue.enqueue(Job(job_id=f"job-{i}", job_type=JobType.AGENT_RUN, resource_id="agent", input_data={}))
+    
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_claim_jobs, args=(db_path, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [job_id for _ in workers for job_id in results.get(timeout=30)]
+    for worker in workers:
+        worker.join(timeout=10)
+    
+    assert len(claimed) == 200
+    assert len(set(claimed)) == 200
+    assert len(queue.list_jobs(status=JobStatus.COMPLETED, limit=500)) == 200
@@ -69,3 +69,184 @@ def test_agent_router():
     # Route from agent2 (no outgoing edges)
     next_agent = router.route({"message": "test"}, "agent2", graph)
     assert next_agent is None
+
+
+class _EchoAgent:
+    """Stand-in agent that tags its input and can be slow."""
+    
+    def __init__(self, name, reply=None, delay=0.0):
+        self.name = name
+        self.reply = reply
+        self.delay = delay
+        self.inputs = []
+    
+    async def arun(self, input_text):
+        import asyncio
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        
+        self.inputs.append(input_text)
+        await asyncio.sleep(self.delay)
+        return AgentResult(output=self.reply or f"{self.name}: {input_text}", status=AgentStatus.COMPLETED)
+
+
+def test_executor_runs_agents_and_follows_conditions():
+    """Test the executor calls agents and routes on compiled edge conditions."""
+    from agent_factory.orchestration.executor import OrchestrationExecutor
+    
+    agents = {
+        "triage": _EchoAgent("triage", reply="billing question about a refund"),
+        "billing": _EchoAgent("billing"),
+        "general": _EchoAgent("general"),
+    }
+    graph = AgentGraph(
+        nodes=[AgentNode(agent_id=name, agent=agent) for name, agent in agents.items()],
+        edges=[
+            RoutingEdge(from_agent="triage", to_agent="billing", condition="'refund' in $output"),
+            RoutingEdge(from_agent="triage", to_agent="general"),
+        ],
+        entry_point="triage",
+    )
+    
+    result = OrchestrationExecutor().execute(graph, {"input": "I want my money back"})
+    
+    assert agents["triage"].inputs == ["I want my money back"]
+    assert result["output"] == "billing: billing question about a refund"
+    assert result["path"] == ["triage", "billing"]
+    assert agents["general"].inputs == []
+    
+    agents["triage"].reply = "where is my order"
+    assert OrchestrationExecutor().execute(graph, {"input": "?"})["path"] == ["triage", "general"]
+
+
+def test_executor_scatter_gather_runs_branches_concurrently():
+    """Test unconditional fan-out runs branches in parallel and joins them once."""
+    import time
+    from agent_factory.orchestration.executor import OrchestrationExecutor
+    
+    branches = [f"expert{i}" for i in range(3)]
+    agents = {"planner": _EchoAgent("planner", reply="plan")}
+    agents.update({name: _EchoAgent(name, reply=f"{name} view", delay=0.1) for name in branches})
+    agents["writer"] = _EchoAgent("writer", reply="final answer")
+    graph = AgentGraph(
+        nodes=[AgentNode(agent_id=name, agent=agent) for name, agent in agents.items()],
+        edges=[RoutingEdge(from_agent="planner", to_agent=name) for name in branches]
+        + [RoutingEdge(from_agent=name, to_agent="writer") for name in branches],
+        entry_point="planner",
+    )
+    
+    assert graph.index.join_for("planner") == "writer"
+    
+    start = time.time()
+    result = OrchestrationExecutor().execute(graph, {"input": "question"})
+    elapsed = time.time() - start
+    
+    assert elapsed < 0.25
+    assert result["output"] == "final answer"
+    assert result["path"][0] == "planner" and result["path"][-1] == "writer"
+    assert sorted(result["path"][1:4]) == branches
+    assert len(agents["writer"].inputs) == 1
+    assert all(f"[{name}]\n{name} view" in agents["writer"].inputs[0] for name in branches)
+
+
+def test_agent_graph_index_tracks_changes_and_rejects_bad_conditions():
+    """Test the index is reused, rebuilt after changes and validates conditions."""
+    from agent_factory.core.exceptions import WorkflowError
+    
+    graph = AgentGraph(
+        nodes=[AgentNode(agent_id="a", agent=_EchoAgent("a"))],
+        edges=[],
+        entry_point="a",
+    )
+    index = graph.index
+    assert graph.get_node("a") is graph.nodes[0]
+    assert graph.index is index
+    
+    graph.add_node(AgentNode(agent_id="b", agent=_EchoAgent("b")))
+    graph.edges.append(RoutingEdge(from_agent="a", to_agent="b"))
+    assert graph.get_node("b") is not None
+    assert [edge.to_agent for edge in graph.get_outgoing_edges("a")] == ["b"]
+    
+    graph.add_edge(RoutingEdge(from_agent="b", to_agent="a", condition="$output >"))
+    with pytest.raises(WorkflowError):
+        graph.get_node("a")
+
+
+def _support_graph(triage_reply):
+    agents = {
+        "triage": _EchoAgent("triage", reply=triage_reply),
+        "billing": _EchoAgent("billing"),
+        "shipping": _EchoAgent("shipping"),
+    }
+    metadata = {
+        "billing": {"description": "refunds, invoices, payments and billing charges"},
+        "shipping": {"description": "shipping, delivery, parcels and order tracking"},
+    }
+    return agents, AgentGraph(
+        nodes=[AgentNode(agent_id=name, agent=agent, metadata=metadata.get(name, {})) for name, agent in agents.items()],
+        edges=[
+            RoutingEdge(from_agent="triage", to_agent="billing"),
+            RoutingEdge(from_agent="triage", to_agent="shipping"),
+        ],
+        entry_point="triage",
+    )
+
+
+def test_embedding_router_picks_closest_candidate():
+    """Test the embedding router chooses one target by description similarity."""
+    from agent_factory.orchestration.executor import OrchestrationExecutor
+    from agent_factory.orchestration.router import EmbeddingRouter
+    
+    fallback = _EchoAgent("router", reply="shipping")
+    router = EmbeddingRouter(margin=0.01, fallback_agent=fallback)
+    agents, graph = _support_graph("customer wants a refund on the invoice payment")
+    
+    result = OrchestrationExecutor(router=router).execute(graph, {"input": "?"})
+    
+    assert result["path"] == ["triage", "billing"]
+    assert fallback.inputs == []
+    assert router.route({"output": "track my parcel delivery"}, "triage", graph) == "shipping"
+    
+    graph.nodes[0].metadata["routing"] = "parallel"
+    assert sorted(router.next_agents({"output": "refund"}, "triage", graph)) == ["billing", "shipping"]
+
+
+def test_embedding_router_asks_fallback_on_close_scores():
+    """Test the fallback agent decides when the top two scores are within the margin."""
+    from agent_factory.orchestration.executor import OrchestrationExecutor
+    from agent_factory.orchestration.router import EmbeddingRouter
+    
+    fallback = _EchoAgent("router", reply="Shipping agent: `shipping`")
+    router = EmbeddingRouter(margin=2.0, fallback_agent=fallback)
+    agents, graph = _support_graph("customer wants a refund on the invoice payment")
+    
+    result = OrchestrationExecutor(router=router).execute(graph, {"input": "?"})
+    
+    assert result["path"] == ["triage", "shipping"]
+    assert "- billing: refunds" in fallback.inputs[0]
+    assert router.get_stats()["fallbacks"] == 1
+    
+    # An answer naming no candidate keeps the embedding choice
+    fallback.reply = "not sure"
+    assert OrchestrationExecutor(router=router).execute(graph, {"input": "?"})["path"] == ["triage", "billing"]
+
+
+def test_embedding_router_caches_candidate_matrix():
+    """Test candidate descriptions are embedded once per candidate set."""
+    from agent_factory.cache.semantic_cache import HashingEmbedder
+    from agent_factory.orchestration.router import EmbeddingRouter
+    
+    class CountingEmbedder(HashingEmbedder):
+        calls = 0
+        
+        def embed(self, text):
+            CountingEmbedder.calls += 1
+            return super().embed(text)
+    
+    router = EmbeddingRouter(embedder=CountingEmbedder())
+    _, graph = _support_graph("")
+    
+    for text in ("refund please", "where is my parcel", "invoice copy"):
+        router.route({"output": text}, "triage", graph)
+    
+    assert CountingEmbedder.calls == 2 + 3
+    assert router.get_stats() == {"decisions": 3, "fallbacks": 0, "cached_matrices": 1}
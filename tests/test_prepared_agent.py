@@ -0,0 +1,93 @@
+"""Tests for precompiled agent request artifacts."""
+
+import pytest
+from unittest.mock import Mock
+
+from agent_factory.agents.agent import Agent, AgentConfig
+from agent_factory.integrations.anthropic_client import AnthropicAgentClient
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.tools.decorator import function_tool
+
+
+@function_tool(name="lookup", description="Look up a term")
+def lookup(term: str) -> str:
+    return term
+
+
+@function_tool(name="echo", description="Echo text")
+def echo(text: str) -> str:
+    return text
+
+
+def _agent(**kwargs):
+    return Agent(id="prep", name="Prep", instructions="Be brief.", tools=[lookup], **kwargs)
+
+
+@pytest.mark.unit
+def test_prepared_agent_is_reused_until_the_agent_changes():
+    """Test the compiled agent is cached and invalidated by mutators."""
+    agent = _agent()
+    first = agent.prepared
+    
+    assert agent.prepared is first
+    assert first.openai_tools[0]["function"]["name"] == "lookup"
+    assert first.anthropic_tools[0]["name"] == "lookup"
+    assert first.tool_tokens > 0
+    
+    agent.add_tool(echo)
+    second = agent.prepared
+    assert second is not first
+    assert [t.id for t in second.tools] == ["lookup", "echo"]
+    assert second.fingerprint != first.fingerprint
+    
+    agent.remove_tool("echo")
+    assert agent.prepared.fingerprint == first.fingerprint
+    
+    agent.update_instructions("Be thorough.")
+    assert agent.prepared.system_prompt == "Be thorough."
+
+
+@pytest.mark.unit
+def test_prepared_agent_tracks_direct_attribute_changes():
+    """Test direct assignments to model, config or tools are picked up."""
+    agent = _agent()
+    first = agent.prepared
+    
+    agent.model = "gpt-4o-mini"
+    assert agent.prepared.model == "gpt-4o-mini"
+    
+    agent.config = AgentConfig(temperature=0)
+    assert agent.prepared.config.temperature == 0
+    
+    agent.tools.append(echo)
+    assert len(agent.prepared.tools) == 2
+    assert agent.prepared is not first
+
+
+@pytest.mark.unit
+def test_clients_reuse_precompiled_tool_schemas():
+    """Test provider clients take tool schemas from the prepared agent."""
+    prepared = _agent().prepared
+    # Tools are not consulted when a prepared agent is given
+    stale_tools = [Mock(get_schema=Mock(side_effect=AssertionError("rebuilt")))]
+    
+    openai_tools = OpenAIAgentClient._build_tools(stale_tools, prepared)
+    request = AnthropicAgentClient._build_request(
+        "Be brief.", "Hi", "claude-3-5-sonnet-20241022", stale_tools, 0.0, 100, None,
+        None, prepared,
+    )
+    
+    assert openai_tools == list(prepared.openai_tools)
+    assert request["tools"] == list(prepared.anthropic_tools)
+    assert OpenAIAgentClient._build_tools([lookup]) == list(prepared.openai_tools)
+
+
+@pytest.mark.unit
+def test_build_request_carries_prepared_agent():
+    """Test agent requests pass the prepared agent to the client."""
+    agent = _agent()
+    request = agent._build_request("Hi", {})
+    
+    assert request["prepared"] is agent.prepared
+    assert request["instructions"] == "Be brief."
+    assert request["tools"] == [lookup]
@@ -0,0 +1,179 @@
+"""Tests for multi-provider routing with failover."""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_factory.agents.agent import Agent, AgentConfig, AgentStatus
+from agent_factory.core.exceptions import AgentFactoryError
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.integrations.provider_router import (
+    ProviderTarget,
+    RouterHealth,
+    RoutingAgentClient,
+    register_provider,
+    unregister_provider,
+)
+from agent_factory.security.circuit_breaker import CircuitState, get_circuit_breaker
+
+
+class LocalProvider:
+    """Stand-in provider answering with its own name, or failing."""
+
+    def __init__(self, name, fail=False, delay=0.0):
+        self.name = name
+        self.fail = fail
+        self.delay = delay
+        self.calls = []
+
+    async def arun_agent(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"{self.name} unavailable")
+        return {"output": f"{self.name}:{kwargs['model']}", "tool_calls": [], "tokens_used": 5, "model": kwargs["model"]}
+
+    async def astream_events(self, **kwargs):
+        if self.fail:
+            raise ValueError(f"{self.name} unavailable")
+        yield {"type": "token", "content": self.name}
+        yield {"type": "response", "output": self.name, "tool_calls": [], "tokens_used": 5, "model": kwargs["model"]}
+
+    build_tool_messages = staticmethod(OpenAIAgentClient.build_tool_messages)
+
+
+@pytest.fixture
+def providers():
+    local = {
+        "local-down": LocalProvider("local-down", fail=True),
+        "local-up": LocalProvider("local-up"),
+        "local-slow": LocalProvider("local-slow", delay=0.02),
+    }
+    for name, provider in local.items():
+        register_provider(name, lambda provider=provider: provider)
+    yield local
+    for name in local:
+        unregister_provider(name)
+        for model in ("m1", "m2"):
+            get_circuit_breaker(f"llm_target:{name}:{model}").reset()
+
+
+def _request(**kwargs):
+    return {"instructions": "Be brief.", "input_text": "hi", **kwargs}
+
+
+@pytest.mark.unit
+def test_router_fails_over_to_next_target(providers):
+    """Test a failing target is skipped and the next one serves the run."""
+    client = RoutingAgentClient(["local-down:m1", "local-up:m2"], health=RouterHealth())
+
+    response = asyncio.run(client.arun_agent(**_request(model="ignored")))
+
+    assert response["output"] == "local-up:m2"
+    info = client.routing_info()
+    assert info["target"] == "local-up:m2"
+    assert info["provider"] == "local-up"
+    assert [f["target"] for f in info["failed_targets"]] == ["local-down:m1"]
+
+    # The run stays on the serving target
+    asyncio.run(client.arun_agent(**_request()))
+    assert len(providers["local-down"].calls) == 1
+    assert len(providers["local-up"].calls) == 2
+
+
+@pytest.mark.unit
+def test_router_skips_targets_with_open_breaker(providers):
+    """Test targets whose breaker is open are not called."""
+    breaker = get_circuit_breaker("llm_target:local-up:m1")
+    breaker.stats.state = CircuitState.OPEN
+    breaker.stats.last_failure_time = time.time()
+
+    client = RoutingAgentClient(["local-up:m1", "local-slow:m2"], health=RouterHealth())
+    response = asyncio.run(client.arun_agent(**_request()))
+
+    assert response["output"] == "local-slow:m2"
+    assert providers["local-up"].calls == []
+    assert client.routing_info()["failed_targets"][0]["error"] == "circuit open"
+
+
+@pytest.mark.unit
+def test_router_latency_strategy_prefers_fast_healthy_targets(providers):
+    """Test the latency strategy ranks by rolling latency and error rate."""
+    health = RouterHealth()
+    slow, fast, flaky = ProviderTarget("p", "slow"), ProviderTarget("p", "fast"), ProviderTarget("p", "flaky")
+    for _ in range(5):
+        health.record(slow, True, 2.0)
+        health.record(fast, True, 0.5)
+        health.record(flaky, True, 0.4)
+        health.record(flaky, False, None)
+
+    client = RoutingAgentClient([slow, flaky, fast], strategy="latency", health=health)
+    assert [t.model for t in client.order()] == ["fast", "flaky", "slow"]
+
+    weighted = RoutingAgentClient([slow, ProviderTarget("p", "fast", weight=1000.0)], strategy="weighted", health=health)
+    assert weighted.order()[0].model == "fast"
+
+
+@pytest.mark.unit
+def test_router_raises_when_all_targets_fail(providers):
+    """Test exhausting every target reports each failure."""
+    client = RoutingAgentClient(["local-down:m1"], health=RouterHealth())
+
+    with pytest.raises(AgentFactoryError, match="local-down:m1"):
+        asyncio.run(client.arun_agent(**_request()))
+
+    with pytest.raises(ValueError):
+        RoutingAgentClient(["no-model"])
+    with pytest.raises(ValueError):
+        RoutingAgentClient(["local-up:m1"], strategy="fastest")
+
+
+@pytest.mark.unit
+def test_agent_records_serving_target_in_metadata(providers):
+    """Test agents configured with targets report which one served the run."""
+    agent = Agent(
+        id="routed",
+        name="Routed",
+        instructions="Be brief.",
+        config=AgentConfig(provider_targets=["local-down:m1", {"provider": "local-up", "model": "m2"}]),
+    )
+
+    result = agent.run("hello")
+
+    assert result.status == AgentStatus.COMPLETED
+    assert result.output == "local-up:m2"
+    assert result.metadata["target"] == "local-up:m2"
+    assert result.metadata["model"] == "m2"
+    assert result.metadata["failed_targets"][0]["target"] == "local-down:m1"
+
+    async def stream():
+        return [event async for event in agent.run_stream("hello")]
+
+    events = asyncio.run(stream())
+    assert events[-1]["type"] == "done"
+    assert events[-1]["output"] == "local-up"
+
+
+@pytest.mark.unit
+def test_routed_agent_uses_response_cache(providers):
+    """Test routing and the response cache work together at temperature 0."""
+    from agent_factory.cache.response_cache import get_response_cache
+
+    get_response_cache().clear()
+    agent = Agent(
+        id="routed-cached",
+        name="Routed",
+        instructions="Be brief.",
+        config=AgentConfig(temperature=0, provider_targets=["local-down:m1", "local-up:m2"]),
+    )
+
+    first = agent.run("cache me")
+    second = agent.run("cache me")
+
+    assert first.status == AgentStatus.COMPLETED, first.error
+    assert first.output == "local-up:m2"
+    assert first.metadata["cached"] is False
+    assert second.output == "local-up:m2"
+    assert second.metadata["cached"] is True
+    assert len(providers["local-up"].calls) == 1
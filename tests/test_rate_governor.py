@@ -0,0 +1,224 @@
+"""Tests for the adaptive LLM concurrency and rate governor."""
+
+import asyncio
+import time
+
+import pytest
+
+from agent_factory.integrations.rate_governor import (
+    AdaptiveLimiter,
+    RateGovernor,
+    RateLimits,
+    estimate_request_tokens,
+)
+from agent_factory.integrations.request_policy import (
+    LatencyTracker,
+    RequestPolicy,
+    ResilientAgentClient,
+    is_rate_limited,
+)
+from agent_factory.security.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+@pytest.mark.unit
+def test_limiter_queues_excess_requests_in_order():
+    """Test requests over the limit wait and are admitted first-come first-served."""
+    limiter = AdaptiveLimiter("test:fifo", RateLimits(initial_concurrency=2, max_concurrency=2))
+    running = []
+    peak = []
+    order = []
+
+    async def call(index):
+        async with limiter.slot():
+            order.append(index)
+            running.append(index)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(index)
+
+    async def main():
+        tasks = []
+        for index in range(6):
+            tasks.append(asyncio.ensure_future(call(index)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert max(peak) == 2
+    assert order == list(range(6))
+    stats = limiter.get_stats()
+    assert stats["admitted"] == 6
+    assert stats["queued"] >= 4
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.unit
+def test_limiter_adapts_to_rate_limits_and_latency():
+    """Test 429s halve the limit once per burst and successes grow it back."""
+    limiter = AdaptiveLimiter("test:aimd", RateLimits(initial_concurrency=8))
+
+    for _ in range(3):
+        limiter.in_flight += 1
+        limiter.release(latency=None, error=RateLimitError())
+    assert limiter.limit == 4  # one decrease for the burst
+    assert limiter.get_stats()["rate_limited"] == 3
+
+    for _ in range(8):
+        limiter.in_flight += 1
+        limiter.release(latency=0.1)
+    assert limiter.limit > 5
+
+
+@pytest.mark.unit
+def test_limiter_is_unbounded_until_rate_limited():
+    """Test unconfigured targets admit everything and only 429s set a limit."""
+    limiter = AdaptiveLimiter("test:open", RateLimits())
+
+    async def main():
+        slots = [limiter.slot() for _ in range(500)]
+        await asyncio.wait_for(asyncio.gather(*(slot.__aenter__() for slot in slots)), 1.0)
+        return slots
+
+    asyncio.run(main())
+    assert limiter.get_stats()["in_flight"] == 500
+    assert limiter.get_stats()["limit"] is None
+
+    for _ in range(99):
+        limiter.release(latency=0.1)
+    for _ in range(20):
+        limiter.release(latency=100.0)  # slow, long answers are not overload
+    assert limiter.get_stats()["limit"] is None
+
+    limiter.release(latency=None, error=RateLimitError())
+    assert limiter.limit == 190.5  # half of the 381 requests in flight when rejected
+    for _ in range(10):
+        limiter.in_flight += 1
+        limiter.release(latency=100.0)
+    assert limiter.limit > 190.5
+
+
+@pytest.mark.unit
+def test_limiter_token_budget_delays_and_corrects():
+    """Test the TPM budget delays requests and is refunded from actual usage."""
+    limiter = AdaptiveLimiter("test:tpm", RateLimits(tokens_per_minute=6000))
+
+    async def main():
+        async with limiter.slot(tokens=6000) as slot:
+            slot.tokens_used = 100  # refunds 5900
+        start = time.monotonic()
+        async with limiter.slot(tokens=5000):
+            pass
+        refunded = time.monotonic() - start
+
+        start = time.monotonic()
+        async with limiter.slot(tokens=1000):
+            pass
+        return refunded, time.monotonic() - start
+
+    refunded, throttled = asyncio.run(main())
+    assert refunded < 0.1
+    assert throttled >= 0.05
+
+
+@pytest.mark.unit
+def test_rate_limits_do_not_open_circuit_breaker():
+    """Test the breaker ignores errors its predicate does not count as failures."""
+    breaker = CircuitBreaker(
+        "test_rate_limited",
+        CircuitBreakerConfig(failure_threshold=2, is_failure=lambda e: not is_rate_limited(e)),
+    )
+
+    def limited():
+        raise RateLimitError()
+
+    for _ in range(5):
+        with pytest.raises(RateLimitError):
+            breaker.call(limited)
+    assert breaker.get_stats()["state"] == "closed"
+
+
+@pytest.mark.unit
+def test_governor_configures_targets_and_resilient_client_uses_it():
+    """Test per-provider limits and admission through ResilientAgentClient."""
+    governor = RateGovernor(default=RateLimits(initial_concurrency=4))
+    governor.configure("anthropic", RateLimits(initial_concurrency=1, max_concurrency=1))
+
+    assert governor.limiter("openai", "gpt-4o").limit == 4
+    assert governor.limiter("anthropic", "claude").limit == 1
+
+    class StubClient:
+        def __init__(self):
+            self.active = 0
+            self.peak = 0
+
+        async def arun_agent(self, **kwargs):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            return {"output": "ok", "tool_calls": [], "tokens_used": 10}
+
+    inner = StubClient()
+    client = ResilientAgentClient(
+        inner, RequestPolicy(), provider="anthropic", tracker=LatencyTracker(), governor=governor
+    )
+
+    async def main():
+        return await asyncio.gather(*[
+            client.arun_agent(instructions="Be brief.", input_text=f"q{i}", model="claude", max_tokens=50)
+            for i in range(4)
+        ])
+
+    results = asyncio.run(main())
+    assert [r["output"] for r in results] == ["ok"] * 4
+    assert inner.peak == 1
+    assert governor.get_stats()["anthropic:claude"]["admitted"] == 4
+
+
+@pytest.mark.unit
+def test_estimate_request_tokens_uses_packed_context():
+    """Test token estimates prefer the packer's count plus the completion budget."""
+    packed = {"packed": True, "context_tokens": 700}
+    assert estimate_request_tokens({"context": packed, "max_tokens": 300}) == 1000
+    assert estimate_request_tokens({"instructions": "x" * 40, "input_text": "", "max_tokens": 0}) > 0
+
+
+@pytest.mark.unit
+def test_queue_wait_does_not_count_toward_attempt_deadline():
+    """Test requests queued behind the governor get a full attempt deadline once admitted."""
+    governor = RateGovernor(default=RateLimits(initial_concurrency=1, max_concurrency=1))
+
+    class StubClient:
+        calls = 0
+
+        async def arun_agent(self, **kwargs):
+            StubClient.calls += 1
+            await asyncio.sleep(0.05)
+            return {"output": "ok", "tool_calls": [], "tokens_used": 1}
+
+    policy = RequestPolicy(max_attempts=1, attempt_timeout=0.2, queue_timeout=5.0)
+    client = ResilientAgentClient(StubClient(), policy, tracker=LatencyTracker(), governor=governor)
+
+    async def main():
+        return await asyncio.gather(*[
+            client.arun_agent(instructions="", input_text=f"q{i}", model="m", max_tokens=1) for i in range(8)
+        ])
+
+    assert [r["output"] for r in asyncio.run(main())] == ["ok"] * 8
+    assert StubClient.calls == 8
+
+    policy.queue_timeout = 0.01
+
+    async def overloaded():
+        return await asyncio.gather(*[
+            client.arun_agent(instructions="", input_text=f"q{i}", model="m", max_tokens=1) for i in range(3)
+        ], return_exceptions=True)
+
+    results = asyncio.run(overloaded())
+    assert sum(isinstance(r, asyncio.TimeoutError) for r in results) == 2
+    assert governor.get_stats()["openai:m"]["waiting"] == 0
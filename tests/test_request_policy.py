@@ -0,0 +1,146 @@
+"""Tests for the LLM request retry and hedging policy."""
+
+import asyncio
+
+import pytest
+
+from agent_factory.agents.agent import AgentConfig
+from agent_factory.integrations.request_policy import (
+    LatencyTracker,
+    RequestPolicy,
+    ResilientAgentClient,
+    call_with_policy,
+    is_retryable,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _policy(**kwargs):
+    defaults = dict(max_attempts=3, attempt_timeout=1.0, backoff_base=0.0)
+    defaults.update(kwargs)
+    return RequestPolicy(**defaults)
+
+
+@pytest.mark.unit
+def test_is_retryable_classification():
+    """Test transient errors are retried and client errors are not."""
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad input"))
+
+    # Wrapped SDK errors are classified by their cause
+    try:
+        try:
+            raise StatusError(500)
+        except StatusError as e:
+            raise RuntimeError("Anthropic API error") from e
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+
+
+@pytest.mark.unit
+def test_policy_from_agent_config():
+    """Test AgentConfig retry settings map onto the policy."""
+    policy = RequestPolicy.from_config(AgentConfig(timeout=10, retry_attempts=2, hedge_requests=True))
+
+    assert policy.max_attempts == 3
+    assert policy.attempt_timeout == 10.0
+    assert policy.hedge
+    assert 0 <= policy.backoff(10) <= policy.backoff_max
+
+
+@pytest.mark.unit
+def test_call_with_policy_retries_transient_errors():
+    """Test 429s are retried until success and 400s fail immediately."""
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise StatusError(429)
+        return "ok"
+
+    assert asyncio.run(call_with_policy(flaky, _policy(), "test:flaky", LatencyTracker())) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+
+    async def rejected():
+        calls.append(1)
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        asyncio.run(call_with_policy(rejected, _policy(), "test:rejected", LatencyTracker()))
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_call_with_policy_enforces_attempt_deadline():
+    """Test a hung attempt is abandoned at its deadline and retried."""
+    calls = []
+
+    async def hangs_once():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return "ok"
+
+    policy = _policy(attempt_timeout=0.05)
+    assert asyncio.run(call_with_policy(hangs_once, policy, "test:hang", LatencyTracker())) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_hedged_request_wins_over_slow_primary():
+    """Test a slow call is hedged after the latency quantile and the faster result wins."""
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record("test:hedge", 0.01)
+    calls = []
+
+    async def slow_then_fast():
+        calls.append(1)
+        await asyncio.sleep(5 if len(calls) == 1 else 0)
+        return len(calls)
+
+    policy = _policy(hedge=True, hedge_min_delay=0.02, attempt_timeout=2.0)
+    result = asyncio.run(call_with_policy(slow_then_fast, policy, "test:hedge", tracker))
+
+    assert result == 2
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_resilient_client_retries_stream_before_first_event():
+    """Test a stream failing before its first event is retried."""
+
+    class FlakyStreamClient:
+        def __init__(self):
+            self.calls = 0
+
+        async def astream_events(self, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise StatusError(502)
+            yield {"type": "token", "content": "hi"}
+            yield {"type": "response", "output": "hi", "tool_calls": []}
+
+        def build_tool_messages(self, response, tool_results):
+            return []
+
+    inner = FlakyStreamClient()
+    client = ResilientAgentClient(inner, _policy(), tracker=LatencyTracker())
+
+    async def collect():
+        return [event async for event in client.astream_events(model="m", input_text="x")]
+
+    events = asyncio.run(collect())
+    assert [event["type"] for event in events] == ["token", "response"]
+    assert inner.calls == 2
@@ -0,0 +1,152 @@
+"""Tests for the LLM response cache."""
+
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from agent_factory.agents.agent import Agent, AgentConfig, AgentStatus
+from agent_factory.cache.response_cache import (
+    DiskResponseCache,
+    ResponseCache,
+    make_cache_key,
+)
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+
+
+def _key(**overrides):
+    params = {
+        "model": "gpt-4o",
+        "instructions": "Be brief",
+        "messages": [{"role": "user", "content": "Hi"}],
+        "tool_schemas": [],
+        "temperature": 0.0,
+        "max_tokens": 100,
+    }
+    params.update(overrides)
+    return make_cache_key(**params)
+
+
+@pytest.mark.unit
+def test_cache_key_is_stable_and_sensitive():
+    """Test identical requests share a key and any parameter change alters it."""
+    assert _key() == _key()
+    assert _key() != _key(temperature=0.5)
+    assert _key() != _key(max_tokens=200)
+    assert _key() != _key(messages=[{"role": "user", "content": "Hello"}])
+    assert _key() != _key(tool_schemas=[{"type": "function", "function": {"name": "t"}}])
+
+
+@pytest.mark.unit
+def test_lru_evicts_by_bytes():
+    """Test least recently used entries are evicted once the byte budget is exceeded."""
+    cache = ResponseCache(max_bytes=120)
+    cache.set("a", {"output": "x" * 30})
+    cache.set("b", {"output": "y" * 30})
+    assert cache.get("a") is not None  # "a" is now most recently used
+    
+    cache.set("c", {"output": "z" * 30})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.get_stats()["bytes"] <= 120
+
+
+@pytest.mark.unit
+def test_persistent_tier_and_metrics(tmp_path):
+    """Test misses fall through to the disk tier and hits are reported."""
+    disk = DiskResponseCache(str(tmp_path / "responses.db"))
+    ResponseCache(persistent=disk).set("k", {"output": "cached"})
+    
+    cache = ResponseCache(persistent=disk)
+    with patch('agent_factory.cache.response_cache.MetricsCollector') as metrics:
+        assert cache.get("k") == {"output": "cached"}
+        assert cache.get("missing") is None
+    
+    metrics.record_cache_hit.assert_called_once_with("llm_response")
+    metrics.record_cache_miss.assert_called_once_with("llm_response")
+
+
+@pytest.mark.unit
+def test_expired_entries_are_not_served():
+    """Test entries past their TTL are dropped."""
+    cache = ResponseCache()
+    cache.set("k", {"output": "old"}, ttl=1)
+    
+    with patch('agent_factory.cache.response_cache.time.time', return_value=10 ** 12):
+        assert cache.get("k") is None
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_serves_repeat_runs_from_cache(mock_client_class):
+    """Test a deterministic agent calls the model once for repeated input."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "42", "tool_calls": [], "tokens_used": 9})
+    mock_client._build_messages = OpenAIAgentClient._build_messages
+    mock_client._build_tools = OpenAIAgentClient._build_tools
+    del mock_client._build_request
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(id="calc", name="Calc", instructions="Answer", config=AgentConfig(temperature=0))
+    
+    with patch('agent_factory.cache.response_cache.get_response_cache', return_value=ResponseCache()):
+        first = agent.run("What is 6 x 7?")
+        second = agent.run("What is 6 x 7?")
+        third = agent.run("What is 6 x 8?")
+    
+    assert first.status == second.status == AgentStatus.COMPLETED
+    assert second.output == "42"
+    assert first.metadata["cached"] is False
+    assert second.metadata["cached"] is True
+    assert third.metadata["cached"] is False
+    assert mock_client.arun_agent.await_count == 2
+
+
+@pytest.mark.unit
+def test_cache_enabled_only_for_zero_temperature_by_default():
+    """Test the cache defaults to on for temperature 0 and can be overridden."""
+    assert Agent(id="a", name="A", instructions="x", config=AgentConfig(temperature=0))._cache_enabled()
+    assert not Agent(id="b", name="B", instructions="x")._cache_enabled()
+    assert Agent(
+        id="c", name="C", instructions="x", config=AgentConfig(cache_responses=True)
+    )._cache_enabled()
+
+
+@pytest.mark.unit
+def test_caching_client_keeps_persistent_tier_off_the_event_loop():
+    """Test the blocking persistent tier is read and written from worker threads."""
+    import asyncio
+    import threading
+    from agent_factory.cache.response_cache import CachingAgentClient
+    
+    class _RecordingTier:
+        def __init__(self):
+            self.threads = []
+            self.data = {}
+        
+        def get(self, key):
+            self.threads.append(threading.get_ident())
+            return self.data.get(key)
+        
+        def set(self, key, value, ttl=None):
+            self.threads.append(threading.get_ident())
+            self.data[key] = value
+    
+    tier = _RecordingTier()
+    client = Mock(spec=["arun_agent"])
+    client.arun_agent = AsyncMock(return_value={"output": "42", "tool_calls": [], "tokens_used": 9})
+    caching = CachingAgentClient(client, ResponseCache(persistent=tier))
+    
+    async def run():
+        first = await caching.arun_agent("Answer", "6 x 7?", temperature=0)
+        caching.cache = ResponseCache(persistent=tier)  # empty memory tier, warm persistent tier
+        second = await caching.arun_agent("Answer", "6 x 7?", temperature=0)
+        return first, second, threading.get_ident()
+    
+    first, second, loop_thread = asyncio.run(run())
+    
+    assert first["output"] == second["output"] == "42"
+    assert second["cached"] is True
+    assert client.arun_agent.await_count == 1
+    assert len(tier.threads) == 3  # miss, store, hit
+    assert loop_thread not in tier.threads
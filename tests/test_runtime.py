@@ -1,10 +1,14 @@
 """Tests for Runtime Engine."""
 
 import pytest
-from unittest.mock import patch, Mock
+import asyncio
+
+from unittest.mock import patch, Mock, AsyncMock
 from agent_factory.runtime.engine import RuntimeEngine, Execution
 from agent_factory.agents.agent import Agent
 from agent_factory.workflows.model import Workflow, WorkflowStep
+from agent_factory.workflows.checkpoint import SQLiteCheckpointStore
+from agent_factory.promptlog import SQLiteStorage
 
 
 @pytest.mark.unit
@@ -51,11 +55,11 @@ def test_register_workflow():
 def test_run_agent(mock_client_class):
     """Test running an agent via runtime engine."""
     mock_client = Mock()
-    mock_client.run_agent.return_value = {
+    mock_client.arun_agent = AsyncMock(return_value={
         "output": "Test output",
         "tool_calls": [],
         "tokens_used": 50,
-    }
+    })
     mock_client_class.return_value = mock_client
     
     engine = RuntimeEngine()
@@ -74,6 +78,53 @@ def test_run_agent(mock_client_class):
     assert execution.status == "completed"
 
 
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_arun_agent(mock_client_class, tmp_path):
+    """Test running an agent via the async runtime API."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "Async output", "tool_calls": []})
+    mock_client_class.return_value = mock_client
+    
+    engine = RuntimeEngine(prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")))
+    engine.telemetry_collector = Mock()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    
+    execution_id = asyncio.run(engine.arun_agent("test-agent", "Test input"))
+    
+    execution = engine.get_execution(execution_id)
+    assert execution.status == "completed"
+    assert execution.result.output == "Async output"
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_arun_workflow(mock_client_class, tmp_path):
+    """Test running a workflow via the async runtime API."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "Step output", "tool_calls": []})
+    mock_client_class.return_value = mock_client
+    
+    engine = RuntimeEngine(
+        prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")),
+        checkpoint_store=SQLiteCheckpointStore(str(tmp_path / "checkpoints.db")),
+    )
+    engine.telemetry_collector = Mock()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    engine.register_workflow(Workflow(
+        id="test-workflow",
+        name="Test Workflow",
+        steps=[WorkflowStep(id="step1", agent_id="test-agent")],
+    ))
+    
+    execution_id = asyncio.run(engine.arun_workflow("test-workflow", {"input": "Hi"}))
+    
+    execution = engine.get_execution(execution_id)
+    assert execution.status == "completed"
+    assert execution.result.success is True
+    assert execution.result.steps_executed == ["step1"]
+
+
 @pytest.mark.unit
 def test_run_agent_not_found():
     """Test running non-existent agent."""
@@ -119,3 +170,150 @@ def test_list_executions():
         executions = engine.list_executions()
         assert len(executions) == 1
         assert executions[0].id == execution_id
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_identical_concurrent_runs_are_coalesced(mock_client_class, tmp_path):
+    """Test identical in-flight runs share one model call and distinct ones do not."""
+    async def slow_answer(**kwargs):
+        await asyncio.sleep(0.1)
+        return {"output": f"Answer to {kwargs['input_text']}", "tool_calls": []}
+    
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(side_effect=slow_answer)
+    mock_client_class.return_value = mock_client
+    
+    engine = RuntimeEngine(prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")))
+    engine.telemetry_collector = Mock()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    
+    async def burst():
+        return await asyncio.gather(
+            *(engine.arun_agent("test-agent", "Same question") for _ in range(5)),
+            engine.arun_agent("test-agent", "Other question"),
+        )
+    
+    execution_ids = asyncio.run(burst())
+    
+    assert len(set(execution_ids)) == 6
+    assert mock_client.arun_agent.await_count == 2
+    executions = [engine.get_execution(eid) for eid in execution_ids]
+    assert all(e.status == "completed" for e in executions)
+    assert {e.result.output for e in executions[:5]} == {"Answer to Same question"}
+    assert sum(1 for e in executions if e.metadata.get("coalesced")) == 4
+    assert engine.get_coalescing_stats() == {"executed": 2, "coalesced": 4, "in_flight": 0}
+    
+    # Once finished, a repeat run executes again
+    asyncio.run(engine.arun_agent("test-agent", "Same question"))
+    assert mock_client.arun_agent.await_count == 3
+
+
+@pytest.mark.unit
+def test_cancelled_leader_does_not_cancel_followers():
+    """Test a follower takes over a cancelled leader's call and a cancelled follower leaves the call alone."""
+    from agent_factory.runtime.singleflight import SingleFlight
+    
+    flight = SingleFlight()
+    calls = []
+    
+    async def call():
+        calls.append(len(calls))
+        await asyncio.sleep(0.05)
+        return f"answer {len(calls)}"
+    
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do("key", call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        followers[0].cancel()
+        results = await asyncio.gather(*followers[1:])
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert followers[0].cancelled()
+        return results
+    
+    results = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert sorted(shared for _, shared in results) == [False, True]
+    assert {output for output, _ in results} == {"answer 2"}
+    assert flight.get_stats()["in_flight"] == 0
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_coalescing_can_be_disabled(mock_client_class, tmp_path):
+    """Test every run calls the model when coalescing is off."""
+    async def slow_answer(**kwargs):
+        await asyncio.sleep(0.05)
+        return {"output": "Answer", "tool_calls": []}
+    
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(side_effect=slow_answer)
+    mock_client_class.return_value = mock_client
+    
+    engine = RuntimeEngine(
+        prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")),
+        coalesce_runs=False,
+    )
+    engine.telemetry_collector = Mock()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    
+    async def burst():
+        return await asyncio.gather(*(engine.arun_agent("test-agent", "Same") for _ in range(3)))
+    
+    asyncio.run(burst())
+    assert mock_client.arun_agent.await_count == 3
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_run_agent_batch(mock_client_class, tmp_path):
+    """Test batch runs keep input order, bound concurrency and report item errors."""
+    in_flight = {"now": 0, "peak": 0}
+    
+    async def answer(**kwargs):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        if kwargs["input_text"] == "ticket 3":
+            raise RuntimeError("provider error")
+        return {"output": f"label for {kwargs['input_text']}", "tool_calls": [], "tokens_used": 7}
+    
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(side_effect=answer)
+    mock_client_class.return_value = mock_client
+    
+    engine = RuntimeEngine(prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")))
+    engine.telemetry_collector = Mock()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    
+    inputs = [f"ticket {i}" for i in range(10)]
+    batch = engine.run_agent_batch("test-agent", inputs, max_concurrency=3)
+    
+    assert [item.index for item in batch.items] == list(range(10))
+    assert [item.input_text for item in batch.items] == inputs
+    assert batch.items[0].result.output == "label for ticket 0"
+    assert batch.items[3].success is False
+    assert "provider error" in batch.items[3].error
+    assert batch.succeeded == 9
+    assert batch.failed == 1
+    assert batch.tokens_used == 9 * 7
+    assert batch.cost_estimate == pytest.approx(0.00029)  # 44 input and 18 output tokens on gpt-4o
+    assert in_flight["peak"] <= 3
+    assert len(engine.list_executions(entity_id="test-agent")) == 10
+
+
+@pytest.mark.unit
+def test_run_agent_batch_validation():
+    """Test batch runs reject unknown agents and non-positive concurrency."""
+    engine = RuntimeEngine()
+    engine.register_agent(Agent(id="test-agent", name="Test Agent", instructions="Test"))
+    
+    with pytest.raises(ValueError, match="Agent not found"):
+        engine.run_agent_batch("non-existent", ["a"])
+    with pytest.raises(ValueError, match="max_concurrency"):
+        engine.run_agent_batch("test-agent", ["a"], max_concurrency=0)
@@ -0,0 +1,158 @@
+"""Tests for the semantic response cache."""
+
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from agent_factory.agents.agent import Agent, AgentConfig, AgentStatus
+from agent_factory.cache.semantic_cache import (
+    Embedder,
+    HashingEmbedder,
+    SemanticCache,
+    make_scope,
+)
+
+
+@pytest.mark.unit
+def test_hashing_embedder_similarity():
+    """Test paraphrases score higher than unrelated questions."""
+    embedder = HashingEmbedder()
+    
+    def similarity(a, b):
+        return sum(x * y for x, y in zip(embedder.embed(a), embedder.embed(b)))
+    
+    base = "How do I reset my password?"
+    assert similarity(base, base) == pytest.approx(1.0)
+    assert similarity(base, "how can I reset my password") > 0.85
+    assert similarity(base, "What are your opening hours?") < 0.3
+
+
+@pytest.mark.unit
+def test_lookup_respects_threshold_scope_and_ttl():
+    """Test hits need enough similarity, the same scope and a live entry."""
+    cache = SemanticCache()
+    cache.store("bot:v1", "How do I reset my password?", "Use the reset link.", ttl=60)
+    
+    match = cache.lookup("bot:v1", "how can I reset my password", threshold=0.85)
+    assert match is not None
+    assert match.payload == "Use the reset link."
+    assert match.matched_input == "How do I reset my password?"
+    
+    assert cache.lookup("bot:v1", "how can I reset my password", threshold=0.99) is None
+    assert cache.lookup("bot:v2", "How do I reset my password?", threshold=0.5) is None
+    
+    with patch('agent_factory.cache.semantic_cache.time.time', return_value=10 ** 12):
+        assert cache.lookup("bot:v1", "How do I reset my password?", threshold=0.5) is None
+
+
+@pytest.mark.unit
+def test_index_is_bounded():
+    """Test the oldest entries are overwritten once a scope is full."""
+    cache = SemanticCache(max_entries=2)
+    for i, text in enumerate(["alpha question", "beta question", "gamma question"]):
+        cache.store("s", text, i)
+    
+    assert cache.get_stats()["entries"] == 2
+    assert cache.lookup("s", "alpha question", threshold=0.99) is None
+    assert cache.lookup("s", "gamma question", threshold=0.99).payload == 2
+
+
+@pytest.mark.unit
+def test_default_threshold_rejects_inputs_differing_in_a_key_word():
+    """Test the default threshold does not serve answers to requests that differ in an amount or plan."""
+    cache = SemanticCache()
+    threshold = AgentConfig().semantic_cache_threshold
+    cache.store("s", "I want a refund of 100 dollars for my order", {"output": "refunded 100"})
+    cache.store("s", "please upgrade my account to the pro plan", {"output": "pro"})
+    
+    assert cache.lookup("s", "I want a refund of 500 dollars for my order", threshold=threshold) is None
+    assert cache.lookup("s", "please upgrade my account to the basic plan", threshold=threshold) is None
+    assert cache.lookup("s", "please upgrade my account to the pro plan!", threshold=threshold).payload == {"output": "pro"}
+
+
+@pytest.mark.unit
+def test_pure_python_index_is_capped_and_scopes_are_locked_separately():
+    """Test the NumPy-less index is capped and each scope has its own lock."""
+    with patch('agent_factory.cache.semantic_cache.np', None):
+        cache = SemanticCache(max_entries=50_000)
+        assert cache.max_entries == 1000
+        cache.store("a", "first", 1)
+        cache.store("b", "second", 2)
+        
+        with cache._indexes["a"].lock:
+            # Scope "a" is busy; scope "b" still answers
+            assert cache.lookup("b", "second", threshold=0.99).payload == 2
+
+
+@pytest.mark.unit
+def test_pluggable_embedder():
+    """Test a custom embedder is used for storage and lookup."""
+    class KeywordEmbedder(Embedder):
+        dim = 2
+        
+        def embed(self, text):
+            return [1.0, 0.0] if "refund" in text else [0.0, 1.0]
+    
+    cache = SemanticCache(embedder=KeywordEmbedder())
+    cache.store("s", "refund policy", "30 days")
+    
+    assert cache.lookup("s", "can I get a refund", threshold=0.9).payload == "30 days"
+    assert cache.lookup("s", "shipping times", threshold=0.9) is None
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_semantic_cache_skips_model_call(mock_client_class):
+    """Test a paraphrased repeat question is answered without calling the model."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "Use the reset link.", "tool_calls": []})
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(
+        id="support-bot",
+        name="Support Bot",
+        instructions="Help customers",
+        config=AgentConfig(semantic_cache=True, semantic_cache_threshold=0.85),
+    )
+    
+    with patch('agent_factory.cache.semantic_cache.get_semantic_cache', return_value=SemanticCache()):
+        first = agent.run("How do I reset my password?")
+        second = agent.run("how can I reset my password")
+        agent.update_instructions("Help customers politely")
+        third = agent.run("how can I reset my password")
+    
+    assert second.status == AgentStatus.COMPLETED
+    assert second.output == "Use the reset link."
+    assert first.metadata["cached"] is False
+    assert second.metadata["cached"] is True
+    assert second.metadata["semantic_similarity"] > 0.85
+    assert third.metadata["cached"] is False
+    assert mock_client.arun_agent.await_count == 2
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_semantic_cache_bypassed_for_sessions_and_context(mock_client_class):
+    """Test runs with a session or caller context never share cached answers."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(return_value={"output": "Your plan renews monthly.", "tool_calls": []})
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(
+        id="account-bot",
+        name="Account Bot",
+        instructions="Answer account questions",
+        config=AgentConfig(semantic_cache=True, semantic_cache_threshold=0.85),
+    )
+    
+    cache = SemanticCache()
+    with patch('agent_factory.cache.semantic_cache.get_semantic_cache', return_value=cache):
+        agent.run("When does my plan renew?", context={"user": "alice"})
+        other = agent.run("when does my plan renew", context={"user": "bob"})
+        session = agent.run("when does my plan renew", session_id="s-1")
+    
+    assert other.metadata["cached"] is False
+    assert session.metadata["cached"] is False
+    assert mock_client.arun_agent.await_count == 3
+    assert cache.lookup(
+        make_scope("account-bot", agent.model, agent.instructions), "when does my plan renew", threshold=0.5,
+    ) is None
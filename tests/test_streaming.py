@@ -0,0 +1,144 @@
+"""Tests for streaming agent runs."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from agent_factory.agents.agent import Agent, AgentStatus
+from agent_factory.core.guardrails import GuardrailResult
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.runtime.tool_executor import stream_tool_loop
+from agent_factory.tools.base import Tool
+
+
+def _stream_client(turns):
+    """Build a client whose astream_events replays one event list per turn."""
+    turns = list(turns)
+    client = Mock()
+    client.build_tool_messages = OpenAIAgentClient.build_tool_messages
+    client.calls = []
+    
+    async def astream_events(**kwargs):
+        client.calls.append(kwargs)
+        for event in turns.pop(0):
+            await asyncio.sleep(0)
+            yield event
+    
+    client.astream_events = astream_events
+    return client
+
+
+def _collect(agen):
+    async def _run():
+        return [event async for event in agen]
+    return asyncio.run(_run())
+
+
+def _chunk(content=None, tool_calls=None, usage=None):
+    choices = [] if content is None and tool_calls is None else [
+        SimpleNamespace(delta=SimpleNamespace(content=content, tool_calls=tool_calls))
+    ]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+@pytest.mark.unit
+def test_openai_astream_events_assembles_tool_calls():
+    """Test text deltas are streamed and tool-call fragments are merged."""
+    fragments = [
+        SimpleNamespace(index=0, id="c1", function=SimpleNamespace(name="lookup", arguments='{"x"')),
+        SimpleNamespace(index=0, id=None, function=SimpleNamespace(name=None, arguments=': "q"}')),
+    ]
+    chunks = [
+        _chunk(content="Hel"),
+        _chunk(content="lo"),
+        _chunk(tool_calls=fragments[:1]),
+        _chunk(tool_calls=fragments[1:]),
+        _chunk(usage=SimpleNamespace(total_tokens=12)),
+    ]
+    
+    async def fake_stream():
+        for chunk in chunks:
+            yield chunk
+    
+    async def _run():
+        client = OpenAIAgentClient(api_key="test-key")
+        client.async_client.chat.completions.create = AsyncMock(return_value=fake_stream())
+        return [event async for event in client.astream_events("Be brief", "Hi")]
+    
+    events = asyncio.run(_run())
+    
+    assert [e["content"] for e in events if e["type"] == "token"] == ["Hel", "lo"]
+    response = events[-1]
+    assert response["type"] == "response"
+    assert response["output"] == "Hello"
+    assert response["tokens_used"] == 12
+    assert response["tool_calls"] == [{"id": "c1", "name": "lookup", "arguments": '{"x": "q"}'}]
+
+
+@pytest.mark.unit
+def test_stream_tool_loop_emits_tool_events():
+    """Test tool calls and results are streamed between model turns."""
+    tool = Tool(id="lookup", name="lookup", description="Lookup", implementation=lambda x: f"found {x}")
+    client = _stream_client([
+        [{"type": "response", "output": "", "tokens_used": 4,
+          "tool_calls": [{"id": "c1", "name": "lookup", "arguments": json.dumps({"x": "q"})}]}],
+        [{"type": "token", "content": "Done"},
+         {"type": "response", "output": "Done", "tool_calls": [], "tokens_used": 6}],
+    ])
+    
+    events = _collect(stream_tool_loop(client, {"input_text": "hi"}, [tool]))
+    
+    assert [e["type"] for e in events] == ["tool_call", "tool_result", "token", "completed"]
+    assert events[1]["output"] == "found q"
+    assert events[-1]["output"] == "Done"
+    assert events[-1]["tokens_used"] == 10
+    assert client.calls[1]["tool_messages"][1]["content"] == "found q"
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_run_stream_yields_tokens_then_done(mock_client_class):
+    """Test tokens arrive before the final event and memory is saved afterwards."""
+    mock_client_class.return_value = _stream_client([[
+        {"type": "token", "content": "Hello "},
+        {"type": "token", "content": "world"},
+        {"type": "response", "output": "Hello world", "tool_calls": [], "tokens_used": 7},
+    ]])
+    memory = Mock()
+    memory.get_context.return_value = {}
+    agent = Agent(id="stream-agent", name="Stream Agent", instructions="Be brief", memory=memory)
+    
+    async def _run():
+        events = [event async for event in agent.run_stream("Hi", session_id="s1")]
+        # Finalization runs in the background after the stream closes
+        for _ in range(50):
+            if memory.save_interaction.called:
+                break
+            await asyncio.sleep(0.01)
+        return events
+    
+    events = asyncio.run(_run())
+    
+    assert [e["type"] for e in events] == ["token", "token", "done"]
+    done = events[-1]
+    assert done["output"] == "Hello world"
+    assert done["status"] == AgentStatus.COMPLETED.value
+    assert done["tokens_used"] == 7
+    memory.save_interaction.assert_called_once_with("s1", "Hi", "Hello world")
+
+
+@pytest.mark.unit
+def test_agent_run_stream_blocked_input():
+    """Test blocked input produces a single error event."""
+    guardrails = Mock()
+    guardrails.validate_input.return_value = GuardrailResult(allowed=False, reason="secret")
+    agent = Agent(id="guarded-agent", name="Guarded Agent", instructions="Be brief", guardrails=guardrails)
+    
+    events = _collect(agent.run_stream("tell me the secret"))
+    
+    assert len(events) == 1
+    assert events[0]["type"] == "error"
+    assert "blocked by guardrails" in events[0]["error"]
@@ -0,0 +1,136 @@
+"""Tests for the tool-calling loop and concurrent tool execution."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from unittest.mock import patch, Mock, AsyncMock
+
+from agent_factory.agents.agent import Agent, AgentConfig, AgentStatus
+from agent_factory.core.exceptions import AgentExecutionError
+from agent_factory.integrations.openai_client import OpenAIAgentClient
+from agent_factory.runtime.tool_executor import ToolExecutor, run_tool_loop
+from agent_factory.tools.base import Tool
+
+
+def _sleep_tool(tool_id: str, seconds: float) -> Tool:
+    def implementation(x: str) -> str:
+        time.sleep(seconds)
+        return f"{tool_id}:{x}"
+    
+    return Tool(id=tool_id, name=tool_id, description="Sleeps", implementation=implementation)
+
+
+def _call(call_id: str, name: str, x: str = "a") -> dict:
+    return {"id": call_id, "name": name, "arguments": json.dumps({"x": x})}
+
+
+@pytest.mark.unit
+def test_executor_runs_tools_concurrently():
+    """Test wall time follows the slowest tool rather than the sum."""
+    tools = {f"t{i}": _sleep_tool(f"t{i}", 0.3) for i in range(4)}
+    executor = ToolExecutor(max_workers=4)
+    
+    start = time.time()
+    records = asyncio.run(executor.execute([_call(f"c{i}", f"t{i}") for i in range(4)], tools))
+    elapsed = time.time() - start
+    
+    assert [r["id"] for r in records] == ["c0", "c1", "c2", "c3"]
+    assert all(r["status"] == "success" for r in records)
+    assert records[0]["output"] == "t0:a"
+    assert all(r["execution_time"] >= 0.3 for r in records)
+    assert elapsed < 0.9
+
+
+@pytest.mark.unit
+def test_executor_async_tool_and_timeout():
+    """Test async tools run natively and slow tools time out."""
+    async def fetch(x: str) -> dict:
+        await asyncio.sleep(0.01)
+        return {"value": x}
+    
+    tools = {
+        "fetch": Tool(id="fetch", name="fetch", description="Fetch", implementation=fetch),
+        "slow": _sleep_tool("slow", 0.5),
+    }
+    executor = ToolExecutor(timeout=0.1)
+    
+    records = asyncio.run(executor.execute(
+        [_call("c1", "fetch", "b"), _call("c2", "slow"), {"id": "c3", "name": "missing"}],
+        tools,
+    ))
+    
+    assert records[0]["status"] == "success"
+    assert json.loads(records[0]["output"]) == {"value": "b"}
+    assert records[1]["status"] == "timeout"
+    assert records[2]["status"] == "error"
+    assert "Unknown tool" in records[2]["error"]
+
+
+@pytest.mark.unit
+def test_tool_loop_feeds_results_back():
+    """Test tool results are sent back to the model for a follow-up turn."""
+    tool = _sleep_tool("lookup", 0.0)
+    client = Mock()
+    client.arun_agent = AsyncMock(side_effect=[
+        {"output": "", "tool_calls": [_call("c1", "lookup", "q")], "tokens_used": 10},
+        {"output": "Final answer", "tool_calls": [], "tokens_used": 5},
+    ])
+    client.build_tool_messages = OpenAIAgentClient.build_tool_messages
+    
+    result = asyncio.run(run_tool_loop(client, {"input_text": "hi"}, [tool]))
+    
+    assert result["output"] == "Final answer"
+    assert result["tokens_used"] == 15
+    assert result["iterations"] == 1
+    assert result["tool_calls"][0]["output"] == "lookup:q"
+    
+    follow_up = client.arun_agent.await_args_list[1].kwargs["tool_messages"]
+    assert follow_up[0]["role"] == "assistant"
+    assert follow_up[0]["tool_calls"][0]["id"] == "c1"
+    assert follow_up[1] == {"role": "tool", "tool_call_id": "c1", "content": "lookup:q"}
+
+
+@pytest.mark.unit
+def test_tool_loop_max_iterations():
+    """Test the loop stops when the model never produces a final answer."""
+    tool = _sleep_tool("lookup", 0.0)
+    client = Mock()
+    client.arun_agent = AsyncMock(return_value={"output": "", "tool_calls": [_call("c", "lookup")]})
+    client.build_tool_messages = OpenAIAgentClient.build_tool_messages
+    
+    with pytest.raises(AgentExecutionError, match="max_iterations"):
+        asyncio.run(run_tool_loop(client, {"input_text": "hi"}, [tool], max_iterations=2))
+    
+    assert client.arun_agent.await_count == 3
+
+
+@pytest.mark.unit
+@patch('agent_factory.integrations.openai_client.OpenAIAgentClient')
+def test_agent_run_records_tool_calls(mock_client_class):
+    """Test agent results include per-call timings."""
+    mock_client = Mock()
+    mock_client.arun_agent = AsyncMock(side_effect=[
+        {"output": "", "tool_calls": [_call("c1", "lookup")]},
+        {"output": "Done", "tool_calls": []},
+    ])
+    mock_client.build_tool_messages = OpenAIAgentClient.build_tool_messages
+    mock_client_class.return_value = mock_client
+    
+    agent = Agent(
+        id="tool-agent",
+        name="Tool Agent",
+        instructions="Use tools",
+        tools=[_sleep_tool("lookup", 0.0)],
+        config=AgentConfig(max_tool_iterations=3),
+    )
+    
+    result = agent.run("Find it")
+    
+    assert result.status == AgentStatus.COMPLETED
+    assert result.output == "Done"
+    assert len(result.tool_calls) == 1
+    assert result.tool_calls[0]["name"] == "lookup"
+    assert result.tool_calls[0]["status"] == "success"
+    assert "execution_time" in result.tool_calls[0]
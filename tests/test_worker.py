@@ -176,3 +176,166 @@ def test_worker_unknown_job_type(mock_get_collector):
     
     assert job.status == JobStatus.FAILED
     assert job.error is not None
+
+
+class _SlowRuntime:
+    """Stand-in runtime engine whose agent runs sleep, or crash the process."""
+    
+    def __init__(self, delay=0.1):
+        self.delay = delay
+    
+    def run_agent(self, agent_id, input_text, session_id=None, context=None):
+        if input_text == "crash":
+            import os
+            os._exit(1)
+        time.sleep(float(input_text) if input_text else self.delay)
+        return f"exec-{agent_id}"
+    
+    def get_execution(self, execution_id):
+        execution = Mock()
+        execution.result.output = "done"
+        execution.result.execution_time = self.delay
+        execution.status = "completed"
+        return execution
+
+
+def _slow_runtime():
+    return _SlowRuntime(delay=0.01)
+
+
+def _agent_job(job_id, input_text="", **kwargs):
+    return Job(
+        job_id=job_id,
+        job_type=JobType.AGENT_RUN,
+        resource_id="agent-1",
+        input_data={"input_text": input_text},
+        **kwargs,
+    )
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.mark.unit
+@patch('agent_factory.runtime.worker.get_collector')
+def test_worker_pool_runs_jobs_concurrently_and_drains(mock_get_collector):
+    """Test the thread pool runs jobs in parallel and finishes claimed jobs on stop."""
+    from agent_factory.runtime.worker import WorkerPool
+    
+    queue = InMemoryJobQueue()
+    for i in range(8):
+        queue.enqueue(_agent_job(f"job-{i}", "0.1"))
+    pool = WorkerPool(runtime_engine=_SlowRuntime(), job_queue=queue, concurrency=4, poll_interval=0.05)
+    
+    start = time.monotonic()
+    pool.start()
+    assert _wait_for(lambda: pool.get_metrics()["completed"] == 8)
+    assert time.monotonic() - start < 0.6
+    
+    queue.enqueue(_agent_job("last", "0.2"))
+    assert _wait_for(lambda: pool.get_metrics()["active_jobs"] == 1)
+    pool.stop(timeout=5.0)
+    
+    metrics = pool.get_metrics()
+    assert queue.get_job("last").status == JobStatus.COMPLETED
+    assert all(job.status == JobStatus.COMPLETED for job in queue.list_jobs())
+    assert "heartbeat_at" not in queue.get_job("last").metadata
+    assert metrics["completed"] == 9 and metrics["queue_depth"] == 0 and metrics["throughput"] > 0
+
+
+@pytest.mark.unit
+@patch('agent_factory.runtime.worker.get_collector')
+def test_worker_pool_stop_keeps_running_thread_jobs_claimed(mock_get_collector):
+    """Test jobs still running at the stop timeout finish once instead of being re-queued."""
+    from agent_factory.runtime.worker import WorkerPool
+    
+    queue = InMemoryJobQueue()
+    queue.enqueue(_agent_job("long", "0.4"))
+    pool = WorkerPool(
+        runtime_engine=_SlowRuntime(), job_queue=queue, concurrency=1, poll_interval=0.05, heartbeat_interval=0.05,
+    )
+    pool.start()
+    assert _wait_for(lambda: pool.get_metrics()["active_jobs"] == 1)
+    pool.stop(timeout=0.05)
+    
+    job = queue.get_job("long")
+    assert job.status == JobStatus.RUNNING
+    heartbeat = job.metadata["heartbeat_at"]
+    assert _wait_for(lambda: queue.get_job("long").metadata.get("heartbeat_at", heartbeat) != heartbeat)
+    assert _wait_for(lambda: queue.get_job("long").status == JobStatus.COMPLETED)
+    assert queue.get_job("long").retry_count == 0
+    assert pool.get_metrics()["requeued"] == 0
+    assert queue.dequeue() is None
+
+
+@pytest.mark.unit
+@patch('agent_factory.runtime.worker.get_collector')
+def test_worker_pool_deadline_and_stale_heartbeats(mock_get_collector):
+    """Test per-job deadlines fail overrunning jobs and lost heartbeats re-queue jobs."""
+    from datetime import timedelta
+    from agent_factory.runtime.worker import WorkerPool
+    
+    queue = InMemoryJobQueue()
+    pool = WorkerPool(runtime_engine=_SlowRuntime(), job_queue=queue, concurrency=1, poll_interval=0.05)
+    queue.enqueue(_agent_job("slow", "0.5", metadata={"timeout": 0.05}))
+    queue.enqueue(_agent_job("next", "0.01"))
+    start = time.monotonic()
+    pool.start()
+    assert _wait_for(lambda: queue.get_job("slow").status == JobStatus.FAILED)
+    assert "deadline" in queue.get_job("slow").error
+    # The overrunning thread keeps the only slot busy until it returns
+    assert _wait_for(lambda: queue.get_job("next").status == JobStatus.COMPLETED)
+    assert time.monotonic() - start >= 0.5
+    pool.stop()
+    assert pool._free == 1
+    
+    orphan = _agent_job("orphan")
+    queue.enqueue(orphan)
+    queue.dequeue()
+    orphan.metadata.update(
+        heartbeat_at=(datetime.utcnow() - timedelta(seconds=120)).isoformat(), worker_id="pool-dead",
+    )
+    queue.update_job(orphan)
+    
+    assert pool.requeue_stale_jobs() == 1
+    assert orphan.status == JobStatus.QUEUED and orphan.retry_count == 1
+    assert queue.dequeue().job_id == "orphan"
+
+
+@pytest.mark.unit
+@patch('agent_factory.runtime.worker.get_collector')
+def test_worker_pool_process_mode_requeues_crashed_jobs(mock_get_collector):
+    """Test process mode runs jobs in child processes and re-queues a job whose process died."""
+    import os
+    from agent_factory.runtime.worker import WorkerPool
+    
+    # Spawned children need an existing working directory, which other tests may have removed
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        previous = os.getcwd()
+    except FileNotFoundError:
+        previous = root
+    os.chdir(root)
+    queue = InMemoryJobQueue()
+    queue.enqueue(_agent_job("crash", "crash", max_retries=1))
+    for i in range(3):
+        queue.enqueue(_agent_job(f"job-{i}"))
+    pool = WorkerPool(
+        job_queue=queue, concurrency=2, mode="process", engine_factory=_slow_runtime,
+        poll_interval=0.05,
+    )
+    pool.start()
+    try:
+        assert _wait_for(lambda: pool.get_metrics()["completed"] == 3 and pool.get_metrics()["failed"] == 1, 15.0)
+    finally:
+        pool.stop()
+        os.chdir(previous)
+    
+    crashed = queue.get_job("crash")
+    assert crashed.status == JobStatus.FAILED and crashed.retry_count == 2
+    assert pool.get_metrics()["requeued"] == 1
+    assert all(queue.get_job(f"job-{i}").status == JobStatus.COMPLETED for i in range(3))
@@ -86,3 +86,379 @@ def test_workflow_execution():
     
     assert result.success is True
     assert "step1" in result.steps_executed
+
+
+class _TimedAgent:
+    """Stand-in agent that records concurrency and echoes its input."""
+    
+    def __init__(self, name, delay=0.05, tracker=None):
+        self.name = name
+        self.delay = delay
+        self.tracker = tracker if tracker is not None else {"active": 0, "peak": 0}
+        self.inputs = []
+    
+    async def arun(self, input_text):
+        import asyncio
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        
+        self.inputs.append(input_text)
+        self.tracker["active"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        await asyncio.sleep(self.delay)
+        self.tracker["active"] -= 1
+        return AgentResult(output=f"{self.name}({input_text})", status=AgentStatus.COMPLETED)
+
+
+def _fan_out_workflow(max_parallel=4, delay=0.05):
+    tracker = {"active": 0, "peak": 0}
+    agents = {f"a{i}": _TimedAgent(f"a{i}", delay, tracker) for i in range(4)}
+    agents["merge"] = _TimedAgent("merge", 0, tracker)
+    steps = [
+        WorkflowStep(id=f"analyze{i}", agent_id=f"a{i}", input_mapping={"q": "$query"},
+                     output_mapping={f"r{i}": "output"})
+        for i in range(4)
+    ]
+    steps.append(WorkflowStep(
+        id="merge",
+        agent_id="merge",
+        input_mapping={"first": "$steps.analyze0.output", "last": "$r3"},
+    ))
+    workflow = Workflow(
+        id="fan-out", name="Fan out", steps=steps, agents_registry=agents, max_parallel=max_parallel,
+    )
+    return workflow, agents, tracker
+
+
+@pytest.mark.unit
+def test_workflow_dependencies_are_inferred():
+    """Test dependencies come from step references and unmapped steps chain."""
+    from agent_factory.workflows.dag import StepGraph
+    
+    workflow, _, _ = _fan_out_workflow()
+    workflow.add_step(WorkflowStep(id="report", agent_id="merge"))
+    graph = StepGraph(workflow.steps)
+    
+    assert all(graph.dependencies[f"analyze{i}"] == set() for i in range(4))
+    assert graph.dependencies["merge"] == {"analyze0", "analyze3"}
+    assert graph.dependencies["report"] == {"merge"}
+
+
+@pytest.mark.unit
+def test_workflow_runs_independent_steps_concurrently():
+    """Test independent steps overlap up to max_parallel and dependents see their outputs."""
+    import time
+    
+    workflow, agents, tracker = _fan_out_workflow(max_parallel=4, delay=0.1)
+    start = time.time()
+    result = workflow.execute({"query": "python"})
+    elapsed = time.time() - start
+    
+    assert result.success is True
+    assert tracker["peak"] == 4
+    assert elapsed < 0.35
+    assert result.steps_executed == ["analyze0", "analyze1", "analyze2", "analyze3", "merge"]
+    assert agents["merge"].inputs == ["first: a0(q: python)\nlast: a3(q: python)"]
+    assert result.output["r2"] == "a2(q: python)"
+    
+    sequential, _, tracker = _fan_out_workflow(max_parallel=1, delay=0.01)
+    assert sequential.execute({"query": "python"}).success is True
+    assert tracker["peak"] == 1
+
+
+@pytest.mark.unit
+def test_workflow_parallel_context_matches_sequential_order():
+    """Test a step reads the value its latest earlier writer produced, not a later one."""
+    agents = {"slow": _TimedAgent("slow", 0.05), "fast": _TimedAgent("fast", 0), "reader": _TimedAgent("reader", 0)}
+    steps = [
+        WorkflowStep(id="s1", agent_id="slow", input_mapping={"q": "$query"}),
+        WorkflowStep(id="s2", agent_id="reader", input_mapping={"prev": "$output"}),
+        WorkflowStep(id="s3", agent_id="fast", input_mapping={"q": "$query"}),
+    ]
+    workflow = Workflow(id="order", name="Order", steps=steps, agents_registry=agents)
+    
+    result = workflow.execute({"query": "x"})
+    
+    assert result.success is True
+    assert agents["reader"].inputs == ["prev: slow(q: x)"]
+    assert result.output["output"] == "fast(q: x)"
+
+
+@pytest.mark.unit
+def test_workflow_explicit_dependencies_and_branching():
+    """Test depends_on overrides inference and a false branch stops later steps."""
+    from agent_factory.workflows.model import Condition
+    
+    agents = {name: _TimedAgent(name, 0) for name in ("a", "b", "c")}
+    steps = [
+        WorkflowStep(id="a", agent_id="a", input_mapping={"q": "$query"}),
+        WorkflowStep(id="b", agent_id="b", input_mapping={"q": "$query"}, depends_on=["a"]),
+        WorkflowStep(id="c", agent_id="c", input_mapping={"q": "$query"}),
+    ]
+    workflow = Workflow(
+        id="branch", name="Branch", steps=steps, agents_registry=agents,
+        branching={"b": Condition(expression="1 > 2")},
+    )
+    
+    result = workflow.execute({"query": "x"})
+    assert result.success is True
+    assert result.steps_executed == ["a", "b"]
+    
+    workflow.steps[0].depends_on = ["c"]
+    result = workflow.execute({"query": "x"})
+    assert result.success is False
+    assert "not an earlier step" in result.error
+
+
+class _ItemAgent(_TimedAgent):
+    """Stand-in agent that fails on inputs containing "bad"."""
+    
+    async def arun(self, input_text):
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        
+        result = await super().arun(input_text)
+        if "bad" in input_text:
+            return AgentResult(output="", status=AgentStatus.ERROR, error=f"cannot handle {input_text}")
+        return result
+
+
+def _map_workflow(items, on_error="fail_fast", concurrency=3, delay=0.02):
+    tracker = {"active": 0, "peak": 0}
+    agents = {"summarize": _ItemAgent("summarize", delay, tracker), "report": _TimedAgent("report", 0)}
+    steps = [
+        WorkflowStep(
+            id="summaries",
+            agent_id="summarize",
+            input_mapping={"title": "$item.title", "n": "$index"},
+            output_mapping={"summaries": "output"},
+            map_over="$results",
+            map_concurrency=concurrency,
+            map_on_error=on_error,
+        ),
+        WorkflowStep(id="report", agent_id="report", input_mapping={"all": "$summaries"}),
+    ]
+    workflow = Workflow(id="map", name="Map", steps=steps, agents_registry=agents)
+    return workflow, agents, tracker
+
+
+@pytest.mark.unit
+def test_map_step_runs_per_item_in_order_with_bounded_concurrency():
+    """Test a map step runs once per element, keeps order and caps in-flight items."""
+    items = [{"title": f"doc{i}"} for i in range(10)]
+    workflow, agents, tracker = _map_workflow(items)
+    
+    result = workflow.execute({"results": items})
+    
+    assert result.success
+    assert result.output["summaries"] == [f"summarize(title: doc{i}\nn: {i})" for i in range(10)]
+    assert len(agents["summarize"].inputs) == 10
+    assert tracker["peak"] == 3
+    assert agents["report"].inputs[0].startswith("all: ['summarize(title: doc0")
+
+
+@pytest.mark.unit
+def test_map_step_accepts_json_array_output():
+    """Test a map step can iterate over a JSON array produced by an earlier agent."""
+    workflow, agents, _ = _map_workflow([])
+    
+    result = workflow.execute({"results": '[{"title": "a"}, {"title": "b"}]'})
+    
+    assert result.success
+    assert len(result.output["summaries"]) == 2
+
+
+@pytest.mark.unit
+def test_map_step_failure_policies():
+    """Test fail_fast fails the step and collect keeps going and reports errors."""
+    items = [{"title": "ok0"}, {"title": "bad1"}, {"title": "ok2"}, {"title": "bad3"}]
+    
+    workflow, _, _ = _map_workflow(items, on_error="fail_fast", concurrency=1)
+    result = workflow.execute({"results": items})
+    assert not result.success
+    assert "item 1" in result.error
+    
+    workflow, agents, _ = _map_workflow(items, on_error="collect")
+    result = workflow.execute({"results": items})
+    assert result.success
+    assert result.output["summaries"][0].startswith("summarize(title: ok0")
+    assert result.output["summaries"][1] is None
+    assert [error["index"] for error in result.metadata["map_errors"]["summaries"]] == [1, 3]
+    assert result.output["steps.summaries.errors"] == result.metadata["map_errors"]["summaries"]
+    
+    workflow, _, _ = _map_workflow(items)
+    assert "not a list" in workflow.execute({"results": 42}).error
+
+
+class _FlakyAgent:
+    """Stand-in agent that fails or hangs for its first attempts."""
+    
+    def __init__(self, failures=0, hangs=0, tokens=10):
+        self.failures = failures
+        self.hangs = hangs
+        self.tokens = tokens
+        self.calls = 0
+    
+    async def arun(self, input_text):
+        import asyncio
+        from agent_factory.agents.agent import AgentResult, AgentStatus
+        
+        self.calls += 1
+        if self.calls <= self.hangs:
+            await asyncio.sleep(60)
+        if self.calls <= self.hangs + self.failures:
+            return AgentResult(
+                output="",
+                status=AgentStatus.ERROR,
+                error="rate limited",
+                tokens_used=self.tokens,
+                metadata={"retryable": True},
+            )
+        return AgentResult(output="done", status=AgentStatus.COMPLETED, tokens_used=self.tokens)
+
+
+@pytest.mark.unit
+def test_step_timeout_and_retries_are_enforced():
+    """Test hung attempts are cancelled, failures retried, and attempts reported."""
+    agent = _FlakyAgent(failures=1, hangs=1)
+    workflow = Workflow(
+        id="flaky",
+        name="Flaky",
+        steps=[WorkflowStep(id="call", agent_id="flaky", timeout=0.05, retry_attempts=2, retry_backoff=0.01)],
+        agents_registry={"flaky": agent},
+    )
+    
+    result = workflow.execute({"input": "x"})
+    
+    assert result.success
+    assert agent.calls == 3
+    stats = result.metadata["steps"]["call"]
+    assert stats["attempts"] == 3
+    assert stats["tokens_used"] == 20  # the hung attempt reported nothing
+    assert 0.05 <= stats["duration"] < 1
+    
+    agent = _FlakyAgent(failures=5)
+    workflow.agents_registry = {"flaky": agent}
+    result = workflow.execute({"input": "x"})
+    assert not result.success
+    assert "rate limited" in result.error
+    assert result.metadata["steps"]["call"]["attempts"] == 3
+
+
+@pytest.mark.unit
+def test_step_retries_only_transient_failures():
+    """Test permanent errors are not retried and agents with a policy get no step retries."""
+    from unittest.mock import AsyncMock, Mock, patch
+    from agent_factory.agents.agent import AgentConfig
+    
+    client = Mock()
+    client.arun_agent = AsyncMock(side_effect=ValueError("bad request"))
+    agent = Agent(id="a", name="a", instructions="Answer.", config=AgentConfig(retry_attempts=1))
+    workflow = Workflow(
+        id="permanent",
+        name="Permanent",
+        steps=[WorkflowStep(id="call", agent_id="a", retry_attempts=2, retry_backoff=0.01)],
+        agents_registry={"a": agent},
+    )
+    with patch('agent_factory.integrations.openai_client.OpenAIAgentClient', return_value=client):
+        result = workflow.execute({"input": "x"})
+    assert not result.success
+    assert result.metadata["steps"]["call"]["attempts"] == 1
+    assert client.arun_agent.await_count == 1
+    
+    # Transient errors are retried by the agent's own policy only
+    client.arun_agent = AsyncMock(side_effect=ConnectionError("reset"))
+    agent = Agent(id="a", name="a", instructions="Answer.", config=AgentConfig(retry_attempts=1))
+    workflow.steps = [WorkflowStep(id="call", agent_id="a", retry_backoff=0.01)]
+    workflow.agents_registry = {"a": agent}
+    with patch('agent_factory.integrations.openai_client.OpenAIAgentClient', return_value=client):
+        result = workflow.execute({"input": "x"})
+    assert not result.success
+    assert result.metadata["steps"]["call"]["attempts"] == 1
+    assert client.arun_agent.await_count == 2
+
+
+@pytest.mark.unit
+def test_default_step_deadline_follows_agent_policy():
+    """Test a hung agent with its own policy is cut off after the policy's worst case."""
+    import asyncio
+    import time
+    from unittest.mock import patch
+    from agent_factory.agents.agent import AgentConfig
+    
+    class _HungAgent(Agent):
+        async def arun(self, input_text, *args, **kwargs):
+            await asyncio.sleep(60)
+    
+    agent = _HungAgent(id="a", name="a", instructions="Answer.", config=AgentConfig(timeout=1, retry_attempts=0))
+    workflow = Workflow(
+        id="hung",
+        name="Hung",
+        steps=[WorkflowStep(id="call", agent_id="a")],
+        agents_registry={"a": agent},
+    )
+    start = time.time()
+    with patch('agent_factory.workflows.model.STEP_DEADLINE_SLACK', 0.1):
+        result = workflow.execute({"input": "x"})
+    assert not result.success
+    assert "timed out after 1.1s" in result.error
+    assert result.metadata["steps"]["call"]["attempts"] == 1
+    assert time.time() - start < 5
+
+
+@pytest.mark.unit
+def test_workflow_deadline_and_token_budget():
+    """Test the run stops at its deadline or once it exceeds its token budget."""
+    import time
+    
+    hung = Workflow(
+        id="hung",
+        name="Hung",
+        steps=[WorkflowStep(id="wait", agent_id="slow", timeout=0, retry_attempts=0)],
+        agents_registry={"slow": _FlakyAgent(hangs=1)},
+        timeout=0.1,
+    )
+    start = time.time()
+    result = hung.execute({"input": "x"})
+    assert not result.success
+    assert "deadline" in result.error
+    assert time.time() - start < 1
+    assert result.metadata["steps"]["wait"]["cancelled"] is True
+    
+    agents = {"a": _FlakyAgent(tokens=60), "b": _FlakyAgent(tokens=60), "c": _FlakyAgent(tokens=60)}
+    budgeted = Workflow(
+        id="budget",
+        name="Budget",
+        steps=[WorkflowStep(id=name, agent_id=name) for name in agents],
+        agents_registry=agents,
+        token_budget=100,
+    )
+    result = budgeted.execute({"input": "x"})
+    assert not result.success
+    assert "Token budget of 100 exceeded" in result.error
+    assert result.steps_executed == ["a", "b"]
+    assert agents["c"].calls == 0
+    assert result.metadata["tokens_used"] == 120
+
+
+@pytest.mark.unit
+def test_token_budget_counts_real_agent_tokens():
+    """Test the token budget trips on tokens reported by real agents' model calls."""
+    from unittest.mock import AsyncMock, Mock, patch
+    
+    client = Mock()
+    client.arun_agent = AsyncMock(return_value={"output": "ok", "tool_calls": [], "tokens_used": 60})
+    agents = {name: Agent(id=name, name=name, instructions="Answer.") for name in ("a", "b", "c")}
+    workflow = Workflow(
+        id="budget-real",
+        name="Budget",
+        steps=[WorkflowStep(id=name, agent_id=name) for name in agents],
+        agents_registry=agents,
+        token_budget=100,
+    )
+    
+    with patch('agent_factory.integrations.openai_client.OpenAIAgentClient', return_value=client):
+        result = workflow.execute({"input": "x"})
+    
+    assert not result.success
+    assert "Token budget of 100 exceeded (120 tokens used)" in result.error
+    assert result.steps_executed == ["a", "b"]
+    assert client.arun_agent.await_count == 2
@@ -0,0 +1,132 @@
+"""Tests for workflow checkpointing and resume."""
+
+import asyncio
+
+import pytest
+
+from agent_factory.agents.agent import AgentResult, AgentStatus
+from agent_factory.runtime.engine import RuntimeEngine
+from agent_factory.workflows.checkpoint import (
+    InMemoryCheckpointStore,
+    SQLiteCheckpointStore,
+    WorkflowCheckpoint,
+)
+from agent_factory.workflows.model import Condition, Workflow, WorkflowStep
+
+
+class _CountingAgent:
+    """Stand-in agent that counts its runs and can be made to fail."""
+    
+    def __init__(self, name, fail=False):
+        self.id = name
+        self.name = name
+        self.fail = fail
+        self.calls = 0
+        self.prompt_log_storage = None
+    
+    async def arun(self, input_text):
+        self.calls += 1
+        if self.fail:
+            return AgentResult(output="", status=AgentStatus.ERROR, error="provider down")
+        return AgentResult(output=f"{self.name}({input_text})", status=AgentStatus.COMPLETED)
+
+
+def _pipeline(agents):
+    return Workflow(
+        id="pipeline",
+        name="Pipeline",
+        steps=[
+            WorkflowStep(id="fetch", agent_id="fetch", input_mapping={"q": "$query"}),
+            WorkflowStep(id="skip", agent_id="fetch", condition=Condition(expression="$query == 'none'")),
+            WorkflowStep(id="analyze", agent_id="analyze", input_mapping={"data": "$output"}),
+            WorkflowStep(id="report", agent_id="report", input_mapping={"data": "$output"}),
+        ],
+        agents_registry=agents,
+    )
+
+
+@pytest.mark.unit
+def test_checkpoint_round_trips_through_sqlite(tmp_path):
+    """Test a checkpoint saved to SQLite loads back with outputs in completion order."""
+    store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+    checkpoint = WorkflowCheckpoint(
+        execution_id="exec-1",
+        workflow_id="pipeline",
+        context={"query": "python"},
+        outputs={"b": {"output": "B"}, "a": {"output": "A"}},
+        skipped=["c"],
+        status="failed",
+        error="boom",
+    )
+    store.save(checkpoint)
+    
+    loaded = store.load("exec-1")
+    assert loaded.steps_executed == ["b", "a"]
+    assert loaded.context == {"query": "python"}
+    assert (loaded.skipped, loaded.status, loaded.error) == (["c"], "failed", "boom")
+    assert [c.execution_id for c in store.list(workflow_id="pipeline", status="failed")] == ["exec-1"]
+    assert store.delete("exec-1")
+    assert store.load("exec-1") is None
+
+
+@pytest.mark.unit
+def test_workflow_resumes_without_rerunning_completed_steps():
+    """Test resuming restores finished step outputs and runs only the rest."""
+    agents = {name: _CountingAgent(name) for name in ("fetch", "analyze", "report")}
+    agents["report"].fail = True
+    workflow = _pipeline(agents)
+    store = InMemoryCheckpointStore()
+    checkpoint = WorkflowCheckpoint(execution_id="exec-1", workflow_id="pipeline", context={"query": "python"})
+    
+    result = asyncio.run(workflow.aexecute(checkpoint.context, checkpoint=checkpoint, checkpoint_store=store))
+    assert not result.success
+    saved = store.load("exec-1")
+    assert saved.status == "failed"
+    assert saved.steps_executed == ["fetch", "analyze"]
+    assert saved.skipped == ["skip"]
+    
+    agents["report"].fail = False
+    resumed = asyncio.run(workflow.aexecute(saved.context, checkpoint=saved, checkpoint_store=store))
+    
+    assert resumed.success
+    assert resumed.steps_executed == ["fetch", "analyze", "report"]
+    assert resumed.metadata["resumed_steps"] == ["fetch", "analyze"]
+    assert resumed.output["output"] == "report(data: analyze(data: fetch(q: python)))"
+    assert [agents[name].calls for name in ("fetch", "analyze", "report")] == [1, 1, 2]
+    assert store.load("exec-1").status == "completed"
+
+
+@pytest.mark.unit
+def test_runtime_resume_workflow(tmp_path):
+    """Test RuntimeEngine.resume_workflow continues a failed execution under the same ID."""
+    from unittest.mock import Mock
+    from agent_factory.promptlog import SQLiteStorage
+    
+    engine = RuntimeEngine(
+        prompt_log_storage=SQLiteStorage(str(tmp_path / "promptlog.db")),
+        checkpoint_store=SQLiteCheckpointStore(str(tmp_path / "checkpoints.db")),
+    )
+    engine.telemetry_collector = Mock()
+    agents = {name: _CountingAgent(name) for name in ("fetch", "analyze", "report")}
+    agents["analyze"].fail = True
+    for agent in agents.values():
+        engine.register_agent(agent)
+    engine.register_workflow(_pipeline({}))
+    
+    execution_id = engine.run_workflow("pipeline", {"query": "python"})
+    assert engine.get_execution(execution_id).status == "error"
+    
+    agents["analyze"].fail = False
+    assert engine.resume_workflow(execution_id) == execution_id
+    
+    execution = engine.get_execution(execution_id)
+    assert execution.status == "completed"
+    assert execution.result.steps_executed == ["fetch", "analyze", "report"]
+    assert agents["fetch"].calls == 1
+    
+    # A completed execution is not run again
+    engine.resume_workflow(execution_id)
+    assert agents["report"].calls == 1
+    
+    with pytest.raises(ValueError):
+        engine.resume_workflow("unknown")
@@ -0,0 +1,61 @@
+"""Tests for compiled workflow condition expressions."""
+
+import pytest
+
+from agent_factory.workflows.conditions import compile_condition
+from agent_factory.workflows.model import Condition
+
+
+@pytest.mark.unit
+def test_condition_resolves_paths_without_losing_types():
+    """Test $paths resolve from flat and nested keys and keep their types."""
+    context = {
+        "steps.search.output": {"count": 3},
+        "status": "done",
+        "query": {"lang": "en"},
+        "tags": ["a", "b"],
+    }
+
+    assert compile_condition("$steps.search.output.count > 0").evaluate(context)
+    assert compile_condition("$status == 'done' and $query.lang in ['en', 'fr']").evaluate(context)
+    assert compile_condition("len($tags) == 2").evaluate(context)
+    assert not compile_condition("$missing.value > 0").evaluate(context)
+    assert compile_condition("$missing is None").evaluate(context)
+
+
+@pytest.mark.unit
+def test_condition_coerces_numeric_agent_output():
+    """Test numeric strings compare as numbers, as agent outputs are strings."""
+    assert compile_condition("$score > 0.5").evaluate({"score": "0.8"})
+    assert compile_condition("$count + 1 == 4").evaluate({"count": "3"})
+    assert not compile_condition("$score > 0.5").evaluate({"score": "n/a"})
+
+
+@pytest.mark.unit
+def test_condition_is_compiled_once_and_cached():
+    """Test the compiled form is cached on the condition and shared per expression."""
+    condition = Condition(expression="$n >= 10")
+
+    assert condition.evaluate({"n": 12})
+    compiled = condition._compiled
+    assert not condition.evaluate({"n": 2})
+    assert condition._compiled is compiled
+    assert compile_condition("$n >= 10") is compiled
+
+    condition.expression = "$n < 10"
+    assert condition.evaluate({"n": 2})
+    assert condition._compiled is not compiled
+
+    assert condition == Condition(expression="$n < 10")
+
+
+@pytest.mark.unit
+def test_invalid_conditions_are_false_or_rejected():
+    """Test unsafe or malformed expressions never evaluate to True."""
+    assert not Condition(expression="$x >").evaluate({"x": 1})
+    assert not Condition(expression="__import__('os').getcwd()").evaluate({})
+
+    with pytest.raises(ValueError):
+        compile_condition("$x.__class__ if True else 0 ; 1")
+    with pytest.raises(ValueError):
+        compile_condition("(lambda: 1)()")
@@ -0,0 +1,93 @@
+"""Tests for cross-run memoization of cacheable workflow steps."""
+
+import time
+
+import pytest
+
+from agent_factory.agents.agent import Agent, AgentResult, AgentStatus
+from agent_factory.workflows.model import Workflow, WorkflowStep
+from agent_factory.workflows.step_cache import StepCache, make_step_key
+
+
+class _CountingAgent:
+    """Stand-in agent that counts its runs."""
+    
+    def __init__(self, name, instructions="Summarize"):
+        self.id = name
+        self.model = "gpt-4o"
+        self.instructions = instructions
+        self.calls = 0
+    
+    async def arun(self, input_text):
+        self.calls += 1
+        return AgentResult(output=f"{self.id}({input_text})", status=AgentStatus.COMPLETED)
+
+
+def _workflow(agents, cache):
+    return Workflow(
+        id="summarize-source",
+        name="Summarize source",
+        steps=[
+            WorkflowStep(id="fetch", agent_id="fetch", input_mapping={"url": "$url"}, cacheable=True),
+            WorkflowStep(id="summarize", agent_id="summarize", cacheable=True),
+            WorkflowStep(id="answer", agent_id="answer", input_mapping={"q": "$question", "s": "$output"}),
+        ],
+        agents_registry=agents,
+        step_cache=cache,
+    )
+
+
+@pytest.mark.unit
+def test_cacheable_steps_are_reused_across_runs():
+    """Test a second run with the same input skips cacheable steps only."""
+    agents = {name: _CountingAgent(name) for name in ("fetch", "summarize", "answer")}
+    cache = StepCache()
+    
+    first = _workflow(agents, cache).execute({"url": "https://example.com", "question": "What?"})
+    second = _workflow(agents, cache).execute({"url": "https://example.com", "question": "Why?"})
+    
+    assert first.success and second.success
+    assert "cached_steps" not in first.metadata
+    assert second.metadata["cached_steps"] == ["fetch", "summarize"]
+    assert second.output["steps.summarize.output"] == first.output["steps.summarize.output"]
+    assert [agents[name].calls for name in ("fetch", "summarize", "answer")] == [1, 1, 2]
+    
+    _workflow(agents, cache).execute({"url": "https://example.org", "question": "Why?"})
+    assert agents["fetch"].calls == 2
+
+
+@pytest.mark.unit
+def test_step_key_tracks_agent_version_config_and_input():
+    """Test the key changes with the agent's instructions, config and the input."""
+    agent = Agent(id="summarizer", name="Summarizer", instructions="Summarize")
+    key = make_step_key(agent, "text")
+    
+    assert make_step_key(agent, "text") == key
+    assert make_step_key(agent, "other text") != key
+    
+    agent.config.temperature = 0.1
+    tuned = make_step_key(agent, "text")
+    assert tuned != key
+    
+    agent.update_instructions("Summarize in one line")
+    assert make_step_key(agent, "text") not in (key, tuned)
+
+
+@pytest.mark.unit
+def test_step_cache_ttl_eviction_and_purge():
+    """Test entries expire, the LRU bound evicts and purge removes by agent."""
+    cache = StepCache(max_entries=2, ttl=60)
+    cache.set("a", "A", agent_id="fetch")
+    cache.set("b", "B", agent_id="summarize")
+    cache.get("a")
+    cache.set("c", "C", agent_id="fetch")
+    
+    assert cache.get("b") is None  # least recently used
+    assert cache.get_stats()["evictions"] == 1
+    
+    assert cache.purge(agent_id="fetch") == 2
+    assert cache.get("a") is None and cache.get("c") is None
+    
+    cache.set("d", "D", ttl=1)
+    cache._entries["d"] = cache._entries["d"]._replace(expires_at=time.time() - 1)
+    assert cache.get("d") is None